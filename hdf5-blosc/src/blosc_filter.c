@@ -37,6 +37,36 @@ size_t blosc_filter(unsigned flags, size_t cd_nelmts,
 
 herr_t blosc_set_local(hid_t dcpl, hid_t type, hid_t space);
 
+/* The number of threads used for (de)compressing each chunk */
+static volatile int filter_nthreads = 1;
+
+/* The context-based Blosc functions start a new pool of threads for
+   every call, so a thread is only used for each of these many bytes of
+   the (uncompressed) chunk. */
+#define BLOSC_FILTER_BYTES_PER_THREAD (256 * 1024)
+
+
+int blosc_filter_set_nthreads(int nthreads){
+
+    int old_nthreads = filter_nthreads;
+
+    if (nthreads < 1) nthreads = 1;
+    filter_nthreads = nthreads;
+    return old_nthreads;
+}
+
+
+/* Get the number of threads for (de)compressing a chunk of nbytes */
+static int chunk_nthreads(size_t nbytes){
+
+    int nthreads = filter_nthreads;
+    size_t maxthreads = nbytes / BLOSC_FILTER_BYTES_PER_THREAD;
+
+    if (maxthreads < 1) maxthreads = 1;
+    if ((size_t)nthreads > maxthreads) nthreads = (int)maxthreads;
+    return nthreads;
+}
+
 
 /* Register the filter, passing on the HDF5 return value */
 int register_blosc(char **version, char **date){
@@ -214,9 +244,9 @@ size_t blosc_filter(unsigned flags, size_t cd_nelmts,
             goto failed;
         }
 
-        blosc_set_compressor(compname);
-        status = blosc_compress(clevel, doshuffle, typesize, nbytes,
-                                *buf, outbuf, nbytes);
+        status = blosc_compress_ctx(clevel, doshuffle, typesize, nbytes,
+                                    *buf, outbuf, nbytes, compname, 0,
+                                    chunk_nthreads(nbytes));
         if (status < 0) {
           PUSH_ERR("blosc_filter", H5E_CALLBACK, "Blosc compression error");
           goto failed;
@@ -249,7 +279,8 @@ size_t blosc_filter(unsigned flags, size_t cd_nelmts,
           goto failed;
         }
 
-        status = blosc_decompress(*buf, outbuf, outbuf_size);
+        status = blosc_decompress_ctx(*buf, outbuf, outbuf_size,
+                                      chunk_nthreads(outbuf_size));
         if(status <= 0){    /* decompression failed */
           PUSH_ERR("blosc_filter", H5E_CALLBACK, "Blosc decompression error");
           goto failed;
@@ -20,6 +20,15 @@ __declspec(dllexport)
 #endif	/* defined(_MSC_VER) */
 int register_blosc(char **version, char **date);
 
+/* Sets the number of threads used by the filter for every chunk, returning
+   the previous value.  The filter uses the context-based Blosc functions,
+   so this does not touch the global state of Blosc and it is safe to use
+   the filter from several threads at the same time. */
+#if defined(_MSC_VER)
+__declspec(dllexport)
+#endif	/* defined(_MSC_VER) */
+int blosc_filter_set_nthreads(int nthreads);
+
 #ifdef __cplusplus
 }
 #endif
@@ -818,6 +818,7 @@ if __name__ == "__main__":
         "console_scripts": [
             "ptdump = tables.scripts.ptdump:main",
             "ptrepack = tables.scripts.ptrepack:main",
+            "ptmerge = tables.scripts.ptmerge:main",
             "pt2to3 = tables.scripts.pt2to3:main",
             "pttree = tables.scripts.pttree:main",
         ],
@@ -28,6 +28,7 @@
  *
  * Comments: Modified by F. Alted. November 07, 2003
  *           Modified by A. Cobb. August 21, 2017 (track_times)
+ *           Added the storage of attributes (attr_*).
  *
  *-------------------------------------------------------------------------
  */
@@ -46,6 +47,9 @@ hid_t H5ARRAYmake(  hid_t loc_id,
                     int   shuffle,
                     int   fletcher32,
 		    hbool_t track_times,
+                    int   attr_max_compact,
+                    int   attr_min_dense,
+                    int   attr_creation_order,
                     const void *data)
 {
 
@@ -88,6 +92,11 @@ hid_t H5ARRAYmake(  hid_t loc_id,
  if ( H5Pset_obj_track_times( plist_id, track_times ) < 0 )
    return -1;
 
+ /* Set the storage of attributes */
+ if ( set_attr_storage( plist_id, attr_max_compact, attr_min_dense,
+                        attr_creation_order ) < 0 )
+   return -1;
+
  if (chunked) {
    /* Modify dataset creation properties, i.e. enable chunking  */
    if ( H5Pset_chunk ( plist_id, rank, dims_chunk ) < 0 )
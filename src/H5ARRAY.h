@@ -27,6 +27,9 @@ hid_t H5ARRAYmake(  hid_t loc_id,
                     int   shuffle,
                     int   fletcher32,
                     hbool_t track_times,
+                    int   attr_max_compact,
+                    int   attr_min_dense,
+                    int   attr_creation_order,
                     const void *data);
 
 herr_t H5ARRAYappend_records( hid_t dataset_id,
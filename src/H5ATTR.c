@@ -27,6 +27,54 @@
  *-------------------------------------------------------------------------
  */
 
+/*-------------------------------------------------------------------------
+ * Function: same_attr_layout
+ *
+ * Purpose: Check whether the attribute attr_id has the type type_id and
+ * the shape given by rank and dims (a scalar dataspace if rank == 0).
+ *
+ * Return: 1 if it does, 0 otherwise.
+ *
+ *-------------------------------------------------------------------------
+ */
+
+static int same_attr_layout( hid_t attr_id,
+                             hid_t type_id,
+                             size_t rank,
+                             hsize_t *dims )
+{
+ hid_t      attr_type_id;
+ hid_t      attr_space_id;
+ hsize_t    attr_dims[H5S_MAX_RANK];
+ int        attr_rank;
+ int        same;
+ size_t     i;
+
+ attr_type_id = H5Aget_type( attr_id );
+ if ( attr_type_id < 0 )
+  return 0;
+ same = H5Tequal( attr_type_id, type_id ) > 0;
+ H5Tclose( attr_type_id );
+ if ( !same )
+  return 0;
+
+ attr_space_id = H5Aget_space( attr_id );
+ if ( attr_space_id < 0 )
+  return 0;
+ attr_rank = H5Sget_simple_extent_ndims( attr_space_id );
+ if ( rank == 0 )
+  same = ( H5Sget_simple_extent_type( attr_space_id ) == H5S_SCALAR );
+ else if ( attr_rank != (int)rank ||
+           H5Sget_simple_extent_dims( attr_space_id, attr_dims, NULL ) < 0 )
+  same = 0;
+ else
+  for ( i = 0; i < rank; i++ )
+   same = same && ( attr_dims[i] == dims[i] );
+ H5Sclose( attr_space_id );
+ return same;
+}
+
+
 /*-------------------------------------------------------------------------
  * Function: H5ATTRset_attribute
  *
@@ -68,9 +116,27 @@ herr_t H5ATTRset_attribute( hid_t obj_id,
  /* Verify whether the attribute already exists */
  has_attr = H5ATTRfind_attribute( obj_id, attr_name );
 
- /* The attribute already exists, delete it */
+ /* The attribute already exists */
  if ( has_attr == 1 )
  {
+  /* Overwrite it in place if its type and shape are the same (this is
+     also needed in SWMR mode, where attributes can not be deleted) */
+  attr_id = H5Aopen( obj_id, attr_name, H5P_DEFAULT );
+  if ( attr_id >= 0 && same_attr_layout( attr_id, type_id, rank, dims ) )
+  {
+   if ( H5Awrite( attr_id, type_id, attr_data ) < 0 )
+   {
+    H5Aclose( attr_id );
+    goto out;
+   }
+   H5Aclose( attr_id );
+   H5Sclose( space_id );
+   return 0;
+  }
+  if ( attr_id >= 0 )
+   H5Aclose( attr_id );
+
+  /* Else, delete it */
   if ( H5Adelete( obj_id, attr_name ) < 0 )
     goto out;
  }
@@ -183,6 +249,100 @@ out:
 }
 
 
+/*-------------------------------------------------------------------------
+ * Function: copy_attribute
+ *
+ * Purpose: H5Aiterate2 callback copying the attribute attr_name of loc_id
+ * to the object whose identifier is pointed to by op_data.
+ *
+ * Return: Success: 0, Failure: -1
+ *
+ *-------------------------------------------------------------------------
+ */
+
+static herr_t copy_attribute( hid_t loc_id,
+                              const char *attr_name,
+                              const H5A_info_t *ainfo,
+                              void *op_data )
+{
+ hid_t      dst_id = *(hid_t *)op_data;
+ hid_t      attr_id = -1;
+ hid_t      type_id = -1;
+ hid_t      space_id = -1;
+ hid_t      new_attr_id = -1;
+ hssize_t   npoints;
+ size_t     size;
+ void       *buf = NULL;
+
+ if ( (attr_id = H5Aopen( loc_id, attr_name, H5P_DEFAULT )) < 0 )
+  goto out;
+ if ( (type_id = H5Aget_type( attr_id )) < 0 )
+  goto out;
+ /* Variable length data can not be copied as a plain buffer */
+ if ( H5Tdetect_class( type_id, H5T_VLEN ) != 0 ||
+      H5Tis_variable_str( type_id ) != 0 )
+  goto out;
+ if ( (space_id = H5Aget_space( attr_id )) < 0 )
+  goto out;
+ if ( (npoints = H5Sget_simple_extent_npoints( space_id )) < 0 )
+  goto out;
+ size = H5Tget_size( type_id ) * (size_t)npoints;
+ if ( (buf = malloc( size > 0 ? size : 1 )) == NULL )
+  goto out;
+ if ( H5Aread( attr_id, type_id, buf ) < 0 )
+  goto out;
+
+ if ( (new_attr_id = H5Acreate( dst_id, attr_name, type_id, space_id,
+                                H5P_DEFAULT, H5P_DEFAULT )) < 0 )
+  goto out;
+ if ( H5Awrite( new_attr_id, type_id, buf ) < 0 )
+  goto out;
+
+ free( buf );
+ H5Aclose( new_attr_id );
+ H5Sclose( space_id );
+ H5Tclose( type_id );
+ H5Aclose( attr_id );
+ return 0;
+
+out:
+ free( buf );
+ if ( new_attr_id >= 0 )
+  H5Aclose( new_attr_id );
+ if ( space_id >= 0 )
+  H5Sclose( space_id );
+ if ( type_id >= 0 )
+  H5Tclose( type_id );
+ if ( attr_id >= 0 )
+  H5Aclose( attr_id );
+ return -1;
+}
+
+
+/*-------------------------------------------------------------------------
+ * Function: H5ATTRcopy_attributes
+ *
+ * Purpose: Copies all the attributes of the object src_id to the object
+ * dst_id, which must not have attributes with the same names.
+ * Attributes with variable length data are not supported.
+ *
+ * Return: Success: 0, Failure: -1
+ *
+ *-------------------------------------------------------------------------
+ */
+
+herr_t H5ATTRcopy_attributes( hid_t src_id,
+                              hid_t dst_id )
+{
+ hsize_t    idx = 0;
+
+ if ( H5Aiterate2( src_id, H5_INDEX_NAME, H5_ITER_INC, &idx,
+                   copy_attribute, (void *)&dst_id ) < 0 )
+  return -1;
+ return 0;
+}
+
+
 /*-------------------------------------------------------------------------
  * Function: H5ATTRget_attribute
  *
@@ -419,51 +579,6 @@ out:
  *-------------------------------------------------------------------------
  */
 
-/*-------------------------------------------------------------------------
- * Function: find_attr
- *
- * Purpose: operator function used by H5ATTRfind_attribute
- *
- * Programmer: Pedro Vicente, pvn@ncsa.uiuc.edu
- *
- * Date: June 21, 2001
- *
- * Comments:
- *
- * Modifications:
- *
- *-------------------------------------------------------------------------
- */
-
-static herr_t find_attr( hid_t loc_id,
-                         const char *name,
-                         const H5A_info_t *ainfo,
-                         void *op_data)
-{
-
- /* Define a default zero value for return. This will cause the
-  * iterator to continue if the palette attribute is not found yet.
-  */
-
- int ret = 0;
-
- char *attr_name = (char*)op_data;
-
- /* Shut the compiler up */
- loc_id=loc_id;
-
- /* Define a positive value for return value if the attribute was
-  * found. This will cause the iterator to immediately return that
-  * positive value, indicating short-circuit success
-  */
-
- if( strcmp( name, attr_name ) == 0 )
-  ret = 1;
-
- return ret;
-}
-
-
 /*-------------------------------------------------------------------------
  * Function: H5ATTRfind_attribute
  *
@@ -475,16 +590,15 @@ static herr_t find_attr( hid_t loc_id,
  * Date: June 21, 2001
  *
  * Comments:
- *  The function uses H5Aiterate with the operator function find_attr
+ *  The function uses H5Aexists, which looks the name up in the name
+ *  index of attributes in dense storage instead of iterating over all
+ *  the attributes.
  *
  * Return:
- *  Success: The return value of the first operator that
- *              returns non-zero, or zero if all members were
- *              processed with no operator returning non-zero.
+ *  Success: 1 if the attribute exists, 0 if it does not.
  *
  *  Failure: Negative if something goes wrong within the
- *              library, or the negative value returned by one
- *              of the operators.
+ *              library.
  *
  *-------------------------------------------------------------------------
  */
@@ -493,14 +607,13 @@ herr_t H5ATTRfind_attribute( hid_t loc_id,
                              const char* attr_name )
 {
 
- hsize_t attr_num;
- herr_t  ret;
+ htri_t ret;
 
- attr_num = 0;
- ret = H5Aiterate( loc_id, H5_INDEX_CRT_ORDER, H5_ITER_NATIVE, &attr_num,
-                   find_attr, (void *)attr_name );
+ ret = H5Aexists( loc_id, attr_name );
+ if ( ret < 0 )
+  return -1;
 
- return ret;
+ return ret > 0 ? 1 : 0;
 }
 
 
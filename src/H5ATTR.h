@@ -43,6 +43,9 @@ herr_t H5ATTRset_attribute_string( hid_t obj_id,
                                    hsize_t attr_size,
                                    int cset );
 
+herr_t H5ATTRcopy_attributes( hid_t src_id,
+                              hid_t dst_id );
+
 herr_t H5ATTRget_attribute( hid_t loc_id,
                             const char *attr_name,
                             hid_t type_id,
@@ -33,6 +33,7 @@
 
 #include "H5TB-opt.h"
 #include "tables.h"
+#include "utils.h"                    /* set_attr_storage */
 #include "H5Zlzo.h"                    /* Import FILTER_LZO */
 #include "H5Zbzip2.h"                  /* Import FILTER_BZIP2 */
 #include "blosc_filter.h"              /* Import FILTER_BLOSC */
@@ -68,6 +69,7 @@
  *
  * Modifications:
  *  * Modified by A. Cobb. August 21, 2017 (track_times)
+ *  * Added the storage of attributes (attr_*).
  *
  *-------------------------------------------------------------------------
  */
@@ -87,6 +89,9 @@ hid_t H5TBOmake_table(  const char *table_title,
                         int shuffle,
                         int fletcher32,
                         hbool_t track_times,
+                        int attr_max_compact,
+                        int attr_min_dense,
+                        int attr_creation_order,
                         const void *data )
 {
 
@@ -114,6 +119,11 @@ hid_t H5TBOmake_table(  const char *table_title,
  if ( H5Pset_obj_track_times( plist_id, track_times ) < 0 )
    return -1;
 
+ /* Set the storage of attributes */
+ if ( set_attr_storage( plist_id, attr_max_compact, attr_min_dense,
+                        attr_creation_order ) < 0 )
+   return -1;
+
  /* Modify dataset creation properties, i.e. enable chunking  */
  if ( H5Pset_chunk ( plist_id, 1, dims_chunk ) < 0 )
   return -1;
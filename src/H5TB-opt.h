@@ -18,6 +18,9 @@ hid_t H5TBOmake_table(  const char *table_title,
                         int shuffle,
                         int fletcher32,
 			hbool_t track_times,
+                        int attr_max_compact,
+                        int attr_min_dense,
+                        int attr_creation_order,
                         const void *data );
 
 herr_t H5TBOread_records( hid_t dataset_id,
@@ -28,6 +28,7 @@
  * Date: November 08, 2003
  *
  * Comments: Modified by A. Cobb. August 21, 2017 (track_times)
+ *           Added the storage of attributes (attr_*).
  *
  *-------------------------------------------------------------------------
  */
@@ -45,6 +46,9 @@ hid_t H5VLARRAYmake(  hid_t loc_id,
                       int   shuffle,
                       int   fletcher32,
                       hbool_t track_times,
+                      int   attr_max_compact,
+                      int   attr_min_dense,
+                      int   attr_creation_order,
                       const void *data)
 {
 
@@ -92,6 +96,11 @@ hid_t H5VLARRAYmake(  hid_t loc_id,
  if ( H5Pset_obj_track_times( plist_id, track_times ) < 0 )
    return -1;
 
+ /* Set the storage of attributes */
+ if ( set_attr_storage( plist_id, attr_max_compact, attr_min_dense,
+                        attr_creation_order ) < 0 )
+   return -1;
+
  /* Modify dataset creation properties, i.e. enable chunking  */
  if ( H5Pset_chunk ( plist_id, 1, dims_chunk ) < 0 )
    return -1;
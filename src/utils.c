@@ -413,6 +413,159 @@ static herr_t aitercb( hid_t loc_id, const char *name,
 }
 
 
+/****************************************************************
+**
+**  has_link(): Check whether a link with the given name exists.
+**
+****************************************************************/
+int has_link(hid_t loc_id, const char *name) {
+  htri_t     ret;
+
+  /* Check for the link, without emiting an error in case an
+     intermediate group does not exist. */
+  H5E_BEGIN_TRY {
+    ret = H5Lexists(loc_id, name, H5P_DEFAULT);
+  } H5E_END_TRY;
+  return ret > 0;
+}
+
+/****************************************************************
+**
+**  set_attr_storage(): Set the storage of attributes in an object
+**  creation property list.  A negative max_compact means the HDF5
+**  defaults for the phase change between compact and dense storage.
+**  Dense storage needs the 1.8 object header format, which is only
+**  used for objects tracking the creation order of attributes (with
+**  the default library version bounds), so creation order is always
+**  tracked when a phase change is given.
+**
+****************************************************************/
+herr_t set_attr_storage(hid_t plist_id, int max_compact, int min_dense,
+                        int creation_order) {
+  unsigned   crt_order_flags = 0;
+
+  if (creation_order)
+    crt_order_flags = H5P_CRT_ORDER_TRACKED | H5P_CRT_ORDER_INDEXED;
+  else if (max_compact >= 0)
+    crt_order_flags = H5P_CRT_ORDER_TRACKED;
+  if (crt_order_flags &&
+      H5Pset_attr_creation_order(plist_id, crt_order_flags) < 0)
+    return -1;
+  if (max_compact >= 0 &&
+      H5Pset_attr_phase_change(plist_id, (unsigned)max_compact,
+                               (unsigned)min_dense) < 0)
+    return -1;
+  return 0;
+}
+
+/****************************************************************
+**
+**  lpagecb(): Link iteration callback routine for pages of links.
+**
+****************************************************************/
+typedef struct {
+  PyObject *children;
+  hsize_t  count;
+} lpage_t;
+
+herr_t lpagecb(hid_t loc_id, const char *name, const H5L_info_t *info,
+               void *data) {
+  lpage_t    *page=(lpage_t *)data;
+  PyObject   *child;
+  herr_t     ret;
+  H5G_stat_t oinfo;
+  int        kind;
+
+  switch(info->type) {
+    case H5L_TYPE_SOFT:
+    case H5L_TYPE_EXTERNAL:
+      kind = 2;
+      break;
+    case H5L_TYPE_HARD:
+      /* Get type of the object and check it */
+      ret = H5Gget_objinfo(loc_id, name, FALSE, &oinfo);
+      if (ret < 0)
+        return -1;
+
+      switch(oinfo.type) {
+        case H5G_GROUP:
+          kind = 0;
+          break;
+        case H5G_DATASET:
+          kind = 1;
+          break;
+        case H5G_TYPE:
+          kind = -1;  /* named types are not listed */
+          break;
+        case H5G_UNKNOWN:
+          kind = 3;
+          break;
+        default:
+          /* should not happen: assume it is an external link */
+          kind = 2;
+      }
+      break;
+    default:
+      /* should not happen */
+      kind = 3;
+  }
+
+  if (kind >= 0) {
+    child = Py_BuildValue("(si)", name, kind);
+    if (child == NULL)
+      return -1;
+    ret = PyList_Append(page->children, child);
+    Py_DECREF(child);
+    if (ret < 0)
+      return -1;
+  }
+
+  /* Stop when the page is full */
+  return (hsize_t)PyList_Size(page->children) >= page->count;
+}
+
+/****************************************************************
+**
+**  Giterate_page(): Group iteration routine for pages of links.
+**
+**  Return a tuple with a list of (name, kind) pairs for (at most)
+**  `count` links of `loc_id` (in name order) from position `start`,
+**  and the position of the next link (or None if there are no more
+**  links).  The kind is 0 for groups, 1 for leaves, 2 for soft and
+**  external links and 3 for unknown objects.
+**
+****************************************************************/
+PyObject *Giterate_page(hid_t loc_id, hsize_t start, hsize_t count) {
+  hsize_t    i=start;
+  herr_t     ret=0;
+  lpage_t    page;
+  H5G_info_t ginfo;
+
+  page.children = PyList_New(0);
+  if (page.children == NULL)
+    return NULL;
+  page.count = count;
+
+  /* Iterating from a position past the last link is an error */
+  if (H5Gget_info(loc_id, &ginfo) < 0)
+    goto out;
+  if (i < ginfo.nlinks) {
+    ret = H5Literate(loc_id, H5_INDEX_NAME, H5_ITER_INC, &i, lpagecb, &page);
+    if (ret < 0)
+      goto out;
+  }
+
+  if (ret == 0 || i >= ginfo.nlinks)
+    return Py_BuildValue("(NO)", page.children, Py_None);
+  return Py_BuildValue("(NK)", page.children, (unsigned long long)i);
+
+ out:
+  Py_DECREF(page.children);
+  if (!PyErr_Occurred())
+    PyErr_SetString(PyExc_RuntimeError, "Can't iterate over the group.");
+  return NULL;
+}
+
 /****************************************************************
 **
 **  Aiterate(): Attribute set iteration routine.
@@ -423,7 +576,9 @@ PyObject *Aiterate(hid_t loc_id) {
   PyObject *attrlist;                  /* List where the attrnames are put */
 
   attrlist = PyList_New(0);
-  H5Aiterate(loc_id, H5_INDEX_CRT_ORDER, H5_ITER_NATIVE, &i,
+  /* Iterate over the name index, which all the objects have (even
+     those with attributes in dense storage and no creation order). */
+  H5Aiterate(loc_id, H5_INDEX_NAME, H5_ITER_NATIVE, &i,
              (H5A_operator_t)aitercb, (void *)attrlist);
 
   return attrlist;
@@ -1006,6 +1161,47 @@ ssize_t pt_H5Fget_file_image(hid_t file_id, void *buf_ptr, size_t buf_len) {
 #endif /* (H5_HAVE_IMAGE_FILE != 1) */
 
 
+#if (H5_HAVE_DIRECT_CHUNK != 1)
+/* HDF5 version < 1.10.5 */
+
+herr_t pt_H5Dwrite_chunk(hid_t dset_id, hid_t dxpl_id, uint32_t filters,
+                         const hsize_t *offset, size_t data_size,
+                         const void *buf) {
+ return -1;
+}
+
+herr_t pt_H5Dread_chunk(hid_t dset_id, hid_t dxpl_id, const hsize_t *offset,
+                        uint32_t *filters, void *buf) {
+ return -1;
+}
+
+herr_t pt_H5Dget_chunk_info_by_coord(hid_t dset_id, const hsize_t *offset,
+                                     unsigned *filter_mask, haddr_t *addr,
+                                     hsize_t *size) {
+ return -1;
+}
+
+herr_t pt_H5Dget_num_chunks(hid_t dset_id, hid_t fspace_id, hsize_t *nchunks) {
+ return -1;
+}
+
+#endif /* (H5_HAVE_DIRECT_CHUNK != 1) */
+
+
+#if (H5_HAVE_SWMR != 1)
+/* HDF5 version < 1.10.0 */
+
+herr_t pt_H5Drefresh(hid_t dset_id) {
+ return -1;
+}
+
+herr_t pt_H5Fstart_swmr_write(hid_t file_id) {
+ return -1;
+}
+
+#endif /* (H5_HAVE_SWMR != 1) */
+
+
 #if H5_VERSION_LE(1,8,12)
 
 herr_t pt_H5free_memory(void *buf) {
@@ -91,6 +91,13 @@ int get_linkinfo(hid_t loc_id, const char *name);
 
 PyObject *Giterate(hid_t parent_id, hid_t loc_id, const char *name);
 
+PyObject *Giterate_page(hid_t loc_id, hsize_t start, hsize_t count);
+
+int has_link(hid_t loc_id, const char *name);
+
+herr_t set_attr_storage(hid_t plist_id, int max_compact, int min_dense,
+                        int creation_order);
+
 PyObject *Aiterate(hid_t loc_id);
 
 H5T_class_t getHDF5ClassID(hid_t loc_id,
@@ -153,6 +160,51 @@ ssize_t pt_H5Fget_file_image(hid_t file_id, void *buf_ptr, size_t buf_len);
 #endif /* (H5_HAVE_IMAGE_FILE != 1) */
 
 
+/* COMAPTIBILITY: H5_VERSION_GE has been introduced in HDF5 1.8.7 */
+#ifndef H5_VERSION_GE
+#define H5_VERSION_GE(Maj,Min,Rel) \
+       (((H5_VERS_MAJOR==Maj) && (H5_VERS_MINOR==Min) && (H5_VERS_RELEASE>=Rel)) || \
+        ((H5_VERS_MAJOR==Maj) && (H5_VERS_MINOR>Min)) || \
+        (H5_VERS_MAJOR>Maj))
+#endif
+
+#if H5_VERSION_GE(1,10,5)
+/* HDF5 version >= 1.10.5 */
+#define H5_HAVE_DIRECT_CHUNK 1
+#define pt_H5Dwrite_chunk H5Dwrite_chunk
+#define pt_H5Dread_chunk H5Dread_chunk
+#define pt_H5Dget_chunk_info_by_coord H5Dget_chunk_info_by_coord
+#define pt_H5Dget_num_chunks H5Dget_num_chunks
+#else
+/* HDF5 version < 1.10.5 */
+#define H5_HAVE_DIRECT_CHUNK 0
+herr_t pt_H5Dwrite_chunk(hid_t dset_id, hid_t dxpl_id, uint32_t filters,
+                         const hsize_t *offset, size_t data_size,
+                         const void *buf);
+herr_t pt_H5Dread_chunk(hid_t dset_id, hid_t dxpl_id, const hsize_t *offset,
+                        uint32_t *filters, void *buf);
+herr_t pt_H5Dget_chunk_info_by_coord(hid_t dset_id, const hsize_t *offset,
+                                     unsigned *filter_mask, haddr_t *addr,
+                                     hsize_t *size);
+herr_t pt_H5Dget_num_chunks(hid_t dset_id, hid_t fspace_id, hsize_t *nchunks);
+#endif
+
+#if H5_VERSION_GE(1,10,0)
+/* HDF5 version >= 1.10.0 */
+#define H5_HAVE_SWMR 1
+#define PT_H5F_ACC_SWMR_READ H5F_ACC_SWMR_READ
+#define PT_H5F_ACC_SWMR_WRITE H5F_ACC_SWMR_WRITE
+#define pt_H5Drefresh H5Drefresh
+#define pt_H5Fstart_swmr_write H5Fstart_swmr_write
+#else
+/* HDF5 version < 1.10.0 */
+#define H5_HAVE_SWMR 0
+#define PT_H5F_ACC_SWMR_READ 0
+#define PT_H5F_ACC_SWMR_WRITE 0
+herr_t pt_H5Drefresh(hid_t dset_id);
+herr_t pt_H5Fstart_swmr_write(hid_t file_id);
+#endif
+
 #if H5_VERSION_LE(1,8,12)
 herr_t pt_H5free_memory(void *buf);
 #else
@@ -37,7 +37,7 @@ hdf5Version = hdf5_version
 
 from .utilsextension import (is_hdf5_file, is_pytables_file,
                              which_lib_version, set_blosc_max_threads,
-                             silence_hdf5_messages)
+                             silence_hdf5_messages, HDF5Lock, hdf5_lock)
 
 from .misc.enum import Enum
 from .atom import *
@@ -58,6 +58,7 @@ from .earray import EArray
 from .vlarray import VLArray
 from .unimplemented import UnImplemented, Unknown
 from .expression import Expr
+from .merge import merge_tables
 from .tests import print_versions, test
 
 
@@ -73,11 +74,12 @@ __all__ = [
     'FiltersWarning', 'DataTypeWarning',
     # Functions:
     'is_hdf5_file', 'is_pytables_file', 'which_lib_version',
-    'copy_file', 'open_file', 'print_versions', 'test',
+    'copy_file', 'open_file', 'merge_tables', 'print_versions', 'test',
     'split_type', 'restrict_flavors', 'set_blosc_max_threads',
-    'silence_hdf5_messages',
+    'silence_hdf5_messages', 'hdf5_lock',
     # Helper classes:
     'IsDescription', 'Description', 'Filters', 'Cols', 'Column',
+    'HDF5Lock',
     # Types:
     'Enum',
     # Atom types:
@@ -0,0 +1,477 @@
+"""Asynchronous (asyncio) front-end for PyTables files.
+
+The classes in this module wrap :class:`File` objects and some of their
+nodes (tables and arrays), providing coroutine versions of the methods
+which do I/O, so that they can be used from an asyncio event loop without
+blocking it.  For instance::
+
+    import tables.aio
+
+    async def handler(request):
+        async with await tables.aio.open_file('data.h5') as h5file:
+            table = await h5file.get_node('/table')
+            rows = await table.read_where('(var1 > 20) & (var2 < 30)')
+            async for batch in table.iter_batches(condition='var1 > 20'):
+                ...
+
+Calls are run in a bounded pool of threads, and calls on the same file
+are serialized, since PyTables objects can not be used concurrently from
+several threads.  Reads of large ranges of rows are split in calls of
+the size of the I/O buffer of the leaf, so that cancelling the awaiting
+task stops the read between buffers.  Calls already running when a task
+is cancelled can not be interrupted, but they complete before any new
+call on the same file is started.
+
+.. versionadded:: 3.7
+
+"""
+
+import sys
+import asyncio
+import functools
+import concurrent.futures
+
+import numpy as np
+
+from . import file
+from .utils import detect_number_of_cores
+
+
+__all__ = ['open_file', 'get_executor', 'AsyncFile', 'AsyncNode',
+           'AsyncLeaf', 'AsyncTable', 'AsyncArray', 'AsyncVLArray']
+
+
+_executor = None
+"""The default pool of threads for running calls."""
+
+
+def get_executor():
+    """Get the default pool of threads used for running calls.
+
+    The pool is shared by all the files opened with this module and it
+    has as many threads as cores in the machine.
+
+    """
+
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(
+            detect_number_of_cores(), thread_name_prefix='tables-aio')
+    return _executor
+
+
+async def open_file(filename, mode='r', title='', root_uep='/',
+                    filters=None, executor=None, **kwargs):
+    """Open a PyTables file and return an :class:`AsyncFile` object.
+
+    The arguments are the same as in :func:`tables.open_file`, except
+    for executor, which is an optional :class:`concurrent.futures.Executor`
+    used for running the calls on the file instead of the default one
+    (see :func:`get_executor`).
+
+    """
+
+    if executor is None:
+        executor = get_executor()
+    loop = asyncio.get_running_loop()
+    h5file = await loop.run_in_executor(executor, functools.partial(
+        file.open_file, filename, mode, title, root_uep, filters, **kwargs))
+    return AsyncFile(h5file, executor)
+
+
+def _split_range(start, stop, step, nrows):
+    """Split ``range(start, stop, step)`` in ranges of `nrows` items."""
+
+    rng = range(start, stop, step)
+    for i in range(0, len(rng), nrows):
+        subrng = rng[i:i + nrows]
+        yield subrng.start, subrng.stop, subrng.step
+
+
+def _user_namespace(condvars, depth=2):
+    """Get the namespace to look up variables of a condition in.
+
+    If `condvars` is None, return a ``(locals, globals)`` pair with the
+    variables of the frame at the given `depth` (that of the caller of
+    the method calling this function), else return None.  The local
+    variables are copied so that the frame can be left while the
+    condition is being prepared in another thread.
+
+    This must be called synchronously by the methods which return
+    coroutines, since the caller of a running coroutine may be the
+    event loop instead of the user (e.g. in :func:`asyncio.gather`).
+
+    """
+
+    if condvars is not None:
+        return None
+    frame = sys._getframe(depth)
+    return dict(frame.f_locals), frame.f_globals
+
+
+class AsyncFile:
+    """Asynchronous wrapper of a :class:`File` object.
+
+    Attributes which do not do any I/O (like filename, mode or isopen)
+    are taken from the wrapped file, while nodes are got with the
+    :meth:`AsyncFile.get_node` coroutine, which wraps them in instances
+    of :class:`AsyncTable`, :class:`AsyncArray`, :class:`AsyncVLArray`
+    or :class:`AsyncNode` for other kinds of nodes.
+
+    Parameters
+    ----------
+    h5file : File
+        The wrapped file.
+    executor : concurrent.futures.Executor
+        The pool of threads for running calls on the file.  If None,
+        the default one is used (see :func:`get_executor`).
+
+    """
+
+    def __init__(self, h5file, executor=None):
+        if executor is None:
+            executor = get_executor()
+        self.file = h5file
+        """The wrapped :class:`File` object."""
+        self._executor = executor
+        self._lock = None
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} of {self.file!r}>'
+
+    async def _run(self, func, *args, **kwargs):
+        """Run ``func(*args, **kwargs)`` in the pool of threads.
+
+        The call is only started once the calls made before on the same
+        file have finished, even if the tasks awaiting them have been
+        cancelled.
+
+        """
+
+        # The lock is created here so that it is bound to the running
+        # event loop (for Python < 3.10).
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        lock = self._lock
+        await lock.acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs))
+        except BaseException:
+            lock.release()
+            raise
+
+        def done(future):
+            lock.release()
+            # Avoid warnings about exceptions never retrieved.
+            if not future.cancelled():
+                future.exception()
+
+        future.add_done_callback(done)
+        # The call is not cancelled along with the awaiting task, so that
+        # the lock is only released when the call finishes.
+        return await asyncio.shield(future)
+
+    def _wrap(self, node):
+        """Wrap `node` in the proper asynchronous class."""
+
+        from .table import Table
+        from .array import Array
+        from .vlarray import VLArray
+
+        if isinstance(node, Table):
+            return AsyncTable(self, node)
+        elif isinstance(node, Array):
+            return AsyncArray(self, node)
+        elif isinstance(node, VLArray):
+            return AsyncVLArray(self, node)
+        return AsyncNode(self, node)
+
+    async def get_node(self, where, name=None, classname=None):
+        """Get the node under where with the given name.
+
+        See :meth:`File.get_node`.  The node is returned wrapped in an
+        asynchronous class.
+
+        """
+
+        node = await self._run(self.file.get_node, where, name, classname)
+        return self._wrap(node)
+
+    async def list_nodes(self, where, classname=None):
+        """Return a list with children nodes hanging from where.
+
+        See :meth:`File.list_nodes`.  The nodes are returned wrapped in
+        asynchronous classes.
+
+        """
+
+        nodes = await self._run(self.file.list_nodes, where, classname)
+        return [self._wrap(node) for node in nodes]
+
+    async def flush(self):
+        """Flush all the alive leaves in the object tree."""
+
+        await self._run(self.file.flush)
+
+    async def close(self):
+        """Flush all the alive leaves in object tree and close the file."""
+
+        await self._run(self.file.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+        return False
+
+
+class AsyncNode:
+    """Asynchronous wrapper of a node.
+
+    Attributes which do not do any I/O (like name, shape or nrows) are
+    taken from the wrapped node.
+
+    """
+
+    def __init__(self, afile, node):
+        self._v_afile = afile
+        self.node = node
+        """The wrapped :class:`Node` object."""
+
+    def __getattr__(self, name):
+        return getattr(self.node, name)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} of {self.node!r}>'
+
+    def _run(self, func, *args, **kwargs):
+        return self._v_afile._run(func, *args, **kwargs)
+
+
+class AsyncLeaf(AsyncNode):
+    """Asynchronous wrapper of a leaf."""
+
+    def __getitem__(self, key):
+        """Get a selection of the leaf (returns an awaitable).
+
+        For example, ``await leaf[10:20]``.
+
+        """
+
+        return self._run(self.node.__getitem__, key)
+
+    def __len__(self):
+        return len(self.node)
+
+    async def _read_split(self, read, start, stop, step, concatenate):
+        """Read a range of rows with `read` in buffer-sized calls.
+
+        ``read(start, stop, step)`` is called for each block of rows in
+        the range, and the list of results is passed to `concatenate`.
+
+        """
+
+        (start, stop, step) = self.node._process_range(start, stop, step)
+        nrowsinbuf = max(self.node.nrowsinbuf, 1)
+        ranges = list(_split_range(start, stop, step, nrowsinbuf))
+        if len(ranges) <= 1:
+            return await self._run(read, start, stop, step)
+        results = []
+        for (bstart, bstop, bstep) in ranges:
+            results.append(await self._run(read, bstart, bstop, bstep))
+        return concatenate(results)
+
+    async def append(self, rows):
+        """Append rows to the end of the leaf (see its append method)."""
+
+        await self._run(self.node.append, rows)
+
+    async def flush(self):
+        """Flush pending data to disk."""
+
+        await self._run(self.node.flush)
+
+    async def refresh(self):
+        """Re-read the extent of the leaf (see :meth:`Leaf.refresh`)."""
+
+        await self._run(self.node.refresh)
+
+
+class AsyncTable(AsyncLeaf):
+    """Asynchronous wrapper of a :class:`Table` object."""
+
+    async def read(self, start=None, stop=None, step=None, field=None):
+        """Get data in the table as a (record) array.
+
+        See :meth:`Table.read`.  The rows are read in buffer-sized calls
+        when the flavor of the table is 'numpy'.
+
+        """
+
+        def read(start, stop, step):
+            return self.node.read(start, stop, step, field)
+
+        if self.node.flavor != 'numpy':
+            return await self._run(read, start, stop, step)
+        return await self._read_split(read, start, stop, step,
+                                      np.concatenate)
+
+    def read_where(self, condition, condvars=None, field=None,
+                   start=None, stop=None, step=None):
+        """Read table data fulfilling the given condition.
+
+        See :meth:`Table.read_where`.  This returns a coroutine, and
+        variables in the condition which are not in `condvars` are taken
+        from the caller when the method is called.  Unless the condition
+        can use indexes, the rows are read in buffer-sized calls when the
+        flavor of the table is 'numpy'.
+
+        """
+
+        return self._read_where(condition, condvars, field, start, stop,
+                                step, _user_namespace(condvars))
+
+    async def _read_where(self, condition, condvars, field, start, stop,
+                          step, user_ns):
+        def prepare():
+            reqvars = self.node._required_expr_vars(condition, condvars,
+                                                    user_ns=user_ns)
+            indexed = (self.node.flavor != 'numpy' or
+                       bool(self.node.will_query_use_indexing(condition,
+                                                              reqvars)))
+            return reqvars, indexed
+
+        reqvars, indexed = await self._run(prepare)
+
+        def read(start, stop, step):
+            return self.node.read_where(condition, reqvars, field,
+                                        start, stop, step)
+
+        if indexed:
+            return await self._run(read, start, stop, step)
+        return await self._read_split(read, start, stop, step,
+                                      np.concatenate)
+
+    def get_where_list(self, condition, condvars=None, sort=False,
+                       start=None, stop=None, step=None):
+        """Get the row coordinates fulfilling the given condition.
+
+        See :meth:`Table.get_where_list`.  This returns a coroutine, and
+        variables in the condition are taken as in
+        :meth:`AsyncTable.read_where`.
+
+        """
+
+        return self._get_where_list(condition, condvars, sort, start, stop,
+                                    step, _user_namespace(condvars))
+
+    async def _get_where_list(self, condition, condvars, sort, start, stop,
+                              step, user_ns):
+        def get_where_list():
+            reqvars = self.node._required_expr_vars(condition, condvars,
+                                                    user_ns=user_ns)
+            return self.node.get_where_list(condition, reqvars, sort,
+                                            start, stop, step)
+
+        return await self._run(get_where_list)
+
+    async def read_coordinates(self, coords, field=None):
+        """Get a set of rows given their indexes as a (record) array.
+
+        See :meth:`Table.read_coordinates`.
+
+        """
+
+        return await self._run(self.node.read_coordinates, coords, field)
+
+    async def read_columns(self, names=None, start=None, stop=None,
+                           step=None):
+        """Read columns of the table into separate arrays.
+
+        See :meth:`Table.read_columns`.
+
+        """
+
+        return await self._run(self.node.read_columns, names, start, stop,
+                               step)
+
+    def iter_batches(self, batch_rows=None, fields=None, condition=None,
+                     condvars=None, start=None, stop=None, step=None):
+        """Iterate asynchronously over the table in batches of rows.
+
+        See :meth:`Table.iter_batches`.  Each batch is read in a
+        separate call, so iteration can be cancelled between batches.
+        Use it with ``async for``.  Variables in the condition are taken
+        as in :meth:`AsyncTable.read_where`.
+
+        """
+
+        return self._iter_batches(batch_rows, fields, condition, condvars,
+                                  start, stop, step,
+                                  _user_namespace(condvars))
+
+    async def _iter_batches(self, batch_rows, fields, condition, condvars,
+                            start, stop, step, user_ns):
+        def iter_batches():
+            reqvars = condvars
+            if condition is not None:
+                reqvars = self.node._required_expr_vars(condition, condvars,
+                                                        user_ns=user_ns)
+            return self.node.iter_batches(batch_rows, fields, condition,
+                                          reqvars, start, stop, step)
+
+        batches = await self._run(iter_batches)
+        marker = object()
+        try:
+            while True:
+                batch = await self._run(next, batches, marker)
+                if batch is marker:
+                    break
+                yield batch
+        finally:
+            await self._run(batches.close)
+
+
+class AsyncArray(AsyncLeaf):
+    """Asynchronous wrapper of an :class:`Array` object.
+
+    This includes :class:`CArray` and :class:`EArray` objects.
+
+    """
+
+    async def read(self, start=None, stop=None, step=None):
+        """Get data in the array as an object of the current flavor.
+
+        See :meth:`Array.read`.  The rows are read in buffer-sized calls
+        when the flavor of the array is 'numpy'.
+
+        """
+
+        if self.node.flavor != 'numpy':
+            return await self._run(self.node.read, start, stop, step)
+        maindim = self.node.maindim
+        return await self._read_split(
+            self.node.read, start, stop, step,
+            lambda results: np.concatenate(results, axis=maindim))
+
+
+class AsyncVLArray(AsyncLeaf):
+    """Asynchronous wrapper of a :class:`VLArray` object."""
+
+    async def read(self, start=None, stop=None, step=1):
+        """Get data in the array as a list of objects of the current flavor.
+
+        See :meth:`VLArray.read`.  The rows are read in buffer-sized
+        calls.
+
+        """
+
+        return await self._read_split(
+            self.node.read, start, stop, step,
+            lambda results: [row for rows in results for row in rows])
@@ -1,10 +1,11 @@
 """Here is defined the Array class."""
 
+import itertools
 import operator
 import sys
 import numpy as np
 
-from . import hdf5extension
+from . import chunkio, hdf5extension
 from .filters import Filters
 from .flavor import flavor_of, array_as_internal, internal_to_flavor
 from .leaf import Leaf
@@ -77,6 +78,12 @@ class Array(hdf5extension.Array, Leaf):
 
         .. versionadded:: 3.4.3
 
+    attr_phase_change, attr_creation_order, expectedattrs
+        The settings for storing the attributes of the leaf (see
+        :meth:`File.create_group`).
+
+        .. versionadded:: 3.7
+
     """
 
     # Class identifier.
@@ -115,7 +122,8 @@ class Array(hdf5extension.Array, Leaf):
     def __init__(self, parentnode, name,
                  obj=None, title="",
                  byteorder=None, _log=True, _atom=None,
-                 track_times=True):
+                 track_times=True, attr_phase_change=None,
+                 attr_creation_order=None, expectedattrs=None):
 
         self._v_version = None
         """The object version of this array."""
@@ -155,6 +163,9 @@ class Array(hdf5extension.Array, Leaf):
         """Whether we are in the middle of an iteration or not (sentinel)."""
         self.listarr = None
         """Current buffer in iterators."""
+        self._sparse = None
+        """The shape of the array and whether some of its chunks were not
+        allocated in the file with that shape."""
 
         # Documented (*public*) attributes.
         self.atom = _atom
@@ -170,7 +181,9 @@ class Array(hdf5extension.Array, Leaf):
 
         # Ordinary arrays have no filters: leaf is created with default ones.
         super().__init__(parentnode, name, new, Filters(), byteorder, _log,
-                         track_times)
+                         track_times, attr_phase_change=attr_phase_change,
+                         attr_creation_order=attr_creation_order,
+                         expectedattrs=expectedattrs)
 
     def _g_create(self):
         """Save a new array in file."""
@@ -726,7 +739,10 @@ class Array(hdf5extension.Array, Leaf):
         # Protection against reading empty arrays
         if 0 not in shape:
             # Arrays that have non-zero dimensionality
-            self._g_read_slice(startl, stopl, stepl, nparr)
+            if not ((stepl == 1).all() and self._read_block(
+                    startl, stopl,
+                    nparr.reshape(tuple(stopl - startl) + self.atom.shape))):
+                self._g_read_slice(startl, stopl, stepl, nparr)
         # For zero-shaped arrays, return the scalar
         if nparr.shape == ():
             nparr = nparr[()]
@@ -820,7 +836,9 @@ class Array(hdf5extension.Array, Leaf):
         # Protection against reading empty arrays
         if 0 not in shape:
             # Arrays that have non-zero dimensionality
-            self._read_array(start, stop, step, arr)
+            if not (step == 1 and arr.dtype == self.atom.dtype.base and
+                    self._read_chunks(start, stop, arr)):
+                self._read_array(start, stop, step, arr)
         # data is always read in the system byteorder
         # if the out array's byteorder is different, do a byteswap
         if (out is not None and
@@ -828,6 +846,99 @@ class Array(hdf5extension.Array, Leaf):
             arr.byteswap(True)
         return arr
 
+    def _read_chunks(self, start, stop, arr):
+        """Read a range of rows into `arr` chunk by chunk.
+
+        Return False if nothing was read.  See :meth:`Array._read_block`.
+
+        """
+
+        if self.chunkshape is None:
+            return False
+        starts = [0] * len(self.shape)
+        stops = list(self.shape)
+        starts[self.maindim] = start
+        stops[self.maindim] = stop
+        shape = [b - a for (a, b) in zip(starts, stops)]
+        return self._read_block(starts, stops,
+                                arr.reshape(tuple(shape) + self.atom.shape))
+
+    def _read_block(self, starts, stops, out):
+        """Read the block from `starts` to `stops` into `out` by chunks.
+
+        The chunks are read with direct chunk reads in several threads
+        (see :func:`chunkio.read`), or one by one if most of them are
+        not allocated (see :meth:`Array._read_sparse`).  Return False if
+        nothing was read, so that the caller can read the block with a
+        single HDF5 call.
+
+        """
+
+        if self.chunkshape is None:
+            return False
+        return (chunkio.read(self, starts, stops, out) or
+                self._read_sparse(starts, stops, out))
+
+    def _read_sparse(self, starts, stops, out):
+        """Read the block from `starts` to `stops` into `out` if sparse.
+
+        Only the chunks allocated in the file are read, and the rest of
+        `out` is filled with the fill value of the dataset.  Return False
+        without reading anything if at least half of the chunks
+        overlapping the block are allocated.
+
+        """
+
+        nchunks = 1
+        for (start, stop, size) in zip(starts, stops, self.chunkshape):
+            nchunks *= max(0, (stop - 1) // size - start // size + 1)
+        if nchunks < 2 or not self._may_be_sparse():
+            return False
+        offsets, nchunks = self._g_allocated_chunks(starts, stops)
+        if len(offsets) * 2 >= nchunks:
+            return False
+        out[...] = self._get_fill_value()
+        rank = len(starts)
+        for offset in offsets.tolist():
+            bstarts = [max(c, start) for (c, start) in zip(offset, starts)]
+            bstops = [min(c + size, stop) for (c, size, stop)
+                      in zip(offset, self.chunkshape, stops)]
+            block = np.empty(tuple(b - a for (a, b) in zip(bstarts, bstops)),
+                             dtype=self.atom.dtype)
+            self._g_read_slice(np.array(bstarts, dtype=SizeType),
+                               np.array(bstops, dtype=SizeType),
+                               np.ones(rank, dtype=SizeType), block)
+            out[tuple(slice(a - start, b - start) for (a, b, start)
+                      in zip(bstarts, bstops, starts))] = block
+        return True
+
+    def _may_be_sparse(self):
+        """Whether some chunks of the array may not be allocated.
+
+        Counting the allocated chunks walks the whole chunk index of the
+        dataset, so the result is kept until the shape of the array
+        changes.  Chunks are not deallocated without shrinking the array,
+        and a stale result only makes reads take the slower path.
+
+        """
+
+        if (not hdf5extension.HAVE_DIRECT_CHUNK or
+                self.atom.kind == 'reference'):
+            return False
+        if self._sparse is None or self._sparse[0] != self.shape:
+            nchunks = 1
+            for (size, chunksize) in zip(self.shape, self.chunkshape):
+                nchunks *= -(-size // chunksize)
+            self._sparse = (self.shape, self._g_get_num_chunks() < nchunks)
+        return self._sparse[1]
+
+    def _get_fill_value(self):
+        """Get the fill value of the dataset, as an element of the atom."""
+
+        value = np.zeros(1, dtype=self.atom.dtype)
+        self._g_read_fill_value(value)
+        return value[0]
+
     def read(self, start=None, stop=None, step=None, out=None):
         """Get data in the array as an object of the current flavor.
 
@@ -866,6 +977,101 @@ class Array(hdf5extension.Array, Leaf):
         arr = self._read(start, stop, step, out)
         return internal_to_flavor(arr, self.flavor)
 
+    def iter_chunks(self, selection=None, reuse_buffer=False):
+        """Iterate over the array in blocks following its chunks.
+
+        This method returns an iterator yielding a ``(slices, block)``
+        tuple for every chunk of the array overlapping the selection, in
+        storage order (i.e. with the last dimension varying fastest).
+        slices is a tuple with a slice per dimension, giving the position
+        of the block in the array, and block is an object of the current
+        flavor with the data in it, so that ``array[slices]`` equals
+        block.  Each block is read from a single chunk, which avoids
+        thrashing the HDF5 chunk cache when traversing N-dimensional
+        arrays.
+
+        The selection may be a slice or a tuple of slices (with a step
+        of 1), like in :meth:`Array.__getitem__`, and it restricts the
+        blocks to the selected region.  Integer indexes select a single
+        element in their dimension, which is kept in the shape of the
+        blocks.  Non-chunked arrays are iterated in blocks of as many
+        rows along the main dimension as fit in the I/O buffer.
+
+        If reuse_buffer is true, all the blocks are views of the same
+        buffer, which is overwritten when the next block is read.  This
+        avoids allocating a new array for each block, but blocks must be
+        copied if they are needed after the next iteration.
+
+        Examples
+        --------
+
+        ::
+
+            result = np.empty(array.shape)
+            for slices, block in array.iter_chunks():
+                result[slices] = np.sqrt(block)
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._g_check_open()
+        if self.shape == ():
+            # Scalar case
+            return iter([((), self.read())])
+        if selection is None:
+            selection = ()
+        (startl, stopl, stepl, shape) = self._interpret_indexing(selection)
+        if (stepl != 1).any():
+            raise ValueError("only selections with a step of 1 are "
+                             "supported")
+        if self.chunkshape is not None:
+            chunkshape = [int(s) for s in self.chunkshape]
+        else:
+            chunkshape = list(self.shape)
+            chunkshape[self.maindim] = max(self.nrowsinbuf, 1)
+        return self._iter_chunks([int(s) for s in startl],
+                                 [int(s) for s in stopl],
+                                 chunkshape, reuse_buffer)
+
+    def _iter_chunks(self, starts, stops, chunkshape, reuse_buffer):
+        """Private part of `iter_chunks()`, once arguments are processed."""
+
+        if any(start >= stop for (start, stop) in zip(starts, stops)):
+            return
+        # Unallocated chunks are filled without reading them.
+        allocated = None
+        if self.chunkshape is not None and self._may_be_sparse():
+            offsets, nchunks = self._g_allocated_chunks(starts, stops)
+            if len(offsets) < nchunks:
+                allocated = set(map(tuple, offsets.tolist()))
+                fill = self._get_fill_value()
+        buf = None
+        if reuse_buffer:
+            buf = np.empty(int(np.prod(chunkshape)), dtype=self.atom.dtype)
+        rank = len(starts)
+        for coords in itertools.product(*[
+                range(start - start % size, stop, size)
+                for (start, stop, size) in zip(starts, stops, chunkshape)]):
+            bstarts = [max(c, start) for (c, start) in zip(coords, starts)]
+            bstops = [min(c + size, stop) for (c, size, stop)
+                      in zip(coords, chunkshape, stops)]
+            bshape = tuple(b - a for (a, b) in zip(bstarts, bstops))
+            if buf is None:
+                block = np.empty(bshape, dtype=self.atom.dtype)
+            else:
+                # A contiguous view of the start of the buffer.
+                block = buf[:int(np.prod(bshape))].reshape(
+                    bshape + self.atom.shape)
+            if allocated is not None and coords not in allocated:
+                block[...] = fill
+            else:
+                self._g_read_slice(np.array(bstarts, dtype=SizeType),
+                                   np.array(bstops, dtype=SizeType),
+                                   np.ones(rank, dtype=SizeType), block)
+            slices = tuple(slice(a, b) for (a, b) in zip(bstarts, bstops))
+            yield slices, internal_to_flavor(block, self.flavor)
+
     def _g_copy_with_stats(self, group, name, start, stop, step,
                            title, filters, chunkshape, _log, **kwargs):
         """Private part of Leaf.copy() for each kind of leaf."""
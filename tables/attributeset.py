@@ -4,10 +4,12 @@ import re
 import sys
 import warnings
 import pickle
+from bisect import bisect_left, insort
 import numpy as np
 
 from . import hdf5extension
 from .utils import SizeType
+from .utilsextension import hdf5_lock
 from .registry import class_name_dict
 from .exceptions import ClosedNodeError, PerformanceWarning
 from .path import check_attribute_name
@@ -20,7 +22,7 @@ SYS_ATTRS = ["CLASS", "VERSION", "TITLE", "NROWS", "EXTDIM",
              "ENCODING", "PYTABLES_FORMAT_VERSION",
              "FLAVOR", "FILTERS", "AUTO_INDEX",
              "DIRTY", "NODE_TYPE", "NODE_TYPE_VERSION",
-             "PSEUDOATOM"]
+             "PSEUDOATOM", "SORTEDBY"]
 # Prefixes of other system attributes
 SYS_ATTRS_PREFIXES = ["FIELD_"]
 # RO_ATTRS will be disabled and let the user modify them if they
@@ -34,7 +36,8 @@ SYS_ATTRS_PREFIXES = ["FIELD_"]
 
 # The next attributes are not meant to be copied during a Node copy process
 SYS_ATTRS_NOTTOBECOPIED = ["CLASS", "VERSION", "TITLE", "NROWS", "EXTDIM",
-                           "PYTABLES_FORMAT_VERSION", "FILTERS", "ENCODING"]
+                           "PYTABLES_FORMAT_VERSION", "FILTERS", "ENCODING",
+                           "SORTEDBY"]
 # Attributes forced to be copied during node copies
 FORCE_COPY_CLASS = ['CLASS', 'VERSION']
 # Regular expression for column default values.
@@ -48,8 +51,129 @@ _new_filters_sub = br'(\1tables.filters\n'
 def issysattrname(name):
     """Check if a name is a system attribute or not"""
 
-    return bool(name in SYS_ATTRS or np.prod(
-        [name.startswith(prefix) for prefix in SYS_ATTRS_PREFIXES]))
+    return name in SYS_ATTRS or all(
+        name.startswith(prefix) for prefix in SYS_ATTRS_PREFIXES)
+
+
+def _in_sorted(names, name):
+    """Is `name` in the sorted list of `names`?
+
+    This takes a logarithmic time, unlike the ``in`` operator.
+
+    """
+
+    if not isinstance(name, str):
+        return False
+    i = bisect_left(names, name)
+    return i < len(names) and names[i] == name
+
+
+def parse_format_version(h5file):
+    """Get the format version of `h5file` as a tuple of ints (or None)."""
+
+    try:
+        format_version = h5file.format_version
+    except AttributeError:
+        return None
+    if format_version == 'unknown':
+        return None
+    return tuple(map(int, format_version.split('.')))
+
+
+def decode_value(name, value, format_version):
+    """Decode the `value` on disk of the attribute `name`.
+
+    Pickled objects and system attributes are decoded, taking into
+    account the `format_version` of the file (see
+    `parse_format_version()`).
+
+    """
+
+    # Check whether the value is pickled
+    # Pickled values always seems to end with a "."
+    maybe_pickled = (
+        isinstance(value, np.generic) and  # NumPy scalar?
+        value.dtype.type == np.bytes_ and  # string type?
+        value.itemsize > 0 and value.endswith(b'.'))
+
+    if (maybe_pickled and value in [b"0", b"0."]):
+        # Workaround for a bug in many versions of Python (starting
+        # somewhere after Python 2.6.1).  See ticket #253.
+        retval = value
+    elif (maybe_pickled and _field_fill_re.match(name)
+          and format_version == (1, 5)):
+        # This format was used during the first 1.2 releases, just
+        # for string defaults.
+        try:
+            retval = pickle.loads(value)
+            retval = np.array(retval)
+        except ImportError:
+            retval = None  # signal error avoiding exception
+    elif (maybe_pickled and
+          name == 'FILTERS' and
+          format_version is not None and
+          format_version < (2, 0)):
+        # This is a big hack, but we don't have other way to recognize
+        # pickled filters of PyTables 1.x files.
+        value = _old_filters_re.sub(_new_filters_sub, value, 1)
+        retval = pickle.loads(value)  # pass unpickling errors through
+    elif maybe_pickled:
+        try:
+            retval = pickle.loads(value)
+        # except cPickle.UnpicklingError:
+        # It seems that pickle may raise other errors than UnpicklingError
+        # Perhaps it would be better just an "except:" clause?
+        # except (cPickle.UnpicklingError, ImportError):
+        # Definitely (see SF bug #1254636)
+        except UnicodeDecodeError:
+            # Object maybe pickled on python 2 and unpickled on python 3.
+            # encoding='bytes' was added in python 3.4 to resolve this.
+            # However 'bytes' mangles class attributes as they are
+            # unplicked as bytestrings. Hence try 'latin1' first.
+            # Ref: http://bugs.python.org/issue6784
+            try:
+                retval = pickle.loads(value, encoding='latin1')
+            except TypeError:
+                try:
+                    retval = pickle.loads(value, encoding='bytes')
+                except Exception:
+                    retval = value
+            except Exception:
+                retval = value
+        except Exception:
+            # catch other unpickling errors:
+            # ivb (2005-09-07): It is too hard to tell
+            # whether the unpickling failed
+            # because of the string not being a pickle one at all,
+            # because of a malformed pickle string,
+            # or because of some other problem in object reconstruction,
+            # thus making inconvenient even the issuing of a warning here.
+            # The documentation contains a note on this issue,
+            # explaining how the user can tell where the problem was.
+            retval = value
+        # Additional check for allowing a workaround for #307
+        if isinstance(retval, str) and retval == '':
+            retval = np.array(retval)[()]
+    elif (name == 'FILTERS' and
+          format_version is not None and
+          format_version >= (2, 0)):
+        try:
+            retval = Filters._unpack(value)
+        except ValueError:
+            sys.stderr.write('Failed parsing FILTERS key\n')
+            sys.stderr.flush()
+            retval = None
+    elif name == 'TITLE' and not isinstance(value, str):
+        retval = value.decode('utf-8')
+    elif (issysattrname(name) and isinstance(value, (bytes, str)) and
+          not isinstance(value, str) and not _field_fill_re.match(name)):
+        # system attributes should always be str
+        # python 3, bytes and not "FIELD_[0-9]+_FILL"
+        retval = value.decode('utf-8')
+    else:
+        retval = value
+
+    return retval
 
 
 class AttributeSet(hdf5extension.AttributeSet):
@@ -174,7 +298,12 @@ class AttributeSet(hdf5extension.AttributeSet):
 
     .. attribute:: _v_unimplemented
 
-        A list of attribute names with unimplemented native HDF5 types.
+        A list of attribute names with unimplemented native HDF5 types
+        (among those read so far).
+
+        .. versionchanged:: 3.7
+           Attribute values are read on first access, not when the
+           attribute set is created.
 
     """
 
@@ -189,7 +318,8 @@ class AttributeSet(hdf5extension.AttributeSet):
     def __init__(self, node):
         """Create the basic structures to keep the attribute information.
 
-        Reads all the HDF5 attributes (if any) on disk for the node "node".
+        Reads the names of the HDF5 attributes (if any) on disk for the
+        node "node".  Their values are read when first accessed.
 
         Parameters
         ----------
@@ -204,32 +334,21 @@ class AttributeSet(hdf5extension.AttributeSet):
 
         dict_ = self.__dict__
 
-        self._g_new(node)
+        with hdf5_lock:
+            self._g_new(node)
+            dict_["_v_attrnames"] = self._g_list_attr(node)
         dict_["_v__nodefile"] = node._v_file
         dict_["_v__nodepath"] = node._v_pathname
-        dict_["_v_attrnames"] = self._g_list_attr(node)
         # The list of unimplemented attribute names
         dict_["_v_unimplemented"] = []
 
         # Get the file version format. This is an optimization
         # in order to avoid accessing it too much.
-        try:
-            format_version = node._v_file.format_version
-        except AttributeError:
-            parsed_version = None
-        else:
-            if format_version == 'unknown':
-                parsed_version = None
-            else:
-                parsed_version = tuple(map(int, format_version.split('.')))
-        dict_["_v__format_version"] = parsed_version
+        dict_["_v__format_version"] = parse_format_version(node._v_file)
         # Split the attribute list in system and user lists
         dict_["_v_attrnamessys"] = []
         dict_["_v_attrnamesuser"] = []
         for attr in self._v_attrnames:
-            # put the attributes on the local dictionary to allow
-            # tab-completion
-            self.__getattr__(attr)
             if issysattrname(attr):
                 self._v_attrnamessys.append(attr)
             else:
@@ -279,7 +398,7 @@ class AttributeSet(hdf5extension.AttributeSet):
         """Get the attribute named "name"."""
 
         # If attribute does not exist, raise AttributeError
-        if name not in self._v_attrnames:
+        if not _in_sorted(self._v_attrnames, name):
             raise AttributeError(f"Attribute {name!r} does not exist "
                                  f"in node: {self._v__nodepath!r}")
 
@@ -287,92 +406,47 @@ class AttributeSet(hdf5extension.AttributeSet):
         # quickly system attributes that are _string_ values, but it
         # takes care of other types as well as for example NROWS for
         # Tables and EXTDIM for EArrays
-        format_version = self._v__format_version
-        value = self._g_getattr(self._v_node, name)
-
-        # Check whether the value is pickled
-        # Pickled values always seems to end with a "."
-        maybe_pickled = (
-            isinstance(value, np.generic) and  # NumPy scalar?
-            value.dtype.type == np.bytes_ and  # string type?
-            value.itemsize > 0 and value.endswith(b'.'))
-
-        if (maybe_pickled and value in [b"0", b"0."]):
-            # Workaround for a bug in many versions of Python (starting
-            # somewhere after Python 2.6.1).  See ticket #253.
-            retval = value
-        elif (maybe_pickled and _field_fill_re.match(name)
-              and format_version == (1, 5)):
-            # This format was used during the first 1.2 releases, just
-            # for string defaults.
-            try:
-                retval = pickle.loads(value)
-                retval = np.array(retval)
-            except ImportError:
-                retval = None  # signal error avoiding exception
-        elif (maybe_pickled and
-              name == 'FILTERS' and
-              format_version is not None and
-              format_version < (2, 0)):
-            # This is a big hack, but we don't have other way to recognize
-            # pickled filters of PyTables 1.x files.
-            value = _old_filters_re.sub(_new_filters_sub, value, 1)
-            retval = pickle.loads(value)  # pass unpickling errors through
-        elif maybe_pickled:
-            try:
-                retval = pickle.loads(value)
-            # except cPickle.UnpicklingError:
-            # It seems that pickle may raise other errors than UnpicklingError
-            # Perhaps it would be better just an "except:" clause?
-            # except (cPickle.UnpicklingError, ImportError):
-            # Definitely (see SF bug #1254636)
-            except UnicodeDecodeError:
-                # Object maybe pickled on python 2 and unpickled on python 3.
-                # encoding='bytes' was added in python 3.4 to resolve this.
-                # However 'bytes' mangles class attributes as they are
-                # unplicked as bytestrings. Hence try 'latin1' first.
-                # Ref: http://bugs.python.org/issue6784
-                try:
-                    retval = pickle.loads(value, encoding='latin1')
-                except TypeError:
-                    try:
-                        retval = pickle.loads(value, encoding='bytes')
-                    except Exception:
-                        retval = value
-                except Exception:
-                    retval = value
-            except Exception:
-                # catch other unpickling errors:
-                # ivb (2005-09-07): It is too hard to tell
-                # whether the unpickling failed
-                # because of the string not being a pickle one at all,
-                # because of a malformed pickle string,
-                # or because of some other problem in object reconstruction,
-                # thus making inconvenient even the issuing of a warning here.
-                # The documentation contains a note on this issue,
-                # explaining how the user can tell where the problem was.
-                retval = value
-            # Additional check for allowing a workaround for #307
-            if isinstance(retval, str) and retval == '':
-                retval = np.array(retval)[()]
-        elif (name == 'FILTERS' and
-              format_version is not None and
-              format_version >= (2, 0)):
-            try:
-                retval = Filters._unpack(value)
-            except ValueError:
-                sys.stderr.write('Failed parsing FILTERS key\n')
-                sys.stderr.flush()
-                retval = None
-        elif name == 'TITLE' and not isinstance(value, str):
-            retval = value.decode('utf-8')
-        elif (issysattrname(name) and isinstance(value, (bytes, str)) and
-              not isinstance(value, str) and not _field_fill_re.match(name)):
-            # system attributes should always be str
-            # python 3, bytes and not "FIELD_[0-9]+_FILL"
-            retval = value.decode('utf-8')
-        else:
-            retval = value
+        with hdf5_lock:
+            value = self._g_getattr(self._v_node, name)
+        return self._g_load_value(name, value)
+
+    def _f_get_many(self, names):
+        """Get the values of several attributes at once.
+
+        Return a dictionary mapping each name in the names sequence to
+        the value of that attribute.  The attributes which have not been
+        accessed yet are read from disk in a single call, which is faster
+        than getting them one by one.  If an attribute does not exist, an
+        AttributeError is raised.
+
+        .. versionadded:: 3.7
+
+        """
+
+        names = list(names)
+        for name in names:
+            if not _in_sorted(self._v_attrnames, name):
+                raise AttributeError(f"Attribute {name!r} does not exist "
+                                     f"in node: {self._v__nodepath!r}")
+
+        dict_ = self.__dict__
+        toread = [name for name in dict.fromkeys(names) if name not in dict_]
+        if toread:
+            with hdf5_lock:
+                values = self._g_getattrs(self._v_node, toread)
+            for (name, value) in zip(toread, values):
+                self._g_load_value(name, value)
+        return {name: dict_[name] for name in names}
+
+    def _g_load_value(self, name, value):
+        """Get the value of attribute `name` from its `value` on disk.
+
+        Pickled objects and system attributes are decoded, and the result
+        is kept in the local dictionary and returned.
+
+        """
+
+        retval = decode_value(name, value, self._v__format_version)
 
         # Put this value in local directory
         self.__dict__[name] = retval
@@ -417,25 +491,21 @@ class AttributeSet(hdf5extension.AttributeSet):
                 stvalue = np.array(value)
             value = stvalue[()]
 
-        self._g_setattr(self._v_node, name, stvalue)
+        with hdf5_lock:
+            self._g_setattr(self._v_node, name, stvalue)
 
         # New attribute or value. Introduce it into the local
         # directory
         self.__dict__[name] = value
 
-        # Finally, add this attribute to the list if not present
+        # Finally, add this attribute to the (sorted) lists if not present
         attrnames = self._v_attrnames
-        if name not in attrnames:
-            attrnames.append(name)
-            attrnames.sort()
+        if not _in_sorted(attrnames, name):
+            insort(attrnames, name)
             if issysattrname(name):
-                attrnamessys = self._v_attrnamessys
-                attrnamessys.append(name)
-                attrnamessys.sort()
+                insort(self._v_attrnamessys, name)
             else:
-                attrnamesuser = self._v_attrnamesuser
-                attrnamesuser.append(name)
-                attrnamesuser.sort()
+                insort(self._v_attrnamesuser, name)
 
     def __setattr__(self, name, value):
         """Set a PyTables attribute.
@@ -471,7 +541,7 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
 
         undo_enabled = nodefile.is_undo_enabled()
         # Log old attribute removal (if any).
-        if undo_enabled and (name in attrnames):
+        if undo_enabled and _in_sorted(attrnames, name):
             self._g_del_and_log(name)
 
         # Set the attribute.
@@ -501,18 +571,18 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
         """
 
         # Delete the attribute from disk
-        self._g_remove(self._v_node, name)
+        with hdf5_lock:
+            self._g_remove(self._v_node, name)
 
-        # Delete the attribute from local lists
-        self._v_attrnames.remove(name)
-        if name in self._v_attrnamessys:
-            self._v_attrnamessys.remove(name)
-        else:
-            self._v_attrnamesuser.remove(name)
+        # Delete the attribute from local (sorted) lists
+        for attrnames in (self._v_attrnames, self._v_attrnamessys,
+                          self._v_attrnamesuser):
+            if _in_sorted(attrnames, name):
+                del attrnames[bisect_left(attrnames, name)]
 
-        # Delete the attribute from the local directory
+        # Delete the attribute from the local directory (if loaded)
         # closes (#1049285)
-        del self.__dict__[name]
+        self.__dict__.pop(name, None)
 
     def __delattr__(self, name):
         """Delete a PyTables attribute.
@@ -526,7 +596,7 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
         nodefile = self._v__nodefile
 
         # Check if attribute exists
-        if name not in self._v_attrnames:
+        if not _in_sorted(self._v_attrnames, name):
             raise AttributeError(
                 "Attribute ('%s') does not exist in node '%s'"
                 % (name, self._v__nodepath))
@@ -574,7 +644,7 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
 
         """
 
-        return name in self._v_attrnames
+        return _in_sorted(self._v_attrnames, name)
 
     def _f_rename(self, oldattrname, newattrname):
         """Rename an attribute from oldattrname to newattrname."""
@@ -618,9 +688,10 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
             set_attr = newset._g__setattr
 
         for attrname in self._v_attrnamesuser:
+            value = getattr(self, attrname)
             # Do not copy the unimplemented attributes.
             if attrname not in self._v_unimplemented:
-                set_attr(attrname, getattr(self, attrname))
+                set_attr(attrname, value)
         # Copy the system attributes that we are allowed to.
         if copysysattrs:
             for attrname in self._v_attrnamessys:
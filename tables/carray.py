@@ -4,6 +4,7 @@ import sys
 
 import numpy as np
 
+from . import chunkio, parallel
 from .atom import Atom
 from .array import Array
 from .utils import correct_byteorder, SizeType
@@ -74,6 +75,12 @@ class CArray(Array):
 
         .. versionadded:: 3.4.3
 
+    attr_phase_change, attr_creation_order, expectedattrs
+        The settings for storing the attributes of the leaf (see
+        :meth:`File.create_group`).
+
+        .. versionadded:: 3.7
+
     Examples
     --------
 
@@ -124,7 +131,8 @@ class CArray(Array):
                  atom=None, shape=None,
                  title="", filters=None,
                  chunkshape=None, byteorder=None,
-                 _log=True, track_times=True):
+                 _log=True, track_times=True, attr_phase_change=None,
+                 attr_creation_order=None, expectedattrs=None):
 
         self.atom = atom
         """An `Atom` instance representing the shape, type of the atomic
@@ -166,6 +174,9 @@ class CArray(Array):
         """Whether we are in the middle of an iteration or not (sentinel)."""
         self.listarr = None
         """Current buffer in iterators."""
+        self._sparse = None
+        """The shape of the array and whether some of its chunks were not
+        allocated in the file with that shape."""
 
         if new:
             if not isinstance(atom, Atom):
@@ -197,8 +208,11 @@ class CArray(Array):
                 self._v_chunkshape = tuple(SizeType(s) for s in chunkshape)
 
         # The `Array` class is not abstract enough! :(
-        super(Array, self).__init__(parentnode, name, new, filters,
-                                    byteorder, _log, track_times)
+        super(Array, self).__init__(
+            parentnode, name, new, filters, byteorder, _log, track_times,
+            attr_phase_change=attr_phase_change,
+            attr_creation_order=attr_creation_order,
+            expectedattrs=expectedattrs)
 
     def _g_create(self):
         """Create a new array in file (specific part)."""
@@ -236,6 +250,43 @@ class CArray(Array):
 
         return self._v_objectid
 
+    def allocated_chunks(self):
+        """Get the offsets of the chunks of the array allocated in the file.
+
+        The result is a NumPy array with a row per allocated chunk (in
+        storage order) holding the coordinates of its first element.
+        Chunks which have never been written are not allocated, and
+        they read as the default value of the atom (see
+        :attr:`Atom.dflt`).  Reads and iterations over mostly empty
+        regions of the array fill those chunks directly, without any
+        I/O.  This needs HDF5 1.10.5 or newer.
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._g_check_open()
+        offsets, nchunks = self._g_allocated_chunks([0] * len(self.shape),
+                                                    self.shape)
+        return offsets
+
+    def map_chunks(self, func, reduce=None, processes=None, start=None,
+                   stop=None, chunks_per_task=None):
+        """Call func on chunk-aligned ranges of rows in a pool of processes.
+
+        The rows from start to stop in the main dimension of the array
+        are split in ranges of whole chunks, and func is called in a
+        worker process with the data in each range, as read by
+        :meth:`Array.read`.  See :meth:`Table.map_chunks` for more info.
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._g_check_open()
+        return parallel.map_chunks(self, func, reduce, processes, None,
+                                   start, stop, chunks_per_task)
+
     def _g_copy_with_stats(self, group, name, start, stop, step,
                            title, filters, chunkshape, _log, **kwargs):
         """Private part of Leaf.copy() for each kind of leaf."""
@@ -255,22 +306,26 @@ class CArray(Array):
         object = CArray(group, name, atom=self.atom, shape=shape,
                         title=title, filters=filters, chunkshape=chunkshape,
                         _log=_log)
-        # Start the copy itself
-        for start2 in range(start, stop, step * nrowsinbuf):
-            # Save the records on disk
-            stop2 = start2 + step * nrowsinbuf
-            if stop2 > stop:
-                stop2 = stop
-            # Set the proper slice in the main dimension
-            slices[maindim] = slice(start2, stop2, step)
-            start3 = (start2 - start) // step
-            stop3 = start3 + nrowsinbuf
-            if stop3 > shape[maindim]:
-                stop3 = shape[maindim]
-            # The next line should be generalised if, in the future,
-            # maindim is designed to be different from 0 in CArrays.
-            # See ticket #199.
-            object[start3:stop3] = self.__getitem__(tuple(slices))
+        if chunkio.can_copy(self, object, start, stop, step):
+            # Copy the chunks as stored, without refiltering them
+            chunkio.copy(self, object, start, stop)
+        else:
+            # Start the copy itself
+            for start2 in range(start, stop, step * nrowsinbuf):
+                # Save the records on disk
+                stop2 = start2 + step * nrowsinbuf
+                if stop2 > stop:
+                    stop2 = stop
+                # Set the proper slice in the main dimension
+                slices[maindim] = slice(start2, stop2, step)
+                start3 = (start2 - start) // step
+                stop3 = start3 + nrowsinbuf
+                if stop3 > shape[maindim]:
+                    stop3 = shape[maindim]
+                # The next line should be generalised if, in the future,
+                # maindim is designed to be different from 0 in CArrays.
+                # See ticket #199.
+                object[start3:stop3] = self.__getitem__(tuple(slices))
         # Activate the conversion again (default)
         self._v_convert = True
         nbytes = np.prod(self.shape, dtype=SizeType) * self.atom.size
@@ -0,0 +1,330 @@
+"""Persistent catalogs of the nodes in files.
+
+A node catalog keeps the paths of the visible nodes in a file, along
+with the kind of HDF5 object of each node, its ``CLASS`` attribute and
+the shape, dtype and storage size of datasets.  When the
+:data:`tables.parameters.NODE_CATALOG` parameter is true, the catalog is
+saved in a sidecar file next to the file (with the ``.ptcatalog``
+suffix) when the latter is closed, and loaded when it is opened again,
+so that listing, walking and looking up nodes does not need to read the
+metadata of groups from the file.  The catalog is built again with a
+single pass over the file if the file has been modified since the
+catalog was saved (e.g. by a program not using catalogs).
+
+"""
+
+import os
+import warnings
+from ast import literal_eval
+
+import numpy as np
+from numpy.lib import format as npformat
+
+from .exceptions import HDF5ExtError, PerformanceWarning
+from .path import isvisiblepath, join_path, split_path
+
+
+CATALOG_SUFFIX = '.ptcatalog'
+"""The suffix added to the name of a file to get the name of its catalog."""
+
+_catalog_version = '1.0'
+"""The version of the format of catalog files."""
+
+_columns = ('path', 'h5class', 'classid', 'shape', 'dtype', 'size')
+"""The columns of the table of nodes in catalog files."""
+
+_kinds = {'Group': 'Group', 'Dataset': 'Leaf',
+          'SoftLink': 'Link', 'ExternalLink': 'Link'}
+"""The kind of child (as in ``Group._v_groups`` etc.) of HDF5 objects."""
+
+
+def get_stamp(filename):
+    """Get the modification stamp of `filename`.
+
+    It is a ``(mtime, size)`` tuple, or None if the file does not exist.
+
+    """
+
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _encode_dtype(dtype):
+    """Get a string which can be decoded back into `dtype` (or None)."""
+
+    if dtype is None:
+        return ''
+    (base, shape) = dtype.subdtype or (dtype, ())
+    try:
+        return repr((npformat.dtype_to_descr(base), shape))
+    except (TypeError, ValueError):
+        return ''  # the catalog does not know about this dtype
+
+
+def _decode_dtype(string):
+    """Decode a dtype encoded with `_encode_dtype()`."""
+
+    if not string:
+        return None
+    (descr, shape) = literal_eval(string)
+    dtype = npformat.descr_to_dtype(descr)
+    return np.dtype((dtype, shape)) if shape else dtype
+
+
+class NodeCatalog:
+    """The catalog of the visible nodes in an open file.
+
+    The catalog is loaded from its file if it is up to date with the
+    `stamp` of the file before opening it (see :func:`get_stamp`), else
+    it is built from the file (which must be open).  Then, the file must
+    tell the catalog about new, removed and moved nodes, and leaves
+    opened for writing.
+
+    """
+
+    def __init__(self, file, stamp):
+        self.file = file
+        """The file whose nodes are catalogued."""
+        self.filename = os.fspath(file.filename) + CATALOG_SUFFIX
+        """The name of the file of the catalog."""
+        self.records = {}
+        """Information on nodes by path (see `File._g_visit_paths()`)."""
+        self.children = {}
+        """The sets of names of the children of groups, by path."""
+        self.touched = set()
+        """The paths of leaves which may have changed since catalogued."""
+        self.dirty = False
+        """Whether the catalog has changed since it was loaded."""
+
+        if stamp is None or not self._load(stamp):
+            self._insert(file._g_visit_paths('/', True, True))
+            self.dirty = True
+
+    def __contains__(self, path):
+        """Is there a node in `path`?"""
+
+        return path in self.records
+
+    def covers(self, path):
+        """Does the catalog tell whether there is a node in `path`?
+
+        Only visible paths in canonical form are covered.
+
+        """
+
+        if not isinstance(path, str):
+            return False
+        return (path == '/' or (path.startswith('/') and
+                                not path.endswith('/') and
+                                '//' not in path and
+                                isvisiblepath(path)))
+
+    def get(self, path):
+        """Get the record of the node in `path` (or None).
+
+        The record is a ``(h5class, classid, shape, dtype, size)`` tuple
+        (see `File._g_visit_paths()`).
+
+        """
+
+        return self.records.get(path)
+
+    def iter_children(self, path, kind=None):
+        """Iterate over the sorted names of children of the group in `path`.
+
+        If `kind` is ``'Group'``, ``'Leaf'`` or ``'Link'``, only the
+        names of children of that kind are returned.
+
+        """
+
+        for name in sorted(self.children.get(path, ())):
+            if (kind is None or
+                    _kinds.get(self.records[join_path(path, name)][0]) ==
+                    kind):
+                yield name
+
+    def iter_records(self, where):
+        """Iterate over the records of nodes under the group in `where`.
+
+        They are ``(path, h5class, classid, shape, dtype, size)`` tuples,
+        in the order of `File._g_visit_paths()`.
+
+        """
+
+        stack = [where]
+        while stack:
+            path = stack.pop()
+            yield (path,) + self.records[path]
+            stack.extend(join_path(path, name) for name in
+                         sorted(self.children.get(path, ()), reverse=True))
+
+    def _insert(self, records):
+        """Add `records` from `File._g_visit_paths()` to the catalog."""
+
+        for record in records:
+            path = record[0]
+            self.records[path] = record[1:]
+            if path != '/':
+                (parent, name) = split_path(path)
+                self.children.setdefault(parent, set()).add(name)
+
+    def _subtree(self, path):
+        """Get the paths of the node in `path` and its descendents."""
+
+        paths = [path]
+        for subpath in paths:
+            paths.extend(join_path(subpath, name)
+                         for name in self.children.get(subpath, ()))
+        return paths
+
+    def add(self, path):
+        """Add the node in `path` (and its descendents) to the catalog."""
+
+        if not isvisiblepath(path):
+            return
+        record = self.file._g_get_path_info(path, True, True)
+        if record is None:
+            return
+        if record[1] == 'Group':
+            self._insert(self.file._g_visit_paths(path, True, True))
+        else:
+            self._insert([record])
+        self.dirty = True
+
+    def register(self, node, new):
+        """Take note of a `node` which has just been created or opened."""
+
+        path = node._v_pathname
+        if new:
+            self.add(path)
+        record = self.records.get(path)
+        if (record is not None and record[0] == 'Dataset' and
+                self.file._iswritable()):
+            self.touched.add(path)
+
+    def remove(self, path):
+        """Remove the node in `path` and its descendents from the catalog."""
+
+        if path not in self.records:
+            return
+        (parent, name) = split_path(path)
+        self.children[parent].discard(name)
+        for subpath in self._subtree(path):
+            del self.records[subpath]
+            self.children.pop(subpath, None)
+            self.touched.discard(subpath)
+        self.dirty = True
+
+    def move(self, oldpath, newpath):
+        """Move the node in `oldpath` and its descendents to `newpath`."""
+
+        if oldpath not in self.records:
+            # A hidden node may have become visible.
+            self.add(newpath)
+            return
+        moved = [(subpath, self.records[subpath], subpath in self.touched)
+                 for subpath in self._subtree(oldpath)]
+        self.remove(oldpath)
+        if not isvisiblepath(newpath):
+            return
+        oldlen = len(oldpath)
+        for (subpath, record, touched) in moved:
+            subpath = newpath + subpath[oldlen:]
+            self._insert([(subpath,) + record])
+            if touched:
+                self.touched.add(subpath)
+
+    def refresh(self):
+        """Update the records of leaves which may have changed."""
+
+        for path in self.touched:
+            record = self.file._g_get_path_info(path, True, True)
+            if record is not None and record[1:] != self.records[path]:
+                self.records[path] = record[1:]
+                self.dirty = True
+
+    def _load(self, stamp):
+        """Load the catalog from its file.
+
+        Return False if the catalog file does not exist, is broken or it
+        is not up to date with the `stamp` of the file.
+
+        """
+
+        from .file import open_file
+
+        if not os.path.exists(self.filename):
+            return False
+        try:
+            with open_file(self.filename, 'r', node_catalog=False) as h5file:
+                attrs = h5file.root._v_attrs
+                if (attrs.CATALOG_VERSION != _catalog_version or
+                        attrs.ROOT_UEP != self.file.root_uep or
+                        tuple(int(value) for value in attrs.STAMP) !=
+                        tuple(stamp)):
+                    return False
+                rows = h5file.root.nodes.read().tolist()
+        except (OSError, HDF5ExtError, LookupError, AttributeError):
+            return False  # it is built again
+
+        shapes = {b'': None}
+        dtypes = {b'': None}
+        records = []
+        for (path, h5class, classid, shape, dtype, size) in rows:
+            if shape not in shapes:
+                shapes[shape] = literal_eval(shape.decode('ascii'))
+            if dtype not in dtypes:
+                dtypes[dtype] = _decode_dtype(dtype.decode('utf-8'))
+            records.append((path.decode('utf-8'), h5class.decode('ascii'),
+                            classid.decode('utf-8') or None, shapes[shape],
+                            dtypes[dtype], None if size < 0 else size))
+        self._insert(records)
+        return True
+
+    def save(self):
+        """Save the catalog to its file.
+
+        The catalog is stamped with the current state of the file, which
+        should be closed by now.  A warning is issued if the catalog can
+        not be saved.
+
+        """
+
+        from .file import open_file
+
+        paths = list(self.records)
+        records = [self.records[path] for path in paths]
+        columns = [
+            np.array([path.encode('utf-8') for path in paths]),
+            np.array([r[0].encode('ascii') for r in records]),
+            np.array([(r[1] or '').encode('utf-8') for r in records]),
+            np.array([('' if r[2] is None else repr(r[2])).encode('ascii')
+                      for r in records]),
+            np.array([_encode_dtype(r[3]).encode('utf-8') for r in records]),
+            np.array([-1 if r[4] is None else r[4] for r in records],
+                     dtype=np.int64),
+        ]
+        nodes = np.empty(len(paths), dtype=[
+            (name, column.dtype) for (name, column) in zip(_columns, columns)])
+        for (name, column) in zip(_columns, columns):
+            nodes[name] = column
+
+        # Write a new file and replace the old one only when complete.
+        tmpname = self.filename + '.tmp'
+        try:
+            with open_file(tmpname, 'w', node_catalog=False) as h5file:
+                h5file.create_table('/', 'nodes', nodes)
+                attrs = h5file.root._v_attrs
+                attrs.CATALOG_VERSION = _catalog_version
+                attrs.ROOT_UEP = self.file.root_uep
+                attrs.STAMP = np.array(get_stamp(self.file.filename),
+                                       dtype=np.int64)
+            os.replace(tmpname, self.filename)
+        except (OSError, HDF5ExtError) as exc:
+            warnings.warn("could not save the node catalog of ``%s``: %s"
+                          % (self.file.filename, exc), PerformanceWarning)
+        else:
+            self.dirty = False
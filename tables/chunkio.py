@@ -0,0 +1,387 @@
+"""Direct chunk I/O for chunked leaves.
+
+The functions in this module filter (e.g. compress) and unfilter the
+chunks of a dataset by themselves, mimicking the HDF5 filters used by
+PyTables, so that several chunks can be processed concurrently in a pool
+of threads.  HDF5 is then only used for storing and fetching the filtered
+chunks, which keeps the resulting files identical in format to those
+written through the filter pipeline.
+
+"""
+
+import collections
+import concurrent.futures
+import itertools
+
+import numpy as np
+
+from . import hdf5extension, utilsextension
+from .exceptions import HDF5ExtError
+
+
+_executors = {}
+"""The pools of threads used for filtering chunks, by size."""
+
+
+def get_executor(nthreads):
+    """Get a (shared) pool of `nthreads` threads for filtering chunks."""
+
+    executor = _executors.get(nthreads)
+    if executor is None:
+        executor = concurrent.futures.ThreadPoolExecutor(
+            nthreads, thread_name_prefix='tables-chunks')
+        _executors[nthreads] = executor
+    return executor
+
+
+def imap(func, iterable, nthreads):
+    """Yield ``(item, func(item))`` for items in `iterable`, in order.
+
+    Calls to `func` are run in a pool of `nthreads` threads, keeping a
+    bounded number of pending results so as to limit memory usage.
+
+    """
+
+    executor = get_executor(nthreads)
+    pending = collections.deque()
+    for item in iterable:
+        pending.append((item, executor.submit(func, item)))
+        if len(pending) > 2 * nthreads:
+            item, future = pending.popleft()
+            yield item, future.result()
+    while pending:
+        item, future = pending.popleft()
+        yield item, future.result()
+
+
+def get_pipeline(leaf):
+    """Get the filter pipeline of `leaf` for direct chunk I/O.
+
+    The pipeline is a tuple of ``(name, params)`` pairs, one per filter
+    in the dataset.  None is returned if direct chunk I/O can not be
+    used with `leaf`, because of its type, because some of its filters
+    are not supported or because it has no filters at all (since there
+    is nothing to gain from it then).
+
+    """
+
+    if not hdf5extension.HAVE_DIRECT_CHUNK or leaf.chunkshape is None:
+        return None
+    # Data must have the same layout in memory than on disk, and must
+    # not need any conversion before being stored (like time64 values).
+    if not leaf._g_same_disk_type():
+        return None
+    if getattr(leaf, '_time64colnames', None):
+        return None
+    if getattr(getattr(leaf, 'atom', None), 'type', None) == 'time64':
+        return None
+
+    filters = utilsextension.get_filters(leaf._v_parent._v_objectid,
+                                         leaf._v_name)
+    if not filters:
+        return None
+    pipeline = []
+    for name, values in filters.items():
+        if name == 'shuffle':
+            params = (values[0],)
+        elif name == 'deflate':
+            params = (values[0],)
+        elif name == 'blosc' and utilsextension.blosc_version:
+            # See ``blosc_filter()`` in ``hdf5-blosc/src/blosc_filter.c``.
+            clevel = values[4] if len(values) > 4 else 5
+            doshuffle = values[5] if len(values) > 5 else 1
+            if len(values) > 6:
+                compname = utilsextension.blosc_compcode_to_compname_(
+                    values[6])
+            else:
+                compname = 'blosclz'
+            params = (clevel, doshuffle, values[2], compname)
+        else:
+            return None
+        pipeline.append((name, params))
+    return tuple(pipeline)
+
+
+def shuffle(data, size):
+    """Shuffle the bytes in `data` like the HDF5 shuffle filter does."""
+
+    buf = np.frombuffer(data, dtype=np.uint8)
+    nelements = len(buf) // size
+    if size <= 1 or nelements <= 1:
+        return buf
+    nbytes = nelements * size
+    out = np.empty_like(buf)
+    out[:nbytes].reshape(size, nelements)[...] = (
+        buf[:nbytes].reshape(nelements, size).T)
+    out[nbytes:] = buf[nbytes:]
+    return out
+
+
+def unshuffle(data, size):
+    """Unshuffle the bytes in `data` like the HDF5 shuffle filter does."""
+
+    buf = np.frombuffer(data, dtype=np.uint8)
+    nelements = len(buf) // size
+    if size <= 1 or nelements <= 1:
+        return buf
+    nbytes = nelements * size
+    out = np.empty_like(buf)
+    out[:nbytes].reshape(nelements, size)[...] = (
+        buf[:nbytes].reshape(size, nelements).T)
+    out[nbytes:] = buf[nbytes:]
+    return out
+
+
+def encode_chunk(pipeline, chunk):
+    """Apply the filters in `pipeline` to the `chunk` array.
+
+    Return a ``(filter_mask, data)`` tuple with the mask of filters which
+    were skipped (optional filters which failed) and the filtered data.
+
+    """
+
+    data = np.ascontiguousarray(chunk)
+    filter_mask = 0
+    for i, (name, params) in enumerate(pipeline):
+        if name == 'shuffle':
+            data = shuffle(data, *params)
+        elif name == 'deflate':
+            data = utilsextension.zlib_compress_buffer(data, *params)
+        elif name == 'blosc':
+            cdata = utilsextension.blosc_compress_buffer(data, *params)
+            if cdata is None:
+                # The data did not compress, so the filter is skipped.
+                filter_mask |= 1 << i
+            else:
+                data = cdata
+    return filter_mask, data
+
+
+def decode_chunk(pipeline, filter_mask, data, nbytes):
+    """Undo the filters in `pipeline` applied to the `data` of a chunk.
+
+    Filters flagged in `filter_mask` are skipped, and `nbytes` is the
+    size of the unfiltered chunk.  Return the unfiltered data.
+
+    """
+
+    for i in reversed(range(len(pipeline))):
+        if filter_mask & (1 << i):
+            continue
+        name, params = pipeline[i]
+        if name == 'shuffle':
+            data = unshuffle(data, *params)
+        elif name == 'deflate':
+            data = utilsextension.zlib_decompress_buffer(data, nbytes)
+        elif name == 'blosc':
+            data = utilsextension.blosc_decompress_buffer(data)
+    return data
+
+
+def write_chunks(leaf, start, nparr, nthreads):
+    """Write `nparr` in `leaf` starting at `start` in its main dimension.
+
+    Data is written in whole chunks, which are filtered concurrently in
+    a pool of `nthreads` threads, so `start` must be a multiple of the
+    chunk length in the main dimension, and `nparr` must fit in the
+    current shape of `leaf`.  Chunks at the edges of other dimensions are
+    padded with zeros.
+
+    """
+
+    pipeline = leaf._v_chunk_pipeline
+    maindim = leaf.maindim
+    chunkshape = tuple(int(s) for s in leaf.chunkshape)
+    # Dimensions of shaped atoms follow those of the dataset.
+    fullshape = chunkshape + nparr.shape[len(chunkshape):]
+
+    def encode(coords):
+        block = nparr[tuple(slice(c, c + s)
+                            for (c, s) in zip(coords, chunkshape))]
+        if block.shape != fullshape:
+            chunk = np.zeros(fullshape, dtype=nparr.dtype)
+            chunk[tuple(slice(0, s) for s in block.shape)] = block
+            block = chunk
+        return encode_chunk(pipeline, block)
+
+    offsets = itertools.product(*[range(0, n, s) for (n, s)
+                                  in zip(nparr.shape, chunkshape)])
+    for coords, (filter_mask, data) in imap(encode, offsets, nthreads):
+        offset = list(coords)
+        offset[maindim] += start
+        leaf._g_write_chunk(offset, data, filter_mask)
+
+
+def append(leaf, nparr, append_rows):
+    """Append `nparr` to `leaf` using direct chunk writes when possible.
+
+    The whole chunks of `leaf` filled by `nparr` are filtered and written
+    by :func:`write_chunks`, in as many threads as set in the
+    ``MAX_CHUNK_THREADS`` parameter, while other rows are appended by
+    calling `append_rows` with them.
+
+    """
+
+    nthreads = leaf._v_file.params['MAX_CHUNK_THREADS']
+    maindim = leaf.maindim
+    nrows = nparr.shape[maindim]
+    nchunks = 0
+    if nthreads > 1 and leaf._v_chunk_pipeline is not None:
+        chunklen = int(leaf.chunkshape[maindim])
+        # Rows needed for completing the last chunk in the leaf.
+        head = min(-leaf.nrows % chunklen, nrows)
+        nchunks = (nrows - head) // chunklen
+    if nchunks < 2:
+        # Not worth the effort.
+        append_rows(nparr)
+        return
+    stop = head + nchunks * chunklen
+
+    def rows(start, stop):
+        slices = [slice(None)] * nparr.ndim
+        slices[maindim] = slice(start, stop)
+        return nparr[tuple(slices)]
+
+    if head > 0:
+        append_rows(np.ascontiguousarray(rows(0, head)))
+    start = leaf.nrows
+    leaf._g_truncate(start + stop - head)
+    try:
+        write_chunks(leaf, start, rows(head, stop), nthreads)
+    except Exception:
+        # Do not leave rows with the fill value at the end of the leaf.
+        leaf._g_truncate(start)
+        raise
+    if stop < nrows:
+        append_rows(np.ascontiguousarray(rows(stop, nrows)))
+
+
+def can_copy(src, dst, start, stop, step):
+    """Whether rows of `src` can be copied to `dst` as stored chunks.
+
+    This is the case when both leaves have the same chunkshape, filters,
+    type and fill value, and the range of rows from `start` to `stop`
+    (with a `step` of 1) in the main dimension of `src` starts and ends
+    at chunk boundaries (or at the end of `src`).
+
+    """
+
+    if not hdf5extension.HAVE_DIRECT_CHUNK or src.chunkshape is None:
+        return False
+    if dst.chunkshape is None or (tuple(int(s) for s in src.chunkshape) !=
+                                  tuple(int(s) for s in dst.chunkshape)):
+        return False
+    if step != 1 or start >= stop:
+        return False
+    chunklen = int(src.chunkshape[src.maindim])
+    if start % chunklen != 0 or (stop != src.nrows and stop % chunklen != 0):
+        return False
+    # References point to objects in the file of the source.
+    if getattr(getattr(src, 'atom', None), 'kind', None) == 'reference':
+        return False
+    if (utilsextension.get_filters(src._v_parent._v_objectid, src._v_name)
+            != utilsextension.get_filters(dst._v_parent._v_objectid,
+                                          dst._v_name)):
+        return False
+    return dst._g_same_storage(src)
+
+
+def copy(src, dst, start, stop, dststart=0):
+    """Copy the rows from `start` to `stop` of `src` to `dst` as stored.
+
+    The chunks of `src` with the rows are copied to `dst` without undoing
+    and redoing their filters, so :func:`can_copy` must be true for them.
+    The rows are copied from row `dststart` of `dst` on, which must be a
+    chunk boundary, and `dst` must be large enough to hold them.  Chunks
+    not allocated in `src` are not allocated in `dst` either.
+
+    """
+
+    maindim = src.maindim
+    starts = [0] * len(src.shape)
+    stops = list(src.shape)
+    starts[maindim] = start
+    stops[maindim] = stop
+    offsets, nchunks = src._g_allocated_chunks(starts, stops)
+    for offset in offsets.tolist():
+        filter_mask, data = src._g_read_chunk(offset)
+        offset[maindim] += dststart - start
+        dst._g_write_chunk(offset, data, filter_mask)
+
+
+def read_chunks(leaf, starts, stops, out, nthreads):
+    """Read the block from `starts` to `stops` of `leaf` into `out`.
+
+    The chunks overlapping the block are fetched as stored in the file,
+    and they are unfiltered and copied into `out` concurrently in a pool
+    of `nthreads` threads.  Chunks not allocated in the file are read as
+    the fill value of the dataset.
+
+    """
+
+    pipeline = leaf._v_chunk_pipeline
+    rank = len(starts)
+    chunkshape = tuple(int(s) for s in leaf.chunkshape)
+    # The shape of a chunk in `out`, including dimensions of the atom.
+    outshape = chunkshape + out.shape[rank:]
+    nbytes = int(np.prod(outshape)) * out.itemsize
+    fill = []
+
+    def chunks():
+        for coords in itertools.product(*[
+                range(start - start % size, stop, size)
+                for (start, stop, size) in zip(starts, stops, chunkshape)]):
+            filter_mask, data = leaf._g_read_chunk(coords)
+            if data is None and not fill:
+                value = np.zeros(1, dtype=(out.dtype, out.shape[rank:]))
+                leaf._g_read_fill_value(value)
+                fill.append(value[0])
+            yield coords, filter_mask, data
+
+    def decode(item):
+        coords, filter_mask, data = item
+        src, dst = [], []
+        for (c, start, stop, size) in zip(coords, starts, stops, chunkshape):
+            lo, hi = max(start, c), min(stop, c + size)
+            src.append(slice(lo - c, hi - c))
+            dst.append(slice(lo - start, hi - start))
+        if data is None:
+            out[tuple(dst)] = fill[0]
+            return
+        try:
+            data = decode_chunk(pipeline, filter_mask, data, nbytes)
+            chunk = np.frombuffer(data, dtype=out.dtype).reshape(outshape)
+        except Exception as exc:
+            offset = tuple(int(c) for c in coords)
+            raise HDF5ExtError("Problems unfiltering the chunk at %s of %s: "
+                               "%s" % (offset, leaf._v_pathname, exc),
+                               h5bt=False)
+        out[tuple(dst)] = chunk[tuple(src)]
+
+    # Chunks are copied into `out` by the threads themselves.
+    for item, result in imap(decode, chunks(), nthreads):
+        pass
+
+
+def read(leaf, starts, stops, out):
+    """Read a block of `leaf` into `out` using direct chunk reads.
+
+    The block goes from `starts` to `stops` in each dimension of `leaf`,
+    and it is read with :func:`read_chunks` in as many threads as set in
+    the ``MAX_CHUNK_THREADS`` parameter.  Return False without reading
+    anything if direct chunk reads can not be used or are not worth the
+    effort, so that the caller can read the block by other means.
+
+    """
+
+    nthreads = leaf._v_file.params['MAX_CHUNK_THREADS']
+    if nthreads <= 1 or leaf._v_chunk_pipeline is None:
+        return False
+    nchunks = 1
+    for (start, stop, size) in zip(starts, stops, leaf.chunkshape):
+        nchunks *= len(range(start - start % size, stop, size))
+    if nchunks < 2:
+        # Not worth the effort.
+        return False
+    read_chunks(leaf, starts, stops, out, nthreads)
+    return True
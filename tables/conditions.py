@@ -300,6 +300,25 @@ def _get_idx_expr(expr, indexedcols):
     return _get_idx_expr_recurse(expr, indexedcols, [], [''])
 
 
+def _get_idx_expr_and_str(expr, indexedcols):
+    """Get the indexable expressions and their string representation.
+
+    This post-processes the answer of `_get_idx_expr()` so that a tuple
+    of (idxexprs, strexpr) is always returned.
+
+    """
+
+    idxexprs = _get_idx_expr(expr, indexedcols)
+    if isinstance(idxexprs, list):
+        # Simple expression
+        strexpr = ['e0']
+    else:
+        # Complex expression
+        idxexprs, strexpr = idxexprs
+    # Get rid of the unneccessary list wrapper for strexpr
+    return idxexprs, strexpr[0]
+
+
 class CompiledCondition:
     """Container for a compiled condition."""
 
@@ -315,7 +334,8 @@ class CompiledCondition:
                 idxvars.append(idxvar)
         return frozenset(idxvars)
 
-    def __init__(self, func, params, idxexprs, strexpr, **kwargs):
+    def __init__(self, func, params, idxexprs, strexpr, sorted_range=False,
+                 **kwargs):
         self.function = func
         """The compiled function object corresponding to this condition."""
         self.parameters = params
@@ -324,13 +344,16 @@ class CompiledCondition:
         """A list of expressions in the form ``(var, (ops), (limits))``."""
         self.string_expression = strexpr
         """The indexable expression in string format."""
+        self.sorted_range = sorted_range
+        """Whether index expressions refer to a sorted column instead of
+        an indexed one, so they can only narrow the range of rows."""
         self.kwargs = kwargs
         """NumExpr kwargs (used to pass ex_uses_vml to numexpr)"""
 
     def __repr__(self):
-        return ("idxexprs: %s\nstrexpr: %s\nidxvars: %s"
+        return ("idxexprs: %s\nstrexpr: %s\nidxvars: %s\nsorted_range: %s"
                 % (self.index_expressions, self.string_expression,
-                   self.index_variables))
+                   self.index_variables, self.sorted_range))
 
     def with_replaced_vars(self, condvars):
         """Replace index limit variables with their values in-place.
@@ -355,7 +378,7 @@ class CompiledCondition:
         # Create a new container for the converted values
         newcc = CompiledCondition(
             self.function, self.parameters, exprs2, self.string_expression,
-            **self.kwargs)
+            self.sorted_range, **self.kwargs)
         return newcc
 
 
@@ -373,7 +396,8 @@ def _get_variable_names(expression):
     return list(set(names))  # remove repeated names
 
 
-def compile_condition(condition, typemap, indexedcols):
+def compile_condition(condition, typemap, indexedcols,
+                      sortedcols=frozenset()):
     """Compile a condition and extract usable index conditions.
 
     Looks for variable-constant comparisons in the `condition` string
@@ -381,6 +405,11 @@ def compile_condition(condition, typemap, indexedcols):
     `indexedcols`.  The part of `condition` having usable indexes is
     returned as a compiled condition in a `CompiledCondition` container.
 
+    If no usable index conditions are found, the comparisons involving
+    the sorted columns whose variable names appear in `sortedcols` are
+    extracted instead, and the ``sorted_range`` attribute of the result
+    is set to true.
+
     Expressions such as '0 < c1 <= 1' do not work as expected.  The
     Numexpr types of *all* variables must be given in the `typemap`
     mapping.  The ``function`` of the resulting `CompiledCondition`
@@ -394,16 +423,12 @@ def compile_condition(condition, typemap, indexedcols):
     if expr.astKind != 'bool':
         raise TypeError("condition ``%s`` does not have a boolean type"
                         % condition)
-    idxexprs = _get_idx_expr(expr, indexedcols)
-    # Post-process the answer
-    if isinstance(idxexprs, list):
-        # Simple expression
-        strexpr = ['e0']
-    else:
-        # Complex expression
-        idxexprs, strexpr = idxexprs
-    # Get rid of the unneccessary list wrapper for strexpr
-    strexpr = strexpr[0]
+    idxexprs, strexpr = _get_idx_expr_and_str(expr, indexedcols)
+    sorted_range = False
+    if not idxexprs and sortedcols:
+        # No indexes can be used, but a sorted column may narrow the range.
+        idxexprs, strexpr = _get_idx_expr_and_str(expr, sortedcols)
+        sorted_range = bool(idxexprs)
 
     # Get the variable names used in the condition.
     # At the same time, build its signature.
@@ -423,7 +448,8 @@ def compile_condition(condition, typemap, indexedcols):
 
     params = varnames
     # This is more comfortable to handle about than a tuple.
-    return CompiledCondition(func, params, idxexprs, strexpr, **kwargs)
+    return CompiledCondition(func, params, idxexprs, strexpr, sorted_range,
+                             **kwargs)
 
 
 def call_on_recarr(func, params, recarr, param2arg=None, **kwargs):
@@ -20,6 +20,7 @@ cdef extern from "time.h":
   ctypedef int time_t
 
 from libc.stdio cimport FILE
+from libc.stdint cimport uint32_t
 
 
 #-----------------------------------------------------------------------------
@@ -55,7 +56,7 @@ cdef extern from "hdf5.h" nogil:
   int H5F_ACC_TRUNC, H5F_ACC_RDONLY, H5F_ACC_RDWR, H5F_ACC_EXCL
   int H5F_ACC_DEBUG, H5F_ACC_CREAT
   int H5P_DEFAULT, H5P_DATASET_XFER, H5S_ALL
-  int H5P_FILE_CREATE, H5P_FILE_ACCESS
+  int H5P_FILE_CREATE, H5P_FILE_ACCESS, H5P_GROUP_CREATE
   int H5FD_LOG_LOC_WRITE, H5FD_LOG_ALL
   int H5I_INVALID_HID
   int H5E_DEFAULT
@@ -94,6 +95,11 @@ cdef extern from "hdf5.h" nogil:
     H5F_SCOPE_GLOBAL    = 1     # entire virtual file
     H5F_SCOPE_DOWN      = 2     # for internal use only
 
+  # The library version bounds for writing objects
+  cdef enum H5F_libver_t:
+    H5F_LIBVER_EARLIEST
+    H5F_LIBVER_LATEST
+
   cdef enum H5FD_mem_t:
     H5FD_MEM_NOLIST     = -1,   # Data should not appear in the free list.
                                 # Must be negative.
@@ -121,6 +127,17 @@ cdef extern from "hdf5.h" nogil:
     H5L_TYPE_SOFT     =  1      # Soft link id
     H5L_TYPE_EXTERNAL = 64,     # External link id
 
+  cdef enum H5_index_t:
+    H5_INDEX_UNKNOWN = -1       # Unknown index type
+    H5_INDEX_NAME               # Index on names
+    H5_INDEX_CRT_ORDER          # Index on creation order
+
+  cdef enum H5_iter_order_t:
+    H5_ITER_UNKNOWN = -1        # Unknown order
+    H5_ITER_INC                 # Increasing order
+    H5_ITER_DEC                 # Decreasing order
+    H5_ITER_NATIVE              # No particular order, whatever is fastest
+
   # Values for fill value status
   cdef enum H5D_fill_value_t:
     H5D_FILL_VALUE_ERROR        = -1
@@ -298,6 +315,17 @@ cdef extern from "hdf5.h" nogil:
     #    H5_ih_info_t    attr
     #} meta_size
 
+  # link info
+  ctypedef struct H5L_info_t:
+    H5L_type_t          type        # Type of link
+
+  ctypedef herr_t (*H5L_iterate_t)(hid_t group, const char *name,
+                                   const H5L_info_t *info, void *op_data)
+
+  # group info
+  ctypedef struct H5G_info_t:
+    hsize_t             nlinks      # Number of links in group
+    int64_t             max_corder  # Current max. creation order value
 
   #------------------------------------------------------------------
 
@@ -329,11 +357,14 @@ cdef extern from "hdf5.h" nogil:
                    hid_t gapl_id)
   hid_t  H5Gopen(hid_t loc_id, char *name, hid_t gapl_id)
   herr_t H5Gclose(hid_t group_id)
+  herr_t H5Gget_info(hid_t loc_id, H5G_info_t *ginfo)
 
   # Operations with links
   herr_t H5Ldelete(hid_t file_id, char *name, hid_t lapl_id)
   herr_t H5Lmove(hid_t src_loc_id, char *src_name,
                   hid_t dst_loc_id, char *dst_name, hid_t lcpl, hid_t lap)
+  herr_t H5Lvisit(hid_t group_id, H5_index_t idx_type, H5_iter_order_t order,
+                  H5L_iterate_t op, void *op_data)
 
   # For dealing with datasets
   hid_t  H5Dopen(hid_t file_id, char *name, hid_t dapl_id)
@@ -418,8 +449,11 @@ cdef extern from "hdf5.h" nogil:
   herr_t H5Pset_cache(hid_t plist_id, int mdc_nelmts, int rdcc_nelmts,
                       size_t rdcc_nbytes, double rdcc_w0)
   herr_t H5Pset_sieve_buf_size(hid_t fapl_id, hsize_t size)
+  herr_t H5Pset_libver_bounds(hid_t fapl_id, H5F_libver_t low,
+                              H5F_libver_t high)
   H5D_layout_t H5Pget_layout(hid_t plist)
   int H5Pget_chunk(hid_t plist, int max_ndims, hsize_t *dims)
+  herr_t H5Pget_fill_value(hid_t plist_id, hid_t type_id, void *value)
 
   hid_t H5Pget_driver(hid_t plist_id)
   herr_t H5Pset_fapl_sec2(hid_t fapl_id)
@@ -490,6 +524,7 @@ cdef extern from "hdf5.h" nogil:
   herr_t H5Rcreate(void *reference, hid_t loc_id, const char *name, H5R_type_t type, hid_t space_id)
   hid_t H5Rdereference(hid_t dset, H5R_type_t rtype, void *reference)
   int H5Rget_object_type(hid_t obj_id, void *reference)
+  hid_t H5Oopen(hid_t loc_id, const char *name, hid_t lapl_id)
   herr_t H5Oclose( hid_t object_id )
 
 
@@ -507,6 +542,7 @@ cdef extern from "H5ATTR.h" nogil:
   herr_t H5ATTRset_attribute_string(hid_t loc_id, char *attr_name,
                                     char *attr_data, hsize_t attr_size,
                                     int cset)
+  herr_t H5ATTRcopy_attributes(hid_t src_id, hid_t dst_id)
   herr_t H5ATTRfind_attribute(hid_t loc_id, char *attr_name)
   herr_t H5ATTRget_type_ndims(hid_t loc_id, char *attr_name,
                               hid_t *type_id, H5T_class_t *class_id,
@@ -527,6 +563,9 @@ cdef extern from "utils.h" nogil:
   herr_t set_cache_size(hid_t file_id, size_t cache_size)
   int get_objinfo(hid_t loc_id, char *name)
   int get_linkinfo(hid_t loc_id, char *name)
+  int has_link(hid_t loc_id, char *name)
+  herr_t set_attr_storage(hid_t plist_id, int max_compact, int min_dense,
+                          int creation_order)
   hsize_t get_len_of_range(hsize_t lo, hsize_t hi, hsize_t step)
   hid_t  create_ieee_float16(char *byteorder)
   hid_t  create_ieee_complex64(char *byteorder)
@@ -545,12 +584,27 @@ cdef extern from "utils.h" nogil:
   herr_t pt_H5Pset_file_image(hid_t fapl_id, void *buf_ptr, size_t buf_len)
   ssize_t pt_H5Fget_file_image(hid_t file_id, void *buf_ptr, size_t buf_len)
   herr_t pt_H5free_memory(void *buf)
+  herr_t pt_H5Dwrite_chunk(hid_t dset_id, hid_t dxpl_id, uint32_t filters,
+                           hsize_t *offset, size_t data_size, void *buf)
+  herr_t pt_H5Dread_chunk(hid_t dset_id, hid_t dxpl_id, hsize_t *offset,
+                          uint32_t *filters, void *buf)
+  herr_t pt_H5Dget_chunk_info_by_coord(hid_t dset_id, hsize_t *offset,
+                                       unsigned *filter_mask, haddr_t *addr,
+                                       hsize_t *size)
+  herr_t pt_H5Dget_num_chunks(hid_t dset_id, hid_t fspace_id,
+                              hsize_t *nchunks)
+
+  herr_t pt_H5Drefresh(hid_t dset_id)
+  herr_t pt_H5Fstart_swmr_write(hid_t file_id)
 
   int H5_HAVE_DIRECT_DRIVER, H5_HAVE_WINDOWS_DRIVER, H5_HAVE_IMAGE_FILE
+  int H5_HAVE_DIRECT_CHUNK, H5_HAVE_SWMR
+  int PT_H5F_ACC_SWMR_READ, PT_H5F_ACC_SWMR_WRITE
 
 
 cdef extern from "utils.h":
   object Giterate(hid_t parent_id, hid_t loc_id, char *name)
+  object Giterate_page(hid_t loc_id, hsize_t start, hsize_t count)
   object Aiterate(hid_t loc_id)
   object H5UIget_info(hid_t loc_id, char *name, char *byteorder)
 
@@ -567,4 +621,5 @@ cdef extern from "typeconv.h" nogil:
 # Blosc registration
 cdef extern from "blosc_filter.h" nogil:
   int register_blosc(char **version, char **date)
+  int blosc_filter_set_nthreads(int nthreads)
   int FILTER_BLOSC
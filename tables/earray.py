@@ -2,6 +2,7 @@
 
 import numpy as np
 
+from . import chunkio
 from .utils import convert_to_np_atom2, SizeType
 from .carray import CArray
 
@@ -90,6 +91,12 @@ class EArray(CArray):
 
         .. versionadded:: 3.4.3
 
+    attr_phase_change, attr_creation_order, expectedattrs
+        The settings for storing the attributes of the leaf (see
+        :meth:`File.create_group`).
+
+        .. versionadded:: 3.7
+
     Examples
     --------
 
@@ -131,7 +138,8 @@ class EArray(CArray):
                  atom=None, shape=None, title="",
                  filters=None, expectedrows=None,
                  chunkshape=None, byteorder=None,
-                 _log=True, track_times=True):
+                 _log=True, track_times=True, attr_phase_change=None,
+                 attr_creation_order=None, expectedattrs=None):
 
         # Specific of EArray
         if expectedrows is None:
@@ -141,7 +149,10 @@ class EArray(CArray):
 
         # Call the parent (CArray) init code
         super().__init__(parentnode, name, atom, shape, title, filters,
-                         chunkshape, byteorder, _log, track_times)
+                         chunkshape, byteorder, _log, track_times,
+                         attr_phase_change=attr_phase_change,
+                         attr_creation_order=attr_creation_order,
+                         expectedattrs=expectedattrs)
 
     def _g_create(self):
         """Create a new array in file (specific part)."""
@@ -200,7 +211,7 @@ class EArray(CArray):
         self._check_shape_append(nparr)
         # If the size of the nparr is zero, don't do anything else
         if nparr.size > 0:
-            self._append(nparr)
+            chunkio.append(self, nparr, self._append)
 
     def _g_copy_with_stats(self, group, name, start, stop, step,
                            title, filters, chunkshape, _log, **kwargs):
@@ -218,22 +229,27 @@ class EArray(CArray):
             group, name, atom=self.atom, shape=shape, title=title,
             filters=filters, expectedrows=nrows, chunkshape=chunkshape,
             _log=_log)
-        # Now, fill the new earray with values from source
-        nrowsinbuf = self.nrowsinbuf
-        # The slices parameter for self.__getitem__
-        slices = [slice(0, dim, 1) for dim in self.shape]
-        # This is a hack to prevent doing unnecessary conversions
-        # when copying buffers
-        self._v_convert = False
-        # Start the copy itself
-        for start2 in range(start, stop, step * nrowsinbuf):
-            # Save the records on disk
-            stop2 = start2 + step * nrowsinbuf
-            if stop2 > stop:
-                stop2 = stop
-            # Set the proper slice in the extensible dimension
-            slices[maindim] = slice(start2, stop2, step)
-            object._append(self.__getitem__(tuple(slices)))
+        if chunkio.can_copy(self, object, start, stop, step):
+            # Copy the chunks as stored, without refiltering them
+            object._g_truncate(nrows)
+            chunkio.copy(self, object, start, stop)
+        else:
+            # Now, fill the new earray with values from source
+            nrowsinbuf = self.nrowsinbuf
+            # The slices parameter for self.__getitem__
+            slices = [slice(0, dim, 1) for dim in self.shape]
+            # This is a hack to prevent doing unnecessary conversions
+            # when copying buffers
+            self._v_convert = False
+            # Start the copy itself
+            for start2 in range(start, stop, step * nrowsinbuf):
+                # Save the records on disk
+                stop2 = start2 + step * nrowsinbuf
+                if stop2 > stop:
+                    stop2 = stop
+                # Set the proper slice in the extensible dimension
+                slices[maindim] = slice(start2, stop2, step)
+                object._append(self.__getitem__(tuple(slices)))
         # Active the conversion again (default)
         self._v_convert = True
         nbytes = np.prod(self.shape, dtype=SizeType) * self.atom.itemsize
@@ -25,28 +25,31 @@ from . import parameters
 from .exceptions import (ClosedFileError, FileModeError, NodeError,
                          NoSuchNodeError, UndoRedoError, ClosedNodeError,
                          PerformanceWarning)
-from .registry import get_class_by_name
+from .registry import get_class_by_name, class_id_dict
 from .path import join_path, split_path
 from . import undoredo
+from .catalog import NodeCatalog, get_stamp
+from .attributeset import decode_value, parse_format_version
 from .description import (IsDescription, UInt8Col, StringCol,
                           descr_from_dtype, dtype_from_descr)
 from .filters import Filters
-from .node import Node, NotLoggedMixin
+from .node import Node, NotLoggedMixin, _get_attr_storage
 from .group import Group, RootGroup
 from .group import TransactionGroupG, TransactionG, MarkG
-from .leaf import Leaf
-from .array import Array
+from .leaf import Leaf, fix_byteorder_data
+from .array import Array, obversion as array_obversion
 from .carray import CArray
 from .earray import EArray
 from .vlarray import VLArray
-from .table import Table
+from .table import Table, obversion as table_obversion
 from . import linkextension
-from .utils import detect_number_of_cores
+from .utils import detect_number_of_cores, byteorders
 from . import lrucacheextension
 from .flavor import flavor_of, array_as_internal
 from .atom import Atom
 
 from .link import SoftLink, ExternalLink
+from .unimplemented import UnImplemented, Unknown
 
 
 # format_version = "1.0"  # Initial format
@@ -246,6 +249,17 @@ def open_file(filename, mode="r", title="", root_uep="/", filters=None,
         they will inherit these ones, which will in turn propagate to
         child nodes.
 
+    swmr : bool
+        Whether to open the file in single-writer/multiple-reader (SWMR)
+        mode.  In read-only mode, the data appended to the leaves of the
+        file by a process writing it in SWMR mode can be seen by calling
+        :meth:`Leaf.refresh` on them.  In the other modes, the file is
+        written in SWMR mode, where no nodes can be created nor removed;
+        new files are written in SWMR mode only after calling
+        :meth:`File.start_swmr_write`.  It needs HDF5 1.10.0 or newer.
+
+        .. versionadded:: 3.7
+
     Notes
     -----
     In addition, it recognizes the (lowercase) names of parameters
@@ -296,7 +310,8 @@ def open_file(filename, mode="r", title="", root_uep="/", filters=None,
                     "close it before reopening in write mode." % filename)
 
     # Finally, create the File instance, and return it
-    return File(filename, mode, title, root_uep, filters, **kwargs)
+    with utilsextension.hdf5_lock:
+        return File(filename, mode, title, root_uep, filters, **kwargs)
 
 
 # A dumb class that doesn't keep nothing at all
@@ -638,6 +653,17 @@ class File(hdf5extension.File):
         specify filter properties for child groups, they will inherit these
         ones, which will in turn propagate to child nodes.
 
+    swmr : bool
+        Whether to open the file in single-writer/multiple-reader (SWMR)
+        mode.  In read-only mode, the data appended to the leaves of the
+        file by a process writing it in SWMR mode can be seen by calling
+        :meth:`Leaf.refresh` on them.  In the other modes, the file is
+        written in SWMR mode, where no nodes can be created nor removed;
+        new files are written in SWMR mode only after calling
+        :meth:`File.start_swmr_write`.  It needs HDF5 1.10.0 or newer.
+
+        .. versionadded:: 3.7
+
     Notes
     -----
     In addition, it recognizes the (lowercase) names of parameters
@@ -677,6 +703,13 @@ class File(hdf5extension.File):
         .. versionchanged:: 3.0
            The *rootUEP* attribute has been renamed into *root_uep*.
 
+    .. attribute:: swmr_mode
+
+        True if the file is being read or written in single-writer/
+        multiple-reader mode (see the :func:`open_file` function).
+
+        .. versionadded:: 3.7
+
     """
 
     # The top level kinds. Group must go first!
@@ -756,8 +789,18 @@ class File(hdf5extension.File):
         if params['MAX_BLOSC_THREADS'] is None:
             params['MAX_BLOSC_THREADS'] = detect_number_of_cores()
 
+        if params['MAX_CHUNK_THREADS'] is None:
+            params['MAX_CHUNK_THREADS'] = detect_number_of_cores()
+
         self.params = params
 
+        # Node catalogs are only kept for files in the local filesystem.
+        use_catalog = (params['NODE_CATALOG'] and
+                       params['DRIVER'] in (None, 'H5FD_SEC2', 'H5FD_STDIO'))
+        if use_catalog:
+            # Get the state of the file before it is opened.
+            stamp = get_stamp(filename)
+
         # Now, it is time to initialize the File extension
         self._g_new(filename, mode, **params)
 
@@ -777,6 +820,9 @@ class File(hdf5extension.File):
         # For the moment Undo/Redo is not enabled.
         self._undoEnabled = False
 
+        # The node catalog is loaded once the root group is available.
+        self._catalog = None
+
         # Set the flag to indicate that the file has been opened.
         # It must be set before opening the root group
         # to allow some basic access to its attributes.
@@ -803,6 +849,10 @@ class File(hdf5extension.File):
                 root._v_attrs._g__setattr(
                     'PYTABLES_FORMAT_VERSION', format_version)
 
+        # Load (or build) the catalog of nodes.
+        if use_catalog:
+            self._catalog = NodeCatalog(self, None if new else stamp)
+
         # If the file is old, and not opened in "read-only" mode,
         # check if it has a transaction log
         if not new and self.mode != "r" and _trans_group_path in self:
@@ -883,8 +933,50 @@ class File(hdf5extension.File):
             parent = child
         return parent
 
+    def _get_leaves_parent(self, where, createparents, names):
+        """Get the parent group of new leaves which are not instantiated.
+
+        The group in `where` is returned (created if `createparents` is
+        true) once it is checked that leaves can be created in it with
+        `names` (see `Group._g_check_leafnames()`).
+
+        """
+
+        parentnode = self._get_or_create_path(where, createparents)
+        if isinstance(parentnode, SoftLink):
+            parentnode = parentnode.dereference()
+        if not isinstance(parentnode, Group):
+            raise TypeError("new parent node ``%s`` is not a group"
+                            % parentnode._v_pathname)
+        parentnode._g_check_leafnames(names)
+        return parentnode
+
+    def _add_new_leaves(self, parentnode, names):
+        """Take note of leaves created under `parentnode` with `names`.
+
+        The leaves have been created without instantiating them, so
+        their creation is logged here (if undo is enabled) and they are
+        added to the children names of `parentnode` and to the node
+        catalog.  Names without a node (e.g. after an error in the
+        middle of creating leaves) are ignored.
+
+        """
+
+        names = [name for name in names if name in parentnode]
+        # Refresh children names in the parent node (if loaded)
+        if '_v_children' in parentnode.__dict__:
+            parentnode._g_add_children_names()
+        undo_enabled = self.is_undo_enabled()
+        for name in names:
+            path = join_path(parentnode._v_pathname, name)
+            if undo_enabled:
+                self._log('CREATE', path)
+            if self._catalog is not None:
+                self._catalog.add(path)
+
     def create_group(self, where, name, title="", filters=None,
-                     createparents=False):
+                     createparents=False, attr_phase_change=None,
+                     attr_creation_order=None, expectedattrs=None):
         """Create a new group.
 
         Parameters
@@ -908,6 +1000,34 @@ class File(hdf5extension.File):
         createparents : bool
             Whether to create the needed groups for the parent
             path to exist (not done by default).
+        attr_phase_change : tuple
+            A ``(max_compact, min_dense)`` pair with the numbers of
+            attributes for switching the new node from compact to dense
+            storage of attributes and back.  Looking up attributes in
+            dense storage is much faster for nodes with many attributes.
+            The default is the value of the ``ATTR_PHASE_CHANGE``
+            parameter (see :data:`tables.parameters.ATTR_PHASE_CHANGE`).
+
+            .. versionadded:: 3.7
+
+        attr_creation_order : bool
+            Whether to track and index the creation order of the
+            attributes of the new node.  The default is the value of the
+            ``ATTR_CREATION_ORDER`` parameter (see
+            :data:`tables.parameters.ATTR_CREATION_ORDER`).
+
+            .. versionadded:: 3.7
+
+        expectedattrs : int
+            A user estimate of the number of attributes that will be
+            set on the new node.  If it is larger than the 8 attributes
+            kept in compact storage by default and no phase change is
+            given (either by `attr_phase_change` or by the
+            ``ATTR_PHASE_CHANGE`` parameter), the new node switches to
+            dense storage of attributes with the HDF5 default phase
+            change of ``(8, 6)``.
+
+            .. versionadded:: 3.7
 
         See Also
         --------
@@ -918,12 +1038,17 @@ class File(hdf5extension.File):
         parentnode = self._get_or_create_path(where, createparents)
         _checkfilters(filters)
         return Group(parentnode, name,
-                     title=title, new=True, filters=filters)
+                     title=title, new=True, filters=filters,
+                     attr_phase_change=attr_phase_change,
+                     attr_creation_order=attr_creation_order,
+                     expectedattrs=expectedattrs)
 
     def create_table(self, where, name, description=None, title="",
                      filters=None, expectedrows=10_000,
                      chunkshape=None, byteorder=None,
-                     createparents=False, obj=None, track_times=True):
+                     createparents=False, obj=None, track_times=True,
+                     attr_phase_change=None, attr_creation_order=None,
+                     expectedattrs=None):
         """Create a new table with the given name in where location.
 
         Parameters
@@ -1007,6 +1132,12 @@ class File(hdf5extension.File):
 
             .. versionadded:: 3.4.3
 
+        attr_phase_change, attr_creation_order, expectedattrs
+            The settings for storing the attributes of the new node (see
+            :meth:`File.create_group`).
+
+            .. versionadded:: 3.7
+
         See Also
         --------
         Table : for more information on tables
@@ -1035,16 +1166,117 @@ class File(hdf5extension.File):
                       description=description, title=title,
                       filters=filters, expectedrows=expectedrows,
                       chunkshape=chunkshape, byteorder=byteorder,
-                      track_times=track_times)
+                      track_times=track_times,
+                      attr_phase_change=attr_phase_change,
+                      attr_creation_order=attr_creation_order,
+                      expectedattrs=expectedattrs)
 
         if obj is not None:
             ptobj.append(obj)
 
         return ptobj
 
+    def create_tables(self, where, tables, title="", filters=None,
+                      expectedrows=10_000, chunkshape=None, byteorder=None,
+                      createparents=False, track_times=True,
+                      attr_phase_change=None, attr_creation_order=None,
+                      expectedattrs=None):
+        """Create many new tables with initial rows at once.
+
+        This is like calling :meth:`File.create_table` for each item of
+        the `tables` mapping, with the name of a new table and its
+        initial rows (a structured array, which also gives its
+        description).  However, Table objects are only created for the
+        first table with each description, and the rest of them are
+        created as copies of the former (filled with their own rows) in
+        a single pass.  This is much faster when there are many small
+        tables.  The tables are loaded when accessed later (e.g. with
+        :meth:`File.get_node`), as with an existing file.
+
+        Parameters
+        ----------
+        where : str or Group
+            The parent group from which the new tables will hang.
+        tables : dict
+            The initial rows of the new tables by name (see the
+            `description` argument of :meth:`File.create_table`).  Use
+            empty structured arrays for empty tables.
+
+        The rest of arguments are those of :meth:`File.create_table`,
+        and they apply to all the new tables.
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._check_writable()
+        _checkfilters(filters)
+        names = list(tables)
+        # Group tables with the same dtype, flavor and expected rows
+        kinds = {}
+        for name in names:
+            obj = tables[name]
+            flavor = flavor_of(obj)
+            if flavor == 'python':
+                nparray = np.rec.array(obj)
+            else:
+                nparray = array_as_internal(obj, flavor)
+            if nparray.dtype.fields is None:
+                raise TypeError("the initial rows of table ``%s`` are not "
+                                "a structured array" % name)
+            nrows = len(nparray) if chunkshape is None else 0
+            key = (nparray.dtype, flavor, max(nrows, expectedrows))
+            kinds.setdefault(key, []).append((name, nparray))
+
+        parentnode = self._get_leaves_parent(where, createparents, names)
+        created = []
+        try:
+            for ((dtype, flavor, nrows), items) in kinds.items():
+                # All the tables are stored with the byteorder of their
+                # rows, unless another one is given (even if they are
+                # empty), and the rows given are never byteswapped.
+                (_, rabyteorder) = descr_from_dtype(dtype,
+                                                    ptparams=self.params)
+                tbyteorder = byteorder
+                if byteorders[rabyteorder] == 'irrelevant':
+                    pass
+                elif byteorder is None:
+                    tbyteorder = byteorders[rabyteorder]
+                elif byteorder != byteorders[rabyteorder]:
+                    items = [(name, nparray.copy())
+                             for (name, nparray) in items]
+                # The first table is created as usual...
+                name = items[0][0]
+                description = tables[name]
+                if flavor == 'numpy':
+                    description = items[0][1]
+                table = Table(parentnode, name, description=description,
+                              title=title, filters=filters,
+                              expectedrows=nrows, chunkshape=chunkshape,
+                              byteorder=tbyteorder, track_times=track_times,
+                              attr_phase_change=attr_phase_change,
+                              attr_creation_order=attr_creation_order,
+                              expectedattrs=expectedattrs)
+                # ...and the rest as copies of it.
+                tnames, recarrays = [], []
+                for (name, nparray) in items[1:]:
+                    (nparray, _) = fix_byteorder_data(nparray, rabyteorder,
+                                                      table.byteorder)
+                    tnames.append(name)
+                    recarrays.append(nparray)
+                created.extend(tnames)
+                with utilsextension.hdf5_lock:
+                    table._create_tables_like(
+                        tnames, recarrays, title,
+                        table.filters.complib or '', table_obversion)
+        finally:
+            self._add_new_leaves(parentnode, created)
+
     def create_array(self, where, name, obj=None, title="",
                      byteorder=None, createparents=False,
-                     atom=None, shape=None, track_times=True):
+                     atom=None, shape=None, track_times=True,
+                     attr_phase_change=None, attr_creation_order=None,
+                     expectedattrs=None):
         """Create a new array.
 
         Parameters
@@ -1101,6 +1333,12 @@ class File(hdf5extension.File):
 
             .. versionadded:: 3.4.3
 
+        attr_phase_change, attr_creation_order, expectedattrs
+            The settings for storing the attributes of the new node (see
+            :meth:`File.create_group`).
+
+            .. versionadded:: 3.7
+
         See Also
         --------
         Array : for more information on arrays
@@ -1136,12 +1374,78 @@ class File(hdf5extension.File):
         parentnode = self._get_or_create_path(where, createparents)
         return Array(parentnode, name,
                      obj=obj, title=title, byteorder=byteorder,
-                     track_times=track_times)
+                     track_times=track_times,
+                     attr_phase_change=attr_phase_change,
+                     attr_creation_order=attr_creation_order,
+                     expectedattrs=expectedattrs)
+
+    def create_arrays(self, where, arrays, title="", byteorder=None,
+                      createparents=False, track_times=True,
+                      attr_phase_change=None, attr_creation_order=None,
+                      expectedattrs=None):
+        """Create many new arrays at once.
+
+        This is like calling :meth:`File.create_array` for each item of
+        the `arrays` mapping, with the name and the data of a new array.
+        However, no Array objects are created: the arrays and their
+        system attributes are written in a single pass, which is much
+        faster when there are many small arrays.  The arrays are loaded
+        when accessed later (e.g. with :meth:`File.get_node`), as with
+        an existing file.
+
+        Parameters
+        ----------
+        where : str or Group
+            The parent group from which the new arrays will hang.
+        arrays : dict
+            The data of the new arrays by name (see the `obj` argument
+            of :meth:`File.create_array`).
+
+        The rest of arguments are those of :meth:`File.create_array`,
+        and they apply to all the new arrays.
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._check_writable()
+        if byteorder not in (None, 'little', 'big'):
+            raise ValueError(
+                "the byteorder can only take 'little' or 'big' values "
+                "and you passed: %s" % byteorder)
+        names = list(arrays)
+        nparrs, byteorders, flavors = [], [], []
+        for name in names:
+            obj = arrays[name]
+            flavor = flavor_of(obj)
+            nparr = array_as_internal(obj, flavor)
+            if nparr.dtype.kind in ['V', 'U', 'O']:
+                raise TypeError("Array objects cannot currently deal with "
+                                "void, unicode or object arrays")
+            (nparr, order) = fix_byteorder_data(nparr, nparr.dtype.byteorder,
+                                                byteorder)
+            nparrs.append(nparr)
+            byteorders.append(order)
+            flavors.append(flavor)
+
+        parentnode = self._get_leaves_parent(where, createparents, names)
+        attr_storage = _get_attr_storage(self.params, attr_phase_change,
+                                         attr_creation_order, expectedattrs)
+        try:
+            with utilsextension.hdf5_lock:
+                hdf5extension.create_arrays(
+                    parentnode._v_objectid, names, nparrs, byteorders,
+                    flavors, title, array_obversion, Array._c_classid,
+                    self.params['PYTABLES_SYS_ATTRS'], track_times,
+                    attr_storage)
+        finally:
+            self._add_new_leaves(parentnode, names)
 
     def create_carray(self, where, name, atom=None, shape=None, title="",
                       filters=None, chunkshape=None,
                       byteorder=None, createparents=False, obj=None,
-                      track_times=True):
+                      track_times=True, attr_phase_change=None,
+                      attr_creation_order=None, expectedattrs=None):
         """Create a new chunked array.
 
         Parameters
@@ -1216,6 +1520,12 @@ class File(hdf5extension.File):
 
             .. versionadded:: 3.4.3
 
+        attr_phase_change, attr_creation_order, expectedattrs
+            The settings for storing the attributes of the new node (see
+            :meth:`File.create_group`).
+
+            .. versionadded:: 3.7
+
         See Also
         --------
         CArray : for more information on chunked arrays
@@ -1242,7 +1552,10 @@ class File(hdf5extension.File):
         ptobj = CArray(parentnode, name,
                        atom=atom, shape=shape, title=title, filters=filters,
                        chunkshape=chunkshape, byteorder=byteorder,
-                       track_times=track_times)
+                       track_times=track_times,
+                       attr_phase_change=attr_phase_change,
+                       attr_creation_order=attr_creation_order,
+                       expectedattrs=expectedattrs)
 
         if obj is not None:
             ptobj[...] = obj
@@ -1252,7 +1565,9 @@ class File(hdf5extension.File):
     def create_earray(self, where, name, atom=None, shape=None, title="",
                       filters=None, expectedrows=1000,
                       chunkshape=None, byteorder=None,
-                      createparents=False, obj=None, track_times=True):
+                      createparents=False, obj=None, track_times=True,
+                      attr_phase_change=None, attr_creation_order=None,
+                      expectedattrs=None):
         """Create a new enlargeable array.
 
         Parameters
@@ -1329,6 +1644,12 @@ class File(hdf5extension.File):
 
             .. versionadded:: 3.4.3
 
+        attr_phase_change, attr_creation_order, expectedattrs
+            The settings for storing the attributes of the new node (see
+            :meth:`File.create_group`).
+
+            .. versionadded:: 3.7
+
         See Also
         --------
         EArray : for more information on enlargeable arrays
@@ -1359,7 +1680,10 @@ class File(hdf5extension.File):
                        atom=atom, shape=shape, title=title,
                        filters=filters, expectedrows=expectedrows,
                        chunkshape=chunkshape, byteorder=byteorder,
-                       track_times=track_times)
+                       track_times=track_times,
+                       attr_phase_change=attr_phase_change,
+                       attr_creation_order=attr_creation_order,
+                       expectedattrs=expectedattrs)
 
         if obj is not None:
             ptobj.append(obj)
@@ -1370,7 +1694,8 @@ class File(hdf5extension.File):
                        filters=None, expectedrows=None,
                        chunkshape=None, byteorder=None,
                        createparents=False, obj=None,
-                       track_times=True):
+                       track_times=True, attr_phase_change=None,
+                       attr_creation_order=None, expectedattrs=None):
         """Create a new variable-length array.
 
         Parameters
@@ -1443,6 +1768,12 @@ class File(hdf5extension.File):
 
             .. versionadded:: 3.4.3
 
+        attr_phase_change, attr_creation_order, expectedattrs
+            The settings for storing the attributes of the new node (see
+            :meth:`File.create_group`).
+
+            .. versionadded:: 3.7
+
         See Also
         --------
         VLArray : for more informationon variable-length arrays
@@ -1471,7 +1802,10 @@ class File(hdf5extension.File):
                         atom=atom, title=title, filters=filters,
                         expectedrows=expectedrows,
                         chunkshape=chunkshape, byteorder=byteorder,
-                        track_times=track_times)
+                        track_times=track_times,
+                        attr_phase_change=attr_phase_change,
+                        attr_creation_order=attr_creation_order,
+                        expectedattrs=expectedattrs)
 
         if obj is not None:
             ptobj.append(obj)
@@ -1494,8 +1828,11 @@ class File(hdf5extension.File):
         targetnode = self.get_node(target)
         parentnode = self._get_or_create_path(where, createparents)
         linkextension._g_create_hard_link(parentnode, name, targetnode)
-        # Refresh children names in link's parent node
-        parentnode._g_add_children_names()
+        # Refresh children names in link's parent node (if loaded)
+        if '_v_children' in parentnode.__dict__:
+            parentnode._g_add_children_names()
+        if self._catalog is not None:
+            self._catalog.add(join_path(parentnode._v_pathname, name))
         # Return the target node
         return self.get_node(parentnode, name)
 
@@ -1523,8 +1860,9 @@ class File(hdf5extension.File):
                     "`target` has to be a string or a node object")
         parentnode = self._get_or_create_path(where, createparents)
         slink = SoftLink(parentnode, name, target)
-        # Refresh children names in link's parent node
-        parentnode._g_add_children_names()
+        # Refresh children names in link's parent node (if loaded)
+        if '_v_children' in parentnode.__dict__:
+            parentnode._g_add_children_names()
         return slink
 
     def create_external_link(self, where, name, target, createparents=False):
@@ -1551,8 +1889,9 @@ class File(hdf5extension.File):
                 "`target` must expressed as 'file:/path/to/node'")
         parentnode = self._get_or_create_path(where, createparents)
         elink = ExternalLink(parentnode, name, target)
-        # Refresh children names in link's parent node
-        parentnode._g_add_children_names()
+        # Refresh children names in link's parent node (if loaded)
+        if '_v_children' in parentnode.__dict__:
+            parentnode._g_add_children_names()
         return elink
 
     def _get_node(self, nodepath):
@@ -1602,34 +1941,44 @@ class File(hdf5extension.File):
         if isinstance(where, Node):
             where._g_check_open()
 
+            file_ = where._v_file
             basepath = where._v_pathname
-            nodepath = join_path(basepath, name or '') or '/'
-            node = where._v_file._get_node(nodepath)
         elif isinstance(where, (str, np.str_)):
             if not where.startswith('/'):
                 raise NameError("``where`` must start with a slash ('/')")
 
+            file_ = self
             basepath = where
-            nodepath = join_path(basepath, name or '') or '/'
-            node = self._get_node(nodepath)
         else:
             raise TypeError(
                 f"``where`` must be a string or a node: {where!r}")
+        nodepath = join_path(basepath, name or '') or '/'
 
         # Finally, check whether the desired node is an instance
         # of the expected class.
+        node = None
         if classname:
             class_ = get_class_by_name(classname)
-            if not isinstance(node, class_):
-                npathname = node._v_pathname
-                nclassname = node.__class__.__name__
+            record = None
+            if (file_._catalog is not None and
+                    file_._catalog.covers(nodepath)):
+                record = file_._catalog.get(nodepath)
+            if record is not None:
+                # Nodes of other classes are not loaded.
+                nclass = file_._get_path_class((nodepath,) + record)
+            else:
+                node = file_._get_node(nodepath)
+                nclass = node.__class__
+            if not issubclass(nclass, class_):
                 # This error message is right since it can never be shown
                 # for ``classname in [None, 'Node']``.
                 raise NoSuchNodeError(
                     "could not find a ``%s`` node at ``%s``; "
                     "instead, a ``%s`` node has been found there"
-                    % (classname, npathname, nclassname))
+                    % (classname, nodepath, nclass.__name__))
 
+        if node is None:
+            node = file_._get_node(nodepath)
         return node
 
     def is_visible_node(self, path):
@@ -1971,7 +2320,7 @@ class File(hdf5extension.File):
 
         return group._f_list_nodes(classname)
 
-    def iter_nodes(self, where, classname=None):
+    def iter_nodes(self, where, classname=None, page_size=None):
         """Iterate over children nodes hanging from where.
 
         Parameters
@@ -1983,18 +2332,74 @@ class File(hdf5extension.File):
             If the name of a class derived from
             Node (see :ref:`NodeClassDescr`) is supplied, only instances of
             that class (or subclasses of it) will be returned.
+        page_size
+            If given, the names of children are read from the file in pages
+            of page_size names while iterating, instead of loading the names
+            of all the children first (see :meth:`Group._f_iter_nodes`).
 
         Notes
         -----
         The returned nodes are alphanumerically sorted by their name.
         This is an iterator version of :meth:`File.list_nodes`.
 
+        .. versionchanged:: 3.7
+           The *page_size* argument has been added.
+
         """
 
         group = self.get_node(where)  # Does the parent exist?
         self._check_group(group)  # Is it a group?
 
-        return group._f_iter_nodes(classname)
+        if page_size is None and self._uses_catalog(group):
+            return self._iter_catalog_nodes(group._v_pathname, classname)
+        return group._f_iter_nodes(classname, page_size)
+
+    def _uses_catalog(self, group):
+        """Can the children of `group` be listed from the node catalog?"""
+
+        return (self._catalog is not None and group._v_file is self and
+                self._catalog.covers(group._v_pathname))
+
+    def _iter_catalog_nodes(self, path, classname):
+        """Iterate over the children of the group in `path`.
+
+        This works like :meth:`Group._f_iter_nodes`, but children are
+        listed and their classes checked in the node catalog, so that
+        only the nodes to be returned are loaded.
+
+        """
+
+        if classname == 'IndexArray':
+            raise TypeError("listing ``IndexArray`` nodes is not allowed")
+        if classname in (None, 'Group', 'Leaf', 'Link'):
+            (kind, class_) = (classname, None)
+        else:
+            (kind, class_) = (None, get_class_by_name(classname))
+
+        catalog = self._catalog
+        for name in catalog.iter_children(path, kind):
+            childpath = join_path(path, name)
+            if class_ is not None:
+                record = (childpath,) + catalog.get(childpath)
+                if not issubclass(self._get_path_class(record), class_):
+                    continue
+            yield self._get_node(childpath)
+
+    def _walk_catalog_groups(self, path):
+        """Iterate over the paths of groups under `path` in the catalog.
+
+        The order is the one of :meth:`Group._f_walk_groups`.
+
+        """
+
+        stack = [path]
+        yield path
+        while stack:
+            grouppath = stack.pop()
+            for name in self._catalog.iter_children(grouppath, 'Group'):
+                childpath = join_path(grouppath, name)
+                stack.append(childpath)
+                yield childpath
 
     def __contains__(self, path):
         """Is there a node with that path?
@@ -2004,6 +2409,11 @@ class File(hdf5extension.File):
 
         """
 
+        self._check_open()
+        # Paths missing from the catalog may still go through links.
+        if (self._catalog is not None and self._catalog.covers(path) and
+                path in self._catalog):
+            return True
         try:
             self.get_node(path)
         except NoSuchNodeError:
@@ -2073,8 +2483,15 @@ class File(hdf5extension.File):
             for group in self.walk_groups(where):
                 yield from self.iter_nodes(group)
         else:  # only nodes of the named type
-            for group in self.walk_groups(where):
-                yield from self.iter_nodes(group, classname)
+            group = self.get_node(where)
+            self._check_group(group)
+            if self._uses_catalog(group):
+                # Groups are not loaded to look for the nodes in them.
+                for path in self._walk_catalog_groups(group._v_pathname):
+                    yield from self._iter_catalog_nodes(path, classname)
+            else:
+                for group in group._f_walk_groups():
+                    yield from self.iter_nodes(group, classname)
 
     def walk_groups(self, where="/"):
         """Recursively iterate over groups (not leaves) hanging from where.
@@ -2091,8 +2508,213 @@ class File(hdf5extension.File):
 
         group = self.get_node(where)  # Does the parent exist?
         self._check_group(group)  # Is it a group?
+        if self._uses_catalog(group):
+            return (self._get_node(path) for path in
+                    self._walk_catalog_groups(group._v_pathname))
         return group._f_walk_groups()
 
+    def iter_paths(self, where="/", classname=None, with_info=True):
+        """Recursively iterate over the paths of nodes hanging from where.
+
+        This is a much faster alternative to :meth:`File.walk_nodes` for
+        getting the paths (and some basic information) of the nodes in
+        big hierarchies, since no node objects are created: all the
+        objects under the where group are visited in a single pass over
+        the file.  The where group itself is listed first, then its
+        descendents, in depth-first order and with the children of each
+        group sorted by name.  Hidden nodes are not listed.
+
+        Parameters
+        ----------
+        where : str or Group, optional
+            The group where the iteration starts.
+        classname
+            If the name of a class derived from Node (see
+            :ref:`NodeClassDescr`) is supplied, only the paths of nodes
+            which would be instances of that class (or subclasses of it)
+            are returned.
+        with_info : bool
+            If true (the default), a named tuple is returned for each
+            node, else only its path.  The fields of the named tuple are:
+
+            path
+                The path of the node.
+            h5class
+                The kind of HDF5 object: ``'Group'``, ``'Dataset'``,
+                ``'SoftLink'``, ``'ExternalLink'`` or ``'Unknown'``.
+            classid
+                The PyTables class identifier in the ``CLASS``
+                attribute of the node (e.g. ``'TABLE'``), or None.
+            shape
+                The shape of a dataset (None for other nodes).
+            dtype
+                The NumPy dtype of a dataset (None for other nodes, or
+                if the type is not supported by NumPy).
+            size
+                The size of a dataset as stored in the file (None for
+                other nodes).
+
+        Examples
+        --------
+
+        ::
+
+            # Get the size on disk of all the tables in a file.
+            sizes = {info.path: info.size
+                     for info in h5file.iter_paths(classname='Table')}
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._check_open()
+        group = self.get_node(where)  # Does the parent exist?
+        self._check_group(group)  # Is it a group?
+        for record in self._iter_path_records(group, classname, with_info):
+            if with_info:
+                yield hdf5extension.PathInfo(*record)
+            else:
+                yield record[0]
+
+    def _get_node_class(self, classname):
+        """Get the class named `classname` to filter nodes with (or None)."""
+
+        if classname is None:
+            return None
+        class_ = get_class_by_name(classname)
+        return None if class_ is Node else class_
+
+    def _iter_path_records(self, group, classname, with_info):
+        """Iterate over the records of nodes under `group` (a Group).
+
+        Records are like those from `File._g_visit_paths()`, but taken
+        from the node catalog if used, and only those for nodes of the
+        class named `classname` are returned (if not None).
+
+        """
+
+        class_ = self._get_node_class(classname)
+        if self._uses_catalog(group):
+            if with_info:
+                self._catalog.refresh()
+            records = self._catalog.iter_records(group._v_pathname)
+        else:
+            records = self._g_visit_paths(
+                group._v_pathname, with_info or class_ is not None, with_info)
+        for record in records:
+            if (class_ is not None and
+                    not issubclass(self._get_path_class(record), class_)):
+                continue
+            yield record
+
+    def read_attrs(self, where, names, classname=None):
+        """Read some attributes of many nodes at once.
+
+        This is a much faster alternative to getting the nodes and
+        reading the attributes from their :class:`AttributeSet`
+        instances when the same attributes of many nodes are needed,
+        since no node objects are created (nor added to the cache of
+        nodes): the objects in the file are opened by path, and only the
+        requested attributes are read from them.
+
+        Parameters
+        ----------
+        where : str, Group or sequence
+            A group (or its path), whose descendents are scanned
+            recursively in the order of :meth:`File.iter_paths` (links
+            are skipped), or a sequence with the paths (or nodes) to be
+            scanned.
+        names : sequence of str
+            The names of the attributes to read.
+        classname
+            If the name of a class derived from Node (see
+            :ref:`NodeClassDescr`) is supplied, only the nodes which
+            would be instances of that class (or subclasses of it) are
+            scanned.
+
+        Returns
+        -------
+        paths : list
+            The paths of the scanned nodes.
+        values : dict
+            A list for each name in `names` with the values of the
+            attribute in the nodes in `paths`, in the same order.  The
+            value for nodes without the attribute is None.  Values are
+            decoded as when read from an :class:`AttributeSet`.
+
+        Examples
+        --------
+
+        ::
+
+            paths, values = h5file.read_attrs('/', ['units', 'scale'],
+                                              classname='Leaf')
+            for path, units in zip(paths, values['units']):
+                print(path, units)
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._check_open()
+        names = list(names)
+
+        if isinstance(where, (str, Node)):
+            group = self.get_node(where)  # Does the parent exist?
+            self._check_group(group)  # Is it a group?
+            paths = [record[0] for record in
+                     self._iter_path_records(group, classname, False)
+                     if record[1] not in ('SoftLink', 'ExternalLink')]
+        else:
+            class_ = self._get_node_class(classname)
+            paths = []
+            for path in where:
+                if isinstance(path, Node):
+                    path = path._v_pathname
+                record = self._g_get_path_info(path, class_ is not None,
+                                               False)
+                if record is None:
+                    raise NoSuchNodeError(
+                        "file ``%s`` has no node ``%s``"
+                        % (self.filename, path))
+                if (class_ is None or
+                        issubclass(self._get_path_class(record), class_)):
+                    paths.append(path)
+
+        with utilsextension.hdf5_lock:
+            columns = self._g_read_attrs(paths, names)
+        format_version = parse_format_version(self)
+        values = {}
+        for (name, column) in zip(names, columns):
+            values[name] = [
+                None if value is None else
+                decode_value(name, value, format_version)
+                for value in column]
+        return (paths, values)
+
+    def _get_path_class(self, record):
+        """Get the node class of a record from `File._g_visit_paths()`.
+
+        The class is guessed like when the node is loaded, but without
+        issuing warnings.
+
+        """
+
+        (path, h5class, classid) = record[:3]
+        if h5class == 'SoftLink':
+            return SoftLink
+        elif h5class == 'ExternalLink':
+            return ExternalLink
+        elif classid in class_id_dict:
+            return class_id_dict[classid]
+        elif h5class == 'Group':
+            return Group
+        elif h5class == 'Dataset':
+            classid = utilsextension.which_class(self._v_objectid,
+                                                 self._g_h5path(path))
+            return class_id_dict.get(classid, UnImplemented)
+        return Unknown
+
     def _check_open(self):
         """Check the state of the file.
 
@@ -2635,6 +3257,28 @@ class File(hdf5extension.File):
         self._node_manager.flush_nodes()
         self._flush_file(0)  # 0 means local scope, 1 global (virtual) scope
 
+    def start_swmr_write(self):
+        """Start writing the file in single-writer/multiple-reader mode.
+
+        This is only needed for new files created with the ``swmr=True``
+        argument of :func:`open_file`, once all the nodes to be written
+        by the single writer exist, since no nodes can be created nor
+        removed in SWMR mode.  Readers can then open the file with
+        ``swmr=True``, and call :meth:`Leaf.refresh` on the leaves they
+        are reading to see the data appended to them.
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._check_open()
+        self._check_writable()
+        if self.swmr_mode:
+            return
+        self.flush()
+        with utilsextension.hdf5_lock:
+            self._g_start_swmr_write()
+
     def close(self):
         """Flush all the alive leaves in object tree and close the file."""
 
@@ -2648,44 +3292,54 @@ class File(hdf5extension.File):
             self._open_count -= 1
             return
 
-        filename = self.filename
+        with utilsextension.hdf5_lock:
+            filename = self.filename
 
-        if self._undoEnabled and self._iswritable():
-            # Save the current mark and current action
-            self._actionlog.attrs._g__setattr("CURMARK", self._curmark)
-            self._actionlog.attrs._g__setattr("CURACTION", self._curaction)
+            if self._undoEnabled and self._iswritable():
+                # Save the current mark and current action
+                self._actionlog.attrs._g__setattr("CURMARK", self._curmark)
+                self._actionlog.attrs._g__setattr("CURACTION", self._curaction)
 
-        # Close all loaded nodes.
-        self.root._f_close()
+            # Close all loaded nodes.
+            self.root._f_close()
 
-        self._node_manager.shutdown()
+            self._node_manager.shutdown()
 
-        # Post-conditions
-        assert len(self._node_manager.cache) == 0, \
-            ("cached nodes remain after closing: %s"
-                % list(self._node_manager.cache))
+            # Post-conditions
+            assert len(self._node_manager.cache) == 0, \
+                ("cached nodes remain after closing: %s"
+                    % list(self._node_manager.cache))
 
-        # No other nodes should have been revived.
-        assert len(self._node_manager.registry) == 0, \
-            ("alive nodes remain after closing: %s"
-                % list(self._node_manager.registry))
+            # No other nodes should have been revived.
+            assert len(self._node_manager.registry) == 0, \
+                ("alive nodes remain after closing: %s"
+                    % list(self._node_manager.registry))
 
-        # Close the file
-        self._close_file()
+            # Get the final state of leaves written to for the catalog.
+            catalog = self._catalog
+            if catalog is not None:
+                catalog.refresh()
 
-        # After the objects are disconnected, destroy the
-        # object dictionary using the brute force ;-)
-        # This should help to the garbage collector
-        self.__dict__.clear()
+            # Close the file
+            self._close_file()
 
-        # Set the flag to indicate that the file is closed
-        self.isopen = 0
+            # Save the catalog (stamped with the state of the closed file).
+            if catalog is not None and (catalog.dirty or self._iswritable()):
+                catalog.save()
 
-        # Restore the filename attribute that is used by _FileRegistry
-        self.filename = filename
+            # After the objects are disconnected, destroy the
+            # object dictionary using the brute force ;-)
+            # This should help to the garbage collector
+            self.__dict__.clear()
+
+            # Set the flag to indicate that the file is closed
+            self.isopen = 0
+
+            # Restore the filename attribute that is used by _FileRegistry
+            self.filename = filename
 
-        # Delete the entry from he registry of opened files
-        _open_files.remove(self)
+            # Delete the entry from he registry of opened files
+            _open_files.remove(self)
 
     def __enter__(self):
         """Enter a context and return the same file."""
@@ -169,8 +169,9 @@ class Filters:
     def _from_leaf(cls, leaf):
         # Get a dictionary with all the filters
         parent = leaf._v_parent
-        filters_dict = utilsextension.get_filters(parent._v_objectid,
-                                                  leaf._v_name)
+        with utilsextension.hdf5_lock:
+            filters_dict = utilsextension.get_filters(parent._v_objectid,
+                                                      leaf._v_name)
         if filters_dict is None:
             filters_dict = {}  # not chunked
 
@@ -13,7 +13,7 @@ from .exceptions import (NodeError, NoSuchNodeError, NaturalNameWarning,
 from .filters import Filters
 from .registry import get_class_by_name
 from .path import check_name_validity, join_path, isvisiblename
-from .node import Node, NotLoggedMixin
+from .node import Node, NotLoggedMixin, _get_attr_storage
 from .leaf import Leaf
 from .unimplemented import UnImplemented, Unknown
 
@@ -76,6 +76,11 @@ class Group(hdf5extension.Group, Node):
         If this group is new or has to be read from disk
     filters : Filters
         A Filters instance
+    attr_phase_change, attr_creation_order, expectedattrs
+        The settings for storing the attributes of the group (see
+        :meth:`File.create_group`).
+
+        .. versionadded:: 3.7
 
 
     .. versionchanged:: 3.0
@@ -189,7 +194,8 @@ class Group(hdf5extension.Group, Node):
 
     def __init__(self, parentnode, name,
                  title="", new=False, filters=None,
-                 _log=True):
+                 _log=True, attr_phase_change=None,
+                 attr_creation_order=None, expectedattrs=None):
 
         # Remember to assign these values in the root group constructor
         # if it does not use this one!
@@ -208,6 +214,11 @@ class Group(hdf5extension.Group, Node):
         self._v_new_filters = filters
         """New default filter properties for child nodes."""
 
+        if new:
+            self._want_attr_storage = _get_attr_storage(
+                parentnode._v_file.params, attr_phase_change,
+                attr_creation_order, expectedattrs)
+
         self._v_max_group_width = parentnode._v_file.params['MAX_GROUP_WIDTH']
         """Maximum number of children on each group before warning the user.
 
@@ -303,7 +314,9 @@ class Group(hdf5extension.Group, Node):
             return class_id_dict[childCID]  # look up leaf class
         else:
             # Unknown or no ``CLASS`` attribute, try a guess.
-            childCID2 = utilsextension.which_class(self._v_objectid, childname)
+            with utilsextension.hdf5_lock:
+                childCID2 = utilsextension.which_class(self._v_objectid,
+                                                       childname)
             if childCID2 == 'UNSUPPORTED':
                 if warn:
                     if childCID is None:
@@ -327,7 +340,7 @@ class Group(hdf5extension.Group, Node):
         mydict = self.__dict__
 
         # The names of the lazy attributes
-        mydict['__members__'] = members = []
+        mydict['__members__'] = members = {}
         """The names of visible children nodes for readline-style completion.
         """
         mydict['_v_children'] = children = _ChildrenDict(self)
@@ -359,7 +372,7 @@ class Group(hdf5extension.Group, Node):
                 # (Assigned values are entirely irrelevant.)
                 if isvisiblename(childname):
                     # Visible node.
-                    members.insert(0, childname)
+                    members[childname] = None
                     children[childname] = None
                     childdict[childname] = None
                 else:
@@ -405,11 +418,10 @@ class Group(hdf5extension.Group, Node):
         """
 
         self._g_check_open()
-        try:
-            self._g_check_has_child(name)
-        except NoSuchNodeError:
+        # Only direct children count, and named datatypes are not nodes.
+        if '/' in name:
             return False
-        return True
+        return self._g_get_objinfo(name) not in ('NoSuchNode', 'NamedType')
 
     def __getitem__(self, childname):
         """Return the (visible or hidden) child with that `name` ( a string).
@@ -511,16 +523,25 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
                 % (self._v_pathname, childname), NaturalNameWarning)
 
         # Check group width limits.
-        if (len(self._v_children) + len(self._v_hidden) >=
-                self._v_max_group_width):
+        # Children names are not loaded just for this, since that would
+        # list all the children in the group.
+        if '_v_children' in self.__dict__:
+            nchildren = len(self._v_children) + len(self._v_hidden)
+        else:
+            nchildren = self._g_get_nlinks()
+        if nchildren >= self._v_max_group_width:
             self._g_width_warning()
 
-        # Update members information.
+        # Update members information, if needed.
+        # (If children names are not loaded yet, the new child will be
+        # found when they are.)
         # Insert references to the new child.
         # (Assigned values are entirely irrelevant.)
-        if isvisiblename(childname):
+        if '_v_children' not in self.__dict__:
+            pass
+        elif isvisiblename(childname):
             # Visible node.
-            self.__members__.insert(0, childname)  # enable completion
+            self.__members__[childname] = None  # enable completion
             self._v_children[childname] = None  # insert node
             if isinstance(childnode, Unknown):
                 self._v_unknown[childname] = None
@@ -534,6 +555,36 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
             # Hidden node.
             self._v_hidden[childname] = None  # insert node
 
+    def _g_check_leafnames(self, childnames):
+        """Check that new leaves can be created with `childnames`.
+
+        This does the checks of `_g_refnode()` for new leaves which are
+        created without instantiating them (see `File.create_arrays()`),
+        before creating any of them.
+
+        """
+
+        for childname in childnames:
+            check_name_validity(childname)
+            Leaf._g_check_name(self, childname)
+            if childname in self:
+                raise NodeError(
+                    "group ``%s`` already has a child node named ``%s``"
+                    % (self._v_pathname, childname))
+            if childname in self.__dict__:
+                warnings.warn(
+                    "group ``%s`` already has an attribute named ``%s``; "
+                    "you will not be able to use natural naming "
+                    "to access the child node"
+                    % (self._v_pathname, childname), NaturalNameWarning)
+
+        if '_v_children' in self.__dict__:
+            nchildren = len(self._v_children) + len(self._v_hidden)
+        else:
+            nchildren = self._g_get_nlinks()
+        if nchildren + len(childnames) > self._v_max_group_width:
+            self._g_width_warning()
+
     def _g_unrefnode(self, childname):
         """Remove references to a node.
 
@@ -550,9 +601,7 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
         if '_v_children' in self.__dict__:
             if childname in self._v_children:
                 # Visible node.
-                members = self.__members__
-                member_index = members.index(childname)
-                del members[member_index]  # disables completion
+                del self.__members__[childname]  # disables completion
 
                 del self._v_children[childname]  # remove node
                 self._v_unknown.pop(childname, None)
@@ -693,7 +742,7 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
 
         return list(self._f_iter_nodes(classname))
 
-    def _f_iter_nodes(self, classname=None):
+    def _f_iter_nodes(self, classname=None, page_size=None):
         """Iterate over children nodes.
 
         Child nodes are yielded alphanumerically sorted by node name.  If the
@@ -701,13 +750,23 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
         supplied in the classname parameter, only instances of that class (or
         subclasses of it) will be returned.
 
+        If page_size is given, the names of children are read from the file
+        in pages of page_size names while iterating, instead of loading the
+        names of all the children of the group first.  This is useful for
+        groups with a huge number of children.
+
         This is an iterator version of :meth:`Group._f_list_nodes`.
 
+        .. versionchanged:: 3.7
+           The *page_size* argument has been added.
+
         """
 
         self._g_check_open()
 
-        if not classname:
+        if page_size is not None:
+            yield from self._g_iter_nodes_paged(classname, page_size)
+        elif not classname:
             # Returns all the children alphanumerically sorted
             for name in sorted(self._v_children):
                 yield self._v_children[name]
@@ -732,6 +791,36 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
                 if isinstance(childnode, class_):
                     yield childnode
 
+    def _g_iter_nodes_paged(self, classname, page_size):
+        """Iterate over children nodes reading their names in pages.
+
+        See :meth:`Group._f_iter_nodes` for the meaning of the arguments.
+
+        """
+
+        if page_size < 1:
+            raise ValueError("`page_size` must be greater than zero")
+        if classname == 'IndexArray':
+            raise TypeError(
+                "listing ``IndexArray`` nodes is not allowed")
+        if classname in (None, 'Group', 'Leaf', 'Link'):
+            class_ = None
+        else:
+            class_ = get_class_by_name(classname)
+
+        position = 0
+        while position is not None:
+            (children, position) = self._g_list_group_page(
+                position, page_size)
+            for (childname, kind) in children:
+                if not isvisiblename(childname):
+                    continue
+                if classname and class_ is None and kind != classname:
+                    continue
+                childnode = self._f_get_child(childname)
+                if class_ is None or isinstance(childnode, class_):
+                    yield childnode
+
     def _f_walk_groups(self):
         """Recursively iterate over descendent groups (not leaves).
 
@@ -836,7 +925,16 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O."""
         #   endless loop on exit!
 
         mydict = self.__dict__
-        if '__members__' in mydict and name in self.__members__:
+        if '__members__' in mydict:
+            ischild = name in self.__members__
+        else:
+            # Look for the child in the file instead of loading the names
+            # of all the children (names with reserved prefixes can not
+            # be used by children).
+            ischild = (self._v_isopen and isvisiblename(name) and
+                       not name.startswith(('_c_', '_f_', '_g_', '_v_')) and
+                       self._g_has_link(name))
+        if ischild:
             warnings.warn(
                 "group ``%s`` already has a child node named ``%s``; "
                 "you will not be able to use natural naming "
@@ -34,6 +34,10 @@ from collections import namedtuple
 ObjInfo = namedtuple('ObjInfo', ['addr', 'rc'])
 ObjTimestamps = namedtuple('ObjTimestamps', ['atime', 'mtime',
                                              'ctime', 'btime'])
+ChunkInfo = namedtuple('ChunkInfo', ['offset', 'filter_mask', 'byte_offset',
+                                     'size'])
+PathInfo = namedtuple('PathInfo', ['path', 'h5class', 'classid', 'shape',
+                                   'dtype', 'size'])
 
 import pickle
 
@@ -46,12 +50,14 @@ from .utils import (check_file_access, byteorders, correct_byteorder,
 
 from .atom import Atom
 
+from .path import isvisiblepath
+
 from .description import descr_from_dtype
 
 from .utilsextension import (encode_filename, set_blosc_max_threads,
   atom_to_hdf5_type, atom_from_hdf5_type, hdf5_to_np_ext_type, create_nested_type,
   pttype_to_hdf5, pt_special_kinds, npext_prefixes_to_ptkinds, hdf5_class_to_string,
-  platform_byteorder)
+  platform_byteorder, hdf5_lock)
 
 
 # Types, constants, functions, classes & other objects from everywhere
@@ -62,6 +68,7 @@ from numpy cimport (import_array, ndarray, npy_intp, PyArray_BYTES, PyArray_DATA
 from cpython.bytes cimport (PyBytes_AsString, PyBytes_FromStringAndSize,
     PyBytes_Check)
 from cpython.unicode cimport PyUnicode_DecodeUTF8
+from cpython.buffer cimport PyObject_GetBuffer, PyBuffer_Release, PyBUF_SIMPLE
 
 
 from .definitions cimport (uintptr_t, hid_t, herr_t, hsize_t, hvl_t,
@@ -71,11 +78,17 @@ from .definitions cimport (uintptr_t, hid_t, herr_t, hsize_t, hvl_t,
   H5T_class_t, H5T_sign_t, H5T_NATIVE_INT,
   H5T_cset_t, H5T_CSET_ASCII, H5T_CSET_UTF8,
   H5F_SCOPE_GLOBAL, H5F_ACC_TRUNC, H5F_ACC_RDONLY, H5F_ACC_RDWR,
-  H5P_DEFAULT, H5P_FILE_ACCESS, H5P_FILE_CREATE, H5T_DIR_DEFAULT,
+  H5P_DEFAULT, H5P_FILE_ACCESS, H5P_FILE_CREATE, H5P_GROUP_CREATE,
+  H5T_DIR_DEFAULT,
   H5S_SELECT_SET, H5S_SELECT_AND, H5S_SELECT_NOTB,
   H5Fcreate, H5Fopen, H5Fclose, H5Fflush, H5Fget_vfd_handle, H5Fget_filesize,
   H5Fget_create_plist,
-  H5Gcreate, H5Gopen, H5Gclose, H5Ldelete, H5Lmove,
+  H5Gcreate, H5Gopen, H5Gclose, H5Ldelete, H5Lmove, H5Lvisit,
+  H5L_info_t, H5_INDEX_NAME, H5_ITER_INC,
+  H5Oopen, H5Oclose, H5Iget_type, H5I_type_t, H5I_GROUP, H5I_DATASET,
+  H5I_DATATYPE, H5T_COMPOUND, H5Tget_class, H5Tget_nmembers,
+  H5Tget_member_name, H5Tget_member_type, H5Tget_member_offset, is_complex,
+  pt_H5free_memory,
   H5Dopen, H5Dclose, H5Dread, H5Dwrite, H5Dget_type, H5Dget_create_plist,
   H5Dget_space, H5Dvlen_reclaim, H5Dget_storage_size, H5Dvlen_get_buf_size,
   H5Tget_native_type, H5Tclose, H5Tis_variable_str, H5Tget_sign,
@@ -91,16 +104,25 @@ from .definitions cimport (uintptr_t, hid_t, herr_t, hsize_t, hvl_t,
   H5ATTRget_attribute_vlen_string_array,
   H5ATTRfind_attribute, H5ATTRget_type_ndims, H5ATTRget_dims,
   H5ARRAYget_ndims, H5ARRAYget_info,
-  set_cache_size, get_objinfo, get_linkinfo, Giterate, Aiterate, H5UIget_info,
+  set_cache_size, get_objinfo, get_linkinfo, has_link, set_attr_storage,
+  Giterate, Giterate_page,
+  Aiterate, H5UIget_info, H5Gget_info, H5G_info_t,
   get_len_of_range, conv_float64_timeval32, truncate_dset,
   H5_HAVE_DIRECT_DRIVER, pt_H5Pset_fapl_direct,
   H5_HAVE_WINDOWS_DRIVER, pt_H5Pset_fapl_windows,
   H5_HAVE_IMAGE_FILE, pt_H5Pset_file_image, pt_H5Fget_file_image,
-  H5Tget_size, hobj_ref_t)
+  H5_HAVE_DIRECT_CHUNK, pt_H5Dwrite_chunk, pt_H5Dread_chunk,
+  pt_H5Dget_chunk_info_by_coord, pt_H5Dget_num_chunks, H5Tequal,
+  H5Pget_fill_value, haddr_t,
+  H5_HAVE_SWMR, PT_H5F_ACC_SWMR_READ, PT_H5F_ACC_SWMR_WRITE,
+  pt_H5Drefresh, pt_H5Fstart_swmr_write, H5Pset_libver_bounds,
+  H5F_LIBVER_LATEST, H5Sget_simple_extent_ndims, H5Sget_simple_extent_dims,
+  H5Tget_size, hobj_ref_t, uint32_t)
 
 cdef int H5T_CSET_DEFAULT = 16
 
 from .utilsextension cimport malloc_dims, get_native_type, cstr_to_pystr, load_reference
+from .utilsextension cimport acquire_hdf5_lock, release_hdf5_lock
 
 
 #-------------------------------------------------------------------
@@ -116,7 +138,9 @@ cdef extern from "H5ARRAY.h" nogil:
                      int rank, hsize_t *dims, int extdim,
                      hid_t type_id, hsize_t *dims_chunk, void *fill_data,
                      int complevel, char  *complib, int shuffle,
-                     int fletcher32, hbool_t track_times, void *data)
+                     int fletcher32, hbool_t track_times,
+                     int attr_max_compact, int attr_min_dense,
+                     int attr_creation_order, void *data)
 
   herr_t H5ARRAYappend_records(hid_t dataset_id, hid_t type_id,
                                int rank, hsize_t *dims_orig,
@@ -151,7 +175,9 @@ cdef extern from "H5VLARRAY.h" nogil:
                         int rank, hsize_t *dims, hid_t type_id,
                         hsize_t chunk_size, void *fill_data, int complevel,
                         char *complib, int shuffle, int flecther32,
-                        hbool_t track_times, void *data)
+                        hbool_t track_times, int attr_max_compact,
+                        int attr_min_dense, int attr_creation_order,
+                        void *data)
 
   herr_t H5VLARRAYappend_records( hid_t dataset_id, hid_t type_id,
                                   int nobjects, hsize_t nrecords,
@@ -252,6 +278,140 @@ cdef object get_attribute_string_or_none(hid_t node_id, char* attr_name):
   return retvalue
 
 
+cdef object get_type_dtype(hid_t type_id):
+  """Get the NumPy dtype of an HDF5 type.
+
+  Unlike `hdf5_to_np_ext_type`, no `Description` is built for compound
+  types.  A TypeError is raised if the type is not supported by NumPy.
+
+  """
+
+  cdef hid_t member_type_id
+  cdef char *c_name
+  cdef int i
+  cdef list names, formats, offsets
+
+  if H5Tget_class(type_id) == H5T_COMPOUND and not is_complex(type_id):
+    names, formats, offsets = [], [], []
+    for i in range(H5Tget_nmembers(type_id)):
+      c_name = H5Tget_member_name(type_id, i)
+      names.append(cstr_to_pystr(c_name))
+      pt_H5free_memory(c_name)
+      member_type_id = H5Tget_member_type(type_id, i)
+      try:
+        formats.append(get_type_dtype(member_type_id))
+      finally:
+        H5Tclose(member_type_id)
+      offsets.append(H5Tget_member_offset(type_id, i))
+    return numpy.dtype({'names': names, 'formats': formats,
+                        'offsets': offsets, 'itemsize': H5Tget_size(type_id)})
+
+  stype, shape = hdf5_to_np_ext_type(type_id, pure_numpy_types=True)
+  return numpy.dtype((stype, shape)) if shape else numpy.dtype(stype)
+
+
+cdef object get_path_info(hid_t loc_id, const char *name, int link_type,
+                          int with_class, int with_info):
+  """Get information on the object reached by the link `name` of `loc_id`.
+
+  Return a ``(h5class, classid, shape, dtype, size)`` tuple, or None for
+  named datatypes.  The ``CLASS`` attribute is only read if `with_class`
+  is true, and the shape, dtype and storage size of datasets are only
+  got if `with_info` is true (else they are None).
+
+  """
+
+  cdef hid_t obj_id, space_id, type_id
+  cdef H5I_type_t obj_type
+  cdef int rank
+  cdef hsize_t *dims
+  cdef object h5class, classid, shape, dtype, size
+
+  classid = shape = dtype = size = None
+  if link_type == H5L_TYPE_SOFT:
+    return ('SoftLink', classid, shape, dtype, size)
+  elif link_type == H5L_TYPE_EXTERNAL:
+    return ('ExternalLink', classid, shape, dtype, size)
+  elif link_type != H5L_TYPE_HARD:
+    return ('Unknown', classid, shape, dtype, size)
+
+  obj_id = H5Oopen(loc_id, name, H5P_DEFAULT)
+  if obj_id < 0:
+    raise HDF5ExtError("Can't open the object ``%s``" % cstr_to_pystr(name))
+  try:
+    obj_type = H5Iget_type(obj_id)
+    if obj_type == H5I_GROUP:
+      h5class = 'Group'
+    elif obj_type == H5I_DATASET:
+      h5class = 'Dataset'
+    elif obj_type == H5I_DATATYPE:
+      return None
+    else:
+      return ('Unknown', classid, shape, dtype, size)
+
+    if with_class:
+      classid = get_attribute_string_or_none(obj_id, "CLASS")
+      if isinstance(classid, bytes):
+        classid = classid.decode('utf-8')
+      elif classid is not None:
+        classid = str(classid)
+
+    if with_info and h5class == 'Dataset':
+      space_id = H5Dget_space(obj_id)
+      rank = H5Sget_simple_extent_ndims(space_id)
+      dims = <hsize_t *>malloc(max(rank, 1) * sizeof(hsize_t))
+      H5Sget_simple_extent_dims(space_id, dims, NULL)
+      shape = getshape(rank, dims)
+      free(<void *>dims)
+      H5Sclose(space_id)
+      type_id = H5Dget_type(obj_id)
+      try:
+        dtype = get_type_dtype(type_id)
+      except TypeError:
+        pass  # not a NumPy type (e.g. enumerated or variable length)
+      finally:
+        H5Tclose(type_id)
+      size = H5Dget_storage_size(obj_id)
+  finally:
+    H5Oclose(obj_id)
+
+  return (h5class, classid, shape, dtype, size)
+
+
+cdef class PathVisitor:
+  """State of a visit of the links under a group (see `visit_paths_cb`)."""
+
+  cdef object where, records, error
+  cdef int with_class, with_info
+
+  def __init__(self, where, with_class, with_info):
+    self.where = where.rstrip('/')
+    self.records = []
+    self.error = None
+    self.with_class = with_class
+    self.with_info = with_info
+
+
+cdef herr_t visit_paths_cb(hid_t loc_id, const char *name,
+                           const H5L_info_t *info, void *data) with gil:
+  cdef PathVisitor visitor = <PathVisitor>data
+  cdef object path, record
+
+  try:
+    path = visitor.where + '/' + cstr_to_pystr(name)
+    # Hidden nodes (and their descendents) are not listed.
+    if not isvisiblepath(path):
+      return 0
+    record = get_path_info(loc_id, name, info.type, visitor.with_class,
+                           visitor.with_info)
+    if record is not None:
+      visitor.records.append((path,) + record)
+  except BaseException as exc:
+    visitor.error = exc
+    return -1
+  return 0
+
+
 # Get the numpy dtype scalar attribute from an HDF5 type as fast as possible
 cdef object get_dtype_scalar(hid_t type_id, H5T_class_t class_id,
                              size_t itemsize):
@@ -298,8 +458,168 @@ _supported_drivers = (
 )
 
 HAVE_DIRECT_DRIVER = bool(H5_HAVE_DIRECT_DRIVER)
+HAVE_DIRECT_CHUNK = bool(H5_HAVE_DIRECT_CHUNK)
+HAVE_SWMR = bool(H5_HAVE_SWMR)
 HAVE_WINDOWS_DRIVER = bool(H5_HAVE_WINDOWS_DRIVER)
 
+cdef object get_attribute(hid_t dset_id, object attrname, object objname,
+                          object ptparams, list unimplemented):
+  """Get the HDF5 attribute `attrname` of an object as a NumPy object.
+
+  H5T_SCALAR types will be retrieved as scalar NumPy.
+  H5T_ARRAY types will be retrieved as ndarray NumPy objects.  The name
+  of an attribute with an unsupported type is added to `unimplemented`
+  and None is returned.
+
+  """
+
+  cdef hsize_t *dims
+  cdef H5T_class_t class_id
+  cdef size_t type_size
+  cdef hid_t mem_type, type_id, native_type
+  cdef int rank, ret, enumtype
+  cdef void *rbuf
+  cdef char *str_value
+  cdef char **str_values = NULL
+  cdef ndarray ndvalue
+  cdef object shape, stype_atom, shape_atom, retvalue
+  cdef int i, nelements
+  cdef char* cattrname = NULL
+  cdef bytes encoded_attrname
+  cdef int cset = H5T_CSET_DEFAULT
+
+  encoded_attrname = attrname.encode('utf-8')
+  # Get the C pointer
+  cattrname = encoded_attrname
+  dims = NULL
+
+  ret = H5ATTRget_type_ndims(dset_id, cattrname, &type_id, &class_id,
+                             &type_size, &rank )
+  if ret < 0:
+    raise HDF5ExtError("Can't get type info on attribute %s in node %s." %
+                       (attrname, objname))
+
+  # Call a fast function for scalar values and typical class types
+  if (rank == 0 and class_id == H5T_STRING):
+    type_size = H5ATTRget_attribute_string(dset_id, cattrname, &str_value,
+                                           &cset)
+    if type_size == 0:
+      if cset == H5T_CSET_UTF8:
+        retvalue = numpy.unicode_('')
+      else:
+        retvalue = numpy.bytes_(b'')
+
+    elif cset == H5T_CSET_UTF8:
+      if type_size == 1 and str_value[0] == 0:
+        # compatibility with PyTables <= 3.1.1
+        retvalue = numpy.unicode_('')
+      retvalue = PyUnicode_DecodeUTF8(str_value, type_size, NULL)
+      retvalue = numpy.unicode_(retvalue)
+    else:
+      retvalue = PyBytes_FromStringAndSize(str_value, type_size)
+      # AV: oct 2012
+      # since now we use the string size got form HDF5 we have to strip
+      # trailing zeros used for padding.
+      # The entire process is quite odd but due to a bug (??) in the way
+      # numpy arrays are pickled in python 3 we can't assume that
+      # strlen(attr_value) is the actual length of the attibute
+      # and numpy.bytes_(attr_value) can give a truncated pickle sting
+      retvalue = retvalue.rstrip(b'\x00')
+      retvalue = numpy.bytes_(retvalue)     # bytes
+    # Important to release attr_value, because it has been malloc'ed!
+    if str_value:
+      free(str_value)
+    H5Tclose(type_id)
+    return retvalue
+  elif (rank == 0 and class_id in (H5T_BITFIELD, H5T_INTEGER, H5T_FLOAT)):
+    dtype_ = get_dtype_scalar(type_id, class_id, type_size)
+    if dtype_ is None:
+      warnings.warn("Unsupported type for attribute '%s' in node '%s'. "
+                    "Offending HDF5 class: %d" % (attrname, objname,
+                                                  class_id), DataTypeWarning)
+      unimplemented.append(attrname)
+      return None
+    shape = ()
+  else:
+    # General case
+
+    # Get the dimensional info
+    dims = <hsize_t *>malloc(rank * sizeof(hsize_t))
+    ret = H5ATTRget_dims(dset_id, cattrname, dims)
+    if ret < 0:
+      raise HDF5ExtError("Can't get dims info on attribute %s in node %s." %
+                         (attrname, objname))
+    shape = getshape(rank, dims)
+    # dims is not needed anymore
+    free(<void *> dims)
+
+    # Get the NumPy dtype from the type_id
+    try:
+      stype_, shape_ = hdf5_to_np_ext_type(type_id, pure_numpy_types=True, ptparams=ptparams)
+      dtype_ = numpy.dtype(stype_, shape_)
+    except TypeError:
+      if class_id == H5T_STRING and H5Tis_variable_str(type_id):
+        nelements = H5ATTRget_attribute_vlen_string_array(dset_id, cattrname,
+                                                          &str_values, &cset)
+        if nelements < 0:
+          raise HDF5ExtError("Can't read attribute %s in node %s." %
+                             (attrname, objname))
+
+        # The following generator expressions do not work with Cython 0.15.1
+        if cset == H5T_CSET_UTF8:
+          #retvalue = numpy.fromiter(
+          #  PyUnicode_DecodeUTF8(<char*>str_values[i],
+          #                        strlen(<char*>str_values[i]),
+          #                        NULL)
+          #    for i in range(nelements), "O8")
+          retvalue = numpy.array([
+            PyUnicode_DecodeUTF8(<char*>str_values[i],
+                                  strlen(<char*>str_values[i]),
+                                  NULL)
+              for i in range(nelements)], "O8")
+
+        else:
+          #retvalue = numpy.fromiter(
+          #  <char*>str_values[i] for i in range(nelements), "O8")
+          retvalue = numpy.array(
+            [<char*>str_values[i] for i in range(nelements)], "O8")
+        retvalue.shape = shape
+
+        # Important to release attr_value, because it has been malloc'ed!
+        for i in range(nelements):
+          free(str_values[i])
+        free(str_values)
+
+        return retvalue
+
+      # This class is not supported. Instead of raising a TypeError, issue a
+      # warning explaining the problem. This will allow to continue browsing
+      # native HDF5 files, while informing the user about the problem.
+      warnings.warn("Unsupported type for attribute '%s' in node '%s'. "
+                    "Offending HDF5 class: %d" % (attrname, objname,
+                                                  class_id), DataTypeWarning)
+      unimplemented.append(attrname)
+      return None
+
+  # Get the container for data
+  ndvalue = numpy.empty(dtype=dtype_, shape=shape)
+  # Get the pointer to the buffer data area
+  rbuf = PyArray_DATA(ndvalue)
+  # Actually read the attribute from disk
+  ret = H5ATTRget_attribute(dset_id, cattrname, type_id, rbuf)
+  if ret < 0:
+    raise HDF5ExtError("Attribute %s exists in node %s, but can't get it." %
+                       (attrname, objname))
+  H5Tclose(type_id)
+
+  if rank > 0:    # multidimensional case
+    retvalue = ndvalue
+  else:
+    retvalue = ndvalue[()]   # 0-dim ndarray becomes a NumPy scalar
+
+  return retvalue
+
+
 # Type extensions declarations (these are subclassed by PyTables
 # Python classes)
 
@@ -315,6 +635,7 @@ cdef class File:
     cdef size_t img_buf_len = 0, user_block_size = 0
     cdef void *img_buf_p = NULL
     cdef bytes encname
+    cdef unsigned swmr_flags = 0
     #cdef bytes logfile_name
 
     # Check if we can handle the driver
@@ -346,6 +667,10 @@ cdef class File:
            "passed the ``check_file_access()`` test; "
            "please report this to the authors" % pymode)
 
+    swmr = params.get('SWMR', False)
+    if swmr and not H5_HAVE_SWMR:
+      raise RuntimeError("SWMR access is only available in HDF5 >= 1.10.0")
+
     image = params.get('DRIVER_CORE_IMAGE')
     if image:
       if driver != "H5FD_CORE":
@@ -456,22 +781,32 @@ cdef class File:
     elif driver == "H5FD_SPLIT":
       err = H5Pset_fapl_split(access_plist, enc_meta_ext, meta_plist_id,
                               enc_raw_ext, raw_plist_id)
+    # Single-writer/multiple-reader access needs the latest file format
+    if swmr and pymode != 'r':
+      err = H5Pset_libver_bounds(access_plist, H5F_LIBVER_LATEST,
+                                 H5F_LIBVER_LATEST)
     if err < 0:
       e = HDF5ExtError("Unable to set the file access property list")
       H5Pclose(create_plist)
       H5Pclose(access_plist)
       raise e
 
+    if swmr:
+      swmr_flags = (PT_H5F_ACC_SWMR_READ if pymode == 'r'
+                    else PT_H5F_ACC_SWMR_WRITE)
     if pymode == 'r':
-      self.file_id = H5Fopen(encname, H5F_ACC_RDONLY, access_plist)
+      self.file_id = H5Fopen(encname, H5F_ACC_RDONLY | swmr_flags,
+                             access_plist)
     elif pymode == 'r+':
-      self.file_id = H5Fopen(encname, H5F_ACC_RDWR, access_plist)
+      self.file_id = H5Fopen(encname, H5F_ACC_RDWR | swmr_flags,
+                             access_plist)
     elif pymode == 'a':
       if exists:
         # A test for logging.
         ## H5Pset_sieve_buf_size(access_plist, 0)
         ## H5Pset_fapl_log (access_plist, "test.log", H5FD_LOG_LOC_WRITE, 0)
-        self.file_id = H5Fopen(encname, H5F_ACC_RDWR, access_plist)
+        self.file_id = H5Fopen(encname, H5F_ACC_RDWR | swmr_flags,
+                               access_plist)
       else:
         self.file_id = H5Fcreate(encname, H5F_ACC_TRUNC, create_plist,
                                  access_plist)
@@ -488,6 +823,10 @@ cdef class File:
     H5Pclose(create_plist)
     H5Pclose(access_plist)
 
+    # New files can not be written in SWMR mode until their nodes are
+    # created (see `File.start_swmr_write()`).
+    self.swmr_mode = bool(swmr) and not self._v_new
+
     # Set the cache size
     set_cache_size(self.file_id, params["METADATA_CACHE_SIZE"])
 
@@ -509,29 +848,30 @@ cdef class File:
     cdef bytes image
     cdef char* cimage
 
-    self.flush()
+    with hdf5_lock:
+      self.flush()
 
-    # retrieve the size of the buffer for the file image
-    size = pt_H5Fget_file_image(self.file_id, NULL, buf_len)
-    if size < 0:
-      raise HDF5ExtError("Unable to retrieve the size of the buffer for the "
-                         "file image.  Plese note that not all drivers "
-                         "provide support for image files.")
+      # retrieve the size of the buffer for the file image
+      size = pt_H5Fget_file_image(self.file_id, NULL, buf_len)
+      if size < 0:
+        raise HDF5ExtError("Unable to retrieve the size of the buffer for "
+                           "the file image.  Plese note that not all "
+                           "drivers provide support for image files.")
 
-    # allocate the memory buffer
-    image = PyBytes_FromStringAndSize(NULL, size)
-    if not image:
-      raise RuntimeError("Unable to allecote meomory fir the file image")
+      # allocate the memory buffer
+      image = PyBytes_FromStringAndSize(NULL, size)
+      if not image:
+        raise RuntimeError("Unable to allecote meomory fir the file image")
 
-    cimage = image
-    buf_len = size
-    size = pt_H5Fget_file_image(self.file_id, <void*>cimage, buf_len)
-    if size < 0:
-      raise HDF5ExtError("Unable to retrieve the file image. "
-                         "Plese note that not all drivers provide support "
-                         "for image files.")
+      cimage = image
+      buf_len = size
+      size = pt_H5Fget_file_image(self.file_id, <void*>cimage, buf_len)
+      if size < 0:
+        raise HDF5ExtError("Unable to retrieve the file image. "
+                           "Plese note that not all drivers provide support "
+                           "for image files.")
 
-    return image
+      return image
 
   def get_filesize(self):
     """Returns the size of an HDF5 file.
@@ -548,11 +888,12 @@ cdef class File:
     cdef herr_t err = 0
     cdef hsize_t size = 0
 
-    err = H5Fget_filesize(self.file_id, &size)
-    if err < 0:
-      raise HDF5ExtError("Unable to retrieve the HDF5 file size")
+    with hdf5_lock:
+      err = H5Fget_filesize(self.file_id, &size)
+      if err < 0:
+        raise HDF5ExtError("Unable to retrieve the HDF5 file size")
 
-    return size
+      return size
 
   def get_userblock_size(self):
     """Retrieves the size of a user block.
@@ -565,18 +906,19 @@ cdef class File:
     cdef hsize_t size = 0
     cdef hid_t create_plist
 
-    create_plist = H5Fget_create_plist(self.file_id)
-    if create_plist < 0:
-      raise HDF5ExtError("Unable to get the creation property list")
+    with hdf5_lock:
+      create_plist = H5Fget_create_plist(self.file_id)
+      if create_plist < 0:
+        raise HDF5ExtError("Unable to get the creation property list")
 
-    err = H5Pget_userblock(create_plist, &size)
-    if err < 0:
-      H5Pclose(create_plist)
-      raise HDF5ExtError("unable to retrieve the user block size")
+      err = H5Pget_userblock(create_plist, &size)
+      if err < 0:
+        H5Pclose(create_plist)
+        raise HDF5ExtError("unable to retrieve the user block size")
 
-    H5Pclose(create_plist)
+      H5Pclose(create_plist)
 
-    return size
+      return size
 
   # Accessor definitions
   def _get_file_id(self):
@@ -593,24 +935,153 @@ cdef class File:
     cdef void *file_handle
     cdef uintptr_t *descriptor
     cdef herr_t err
-    err = H5Fget_vfd_handle(self.file_id, H5P_DEFAULT, &file_handle)
-    if err < 0:
-      raise HDF5ExtError(
-        "Problems getting file descriptor for file ``%s``" % self.name)
-    # Convert the 'void *file_handle' into an 'int *descriptor'
-    descriptor = <uintptr_t *>file_handle
-    return descriptor[0]
+    with hdf5_lock:
+      err = H5Fget_vfd_handle(self.file_id, H5P_DEFAULT, &file_handle)
+      if err < 0:
+        raise HDF5ExtError(
+          "Problems getting file descriptor for file ``%s``" % self.name)
+      # Convert the 'void *file_handle' into an 'int *descriptor'
+      descriptor = <uintptr_t *>file_handle
+      return descriptor[0]
+
 
+  def _g_h5path(self, path):
+    """Get the path in the HDF5 file of the node in `path`.
+
+    This takes into account the root user entry point of the file.
+
+    """
+
+    if path == '/':
+      return self.root_uep
+    return self.root_uep.rstrip('/') + path
+
+  def _g_get_path_info(self, path, with_class, with_info):
+    """Return information on the object in `path`.
+
+    A ``(path, h5class, classid, shape, dtype, size)`` tuple is returned
+    (see `_g_visit_paths`), or None if there is no such object.
+
+    """
+
+    cdef bytes encoded_path
+    cdef int link_type
+    cdef object record
+
+    with hdf5_lock:
+      encoded_path = self._g_h5path(path).encode('utf-8')
+      if path == '/':
+        link_type = H5L_TYPE_HARD
+      else:
+        link_type = get_linkinfo(self.file_id, encoded_path)
+        if link_type < 0:
+          return None
+      record = get_path_info(self.file_id, encoded_path, link_type, with_class,
+                             with_info)
+      if record is None:
+        return None
+      return (path,) + record
+
+  def _g_visit_paths(self, where, with_class, with_info):
+    """Return information on the objects under the group in `where`.
+
+    The links under the group are visited recursively in a single pass,
+    in depth-first order and with the links in each group in name order.
+    A list of ``(path, h5class, classid, shape, dtype, size)`` tuples is
+    returned, starting with the group itself.  See `get_path_info` for
+    the meaning of `with_class` and `with_info`.
+
+    """
+
+    cdef hid_t group_id
+    cdef herr_t ret
+    cdef bytes encoded_where
+    cdef PathVisitor visitor
+
+    with hdf5_lock:
+      encoded_where = self._g_h5path(where).encode('utf-8')
+      group_id = H5Gopen(self.file_id, encoded_where, H5P_DEFAULT)
+      if group_id < 0:
+        raise HDF5ExtError("Can't open the group: '%s'." % where)
+      try:
+        visitor = PathVisitor(where, with_class, with_info)
+        visitor.records.append(
+          (where,) + get_path_info(group_id, ".", H5L_TYPE_HARD, with_class,
+                                   with_info))
+        ret = H5Lvisit(group_id, H5_INDEX_NAME, H5_ITER_INC, visit_paths_cb,
+                       <void *>visitor)
+        if visitor.error is not None:
+          raise visitor.error
+        if ret < 0:
+          raise HDF5ExtError("Can't visit the links under ``%s``" % where)
+      finally:
+        H5Gclose(group_id)
+      return visitor.records
+
+  def _g_read_attrs(self, paths, attrnames):
+    """Read the attributes named in `attrnames` of the objects in `paths`.
+
+    A list with a list of values for each attribute name is returned,
+    with the values of the attribute in the objects in `paths`, in the
+    same order.  The value of an attribute which does not exist in an
+    object (or has an unsupported type) is None.  The values are the
+    raw ones returned by `AttributeSet._g_getattr`.
+
+    """
+
+    cdef hid_t obj_id
+    cdef object path, attrname, objname, ptparams, value
+    cdef list columns, encoded_names, unimplemented
+    cdef bytes encoded_name
+    cdef int i
+
+    ptparams = self.params
+    encoded_names = [attrname.encode('utf-8') for attrname in attrnames]
+    columns = [[] for attrname in attrnames]
+    unimplemented = []
+    for path in paths:
+      obj_id = H5Oopen(self.file_id, self._g_h5path(path).encode('utf-8'),
+                       H5P_DEFAULT)
+      if obj_id < 0:
+        raise HDF5ExtError("Can't open the object: '%s'." % path)
+      objname = path.rsplit('/', 1)[-1]
+      try:
+        for i, attrname in enumerate(attrnames):
+          encoded_name = encoded_names[i]
+          if H5ATTRfind_attribute(obj_id, encoded_name) == 1:
+            value = get_attribute(obj_id, attrname, objname, ptparams,
+                                  unimplemented)
+          else:
+            value = None
+          columns[i].append(value)
+      finally:
+        H5Oclose(obj_id)
+    return columns
 
   def _flush_file(self, scope):
-    # Close the file
-    H5Fflush(self.file_id, scope)
+    with hdf5_lock:
+      # Close the file
+      H5Fflush(self.file_id, scope)
 
 
+  def _g_start_swmr_write(self):
+    """Start writing the file in single-writer/multiple-reader mode."""
+
+    cdef herr_t ret
+
+    if not H5_HAVE_SWMR:
+      raise RuntimeError("SWMR access is only available in HDF5 >= 1.10.0")
+    ret = pt_H5Fstart_swmr_write(self.file_id)
+    if ret < 0:
+      raise HDF5ExtError("Unable to start SWMR writing in file '%s'"
+                         % self.name)
+    self.swmr_mode = True
+
   def _close_file(self):
-    # Close the file
-    H5Fclose( self.file_id )
-    self.file_id = 0    # Means file closed
+    with hdf5_lock:
+      # Close the file
+      H5Fclose( self.file_id )
+      self.file_id = 0    # Means file closed
 
 
   # This method is moved out of scope, until we provide code to delete
@@ -721,155 +1192,18 @@ cdef class AttributeSet:
 
     """
 
-    cdef hsize_t *dims
-    cdef H5T_class_t class_id
-    cdef size_t type_size
-    cdef hid_t mem_type, dset_id, type_id, native_type
-    cdef int rank, ret, enumtype
-    cdef void *rbuf
-    cdef char *str_value
-    cdef char **str_values = NULL
-    cdef ndarray ndvalue
-    cdef object shape, stype_atom, shape_atom, retvalue
-    cdef int i, nelements
-    cdef char* cattrname = NULL
-    cdef bytes encoded_attrname
-    cdef int cset = H5T_CSET_DEFAULT
-
-    encoded_attrname = attrname.encode('utf-8')
-    # Get the C pointer
-    cattrname = encoded_attrname
-
-    # The dataset id of the node
-    dset_id = node._v_objectid
-    dims = NULL
-
-    ret = H5ATTRget_type_ndims(dset_id, cattrname, &type_id, &class_id,
-                               &type_size, &rank )
-    if ret < 0:
-      raise HDF5ExtError("Can't get type info on attribute %s in node %s." %
-                         (attrname, self.name))
-
-    # Call a fast function for scalar values and typical class types
-    if (rank == 0 and class_id == H5T_STRING):
-      type_size = H5ATTRget_attribute_string(dset_id, cattrname, &str_value,
-                                             &cset)
-      if type_size == 0:
-        if cset == H5T_CSET_UTF8:
-          retvalue = numpy.unicode_('')
-        else:
-          retvalue = numpy.bytes_(b'')
-
-      elif cset == H5T_CSET_UTF8:
-        if type_size == 1 and str_value[0] == 0:
-          # compatibility with PyTables <= 3.1.1
-          retvalue = numpy.unicode_('')
-        retvalue = PyUnicode_DecodeUTF8(str_value, type_size, NULL)
-        retvalue = numpy.unicode_(retvalue)
-      else:
-        retvalue = PyBytes_FromStringAndSize(str_value, type_size)
-        # AV: oct 2012
-        # since now we use the string size got form HDF5 we have to strip
-        # trailing zeros used for padding.
-        # The entire process is quite odd but due to a bug (??) in the way
-        # numpy arrays are pickled in python 3 we can't assume that
-        # strlen(attr_value) is the actual length of the attibute
-        # and numpy.bytes_(attr_value) can give a truncated pickle sting
-        retvalue = retvalue.rstrip(b'\x00')
-        retvalue = numpy.bytes_(retvalue)     # bytes
-      # Important to release attr_value, because it has been malloc'ed!
-      if str_value:
-        free(str_value)
-      H5Tclose(type_id)
-      return retvalue
-    elif (rank == 0 and class_id in (H5T_BITFIELD, H5T_INTEGER, H5T_FLOAT)):
-      dtype_ = get_dtype_scalar(type_id, class_id, type_size)
-      if dtype_ is None:
-        warnings.warn("Unsupported type for attribute '%s' in node '%s'. "
-                      "Offending HDF5 class: %d" % (attrname, self.name,
-                                                    class_id), DataTypeWarning)
-        self._v_unimplemented.append(attrname)
-        return None
-      shape = ()
-    else:
-      # General case
-
-      # Get the dimensional info
-      dims = <hsize_t *>malloc(rank * sizeof(hsize_t))
-      ret = H5ATTRget_dims(dset_id, cattrname, dims)
-      if ret < 0:
-        raise HDF5ExtError("Can't get dims info on attribute %s in node %s." %
-                           (attrname, self.name))
-      shape = getshape(rank, dims)
-      # dims is not needed anymore
-      free(<void *> dims)
+    return get_attribute(node._v_objectid, attrname, self.name,
+                         node._v_file.params, self._v_unimplemented)
 
-      # Get the NumPy dtype from the type_id
-      try:
-        stype_, shape_ = hdf5_to_np_ext_type(type_id, pure_numpy_types=True, ptparams=node._v_file.params)
-        dtype_ = numpy.dtype(stype_, shape_)
-      except TypeError:
-        if class_id == H5T_STRING and H5Tis_variable_str(type_id):
-          nelements = H5ATTRget_attribute_vlen_string_array(dset_id, cattrname,
-                                                            &str_values, &cset)
-          if nelements < 0:
-            raise HDF5ExtError("Can't read attribute %s in node %s." %
-                               (attrname, self.name))
-
-          # The following generator expressions do not work with Cython 0.15.1
-          if cset == H5T_CSET_UTF8:
-            #retvalue = numpy.fromiter(
-            #  PyUnicode_DecodeUTF8(<char*>str_values[i],
-            #                        strlen(<char*>str_values[i]),
-            #                        NULL)
-            #    for i in range(nelements), "O8")
-            retvalue = numpy.array([
-              PyUnicode_DecodeUTF8(<char*>str_values[i],
-                                    strlen(<char*>str_values[i]),
-                                    NULL)
-                for i in range(nelements)], "O8")
+  def _g_getattrs(self, node, attrnames):
+    """Get several HDF5 attributes (see `_g_getattr`) in a list."""
 
-          else:
-            #retvalue = numpy.fromiter(
-            #  <char*>str_values[i] for i in range(nelements), "O8")
-            retvalue = numpy.array(
-              [<char*>str_values[i] for i in range(nelements)], "O8")
-          retvalue.shape = shape
-
-          # Important to release attr_value, because it has been malloc'ed!
-          for i in range(nelements):
-            free(str_values[i])
-          free(str_values)
-
-          return retvalue
-
-        # This class is not supported. Instead of raising a TypeError, issue a
-        # warning explaining the problem. This will allow to continue browsing
-        # native HDF5 files, while informing the user about the problem.
-        warnings.warn("Unsupported type for attribute '%s' in node '%s'. "
-                      "Offending HDF5 class: %d" % (attrname, self.name,
-                                                    class_id), DataTypeWarning)
-        self._v_unimplemented.append(attrname)
-        return None
-
-    # Get the container for data
-    ndvalue = numpy.empty(dtype=dtype_, shape=shape)
-    # Get the pointer to the buffer data area
-    rbuf = PyArray_DATA(ndvalue)
-    # Actually read the attribute from disk
-    ret = H5ATTRget_attribute(dset_id, cattrname, type_id, rbuf)
-    if ret < 0:
-      raise HDF5ExtError("Attribute %s exists in node %s, but can't get it." %
-                         (attrname, self.name))
-    H5Tclose(type_id)
-
-    if rank > 0:    # multidimensional case
-      retvalue = ndvalue
-    else:
-      retvalue = ndvalue[()]   # 0-dim ndarray becomes a NumPy scalar
-
-    return retvalue
+    cdef hid_t dset_id = node._v_objectid
+    cdef object ptparams = node._v_file.params
 
+    return [get_attribute(dset_id, attrname, self.name, ptparams,
+                          self._v_unimplemented)
+            for attrname in attrnames]
 
   def _g_remove(self, node, attrname):
     cdef int ret
@@ -903,13 +1237,14 @@ cdef class Node:
     cdef int ret
     cdef bytes encoded_name
 
-    encoded_name = self.name.encode('utf-8')
+    with hdf5_lock:
+      encoded_name = self.name.encode('utf-8')
 
-    # Delete this node
-    ret = H5Ldelete(parent._v_objectid, encoded_name, H5P_DEFAULT)
-    if ret < 0:
-      raise HDF5ExtError("problems deleting the node ``%s``" % self.name)
-    return ret
+      # Delete this node
+      ret = H5Ldelete(parent._v_objectid, encoded_name, H5P_DEFAULT)
+      if ret < 0:
+        raise HDF5ExtError("problems deleting the node ``%s``" % self.name)
+      return ret
 
   def __dealloc__(self):
     self.parent_id = 0
@@ -918,40 +1253,53 @@ cdef class Node:
     cdef herr_t ret = 0
     cdef H5O_info_t oinfo
 
-    ret = H5Oget_info(self._v_objectid, &oinfo)
-    if ret < 0:
-      raise HDF5ExtError("Unable to get object info for '%s'" %
-                         self. _v_pathname)
+    with hdf5_lock:
+      ret = H5Oget_info(self._v_objectid, &oinfo)
+      if ret < 0:
+        raise HDF5ExtError("Unable to get object info for '%s'" %
+                           self. _v_pathname)
 
-    return ObjInfo(oinfo.addr, oinfo.rc)
+      return ObjInfo(oinfo.addr, oinfo.rc)
 
   def _get_obj_timestamps(self):
     cdef herr_t ret = 0
     cdef H5O_info_t oinfo
 
-    ret = H5Oget_info(self._v_objectid, &oinfo)
-    if ret < 0:
-      raise HDF5ExtError("Unable to get object info for '%s'" %
-                         self. _v_pathname)
+    with hdf5_lock:
+      ret = H5Oget_info(self._v_objectid, &oinfo)
+      if ret < 0:
+        raise HDF5ExtError("Unable to get object info for '%s'" %
+                           self. _v_pathname)
 
-    return ObjTimestamps(oinfo.atime, oinfo.mtime, oinfo.ctime,
-                         oinfo.btime)
+      return ObjTimestamps(oinfo.atime, oinfo.mtime, oinfo.ctime,
+                           oinfo.btime)
 
 
 cdef class Group(Node):
   cdef hid_t   group_id
 
   def _g_create(self):
-    cdef hid_t ret
+    cdef hid_t ret, create_plist
     cdef bytes encoded_name
+    cdef int max_compact, min_dense, creation_order
 
     encoded_name = self.name.encode('utf-8')
 
     # @TODO: set property list --> utf-8
 
+    # Group creation property list
+    (max_compact, min_dense, creation_order) = self._want_attr_storage
+    create_plist = H5Pcreate(H5P_GROUP_CREATE)
+    if set_attr_storage(create_plist, max_compact, min_dense,
+                        creation_order) < 0:
+      H5Pclose(create_plist)
+      raise HDF5ExtError("Can't set the storage of attributes of the "
+                         "group %s." % self.name)
+
     # Create a new group
-    ret = H5Gcreate(self.parent_id, encoded_name, H5P_DEFAULT, H5P_DEFAULT,
+    ret = H5Gcreate(self.parent_id, encoded_name, H5P_DEFAULT, create_plist,
                     H5P_DEFAULT)
+    H5Pclose(create_plist)
     if ret < 0:
       raise HDF5ExtError("Can't create the group %s." % self.name)
     self.group_id = ret
@@ -977,44 +1325,82 @@ cdef class Group(Node):
     cdef bytes encoded_name
     cdef char *cname
 
-    encoded_name = h5name.encode('utf-8')
-    # Get the C pointer
-    cname = encoded_name
-
-    ret = get_linkinfo(self.group_id, cname)
-    if ret == -2 or ret == H5L_TYPE_ERROR:
-      node_type = "NoSuchNode"
-    elif ret == H5L_TYPE_SOFT:
-      node_type = "SoftLink"
-    elif ret == H5L_TYPE_EXTERNAL:
-      node_type = "ExternalLink"
-    elif ret == H5L_TYPE_HARD:
-        ret = get_objinfo(self.group_id, cname)
-        if ret == -2:
-          node_type = "NoSuchNode"
-        elif ret == H5O_TYPE_UNKNOWN:
-          node_type = "Unknown"
-        elif ret == H5O_TYPE_GROUP:
-          node_type = "Group"
-        elif ret == H5O_TYPE_DATASET:
-          node_type = "Leaf"
-        elif ret == H5O_TYPE_NAMED_DATATYPE:
-          node_type = "NamedType"              # Not supported yet
-        #else H5O_TYPE_LINK:
-        #    # symbolic link
-        #    raise RuntimeError('unexpected object type')
-        else:
-          node_type = "Unknown"
-    return node_type
+    with hdf5_lock:
+      encoded_name = h5name.encode('utf-8')
+      # Get the C pointer
+      cname = encoded_name
+
+      ret = get_linkinfo(self.group_id, cname)
+      if ret == -2 or ret == H5L_TYPE_ERROR:
+        node_type = "NoSuchNode"
+      elif ret == H5L_TYPE_SOFT:
+        node_type = "SoftLink"
+      elif ret == H5L_TYPE_EXTERNAL:
+        node_type = "ExternalLink"
+      elif ret == H5L_TYPE_HARD:
+          ret = get_objinfo(self.group_id, cname)
+          if ret == -2:
+            node_type = "NoSuchNode"
+          elif ret == H5O_TYPE_UNKNOWN:
+            node_type = "Unknown"
+          elif ret == H5O_TYPE_GROUP:
+            node_type = "Group"
+          elif ret == H5O_TYPE_DATASET:
+            node_type = "Leaf"
+          elif ret == H5O_TYPE_NAMED_DATATYPE:
+            node_type = "NamedType"              # Not supported yet
+          #else H5O_TYPE_LINK:
+          #    # symbolic link
+          #    raise RuntimeError('unexpected object type')
+          else:
+            node_type = "Unknown"
+      return node_type
 
   def _g_list_group(self, parent):
     """Return a tuple with the groups and the leaves hanging from self."""
 
     cdef bytes encoded_name
 
-    encoded_name = self.name.encode('utf-8')
+    with hdf5_lock:
+      encoded_name = self.name.encode('utf-8')
 
-    return Giterate(parent._v_objectid, self._v_objectid, encoded_name)
+      return Giterate(parent._v_objectid, self._v_objectid, encoded_name)
+
+  def _g_list_group_page(self, start, count):
+    """Return a page of the children hanging from self.
+
+    The page is a list with the ``(name, kind)`` pairs of (at most)
+    `count` children, in name order, from the link in position `start`
+    on.  The kind is one of ``'Group'``, ``'Leaf'``, ``'Link'`` or
+    ``'Unknown'``.  The position of the link following the page is
+    returned too, or None if there are no more links.
+
+    """
+
+    cdef tuple kinds = ('Group', 'Leaf', 'Link', 'Unknown')
+
+    with hdf5_lock:
+      (children, next_) = Giterate_page(self.group_id, start, count)
+      return [(name, kinds[kind]) for (name, kind) in children], next_
+
+  def _g_get_nlinks(self):
+    """Return the number of links (visible or hidden) in self."""
+
+    cdef H5G_info_t ginfo
+
+    with hdf5_lock:
+      if H5Gget_info(self.group_id, &ginfo) < 0:
+        raise HDF5ExtError("Can't get info on the group: '%s'." % self.name)
+      return ginfo.nlinks
+
+  def _g_has_link(self, object h5name):
+    """Check whether self has a link named `h5name`, without listing it."""
+
+    cdef bytes encoded_name
+
+    with hdf5_lock:
+      encoded_name = h5name.encode('utf-8')
+      return bool(has_link(self.group_id, encoded_name))
 
 
   def _g_get_gchild_attr(self, group_name, attr_name):
@@ -1029,20 +1415,21 @@ cdef class Group(Node):
     cdef bytes encoded_group_name
     cdef bytes encoded_attr_name
 
-    encoded_group_name = group_name.encode('utf-8')
-    encoded_attr_name = attr_name.encode('utf-8')
+    with hdf5_lock:
+      encoded_group_name = group_name.encode('utf-8')
+      encoded_attr_name = attr_name.encode('utf-8')
 
-    # Open the group
-    retvalue = None  # Default value
-    gchild_id = H5Gopen(self.group_id, encoded_group_name, H5P_DEFAULT)
-    if gchild_id < 0:
-      raise HDF5ExtError("Non-existing node ``%s`` under ``%s``" %
-                         (group_name, self._v_pathname))
-    retvalue = get_attribute_string_or_none(gchild_id, encoded_attr_name)
-    # Close child group
-    H5Gclose(gchild_id)
+      # Open the group
+      retvalue = None  # Default value
+      gchild_id = H5Gopen(self.group_id, encoded_group_name, H5P_DEFAULT)
+      if gchild_id < 0:
+        raise HDF5ExtError("Non-existing node ``%s`` under ``%s``" %
+                           (group_name, self._v_pathname))
+      retvalue = get_attribute_string_or_none(gchild_id, encoded_attr_name)
+      # Close child group
+      H5Gclose(gchild_id)
 
-    return retvalue
+      return retvalue
 
 
   def _g_get_lchild_attr(self, leaf_name, attr_name):
@@ -1057,32 +1444,35 @@ cdef class Group(Node):
     cdef bytes encoded_leaf_name
     cdef bytes encoded_attr_name
 
-    encoded_leaf_name = leaf_name.encode('utf-8')
-    encoded_attr_name = attr_name.encode('utf-8')
-
-    # Open the dataset
-    leaf_id = H5Dopen(self.group_id, encoded_leaf_name, H5P_DEFAULT)
-    if leaf_id < 0:
-      raise HDF5ExtError("Non-existing node ``%s`` under ``%s``" %
-                         (leaf_name, self._v_pathname))
-    retvalue = get_attribute_string_or_none(leaf_id, encoded_attr_name)
-    # Close the dataset
-    H5Dclose(leaf_id)
-    return retvalue
+    with hdf5_lock:
+      encoded_leaf_name = leaf_name.encode('utf-8')
+      encoded_attr_name = attr_name.encode('utf-8')
+
+      # Open the dataset
+      leaf_id = H5Dopen(self.group_id, encoded_leaf_name, H5P_DEFAULT)
+      if leaf_id < 0:
+        raise HDF5ExtError("Non-existing node ``%s`` under ``%s``" %
+                           (leaf_name, self._v_pathname))
+      retvalue = get_attribute_string_or_none(leaf_id, encoded_attr_name)
+      # Close the dataset
+      H5Dclose(leaf_id)
+      return retvalue
 
 
   def _g_flush_group(self):
-    # Close the group
-    H5Fflush(self.group_id, H5F_SCOPE_GLOBAL)
+    with hdf5_lock:
+      # Close the group
+      H5Fflush(self.group_id, H5F_SCOPE_GLOBAL)
 
 
   def _g_close_group(self):
     cdef int ret
 
-    ret = H5Gclose(self.group_id)
-    if ret < 0:
-      raise HDF5ExtError("Problems closing the Group %s" % self.name)
-    self.group_id = 0  # indicate that this group is closed
+    with hdf5_lock:
+      ret = H5Gclose(self.group_id)
+      if ret < 0:
+        raise HDF5ExtError("Problems closing the Group %s" % self.name)
+      self.group_id = 0  # indicate that this group is closed
 
 
   def _g_move_node(self, hid_t oldparent, oldname, hid_t newparent, newname,
@@ -1090,15 +1480,16 @@ cdef class Group(Node):
     cdef int ret
     cdef bytes encoded_oldname, encoded_newname
 
-    encoded_oldname = oldname.encode('utf-8')
-    encoded_newname = newname.encode('utf-8')
+    with hdf5_lock:
+      encoded_oldname = oldname.encode('utf-8')
+      encoded_newname = newname.encode('utf-8')
 
-    ret = H5Lmove(oldparent, encoded_oldname, newparent, encoded_newname,
-                  H5P_DEFAULT, H5P_DEFAULT)
-    if ret < 0:
-      raise HDF5ExtError("Problems moving the node %s to %s" %
-                         (oldpathname, newpathname) )
-    return ret
+      ret = H5Lmove(oldparent, encoded_oldname, newparent, encoded_newname,
+                    H5P_DEFAULT, H5P_DEFAULT)
+      if ret < 0:
+        raise HDF5ExtError("Problems moving the node %s to %s" %
+                           (oldpathname, newpathname) )
+      return ret
 
 
 
@@ -1106,7 +1497,8 @@ cdef class Leaf(Node):
   # Instance variables declared in .pxd
 
   def _get_storage_size(self):
-      return H5Dget_storage_size(self.dataset_id)
+      with hdf5_lock:
+        return H5Dget_storage_size(self.dataset_id)
 
   def _get_obj_track_times(self):
     """Get track_times boolean for dataset
@@ -1123,23 +1515,24 @@ cdef class Leaf(Node):
     cdef:
       hbool_t track_times = True
 
-    if self.dataset_id < 0:
-      raise ValueError('Invalid dataset id %s' % self.dataset_id)
-
-    plist_id = H5Dget_create_plist(self.dataset_id)
-    if plist_id < 0:
-      raise HDF5ExtError("Could not get dataset creation property list "
-                         "from dataset id %s" % self.dataset_id)
+    with hdf5_lock:
+      if self.dataset_id < 0:
+        raise ValueError('Invalid dataset id %s' % self.dataset_id)
 
-    try:
-      # Get track_times boolean for dataset
-      if H5Pget_obj_track_times(plist_id, &track_times) < 0:
-        raise HDF5ExtError("Could not get dataset track_times property "
+      plist_id = H5Dget_create_plist(self.dataset_id)
+      if plist_id < 0:
+        raise HDF5ExtError("Could not get dataset creation property list "
                            "from dataset id %s" % self.dataset_id)
-    finally:
-      H5Pclose(plist_id)
 
-    return bool(track_times)
+      try:
+        # Get track_times boolean for dataset
+        if H5Pget_obj_track_times(plist_id, &track_times) < 0:
+          raise HDF5ExtError("Could not get dataset track_times property "
+                             "from dataset id %s" % self.dataset_id)
+      finally:
+        H5Pclose(plist_id)
+
+      return bool(track_times)
 
   def _g_new(self, where, name, init):
     if init:
@@ -1188,8 +1581,9 @@ cdef class Leaf(Node):
     nelements = <size_t>nparr.size // nrecords
     t64buf = PyArray_DATA(nparr)
 
-    conv_float64_timeval32(
-      t64buf, byteoffset, bytestride, nrecords, nelements, sense)
+    with nogil:
+      conv_float64_timeval32(
+        t64buf, byteoffset, bytestride, nrecords, nelements, sense)
 
   # can't do since cdef'd
 
@@ -1198,39 +1592,325 @@ cdef class Leaf(Node):
 
     cdef hsize_t ret
 
-    ret = truncate_dset(self.dataset_id, self.maindim, size)
+    with hdf5_lock:
+      ret = truncate_dset(self.dataset_id, self.maindim, size)
+      if ret < 0:
+        raise HDF5ExtError("Problems truncating the leaf: %s" % self)
+
+      classname = self.__class__.__name__
+      if classname in ('EArray', 'CArray'):
+        # Update the new dimensionality
+        self.dims[self.maindim] = size
+        # Update the shape
+        shape = list(self.shape)
+        shape[self.maindim] = SizeType(size)
+        self.shape = tuple(shape)
+      elif classname in ('Table', 'VLArray'):
+        self.nrows = size
+      else:
+        raise ValueError("Unexpected classname: %s" % classname)
+
+  def _g_refresh(self):
+    """Refresh the metadata of a Leaf and update its shape (or nrows)."""
+
+    cdef herr_t ret
+    cdef hid_t space_id
+    cdef hsize_t *dims
+    cdef int i, rank
+
+    with hdf5_lock:
+      if not H5_HAVE_SWMR:
+        raise RuntimeError("Refreshing leaves is only available in "
+                           "HDF5 >= 1.10.0")
+      ret = pt_H5Drefresh(self.dataset_id)
+      if ret < 0:
+        raise HDF5ExtError("Problems refreshing the leaf: %s" % self)
+
+      space_id = H5Dget_space(self.dataset_id)
+      rank = H5Sget_simple_extent_ndims(space_id)
+      dims = <hsize_t *>malloc(max(rank, 1) * sizeof(hsize_t))
+      H5Sget_simple_extent_dims(space_id, dims, NULL)
+      H5Sclose(space_id)
+      shape = tuple([SizeType(dims[i]) for i in range(rank)])
+      free(dims)
+
+      classname = self.__class__.__name__
+      if classname in ('Table', 'VLArray'):
+        self.nrows = shape[0]
+      elif self.dims != NULL:
+        # Update the new dimensionality
+        for i in range(rank):
+          self.dims[i] = shape[i]
+        # Update the shape
+        self.shape = shape
+
+  def _g_same_disk_type(self):
+    """Whether data in memory has the same layout than on disk."""
+
+    return H5Tequal(self.disk_type_id, self.type_id) > 0
+
+  def _g_same_storage(self, Leaf other):
+    """Whether stored chunks of `other` can be stored as is in this leaf.
+
+    This is so when both datasets have the same type on disk and the
+    same fill value (filters and chunkshape are not checked).
+
+    """
+
+    cdef hid_t plist_id
+    cdef herr_t ret
+    cdef ndarray value
+
+    with hdf5_lock:
+      if H5Tequal(self.disk_type_id, other.disk_type_id) <= 0:
+        return False
+      values = []
+      for dataset_id in (self.dataset_id, other.dataset_id):
+        value = numpy.zeros(H5Tget_size(self.disk_type_id), dtype=numpy.uint8)
+        plist_id = H5Dget_create_plist(dataset_id)
+        ret = H5Pget_fill_value(plist_id, self.disk_type_id,
+                                PyArray_DATA(value))
+        H5Pclose(plist_id)
+        if ret < 0:
+          raise HDF5ExtError("Problems getting the fill value of %s"
+                             % self._v_pathname)
+        values.append(value.tobytes())
+      return values[0] == values[1]
+
+  def _g_write_chunk(self, offset, object data, uint32_t filter_mask=0):
+    """Write `data` as the chunk of the leaf starting at `offset`.
+
+    `data` must be a contiguous buffer already processed by the filters
+    of the dataset, except those flagged in `filter_mask`.
+
+    """
+
+    cdef herr_t ret
+    cdef hsize_t *coffset
+    cdef Py_buffer view
+
+    if not H5_HAVE_DIRECT_CHUNK:
+      raise HDF5ExtError(
+        "Direct chunk I/O is not supported by this HDF5 version")
+
+    PyObject_GetBuffer(data, &view, PyBUF_SIMPLE)
+    coffset = malloc_dims(offset)
+    with nogil:
+      acquire_hdf5_lock()
+      ret = pt_H5Dwrite_chunk(self.dataset_id, H5P_DEFAULT, filter_mask,
+                              coffset, view.len, view.buf)
+      release_hdf5_lock()
+    free(coffset)
+    PyBuffer_Release(&view)
+
     if ret < 0:
-      raise HDF5ExtError("Problems truncating the leaf: %s" % self)
-
-    classname = self.__class__.__name__
-    if classname in ('EArray', 'CArray'):
-      # Update the new dimensionality
-      self.dims[self.maindim] = size
-      # Update the shape
-      shape = list(self.shape)
-      shape[self.maindim] = SizeType(size)
-      self.shape = tuple(shape)
-    elif classname in ('Table', 'VLArray'):
-      self.nrows = size
-    else:
-      raise ValueError("Unexpected classname: %s" % classname)
+      raise HDF5ExtError("Problems writing the chunk at %s of %s"
+                         % (tuple(offset), self._v_pathname))
+
+  def _g_read_chunk(self, offset):
+    """Read the chunk of the leaf starting at `offset`, as stored.
+
+    Return a ``(filter_mask, data)`` tuple with the mask of filters of
+    the dataset which were not applied to the chunk and an array with
+    its bytes.  If the chunk is not allocated in the file, ``(0, None)``
+    is returned.
+
+    """
+
+    cdef herr_t ret
+    cdef hsize_t *coffset
+    cdef hsize_t nbytes = 0
+    cdef haddr_t addr
+    cdef unsigned info_mask
+    cdef uint32_t filter_mask = 0
+    cdef ndarray data
+    cdef void *rbuf
+
+    if not H5_HAVE_DIRECT_CHUNK:
+      raise HDF5ExtError(
+        "Direct chunk I/O is not supported by this HDF5 version")
+
+    coffset = malloc_dims(offset)
+    try:
+      with nogil:
+        acquire_hdf5_lock()
+        ret = pt_H5Dget_chunk_info_by_coord(self.dataset_id, coffset,
+                                            &info_mask, &addr, &nbytes)
+        release_hdf5_lock()
+      if ret < 0:
+        raise HDF5ExtError("Problems getting info on the chunk at %s of %s"
+                           % (tuple(offset), self._v_pathname))
+      if nbytes == 0:
+        # The chunk is not allocated.
+        return 0, None
+      data = numpy.empty(nbytes, dtype=numpy.uint8)
+      rbuf = PyArray_DATA(data)
+      with nogil:
+        acquire_hdf5_lock()
+        ret = pt_H5Dread_chunk(self.dataset_id, H5P_DEFAULT, coffset,
+                               &filter_mask, rbuf)
+        release_hdf5_lock()
+      if ret < 0:
+        raise HDF5ExtError("Problems reading the chunk at %s of %s"
+                           % (tuple(offset), self._v_pathname))
+    finally:
+      free(coffset)
+
+    return filter_mask, data
+
+  def _g_get_num_chunks(self):
+    """Get the number of chunks of the leaf allocated in the file."""
+
+    cdef herr_t ret
+    cdef hid_t space_id
+    cdef hsize_t nchunks = 0
+
+    if not H5_HAVE_DIRECT_CHUNK:
+      raise HDF5ExtError(
+        "Querying chunks is not supported by this HDF5 version")
+    with hdf5_lock:
+      space_id = H5Dget_space(self.dataset_id)
+      ret = pt_H5Dget_num_chunks(self.dataset_id, space_id, &nchunks)
+      H5Sclose(space_id)
+    if ret < 0:
+      raise HDF5ExtError("Problems getting the number of chunks of %s"
+                         % self._v_pathname)
+    return nchunks
+
+  def _g_allocated_chunks(self, starts, stops):
+    """Get the allocated chunks of the leaf in a block.
+
+    The block goes from `starts` to `stops` in each dimension.  Return
+    a ``(offsets, nchunks)`` tuple with an array of the offsets of the
+    chunks overlapping the block which are allocated in the file (one
+    row per chunk, in storage order) and the number of chunks
+    overlapping the block.
+
+    """
+
+    info = self._g_get_chunks_info(starts, stops)
+    return info[0], info[4]
+
+  def _g_get_chunks_info(self, starts, stops):
+    """Get information on the allocated chunks of the leaf in a block.
+
+    Like `_g_allocated_chunks()`, but return a ``(offsets, filter_masks,
+    addrs, sizes, nchunks)`` tuple, with arrays of the filter masks, the
+    addresses in the file and the stored sizes of the allocated chunks
+    too.
+
+    """
+
+    cdef herr_t ret = 0
+    cdef int i, rank = len(starts)
+    cdef hsize_t nchunks = 1, nallocated = 0, n
+    cdef hsize_t nbytes
+    cdef haddr_t addr
+    cdef unsigned info_mask
+    cdef ndarray offsets, masks, addrs, sizes
+    cdef hsize_t *coffsets
+    cdef uint32_t *cmasks
+    cdef haddr_t *caddrs
+    cdef hsize_t *csizes_out
+    cdef hsize_t *cstarts
+    cdef hsize_t *cstops
+    cdef hsize_t *csizes
+    cdef hsize_t *coffset
+
+    if not H5_HAVE_DIRECT_CHUNK:
+      raise HDF5ExtError(
+        "Querying chunks is not supported by this HDF5 version")
+
+    cstarts = malloc_dims([start - start % size for (start, size)
+                           in zip(starts, self.chunkshape)])
+    cstops = malloc_dims(stops)
+    csizes = malloc_dims(self.chunkshape)
+    coffset = malloc_dims(starts)
+    for i in range(rank):
+      if cstops[i] <= cstarts[i]:
+        nchunks = 0
+        break
+      nchunks *= (cstops[i] - cstarts[i] - 1) // csizes[i] + 1
+    offsets = numpy.empty((nchunks, rank), dtype=SizeType)
+    masks = numpy.empty(nchunks, dtype=numpy.uint32)
+    addrs = numpy.empty(nchunks, dtype=numpy.uint64)
+    sizes = numpy.empty(nchunks, dtype=SizeType)
+    coffsets = <hsize_t *>PyArray_DATA(offsets)
+    cmasks = <uint32_t *>PyArray_DATA(masks)
+    caddrs = <haddr_t *>PyArray_DATA(addrs)
+    csizes_out = <hsize_t *>PyArray_DATA(sizes)
+
+    # Visit the chunks in storage order, like an odometer.
+    with nogil:
+      acquire_hdf5_lock()
+      for i in range(rank):
+        coffset[i] = cstarts[i]
+      n = 0
+      while n < nchunks:
+        nbytes = 0
+        ret = pt_H5Dget_chunk_info_by_coord(self.dataset_id, coffset,
+                                            &info_mask, &addr, &nbytes)
+        if ret < 0:
+          break
+        if nbytes > 0:
+          for i in range(rank):
+            coffsets[nallocated * rank + i] = coffset[i]
+          cmasks[nallocated] = info_mask
+          caddrs[nallocated] = addr
+          csizes_out[nallocated] = nbytes
+          nallocated += 1
+        n += 1
+        i = rank - 1
+        while i >= 0:
+          coffset[i] += csizes[i]
+          if coffset[i] < cstops[i]:
+            break
+          coffset[i] = cstarts[i]
+          i -= 1
+      release_hdf5_lock()
+
+    free(cstarts)
+    free(cstops)
+    free(csizes)
+    free(coffset)
+    if ret < 0:
+      raise HDF5ExtError("Problems getting info on the chunks of %s"
+                         % self._v_pathname)
+    return (offsets[:nallocated], masks[:nallocated], addrs[:nallocated],
+            sizes[:nallocated], nchunks)
+
+  def _g_read_fill_value(self, ndarray value):
+    """Read the fill value of the dataset into the `value` array."""
+
+    cdef hid_t plist_id
+    cdef herr_t ret
+
+    with hdf5_lock:
+      plist_id = H5Dget_create_plist(self.dataset_id)
+      ret = H5Pget_fill_value(plist_id, self.type_id, PyArray_DATA(value))
+      H5Pclose(plist_id)
+      if ret < 0:
+        raise HDF5ExtError("Problems getting the fill value of %s"
+                           % self._v_pathname)
 
   def _g_flush(self):
-    # Flush the dataset (in fact, the entire buffers in file!)
-    if self.dataset_id >= 0:
-        H5Fflush(self.dataset_id, H5F_SCOPE_GLOBAL)
+    with hdf5_lock:
+      # Flush the dataset (in fact, the entire buffers in file!)
+      if self.dataset_id >= 0:
+          H5Fflush(self.dataset_id, H5F_SCOPE_GLOBAL)
 
   def _g_close(self):
-    # Close dataset in HDF5 space
-    # Release resources
-    if self.type_id >= 0:
-      H5Tclose(self.type_id)
-    if self.disk_type_id >= 0:
-      H5Tclose(self.disk_type_id)
-    if self.base_type_id >= 0:
-      H5Tclose(self.base_type_id)
-    if self.dataset_id >= 0:
-      H5Dclose(self.dataset_id)
+    with hdf5_lock:
+      # Close dataset in HDF5 space
+      # Release resources
+      if self.type_id >= 0:
+        H5Tclose(self.type_id)
+      if self.disk_type_id >= 0:
+        H5Tclose(self.disk_type_id)
+      if self.base_type_id >= 0:
+        H5Tclose(self.base_type_id)
+      if self.dataset_id >= 0:
+        H5Dclose(self.dataset_id)
 
 
 cdef void* _array_data(ndarray arr):
@@ -1246,6 +1926,82 @@ cdef void* _array_data(ndarray arr):
             return PyArray_DATA(arr)
     return NULL
 
+
+def create_arrays(hid_t parent_id, list names, list arrays, list byteorders,
+                  list flavors, object title, object version, object class_,
+                  int sys_attrs, int track_times, object attr_storage):
+  """Create arrays named after `names` under the group `parent_id`.
+
+  This is a fast path for `File.create_arrays()`, where no node objects
+  are created.  The data of the new arrays is in the `arrays` NumPy
+  arrays, whose byteorder on disk is in `byteorders` (see
+  `leaf.fix_byteorder_data()`).  The system attributes of arrays
+  (with the given `flavors`, `title`, `version` and `class_`) are set
+  if `sys_attrs` is true.
+
+  """
+
+  cdef int i, rank, max_compact, min_dense, creation_order
+  cdef hid_t dataset_id, type_id
+  cdef hsize_t *dims
+  cdef ndarray nparr
+  cdef dict type_ids = {}
+  cdef object key
+  cdef bytes encoded_name, encoded_title, encoded_version, encoded_class
+  cdef bytes encoded_flavor
+  cdef H5T_cset_t cset = H5T_CSET_UTF8
+
+  encoded_title = title.encode('utf-8')
+  encoded_version = version.encode('utf-8')
+  encoded_class = class_.encode('utf-8')
+  (max_compact, min_dense, creation_order) = attr_storage
+  try:
+    for i in range(len(names)):
+      nparr = arrays[i]
+      encoded_name = names[i].encode('utf-8')
+
+      # Get the HDF5 type of the array (only once for each type)
+      key = (nparr.dtype.base, byteorders[i])
+      if key in type_ids:
+        type_id = type_ids[key]
+      else:
+        type_id = atom_to_hdf5_type(Atom.from_dtype(key[0]), key[1])
+        if type_id < 0:
+          raise HDF5ExtError(
+            "Problems creating the array ``%s``: invalid disk type ID for "
+            "dtype %s" % (names[i], key[0]))
+        type_ids[key] = type_id
+
+      rank = PyArray_NDIM(nparr)
+      dims = npy_malloc_dims(rank, PyArray_DIMS(nparr))
+      dataset_id = H5ARRAYmake(parent_id, encoded_name, encoded_version,
+                               rank, dims, -1, type_id, NULL, NULL, 0, b'',
+                               0, 0, track_times, max_compact, min_dense,
+                               creation_order, _array_data(nparr))
+      free(dims)
+      if dataset_id < 0:
+        raise HDF5ExtError("Problems creating the array ``%s``." % names[i])
+
+      if sys_attrs:
+        encoded_flavor = flavors[i].encode('utf-8')
+        if (H5ATTRset_attribute_string(dataset_id, "CLASS", encoded_class,
+                                       len(encoded_class), cset) < 0 or
+            H5ATTRset_attribute_string(dataset_id, "VERSION",
+                                       encoded_version, len(encoded_version),
+                                       cset) < 0 or
+            H5ATTRset_attribute_string(dataset_id, "TITLE", encoded_title,
+                                       len(encoded_title), cset) < 0 or
+            H5ATTRset_attribute_string(dataset_id, "FLAVOR", encoded_flavor,
+                                       len(encoded_flavor), cset) < 0):
+          H5Dclose(dataset_id)
+          raise HDF5ExtError("Can't set the system attributes of the array "
+                             "``%s``." % names[i])
+      H5Dclose(dataset_id)
+  finally:
+    for type_id in type_ids.values():
+      H5Tclose(type_id)
+
+
 cdef class Array(Leaf):
   # Instance variables declared in .pxd
 
@@ -1258,6 +2014,7 @@ cdef class Array(Leaf):
     cdef ndarray dims
     cdef bytes encoded_title, encoded_name
     cdef H5T_cset_t cset = H5T_CSET_ASCII
+    cdef int max_compact, min_dense, creation_order
 
     encoded_title = title.encode('utf-8')
     encoded_name = self.name.encode('utf-8')
@@ -1286,14 +2043,15 @@ cdef class Array(Leaf):
     complib = (self.filters.complib or '').encode('utf-8')
     version = self._v_version.encode('utf-8')
     class_ = self._c_classid.encode('utf-8')
+    (max_compact, min_dense, creation_order) = self._want_attr_storage
     self.dataset_id = H5ARRAYmake(self.parent_id, encoded_name, version,
                                   self.rank, self.dims,
                                   self.extdim, self.disk_type_id, NULL, NULL,
                                   self.filters.complevel, complib,
                                   self.filters.shuffle_bitshuffle,
                                   self.filters.fletcher32,
-                                  self._want_track_times,
-                                  rbuf)
+                                  self._want_track_times, max_compact,
+                                  min_dense, creation_order, rbuf)
     if self.dataset_id < 0:
       raise HDF5ExtError("Problems creating the %s." % self.__class__.__name__)
 
@@ -1324,6 +2082,7 @@ cdef class Array(Leaf):
     cdef ndarray extdim
     cdef object atom
     cdef bytes encoded_title, encoded_name
+    cdef int max_compact, min_dense, creation_order
 
     encoded_title = title.encode('utf-8')
     encoded_name = self.name.encode('utf-8')
@@ -1356,12 +2115,13 @@ cdef class Array(Leaf):
       atom.dflt = dflts
 
     # Create the CArray/EArray
+    (max_compact, min_dense, creation_order) = self._want_attr_storage
     self.dataset_id = H5ARRAYmake(
       self.parent_id, encoded_name, version, self.rank,
       self.dims, self.extdim, self.disk_type_id, self.dims_chunk,
       fill_data, self.filters.complevel, complib,
         self.filters.shuffle_bitshuffle, self.filters.fletcher32,
-        self._want_track_times, rbuf)
+        self._want_track_times, max_compact, min_dense, creation_order, rbuf)
     if self.dataset_id < 0:
       raise HDF5ExtError("Problems creating the %s." % self.__class__.__name__)
 
@@ -1489,8 +2249,10 @@ cdef class Array(Leaf):
     # Append the records
     extdim = self.extdim
     with nogil:
+        acquire_hdf5_lock()
         ret = H5ARRAYappend_records(self.dataset_id, self.type_id, self.rank,
                                     self.dims, dims_arr, extdim, rbuf)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Problems appending the elements")
@@ -1507,45 +2269,50 @@ cdef class Array(Leaf):
     cdef void *rbuf
     cdef hsize_t nrows
     cdef int extdim
-    cdef size_t item_size = H5Tget_size(self.type_id)
+    cdef size_t item_size
     cdef void * refbuf = NULL
+    cdef bint swap = False
 
     # Number of rows to read
     nrows = get_len_of_range(start, stop, step)
 
-    # Get the pointer to the buffer data area
-    if self.atom.kind == "reference":
-      refbuf = malloc(nrows * item_size)
-      rbuf = refbuf
-    else:
-      rbuf = PyArray_DATA(nparr)
-
     if hasattr(self, "extdim"):
       extdim = self.extdim
     else:
       extdim = -1
 
-    # Do the physical read
-    with nogil:
-        ret = H5ARRAYread(self.dataset_id, self.type_id, start, nrows, step,
-                          extdim, rbuf)
-
-    try:
-      if ret < 0:
-        raise HDF5ExtError("Problems reading the array data.")
-
+    with hdf5_lock:
+      item_size = H5Tget_size(self.type_id)
       # Get the pointer to the buffer data area
       if self.atom.kind == "reference":
-        load_reference(self.dataset_id, <hobj_ref_t *>rbuf, item_size, nparr)
-    finally:
-      if refbuf:
-        free(refbuf)
-        refbuf = NULL
+        refbuf = malloc(nrows * item_size)
+        rbuf = refbuf
+      else:
+        rbuf = PyArray_DATA(nparr)
 
-    if self.atom.kind == 'time':
+      # Do the physical read
+      with nogil:
+          ret = H5ARRAYread(self.dataset_id, self.type_id, start, nrows, step,
+                            extdim, rbuf)
+
+      try:
+        if ret < 0:
+          raise HDF5ExtError("Problems reading the array data.")
+
+        # Get the pointer to the buffer data area
+        if self.atom.kind == "reference":
+          load_reference(self.dataset_id, <hobj_ref_t *>rbuf, item_size, nparr)
+      finally:
+        if refbuf:
+          free(refbuf)
+          refbuf = NULL
+
+      if self.atom.kind == 'time':
+        swap = H5Tget_order(self.type_id) != platform_byteorder
+
+    if swap:
       # Swap the byteorder by hand (this is not currently supported by HDF5)
-      if H5Tget_order(self.type_id) != platform_byteorder:
-        nparr.byteswap(True)
+      nparr.byteswap(True)
 
     # Convert some HDF5 types to NumPy after reading.
     if self.atom.type == 'time64':
@@ -1561,41 +2328,46 @@ cdef class Array(Leaf):
     cdef hsize_t *stop
     cdef hsize_t *step
     cdef void *rbuf
-    cdef size_t item_size = H5Tget_size(self.type_id)
+    cdef size_t item_size
     cdef void * refbuf = NULL
+    cdef bint swap = False
 
     # Get the pointer to the buffer data area of startl, stopl and stepl arrays
     start = <hsize_t *>PyArray_DATA(startl)
     stop = <hsize_t *>PyArray_DATA(stopl)
     step = <hsize_t *>PyArray_DATA(stepl)
 
-    # Get the pointer to the buffer data area
-    if self.atom.kind == "reference":
-      refbuf = malloc(nparr.size * item_size)
-      rbuf = refbuf
-    else:
-      rbuf = PyArray_DATA(nparr)
-
-    # Do the physical read
-    with nogil:
-        ret = H5ARRAYreadSlice(self.dataset_id, self.type_id,
-                               start, stop, step, rbuf)
-    try:
-      if ret < 0:
-        raise HDF5ExtError("Problems reading the array data.")
-
+    with hdf5_lock:
+      item_size = H5Tget_size(self.type_id)
       # Get the pointer to the buffer data area
       if self.atom.kind == "reference":
-        load_reference(self.dataset_id, <hobj_ref_t *>rbuf, item_size, nparr)
-    finally:
-      if refbuf:
-        free(refbuf)
-        refbuf = NULL
+        refbuf = malloc(nparr.size * item_size)
+        rbuf = refbuf
+      else:
+        rbuf = PyArray_DATA(nparr)
 
-    if self.atom.kind == 'time':
+      # Do the physical read
+      with nogil:
+          ret = H5ARRAYreadSlice(self.dataset_id, self.type_id,
+                                 start, stop, step, rbuf)
+      try:
+        if ret < 0:
+          raise HDF5ExtError("Problems reading the array data.")
+
+        # Get the pointer to the buffer data area
+        if self.atom.kind == "reference":
+          load_reference(self.dataset_id, <hobj_ref_t *>rbuf, item_size, nparr)
+      finally:
+        if refbuf:
+          free(refbuf)
+          refbuf = NULL
+
+      if self.atom.kind == 'time':
+        swap = H5Tget_order(self.type_id) != platform_byteorder
+
+    if swap:
       # Swap the byteorder by hand (this is not currently supported by HDF5)
-      if H5Tget_order(self.type_id) != platform_byteorder:
-        nparr.byteswap(True)
+      nparr.byteswap(True)
 
     # Convert some HDF5 types to NumPy after reading
     if self.atom.type == 'time64':
@@ -1613,52 +2385,59 @@ cdef class Array(Leaf):
     cdef hsize_t size
     cdef void *rbuf
     cdef object mode
-    cdef size_t item_size = H5Tget_size(self.type_id)
+    cdef size_t item_size
     cdef void * refbuf = NULL
+    cdef bint swap = False
 
-    # Get the dataspace handle
-    space_id = H5Dget_space(self.dataset_id)
-    # Create a memory dataspace handle
-    size = nparr.size
-    mem_space_id = H5Screate_simple(1, &size, NULL)
-
-    # Select the dataspace to be read
-    H5Sselect_elements(space_id, H5S_SELECT_SET,
-                       <size_t>size, <hsize_t *>PyArray_DATA(coords))
-
-    # Get the pointer to the buffer data area
-    if self.atom.kind == "reference":
-      refbuf = malloc(nparr.size * item_size)
-      rbuf = refbuf
-    else:
-      rbuf = PyArray_DATA(nparr)
+    # Take the lock for the whole sequence of HDF5 calls, releasing the
+    # GIL for the actual read.
+    with hdf5_lock:
+      item_size = H5Tget_size(self.type_id)
+      # Get the dataspace handle
+      space_id = H5Dget_space(self.dataset_id)
+      # Create a memory dataspace handle
+      size = nparr.size
+      mem_space_id = H5Screate_simple(1, &size, NULL)
 
-    # Do the actual read
-    with nogil:
-        ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
-                      H5P_DEFAULT, rbuf)
-
-    try:
-      if ret < 0:
-        raise HDF5ExtError("Problems reading the array data.")
+      # Select the dataspace to be read
+      H5Sselect_elements(space_id, H5S_SELECT_SET,
+                         <size_t>size, <hsize_t *>PyArray_DATA(coords))
 
       # Get the pointer to the buffer data area
       if self.atom.kind == "reference":
-        load_reference(self.dataset_id, <hobj_ref_t *>rbuf, item_size, nparr)
-    finally:
-      if refbuf:
-        free(refbuf)
-        refbuf = NULL
+        refbuf = malloc(nparr.size * item_size)
+        rbuf = refbuf
+      else:
+        rbuf = PyArray_DATA(nparr)
 
-    # Terminate access to the memory dataspace
-    H5Sclose(mem_space_id)
-    # Terminate access to the dataspace
-    H5Sclose(space_id)
+      # Do the actual read
+      with nogil:
+          ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
+                        H5P_DEFAULT, rbuf)
 
-    if self.atom.kind == 'time':
+      try:
+        if ret < 0:
+          raise HDF5ExtError("Problems reading the array data.")
+
+        # Get the pointer to the buffer data area
+        if self.atom.kind == "reference":
+          load_reference(self.dataset_id, <hobj_ref_t *>rbuf, item_size, nparr)
+      finally:
+        if refbuf:
+          free(refbuf)
+          refbuf = NULL
+
+      # Terminate access to the memory dataspace
+      H5Sclose(mem_space_id)
+      # Terminate access to the dataspace
+      H5Sclose(space_id)
+
+      if self.atom.kind == 'time':
+        swap = H5Tget_order(self.type_id) != platform_byteorder
+
+    if swap:
       # Swap the byteorder by hand (this is not currently supported by HDF5)
-      if H5Tget_order(self.type_id) != platform_byteorder:
-        nparr.byteswap(True)
+      nparr.byteswap(True)
 
     # Convert some HDF5 types to NumPy after reading
     if self.atom.type == 'time64':
@@ -1666,7 +2445,6 @@ cdef class Array(Leaf):
 
     return
 
-
   def perform_selection(self, space_id, start, count, step, idx, mode):
     """Performs a selection using start/count/step in the given axis.
 
@@ -1719,55 +2497,62 @@ cdef class Array(Leaf):
     cdef hsize_t size
     cdef void *rbuf
     cdef object mode
-    cdef size_t item_size = H5Tget_size(self.type_id)
+    cdef size_t item_size
     cdef void * refbuf = NULL
+    cdef bint swap = False
 
-    # Get the dataspace handle
-    space_id = H5Dget_space(self.dataset_id)
-    # Create a memory dataspace handle
-    size = nparr.size
-    mem_space_id = H5Screate_simple(1, &size, NULL)
-
-    # Select the dataspace to be read
-    # Start by selecting everything
-    H5Sselect_all(space_id)
-    # Now refine with outstanding selections
-    for args in selection:
-      self.perform_selection(space_id, *args)
-
-    # Get the pointer to the buffer data area
-    if self.atom.kind == "reference":
-      refbuf = malloc(nparr.size * item_size)
-      rbuf = refbuf
-    else:
-      rbuf = PyArray_DATA(nparr)
-
-    # Do the actual read
-    with nogil:
-        ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
-                      H5P_DEFAULT, rbuf)
+    # Take the lock for the whole sequence of HDF5 calls, releasing the
+    # GIL for the actual read.
+    with hdf5_lock:
+      item_size = H5Tget_size(self.type_id)
+      # Get the dataspace handle
+      space_id = H5Dget_space(self.dataset_id)
+      # Create a memory dataspace handle
+      size = nparr.size
+      mem_space_id = H5Screate_simple(1, &size, NULL)
 
-    try:
-      if ret < 0:
-        raise HDF5ExtError("Problems reading the array data.")
+      # Select the dataspace to be read
+      # Start by selecting everything
+      H5Sselect_all(space_id)
+      # Now refine with outstanding selections
+      for args in selection:
+        self.perform_selection(space_id, *args)
 
       # Get the pointer to the buffer data area
       if self.atom.kind == "reference":
-        load_reference(self.dataset_id, <hobj_ref_t *>rbuf, item_size, nparr)
-    finally:
-      if refbuf:
-        free(refbuf)
-        refbuf = NULL
+        refbuf = malloc(nparr.size * item_size)
+        rbuf = refbuf
+      else:
+        rbuf = PyArray_DATA(nparr)
 
-    # Terminate access to the memory dataspace
-    H5Sclose(mem_space_id)
-    # Terminate access to the dataspace
-    H5Sclose(space_id)
+      # Do the actual read
+      with nogil:
+          ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
+                        H5P_DEFAULT, rbuf)
 
-    if self.atom.kind == 'time':
+      try:
+        if ret < 0:
+          raise HDF5ExtError("Problems reading the array data.")
+
+        # Get the pointer to the buffer data area
+        if self.atom.kind == "reference":
+          load_reference(self.dataset_id, <hobj_ref_t *>rbuf, item_size, nparr)
+      finally:
+        if refbuf:
+          free(refbuf)
+          refbuf = NULL
+
+      # Terminate access to the memory dataspace
+      H5Sclose(mem_space_id)
+      # Terminate access to the dataspace
+      H5Sclose(space_id)
+
+      if self.atom.kind == 'time':
+        swap = H5Tget_order(self.type_id) != platform_byteorder
+
+    if swap:
       # Swap the byteorder by hand (this is not currently supported by HDF5)
-      if H5Tget_order(self.type_id) != platform_byteorder:
-        nparr.byteswap(True)
+      nparr.byteswap(True)
 
     # Convert some HDF5 types to NumPy after reading
     if self.atom.type == 'time64':
@@ -1775,7 +2560,6 @@ cdef class Array(Leaf):
 
     return
 
-
   def _g_write_slice(self, ndarray startl, ndarray stepl, ndarray countl,
                     ndarray nparr):
     """Write a slice in an already created NumPy array."""
@@ -1802,8 +2586,10 @@ cdef class Array(Leaf):
 
     # Modify the elements:
     with nogil:
+        acquire_hdf5_lock()
         ret = H5ARRAYwrite_records(self.dataset_id, self.type_id, self.rank,
                                    start, step, count, rbuf)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Internal error modifying the elements "
@@ -1824,15 +2610,6 @@ cdef class Array(Leaf):
 
     if self.atom.kind == "reference":
       raise ValueError("Cannot write reference types yet")
-    # Get the dataspace handle
-    space_id = H5Dget_space(self.dataset_id)
-    # Create a memory dataspace handle
-    size = nparr.size
-    mem_space_id = H5Screate_simple(1, &size, NULL)
-
-    # Select the dataspace to be written
-    H5Sselect_elements(space_id, H5S_SELECT_SET,
-                       <size_t>size, <hsize_t *>PyArray_DATA(coords))
 
     # Get the pointer to the buffer data area
     rbuf = PyArray_DATA(nparr)
@@ -1841,19 +2618,32 @@ cdef class Array(Leaf):
     if self.atom.type == 'time64':
       self._convert_time64(nparr, 0)
 
-    # Do the actual write
-    with nogil:
-        ret = H5Dwrite(self.dataset_id, self.type_id, mem_space_id, space_id,
-                       H5P_DEFAULT, rbuf)
+    # Take the lock for the whole sequence of HDF5 calls, releasing the
+    # GIL for the actual write.
+    with hdf5_lock:
+      # Get the dataspace handle
+      space_id = H5Dget_space(self.dataset_id)
+      # Create a memory dataspace handle
+      size = nparr.size
+      mem_space_id = H5Screate_simple(1, &size, NULL)
+
+      # Select the dataspace to be written
+      H5Sselect_elements(space_id, H5S_SELECT_SET,
+                         <size_t>size, <hsize_t *>PyArray_DATA(coords))
+
+      # Do the actual write
+      with nogil:
+          ret = H5Dwrite(self.dataset_id, self.type_id, mem_space_id, space_id,
+                         H5P_DEFAULT, rbuf)
+
+      # Terminate access to the memory dataspace
+      H5Sclose(mem_space_id)
+      # Terminate access to the dataspace
+      H5Sclose(space_id)
 
     if ret < 0:
       raise HDF5ExtError("Problems writing the array data.")
 
-    # Terminate access to the memory dataspace
-    H5Sclose(mem_space_id)
-    # Terminate access to the dataspace
-    H5Sclose(space_id)
-
     return
 
 
@@ -1869,18 +2659,6 @@ cdef class Array(Leaf):
 
     if self.atom.kind == "reference":
       raise ValueError("Cannot write reference types yet")
-    # Get the dataspace handle
-    space_id = H5Dget_space(self.dataset_id)
-    # Create a memory dataspace handle
-    size = nparr.size
-    mem_space_id = H5Screate_simple(1, &size, NULL)
-
-    # Select the dataspace to be written
-    # Start by selecting everything
-    H5Sselect_all(space_id)
-    # Now refine with outstanding selections
-    for args in selection:
-      self.perform_selection(space_id, *args)
 
     # Get the pointer to the buffer data area
     rbuf = PyArray_DATA(nparr)
@@ -1889,22 +2667,37 @@ cdef class Array(Leaf):
     if self.atom.type == 'time64':
       self._convert_time64(nparr, 0)
 
-    # Do the actual write
-    with nogil:
-        ret = H5Dwrite(self.dataset_id, self.type_id, mem_space_id, space_id,
-                       H5P_DEFAULT, rbuf)
+    # Take the lock for the whole sequence of HDF5 calls, releasing the
+    # GIL for the actual write.
+    with hdf5_lock:
+      # Get the dataspace handle
+      space_id = H5Dget_space(self.dataset_id)
+      # Create a memory dataspace handle
+      size = nparr.size
+      mem_space_id = H5Screate_simple(1, &size, NULL)
+
+      # Select the dataspace to be written
+      # Start by selecting everything
+      H5Sselect_all(space_id)
+      # Now refine with outstanding selections
+      for args in selection:
+        self.perform_selection(space_id, *args)
+
+      # Do the actual write
+      with nogil:
+          ret = H5Dwrite(self.dataset_id, self.type_id, mem_space_id, space_id,
+                         H5P_DEFAULT, rbuf)
+
+      # Terminate access to the memory dataspace
+      H5Sclose(mem_space_id)
+      # Terminate access to the dataspace
+      H5Sclose(space_id)
 
     if ret < 0:
       raise HDF5ExtError("Problems writing the array data.")
 
-    # Terminate access to the memory dataspace
-    H5Sclose(mem_space_id)
-    # Terminate access to the dataspace
-    H5Sclose(space_id)
-
     return
 
-
   def __dealloc__(self):
     if self.dims:
       free(<void *>self.dims)
@@ -1927,6 +2720,7 @@ cdef class VLArray(Leaf):
     cdef object type_, itemsize, atom, scatom
     cdef bytes encoded_title, encoded_name
     cdef H5T_cset_t cset = H5T_CSET_ASCII
+    cdef int max_compact, min_dense, creation_order
 
     encoded_title = title.encode('utf-8')
     encoded_name = self.name.encode('utf-8')
@@ -1955,13 +2749,15 @@ cdef class VLArray(Leaf):
     class_ = self._c_classid.encode('utf-8')
 
     # Create the vlarray
+    (max_compact, min_dense, creation_order) = self._want_attr_storage
     self.dataset_id = H5VLARRAYmake(self.parent_id, encoded_name, version,
                                     rank, dims, self.base_type_id,
                                     self.chunkshape[0], rbuf,
                                     self.filters.complevel, complib,
                                     self.filters.shuffle_bitshuffle,
                                     self.filters.fletcher32,
-                                    self._want_track_times, rbuf)
+                                    self._want_track_times, max_compact,
+                                    min_dense, creation_order, rbuf)
     if dims:
       free(<void *>dims)
     if self.dataset_id < 0:
@@ -2043,8 +2839,10 @@ cdef class VLArray(Leaf):
 
     # Append the records:
     with nogil:
+        acquire_hdf5_lock()
         ret = H5VLARRAYappend_records(self.dataset_id, self.type_id,
                                       nobjects, self.nrecords, rbuf)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Problems appending the records.")
@@ -2064,8 +2862,10 @@ cdef class VLArray(Leaf):
 
     # Append the records:
     with nogil:
+        acquire_hdf5_lock()
         ret = H5VLARRAYmodify_records(self.dataset_id, self.type_id,
                                       nrow, nobjects, rbuf)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Problems modifying the record.")
@@ -2082,16 +2882,19 @@ cdef class VLArray(Leaf):
     if self.nrows == 0:
       size = 0
     else:
-      # Get the dataspace handle
-      space_id = H5Dget_space(self.dataset_id)
-      # Return the size of the entire dataset
-      ret = H5Dvlen_get_buf_size(self.dataset_id, self.type_id, space_id,
-                                 &size)
-      if ret < 0:
-        size = -1
+      with nogil:
+        acquire_hdf5_lock()
+        # Get the dataspace handle
+        space_id = H5Dget_space(self.dataset_id)
+        # Return the size of the entire dataset
+        ret = H5Dvlen_get_buf_size(self.dataset_id, self.type_id, space_id,
+                                   &size)
+        if ret < 0:
+          size = -1
 
-      # Terminate access to the dataspace
-      H5Sclose(space_id)
+        # Terminate access to the dataspace
+        H5Sclose(space_id)
+        release_hdf5_lock()
 
     return size
 
@@ -2103,6 +2906,7 @@ cdef class VLArray(Leaf):
     cdef hsize_t nrows
     cdef hid_t space_id
     cdef hid_t mem_space_id
+    cdef bint swap = False
     cdef object buf, nparr, shape, datalist
 
     # Compute the number of rows to read
@@ -2114,6 +2918,7 @@ cdef class VLArray(Leaf):
 
     # Now, read the chunk of rows
     with nogil:
+        acquire_hdf5_lock()
         # Allocate the necessary memory for keeping the row handlers
         rdata = <hvl_t *>malloc(<size_t>nrows*sizeof(hvl_t))
         # Get the dataspace handle
@@ -2126,11 +2931,16 @@ cdef class VLArray(Leaf):
         # Do the actual read
         ret = H5Dread(self.dataset_id, self.type_id, mem_space_id, space_id,
                       H5P_DEFAULT, rdata)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError(
         "VLArray._read_array: Problems reading the array data.")
 
+    if self.atom.kind == 'time':
+      with hdf5_lock:
+        swap = H5Tget_order(self.type_id) != platform_byteorder
+
     datalist = []
     for i from 0 <= i < nrows:
       # Number of atoms in row
@@ -2152,10 +2962,9 @@ cdef class VLArray(Leaf):
         buffer=buf, dtype=self._atomicdtype.base, shape=shape)
       # Set the writeable flag for this ndarray object
       nparr.flags.writeable = True
-      if self.atom.kind == 'time':
+      if swap:
         # Swap the byteorder by hand (this is not currently supported by HDF5)
-        if H5Tget_order(self.type_id) != platform_byteorder:
-          nparr.byteswap(True)
+        nparr.byteswap(True)
       # Convert some HDF5 types to NumPy after reading.
       if self.atom.type == 'time64':
         self._convert_time64(nparr, 1)
@@ -2163,16 +2972,19 @@ cdef class VLArray(Leaf):
       datalist.append(nparr)
 
     # Release resources
-    # Reclaim all the (nested) VL data
-    ret = H5Dvlen_reclaim(self.type_id, mem_space_id, H5P_DEFAULT, rdata)
-    if ret < 0:
-      raise HDF5ExtError("VLArray._read_array: error freeing the data buffer.")
-    # Terminate access to the memory dataspace
-    H5Sclose(mem_space_id)
-    # Terminate access to the dataspace
-    H5Sclose(space_id)
+    with nogil:
+        acquire_hdf5_lock()
+        # Reclaim all the (nested) VL data
+        ret = H5Dvlen_reclaim(self.type_id, mem_space_id, H5P_DEFAULT, rdata)
+        # Terminate access to the memory dataspace
+        H5Sclose(mem_space_id)
+        # Terminate access to the dataspace
+        H5Sclose(space_id)
+        release_hdf5_lock()
     # Free the amount of row pointers to VL row data
     free(rdata)
+    if ret < 0:
+      raise HDF5ExtError("VLArray._read_array: error freeing the data buffer.")
 
     return datalist
 
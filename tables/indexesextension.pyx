@@ -47,6 +47,7 @@ from libc.string cimport memcpy, strncmp
 
 from .definitions cimport hid_t, herr_t, hsize_t, H5Screate_simple, H5Sclose
 from .lrucacheextension cimport NumCache
+from .utilsextension cimport acquire_hdf5_lock, release_hdf5_lock
 
 
 
@@ -564,18 +565,30 @@ cdef class CacheArray(Array):
   cdef initread(self, int nbounds):
     # "Actions to accelerate the reads afterwards."
 
+    cdef herr_t ret
+
     # Precompute the mem_space_id
-    if (H5ARRAYOinit_readSlice(self.dataset_id, &self.mem_space_id,
-                               nbounds) < 0):
+    with nogil:
+        acquire_hdf5_lock()
+        ret = H5ARRAYOinit_readSlice(self.dataset_id, &self.mem_space_id,
+                                     nbounds)
+        release_hdf5_lock()
+    if ret < 0:
       raise HDF5ExtError("Problems initializing the bounds array data.")
     return
 
   cdef read_slice(self, hsize_t nrow, hsize_t start, hsize_t stop, void *rbuf):
     # "Read an slice of bounds."
 
-    if (H5ARRAYOread_readBoundsSlice(
-      self.dataset_id, self.mem_space_id, self.type_id,
-      nrow, start, stop, rbuf) < 0):
+    cdef herr_t ret
+
+    with nogil:
+        acquire_hdf5_lock()
+        ret = H5ARRAYOread_readBoundsSlice(
+          self.dataset_id, self.mem_space_id, self.type_id,
+          nrow, start, stop, rbuf)
+        release_hdf5_lock()
+    if ret < 0:
       raise HDF5ExtError("Problems reading the bounds array data.")
     return
 
@@ -583,7 +596,10 @@ cdef class CacheArray(Array):
     super()._g_close()
     # Release specific resources of this class
     if self.mem_space_id > 0:
-      H5Sclose(self.mem_space_id)
+      with nogil:
+          acquire_hdf5_lock()
+          H5Sclose(self.mem_space_id)
+          release_hdf5_lock()
 
 
 cdef class IndexArray(Array):
@@ -607,8 +623,10 @@ cdef class IndexArray(Array):
 
     # Do the physical read
     with nogil:
+        acquire_hdf5_lock()
         ret = H5ARRAYOread_readSlice(self.dataset_id, self.type_id,
                                      irow, start, stop, buf)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Problems reading the index indices.")
@@ -635,7 +653,10 @@ cdef class IndexArray(Array):
       rank = 2
       count[0] = 1
       count[1] = self.chunksize
-      self.mem_space_id = H5Screate_simple(rank, count, NULL)
+      with nogil:
+          acquire_hdf5_lock()
+          self.mem_space_id = H5Screate_simple(rank, count, NULL)
+          release_hdf5_lock()
       # Cache some counters in local extension variables
       self.l_chunksize = self.chunksize
       self.l_slicesize = self.slicesize
@@ -679,9 +700,11 @@ cdef class IndexArray(Array):
     """Read the sorted part of an index."""
 
     with nogil:
+        acquire_hdf5_lock()
         ret = H5ARRAYOread_readSortedSlice(
           self.dataset_id, self.mem_space_id, self.type_id,
           irow, start, stop, self.rbuflb)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Problems reading the array data.")
@@ -1487,7 +1510,10 @@ cdef class IndexArray(Array):
     super()._g_close()
     # Release specific resources of this class
     if self.mem_space_id > 0:
-      H5Sclose(self.mem_space_id)
+      with nogil:
+          acquire_hdf5_lock()
+          H5Sclose(self.mem_space_id)
+          release_hdf5_lock()
 
 
 cdef class LastRowArray(Array):
@@ -1500,8 +1526,10 @@ cdef class LastRowArray(Array):
 
     cdef void *buf = PyArray_DATA(idx)
     with nogil:
+        acquire_hdf5_lock()
         ret = H5ARRAYOreadSliceLR(self.dataset_id, self.type_id,
                                   start, stop, buf)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Problems reading the index data in Last Row.")
@@ -1514,8 +1542,10 @@ cdef class LastRowArray(Array):
 
     rbuflb = sorted.rbuflb  # direct access to rbuflb: very fast.
     with nogil:
+        acquire_hdf5_lock()
         ret = H5ARRAYOreadSliceLR(self.dataset_id, self.type_id,
                                   start, stop, rbuflb)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Problems reading the index data.")
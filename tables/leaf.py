@@ -7,7 +7,8 @@ import numpy as np
 
 from .flavor import (check_flavor, internal_flavor, toarray,
                      alias_map as flavor_alias_map)
-from .node import Node
+from . import chunkio, hdf5extension
+from .node import Node, _get_attr_storage
 from .filters import Filters
 from .utils import byteorders, lazyattr, SizeType
 from .exceptions import PerformanceWarning
@@ -58,6 +59,40 @@ def calc_chunksize(expected_mb):
     return chunksize * 8
 
 
+def fix_byteorder_data(data, dbyteorder, byteorder=None):
+    """Fix the byteorder of `data` for storing it with `byteorder`.
+
+    `dbyteorder` is the byteorder of `data` (as in NumPy dtypes), which
+    is also used for storing it if `byteorder` is None.  A ``(data,
+    byteorder)`` tuple is returned with the data (byteswapped if needed)
+    and the byteorder for storing it (``'irrelevant'`` if the data has
+    no byteorder).
+
+    """
+
+    dbyteorder = byteorders[dbyteorder]
+    # If a byteorder has not been given, then set it to the same value
+    # of data.
+    if byteorder is None:
+        byteorder = dbyteorder
+    # Do an additional in-place byteswap of data if the in-memory
+    # byteorder doesn't match that of the on-disk.  This is the only
+    # place that we have to do the conversion manually. In all the
+    # other cases, it will be HDF5 the responsible of doing the
+    # byteswap properly.
+    if dbyteorder in ['little', 'big']:
+        if dbyteorder != byteorder:
+            # if data is not writeable, do a copy first
+            if not data.flags.writeable:
+                data = data.copy()
+            data.byteswap(True)
+    else:
+        # Fix the byteorder again, no matter which byteorder have
+        # specified the user.
+        byteorder = "irrelevant"
+    return (data, byteorder)
+
+
 class Leaf(Node):
     """Abstract base class for all PyTables leaves.
 
@@ -162,6 +197,16 @@ class Leaf(Node):
 
         return Filters._from_leaf(self)
 
+    @lazyattr
+    def _v_chunk_pipeline(self):
+        """The filter pipeline for direct chunk I/O (None if unsupported).
+
+        See :func:`tables.chunkio.get_pipeline`.
+
+        """
+
+        return chunkio.get_pipeline(self)
+
     @property
     def track_times(self):
         """Whether timestamps for the leaf are recorded
@@ -225,7 +270,8 @@ class Leaf(Node):
     def __init__(self, parentnode, name,
                  new=False, filters=None,
                  byteorder=None, _log=True,
-                 track_times=True):
+                 track_times=True, attr_phase_change=None,
+                 attr_creation_order=None, expectedattrs=None):
         self._v_new = new
         """Is this the first time the node has been created?"""
         self.nrowsinbuf = None
@@ -251,6 +297,10 @@ class Leaf(Node):
             self.byteorder = byteorder
             """The byte ordering of the leaf data *on disk*."""
 
+            self._want_attr_storage = _get_attr_storage(
+                parentnode._v_file.params, attr_phase_change,
+                attr_creation_order, expectedattrs)
+
         self._want_track_times = track_times
 
         # Existing filters need not be read since `filters`
@@ -453,26 +503,8 @@ very small/large chunksize, you may want to increase/decrease it."""
 
     def _g_fix_byteorder_data(self, data, dbyteorder):
         """Fix the byteorder of data passed in constructors."""
-        dbyteorder = byteorders[dbyteorder]
-        # If self.byteorder has not been passed as an argument of
-        # the constructor, then set it to the same value of data.
-        if self.byteorder is None:
-            self.byteorder = dbyteorder
-        # Do an additional in-place byteswap of data if the in-memory
-        # byteorder doesn't match that of the on-disk.  This is the only
-        # place that we have to do the conversion manually. In all the
-        # other cases, it will be HDF5 the responsible of doing the
-        # byteswap properly.
-        if dbyteorder in ['little', 'big']:
-            if dbyteorder != self.byteorder:
-                # if data is not writeable, do a copy first
-                if not data.flags.writeable:
-                    data = data.copy()
-                data.byteswap(True)
-        else:
-            # Fix the byteorder again, no matter which byteorder have
-            # specified the user in the constructor.
-            self.byteorder = "irrelevant"
+        (data, self.byteorder) = fix_byteorder_data(data, dbyteorder,
+                                                    self.byteorder)
         return data
 
     def _point_selection(self, key):
@@ -650,6 +682,142 @@ very small/large chunksize, you may want to increase/decrease it."""
             raise TypeError("non-enlargeable datasets cannot be truncated")
         self._g_truncate(size)
 
+    def refresh(self):
+        """Re-read the extent of the dataset from the file.
+
+        This updates the shape of the leaf (and its number of rows) with
+        data appended to the dataset since it was opened, e.g. by a writer
+        process when the file is opened with ``swmr=True`` for reading (see
+        :func:`open_file`).  It needs HDF5 1.10.0 or newer.
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._g_check_open()
+        self._g_refresh()
+
+    def _check_chunked(self):
+        """Check that raw chunk I/O can be used with the leaf."""
+
+        if self.chunkshape is None:
+            raise TypeError("``%s`` is not a chunked leaf" % self._v_pathname)
+        if not hdf5extension.HAVE_DIRECT_CHUNK:
+            raise RuntimeError(
+                "raw chunk I/O is only available in HDF5 >= 1.10.5")
+
+    def _check_chunk_offset(self, offset):
+        """Check that `offset` is the offset of a chunk of the leaf.
+
+        Return the offset as a tuple of integers.
+
+        """
+
+        self._check_chunked()
+        offset = tuple(int(c) for c in offset)
+        if len(offset) != len(self.chunkshape):
+            raise ValueError("chunk offset %r must have %d coordinates"
+                             % (offset, len(self.chunkshape)))
+        for (c, size, dim) in zip(offset, self.chunkshape, self.shape):
+            if c < 0 or c % size != 0:
+                raise ValueError("%r is not the offset of a chunk with "
+                                 "shape %r" % (offset, self.chunkshape))
+            if c >= dim:
+                raise IndexError("chunk offset %r out of the shape %r of "
+                                 "the leaf" % (offset, self.shape))
+        return offset
+
+    def iter_chunk_info(self):
+        """Iterate over the chunks of the leaf allocated in the file.
+
+        This method returns an iterator yielding a named tuple for every
+        chunk of the dataset which is allocated in the file, in storage
+        order.  Its fields are:
+
+        offset
+            The coordinates of the first element of the chunk in the
+            dataset, as a tuple.
+        filter_mask
+            A bit mask of the filters of the dataset (in the order of
+            the filter pipeline) which were *not* applied to the chunk.
+        byte_offset
+            The address of the chunk in the file.
+        size
+            The size of the chunk as stored in the file (e.g. its
+            compressed size).
+
+        Chunks which have never been written are not allocated.  This
+        method only works with chunked leaves (a TypeError is raised
+        otherwise), and it needs HDF5 1.10.5 or newer.
+
+        Examples
+        --------
+
+        ::
+
+            sizes = [info.size for info in leaf.iter_chunk_info()]
+            print("chunk sizes: min %d, max %d" % (min(sizes), max(sizes)))
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._g_check_open()
+        self._check_chunked()
+        offsets, masks, addrs, sizes, nchunks = self._g_get_chunks_info(
+            [0] * len(self.shape), self.shape)
+        return (hdf5extension.ChunkInfo(tuple(offset), mask, addr, size)
+                for (offset, mask, addr, size) in zip(
+                    offsets.tolist(), masks.tolist(), addrs.tolist(),
+                    sizes.tolist()))
+
+    def read_raw_chunk(self, offset):
+        """Read the chunk of the leaf starting at offset, as stored.
+
+        The data of the chunk is returned without undoing any filters
+        (like compression), as a ``(filter_mask, data)`` tuple, where
+        filter_mask has the meaning given in
+        :meth:`Leaf.iter_chunk_info` and data is a NumPy array of bytes.
+        If the chunk is not allocated in the file, data is None.
+
+        The offset must be a sequence with the coordinates of the first
+        element of the chunk, which must be a multiple of the chunkshape
+        of the leaf.  This needs HDF5 1.10.5 or newer.
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._g_check_open()
+        offset = self._check_chunk_offset(offset)
+        return self._g_read_chunk(offset)
+
+    def write_raw_chunk(self, offset, data, filter_mask=0):
+        """Write data as the chunk of the leaf starting at offset.
+
+        The data (an object supporting the buffer protocol, like bytes
+        or a NumPy array) is written as is, so it must have already been
+        processed by the filters of the leaf (e.g. compressed), except
+        for the ones flagged in filter_mask (see
+        :meth:`Leaf.iter_chunk_info`).  A chunk read with
+        :meth:`Leaf.read_raw_chunk` may be written as is in another leaf
+        with the same type, chunkshape and filters, for instance.
+
+        The offset must be a sequence with the coordinates of the first
+        element of the chunk, which must be a multiple of the chunkshape
+        of the leaf, and the chunk must be inside the current shape of
+        the leaf (enlargeable leaves must be enlarged first, e.g. with
+        :meth:`Leaf.truncate`).  This needs HDF5 1.10.5 or newer.
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._g_check_open()
+        self._v_file._check_writable()
+        offset = self._check_chunk_offset(offset)
+        self._g_write_chunk(offset, data, filter_mask)
+
     def isvisible(self):
         """Is this node visible?
 
@@ -11,6 +11,7 @@
 """Cython functions and classes for supporting links in HDF5."""
 
 from .exceptions import HDF5ExtError
+from .path import join_path
 
 from .hdf5extension cimport Node
 from .utilsextension cimport cstr_to_pystr
@@ -143,6 +144,11 @@ cdef class Link(Node):
     if ret < 0:
       raise HDF5ExtError("failed to copy HDF5 link")
 
+    # Add the new link to the node catalog of the file (if any).
+    catalog = newparent._v_file._catalog
+    if catalog is not None:
+      catalog.add(join_path(newparent._v_pathname, newname))
+
     # Update statistics if needed.
     stats = kwargs.get('stats', None)
     if stats is not None:
@@ -0,0 +1,190 @@
+"""Merging tables and enlargeable arrays from several files.
+
+The rows of the tables and enlargeable arrays with the same pathname in
+several files (e.g. shards written concurrently by different processes)
+are concatenated into a single node of a destination file.  Whenever the
+source and destination leaves have the same filters, chunkshape and type,
+and the destination ends at a chunk boundary, rows are copied as stored
+chunks, without decompressing and compressing them again.
+
+"""
+
+from . import chunkio
+from .earray import EArray
+from .file import File, open_file
+from .group import Group
+from .table import Table
+
+
+def _check_compatible(src, dst):
+    """Raise a ValueError if rows of `src` can not be appended to `dst`."""
+
+    if isinstance(src, Table):
+        if not isinstance(dst, Table):
+            raise ValueError("can not merge table ``%s`` into ``%s``, "
+                             "which is not a table"
+                             % (src._v_pathname, dst._v_pathname))
+        if src.description._v_dtype != dst.description._v_dtype:
+            raise ValueError("the description of table ``%s`` in ``%s`` "
+                             "does not match the one of the destination"
+                             % (src._v_pathname, src._v_file.filename))
+        return
+    if not isinstance(dst, EArray):
+        raise ValueError("can not merge enlargeable array ``%s`` into "
+                         "``%s``, which is not an enlargeable array"
+                         % (src._v_pathname, dst._v_pathname))
+    srcshape, dstshape = list(src.shape), list(dst.shape)
+    del srcshape[src.maindim], dstshape[dst.maindim]
+    if (src.atom.dtype != dst.atom.dtype or src.maindim != dst.maindim or
+            srcshape != dstshape):
+        raise ValueError("the atom or shape of enlargeable array ``%s`` in "
+                         "``%s`` does not match the ones of the destination"
+                         % (src._v_pathname, src._v_file.filename))
+
+
+def _get_destination(dstfileh, src):
+    """Get the node of `dstfileh` where rows of `src` are appended.
+
+    If it does not exist, it is created as an empty copy of `src` (with
+    the same filters, chunkshape, attributes and indexes).
+
+    """
+
+    try:
+        return dstfileh.get_node(src._v_pathname)
+    except LookupError:
+        parent = dstfileh._create_path(src._v_parent._v_pathname)
+        return src.copy(parent, src._v_name, start=0, stop=0,
+                        propindexes=True)
+
+
+def _update_indexes(table, nrows):
+    """Add `nrows` new rows at the end of `table` to its indexes.
+
+    New rows are sorted and added as new slices of the indexes (like when
+    appending rows), instead of sorting the existing rows again.
+
+    """
+
+    table._unsaved_indexedrows += nrows
+    table._dirtycache = True
+    if table.autoindex:
+        table.flush_rows_to_index(_lastrow=False)
+    else:
+        table._mark_columns_as_dirty(table.colpathnames)
+
+
+def append_rows(src, dst, start, stop):
+    """Append the rows from `start` to `stop` of `src` to `dst`.
+
+    The rows are copied as stored chunks if possible (see
+    :func:`chunkio.can_copy`), else they are read and appended in
+    buffers of rows.  Return True if chunks were copied.
+
+    """
+
+    if start >= stop:
+        return False
+    dst.flush()  # write rows buffered in `dst` before its end is used
+    dststart = dst.nrows
+    chunklen = int(dst.chunkshape[dst.maindim])
+    if (dststart % chunklen == 0 and
+            getattr(dst, 'sortedby', None) is None and
+            chunkio.can_copy(src, dst, start, stop, 1)):
+        dst._g_truncate(dststart + stop - start)
+        chunkio.copy(src, dst, start, stop, dststart)
+        if isinstance(dst, Table) and dst.indexed:
+            _update_indexes(dst, stop - start)
+        return True
+    nrowsinbuf = src.nrowsinbuf
+    for bstart in range(start, stop, nrowsinbuf):
+        dst.append(src._read(bstart, min(bstart + nrowsinbuf, stop), 1))
+    return False
+
+
+def merge_tables(sources, dest, where='/', ordered=True):
+    """Concatenate the tables and enlargeable arrays of several files.
+
+    The rows of every table and enlargeable array under the `where`
+    group in the files named in `sources` are appended, one file after
+    the other, to the node with the same pathname in `dest`.  Nodes
+    which do not exist in `dest` yet are created with the filters,
+    chunkshape, attributes and indexes of the first source node.  Nodes
+    with the same pathname must have the same description (or atom and
+    shape), else a ValueError is raised.
+
+    Rows are copied as stored chunks (i.e. without decompressing and
+    compressing them again) when the source and destination nodes have
+    the same filters, chunkshape and type, and the destination node ends
+    at a chunk boundary.  Since the last chunk of a source is usually
+    not complete, this only happens for the first of the sources, unless
+    `ordered` is false: then, the rows in the last (incomplete) chunk of
+    every source node are appended after the rows of the complete chunks
+    of all the sources, so that the latter can always be copied as
+    stored.
+
+    Indexes in the destination tables are updated with the new rows as
+    when appending rows to them, i.e. new rows are sorted and added to
+    the existing indexes, which are not built again.
+
+    Parameters
+    ----------
+    sources : iterable of str
+        The names of the files to be merged.
+    dest : str or File
+        The name of the destination file (which is created if it does
+        not exist), or the destination file itself, open for writing.
+    where : str
+        The pathname of the group with the nodes to be merged (or of a
+        single node).  The default is to merge all the nodes.
+    ordered : bool
+        Whether to keep the rows of every source node together, in the
+        order of `sources`.
+
+    Returns
+    -------
+    dict
+        The number of rows appended to each destination node, by
+        pathname.
+
+    .. versionadded:: 3.7
+
+    """
+
+    if isinstance(dest, File):
+        dstfileh = dest
+        dstfileh._check_writable()
+    else:
+        dstfileh = open_file(dest, 'a')
+
+    nrows = {}
+    tails = []
+    try:
+        for source in sources:
+            with open_file(source, 'r') as srcfileh:
+                node = srcfileh.get_node(where)
+                if isinstance(node, Group):
+                    nodes = srcfileh.walk_nodes(node)
+                else:
+                    nodes = [node]
+                for src in nodes:
+                    if not isinstance(src, (Table, EArray)):
+                        continue
+                    dst = _get_destination(dstfileh, src)
+                    _check_compatible(src, dst)
+                    stop = src.nrows
+                    if not ordered:
+                        stop -= stop % int(src.chunkshape[src.maindim])
+                        if stop < src.nrows:
+                            tails.append((dst._v_pathname,
+                                          src._read(stop, src.nrows, 1)))
+                    append_rows(src, dst, 0, stop)
+                    pathname = dst._v_pathname
+                    nrows[pathname] = nrows.get(pathname, 0) + src.nrows
+        for (pathname, rows) in tails:
+            dstfileh.get_node(pathname).append(rows)
+        dstfileh.flush()
+    finally:
+        if dstfileh is not dest:
+            dstfileh.close()
+    return nrows
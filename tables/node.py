@@ -8,6 +8,7 @@ from .exceptions import (ClosedNodeError, NodeError, UndoRedoWarning,
                          PerformanceWarning)
 from .path import join_path, split_path, isvisiblepath
 from .utils import lazyattr
+from .utilsextension import hdf5_lock
 from .undoredo import move_to_shadow
 from .attributeset import AttributeSet, NotLoggedAttributeSet
 
@@ -37,6 +38,52 @@ def _closedrepr(oldmethod):
     return newmethod
 
 
+# The default attribute phase change of HDF5.
+_ATTR_MAX_COMPACT = 8
+_ATTR_MIN_DENSE = 6
+
+
+def _get_attr_storage(params, phase_change=None, creation_order=None,
+                      expectedattrs=None):
+    """Get the settings for storing the attributes of a new node.
+
+    `phase_change`, `creation_order` and `expectedattrs` are the
+    `attr_phase_change`, `attr_creation_order` and `expectedattrs`
+    arguments of the ``File.create_*()`` methods.  The first two default
+    to the ``ATTR_PHASE_CHANGE`` and ``ATTR_CREATION_ORDER`` values in
+    the `params` of the file, and if no phase change is set either way,
+    the HDF5 default one is used for nodes expected to have more
+    attributes than it keeps in compact storage.  A ``(max_compact,
+    min_dense, creation_order)`` tuple of integers is returned for the
+    extensions, where negative phase change values stand for the HDF5
+    defaults.
+
+    """
+
+    if phase_change is None:
+        phase_change = params['ATTR_PHASE_CHANGE']
+    if (phase_change is None and expectedattrs is not None
+            and expectedattrs > _ATTR_MAX_COMPACT):
+        phase_change = (_ATTR_MAX_COMPACT, _ATTR_MIN_DENSE)
+    if creation_order is None:
+        creation_order = params['ATTR_CREATION_ORDER']
+    if phase_change is None:
+        return (-1, -1, int(bool(creation_order)))
+
+    try:
+        (max_compact, min_dense) = (int(value) for value in phase_change)
+    except (TypeError, ValueError):
+        raise TypeError("the attribute phase change must be a "
+                        "``(max_compact, min_dense)`` pair: %r"
+                        % (phase_change,))
+    if not (0 <= max_compact < 65536 and 0 <= min_dense <= max_compact + 1):
+        raise ValueError("the attribute phase change values must be such "
+                         "that 0 <= max_compact < 65536 and "
+                         "0 <= min_dense <= max_compact + 1: %r"
+                         % (phase_change,))
+    return (max_compact, min_dense, int(bool(creation_order)))
+
+
 class MetaNode(type):
     """Node metaclass.
 
@@ -240,29 +287,34 @@ class Node(metaclass=MetaNode):
             parentnode._g_refnode(self, name, validate)
         self._g_set_location(parentnode, name)
 
-        try:
-            # hdf5extension operations:
-            #   Update node attributes.
-            self._g_new(parentnode, name, init=True)
-            #   Create or open the node and get its object ID.
-            if new:
-                self._v_objectid = self._g_create()
-            else:
-                self._v_objectid = self._g_open()
-
-            # The node *has* been created, log that.
-            if new and _log and file_.is_undo_enabled():
-                self._g_log_create()
-
-            # This allows extra operations after creating the node.
-            self._g_post_init_hook()
-        except Exception:
-            # If anything happens, the node must be closed
-            # to undo every possible registration made so far.
-            # We do *not* rely on ``__del__()`` doing it later,
-            # since it might never be called anyway.
-            self._f_close()
-            raise
+        with hdf5_lock:
+            try:
+                # hdf5extension operations:
+                #   Update node attributes.
+                self._g_new(parentnode, name, init=True)
+                #   Create or open the node and get its object ID.
+                if new:
+                    self._v_objectid = self._g_create()
+                else:
+                    self._v_objectid = self._g_open()
+
+                # The node *has* been created, log that.
+                if new and _log and file_.is_undo_enabled():
+                    self._g_log_create()
+
+                # This allows extra operations after creating the node.
+                self._g_post_init_hook()
+
+                # Keep the node catalog of the file (if any) up to date.
+                if file_._catalog is not None:
+                    file_._catalog.register(self, new)
+            except Exception:
+                # If anything happens, the node must be closed
+                # to undo every possible registration made so far.
+                # We do *not* rely on ``__del__()`` doing it later,
+                # since it might never be called anyway.
+                self._f_close()
+                raise
 
     def _g_log_create(self):
         self._v_file._log('CREATE', self._v_pathname)
@@ -497,12 +549,17 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
 
         # Remove the node from the PyTables hierarchy.
         parent = self._v_parent
+        file_ = self._v_file
+        pathname = self._v_pathname
         parent._g_unrefnode(self._v_name)
         # Close the node itself.
         self._f_close()
         # hdf5extension operations:
         # Remove the node from the HDF5 hierarchy.
         self._g_delete(parent)
+        # Remove the node from the node catalog of the file (if any).
+        if file_._catalog is not None:
+            file_._catalog.remove(pathname)
 
     def _f_remove(self, recursive=False, force=False):
         """Remove this node from the hierarchy.
@@ -567,6 +624,11 @@ be ready to see PyTables asking for *lots* of memory and possibly slow I/O"""
         # Tell dependent objects about the new location of this node.
         self._g_update_dependent()
 
+        # Move the node in the node catalog of the file (if any).
+        catalog = self._v_file._catalog
+        if catalog is not None:
+            catalog.move(oldpathname, self._v_pathname)
+
     def _f_rename(self, newname, overwrite=False):
         """Rename this node in place.
 
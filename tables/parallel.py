@@ -0,0 +1,195 @@
+"""Map/reduce over the chunks of leaves in a pool of processes.
+
+The functions in this module split a chunked leaf in ranges of rows
+aligned with its chunks, and call a function on the data of each range
+in a pool of worker processes.  Each worker opens the file of the leaf
+in read-only mode the first time it needs it, and keeps it open for
+the following ranges (and calls), so the cost of starting the workers
+and opening the file is only paid once.
+
+"""
+
+import atexit
+import collections
+import concurrent.futures
+import functools
+import multiprocessing
+import os
+
+from .utils import detect_number_of_cores
+
+
+_pools = {}
+"""The pools of worker processes, by size."""
+
+_files = {}
+"""The files opened by this (worker) process, by filename."""
+
+
+def _init_worker():
+    """Initialize a worker process."""
+
+    # The parent may keep the file open for writing, which locks it in
+    # HDF5 >= 1.10.  It flushes the file before starting a map, and
+    # workers only read from it.
+    os.environ['HDF5_USE_FILE_LOCKING'] = 'FALSE'
+    # Close the cached files before PyTables warns about them at exit.
+    atexit.register(_close_files)
+
+
+def _close_files():
+    """Close the files opened by this (worker) process."""
+
+    for (stamp, h5file) in _files.values():
+        if h5file.isopen:
+            h5file.close()
+    _files.clear()
+
+
+def get_pool(processes):
+    """Get a (shared) pool of `processes` worker processes.
+
+    Workers are spawned rather than forked, so that they do not inherit
+    the state of the HDF5 library (and of its open files) in the parent.
+
+    """
+
+    pool = _pools.get(processes)
+    if pool is None:
+        pool = concurrent.futures.ProcessPoolExecutor(
+            processes, mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker)
+        _pools[processes] = pool
+    return pool
+
+
+@atexit.register
+def _shutdown_pools():
+    """Shut down the pools of worker processes at exit."""
+
+    for pool in _pools.values():
+        pool.shutdown()
+    _pools.clear()
+
+
+def _get_node(filename, nodepath):
+    """Get the node in `nodepath` of `filename`, opened in read-only mode.
+
+    The file is kept open in the worker process, and it is only opened
+    again if it has been modified since then.
+
+    """
+
+    from .file import open_file
+
+    stat = os.stat(filename)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _files.get(filename)
+    if cached is not None and (cached[0] != stamp or not cached[1].isopen):
+        cached[1].close()
+        cached = None
+    if cached is None:
+        cached = (stamp, open_file(filename, 'r'))
+        _files[filename] = cached
+    return cached[1].get_node(nodepath)
+
+
+def _map_range(func, filename, nodepath, start, stop, condition):
+    """Call `func` with the rows from `start` to `stop` of a leaf.
+
+    This is run in the worker processes.  If `condition` is not None, it
+    is a ``(condition, values, columns)`` tuple, and only the rows of
+    the table fulfilling the condition are passed to `func`.
+
+    """
+
+    node = _get_node(filename, nodepath)
+    if condition is None:
+        data = node.read(start, stop)
+    else:
+        (condition, condvars, columns) = condition
+        condvars = dict(condvars)
+        for var, colpath in columns.items():
+            condvars[var] = node.cols._f_col(colpath)
+        data = node.read_where(condition, condvars, start=start, stop=stop)
+    return func(data)
+
+
+def chunk_ranges(leaf, start, stop, chunks_per_task):
+    """Split the rows from `start` to `stop` of `leaf` in chunk ranges.
+
+    Each range but the first and the last ones spans `chunks_per_task`
+    whole chunks in the main dimension of `leaf`.
+
+    """
+
+    chunklen = int(leaf.chunkshape[leaf.maindim]) * chunks_per_task
+    bstart = start
+    while bstart < stop:
+        bstop = min((bstart // chunklen + 1) * chunklen, stop)
+        yield bstart, bstop
+        bstart = bstop
+
+
+def map_chunks(leaf, func, reduce=None, processes=None, condition=None,
+               start=None, stop=None, chunks_per_task=None):
+    """Call `func` on chunk-aligned ranges of `leaf` in worker processes.
+
+    This is the implementation of the ``map_chunks()`` method of tables
+    and chunked arrays, see :meth:`Table.map_chunks` for the meaning of
+    the arguments.  If given, `condition` must be a ``(condition,
+    values, columns)`` tuple, with the picklable values of the condition
+    variables and the pathnames of the columns in it.
+
+    """
+
+    if leaf.chunkshape is None:
+        raise TypeError("``%s`` is not a chunked leaf" % leaf._v_pathname)
+    driver = leaf._v_file.params['DRIVER']
+    if driver not in (None, 'H5FD_SEC2', 'H5FD_STDIO'):
+        raise ValueError("the file of ``%s`` can not be opened by other "
+                         "processes with driver ``%s``"
+                         % (leaf._v_pathname, driver))
+    if processes is None:
+        processes = detect_number_of_cores()
+    if processes < 1:
+        raise ValueError("`processes` must be greater than zero")
+    if chunks_per_task is None:
+        chunklen = int(leaf.chunkshape[leaf.maindim])
+        chunks_per_task = max(leaf.nrowsinbuf // chunklen, 1)
+    if chunks_per_task < 1:
+        raise ValueError("`chunks_per_task` must be greater than zero")
+    (start, stop, step) = leaf._process_range(start, stop, None)
+
+    # Workers must see all the data written so far.
+    if leaf._v_file.mode != 'r':
+        leaf._v_file.flush()
+
+    pool = get_pool(processes)
+    call = functools.partial(_map_range, func, leaf._v_file.filename,
+                             leaf._v_pathname)
+    # Keep a bounded number of pending results so as to limit memory
+    # usage (like ``chunkio.imap()`` does with threads).
+    pending = collections.deque()
+    results = []
+    result = None
+    first = True
+    ranges = chunk_ranges(leaf, start, stop, chunks_per_task)
+    while True:
+        for (bstart, bstop) in ranges:
+            pending.append(pool.submit(call, bstart, bstop, condition))
+            if len(pending) > 2 * processes:
+                break
+        if not pending:
+            break
+        value = pending.popleft().result()
+        if reduce is None:
+            results.append(value)
+        elif first:
+            result = value
+        else:
+            result = reduce(result, value)
+        first = False
+    if reduce is None:
+        return results
+    return result
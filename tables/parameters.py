@@ -165,6 +165,26 @@ be warned when the number of loaded nodes will reach the
 Finally, a value of zero means that any cache mechanism is disabled.
 """
 
+NODE_CATALOG = False
+"""Keep a persistent catalog of the nodes in files.
+
+If true, the paths of the visible nodes in a file, their classes and the
+shape, dtype and storage size of leaves are saved in a catalog file next
+to it (named like the file plus a ``.ptcatalog`` suffix) when the file
+is closed.  When the file is opened again, listing, walking and looking
+up nodes (e.g. with :meth:`File.list_nodes`, :meth:`File.walk_nodes`,
+:meth:`File.iter_paths` or the ``in`` operator) use the catalog instead
+of reading the metadata of groups from the file, and the class given to
+:meth:`File.get_node` is checked before loading the node.  This is much
+faster for files with a huge number of nodes.  If the file has been modified
+since the catalog was saved, the catalog is built again (with a single
+pass over the file).  Catalogs are only kept with the default,
+``H5FD_SEC2`` and ``H5FD_STDIO`` drivers.
+
+.. versionadded:: 3.7
+
+"""
+
 
 # Parameters for the I/O buffer in `Leaf` objects
 # -----------------------------------------------
@@ -208,12 +228,30 @@ your machine. In general, it is a good idea to set this to the number of
 cores in your machine or, when your machine has many of them (e.g. > 8),
 perhaps stay at 8 at maximum.  In general, 4 threads is a good tradeoff."""
 
-MAX_BLOSC_THREADS = 1    # 1 is safe for concurrency
+MAX_BLOSC_THREADS = None
 """The maximum number of threads that PyTables should use internally in
 Blosc.  If `None`, it is automatically set to the number of cores in
-your machine.  For applications that use several PyTables instances
-concurrently and so as to avoid locking problems, the recommended value
-is 1.  In other cases a value of 2 or 4 could make sense.
+your machine.  The Blosc filter does not share any state between the
+chunks it processes, so this is safe for applications that use several
+PyTables instances concurrently.  Note that a thread is only used for
+each 256 KB of a chunk, since Blosc starts new threads for every chunk.
+
+.. versionchanged:: 3.7
+   The default value is `None` instead of 1.
+
+"""
+
+MAX_CHUNK_THREADS = 1
+"""The maximum number of threads that PyTables should use for filtering
+(e.g. compressing) and unfiltering chunks by itself instead of in the
+HDF5 filter pipeline, which works in a single thread.  This is done when
+appending data filling whole chunks to tables and enlargeable arrays,
+and when reading contiguous ranges of tables or slices of arrays spanning
+several chunks, as long as their filters are supported (zlib, Blosc and
+shuffle).  It needs HDF5 1.10.5 or newer.  A value of 1 disables it.  If
+`None`, it is automatically set to the number of cores in your machine.
+
+.. versionadded:: 3.7
 
 """
 
@@ -239,6 +277,45 @@ datasets/attributes (i.e. the previous behaviour), set this to `False`.
 
 """
 
+ATTR_PHASE_CHANGE = None
+"""The attribute storage phase change values for new nodes.
+
+This does not apply to the root group, which is created with the file.
+
+If not None, it is a ``(max_compact, min_dense)`` pair: the attributes
+of a node are kept in its object header (compact storage) while it has
+up to `max_compact` attributes, and they are moved to a heap indexed by
+name (dense storage) beyond that, until the node has less than
+`min_dense` attributes again.  Looking up an attribute in a node with
+dense storage is much faster than with compact storage (which is scanned
+linearly) when the node has many attributes.
+
+Dense storage needs the object header format of HDF5 1.8, so the
+creation order of attributes is tracked in nodes created with a phase
+change (see :data:`ATTR_CREATION_ORDER`).  If None, the HDF5 defaults
+are used and dense storage is not used, so that new nodes can be read by
+HDF5 1.6.  This can be overridden for each node with the
+`attr_phase_change` argument of the ``File.create_*()`` methods, and
+nodes created with an `expectedattrs` argument larger than 8 use the
+HDF5 default phase change of ``(8, 6)`` when this is None.
+
+.. versionadded:: 3.7
+
+"""
+
+ATTR_CREATION_ORDER = False
+"""Track and index the creation order of the attributes of new nodes.
+
+Nodes created with this enabled use the object header format of HDF5
+1.8, so their attributes are moved to dense storage when they are more
+than the ones given in :data:`ATTR_PHASE_CHANGE` (8 with the HDF5
+defaults).  This can be overridden for each node with the
+`attr_creation_order` argument of the ``File.create_*()`` methods.
+
+.. versionadded:: 3.7
+
+"""
+
 
 # HDF5 driver management
 # ----------------------
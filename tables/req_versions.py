@@ -10,6 +10,6 @@ from distutils.version import LooseVersion
 min_numpy_version = LooseVersion('1.9.3')
 min_numexpr_version = LooseVersion('2.6.2')
 min_hdf5_version = LooseVersion('1.8.4')
-min_blosc_version = LooseVersion("1.4.1")
+min_blosc_version = LooseVersion("1.6.0")
 min_blosc_bitshuffle_version = LooseVersion("1.8.0")
 """The minumum Blosc version where BitShuffle can be used safely."""
@@ -0,0 +1,71 @@
+"""This utility merges the tables and enlargeable arrays of several files.
+
+Pass the flag -h to this for help on usage.
+
+"""
+
+import argparse
+from pathlib import Path
+from time import perf_counter as clock
+
+import tables as tb
+
+
+def _get_parser():
+    parser = argparse.ArgumentParser(
+        description='''Concatenate the tables and enlargeable arrays with the
+        same pathnames in several files (e.g. shards written by different
+        processes) into a single file.  Rows are copied as stored (i.e.
+        without decompressing and compressing them again) when the filters,
+        chunkshape and type of the nodes match, and the indexes of tables
+        are updated with the new rows.''')
+
+    parser.add_argument(
+        '-v', '--verbose', action='store_true',
+        help='show verbose information',
+    )
+    parser.add_argument(
+        '-o', '--overwrite', action='store_true', dest='overwritefile',
+        help='overwrite destination file (default is to append to it)',
+    )
+    parser.add_argument(
+        '--where', default='/',
+        help='''merge only the nodes under this group (or this node).
+        Defaults to "%(default)s"''',
+    )
+    parser.add_argument(
+        '--unordered', action='store_false', default=True, dest='ordered',
+        help='''append the rows in the last chunk of every source node after
+        the rows in the other chunks of all the sources, so that the latter
+        can be copied as stored.  The default is to keep the rows of every
+        source together''',
+    )
+    parser.add_argument(
+        'src', metavar='sourcefile', nargs='+', help='source files',
+    )
+    parser.add_argument(
+        'dst', metavar='destfile', help='destination file',
+    )
+
+    return parser
+
+
+def main():
+    parser = _get_parser()
+    args = parser.parse_args()
+
+    if args.dst in args.src:
+        parser.error("the destination file can not be a source file")
+    if args.overwritefile and Path(args.dst).is_file():
+        Path(args.dst).unlink()
+
+    t1 = clock()
+    nrows = tb.merge_tables(args.src, args.dst, where=args.where,
+                            ordered=args.ordered)
+    tmerge = clock() - t1
+
+    if args.verbose:
+        for pathname in sorted(nrows):
+            print(f"{pathname}: {nrows[pathname]} rows appended")
+        print(f"Files merged: {len(args.src)}, nodes merged: {len(nrows)}")
+        print(f"Time merging: {tmerge:.3f} s")
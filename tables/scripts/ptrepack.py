@@ -5,13 +5,18 @@ Pass the flag -h to this for help on usage.
 """
 
 import argparse
+import collections
+import os
+import shutil
 import sys
+import tempfile
 import warnings
 from pathlib import Path
 from time import perf_counter as clock
 from time import process_time as cpuclock
 
 import tables as tb
+from tables.parallel import get_pool
 
 
 # Global variables
@@ -27,6 +32,9 @@ numpy_aliases = [
     'CharArray',
 ]
 
+MANIFEST_SUFFIX = '.ptrepack-manifest'
+"""The suffix of the manifest of nodes copied by ``--resume`` runs."""
+
 
 def newdst_group(dstfileh, dstgroup, title, filters):
     group = dstfileh.root
@@ -46,6 +54,15 @@ def newdst_group(dstfileh, dstgroup, title, filters):
     return group
 
 
+def upgrade_flavor(srcfileh, dstnode):
+    if srcfileh.format_version.startswith("1"):
+        # Remove original flavor in case the source file has 1.x format
+        dstnode.del_attr('FLAVOR')
+    elif srcfileh.format_version < "2.1":
+        if dstnode.get_attr('FLAVOR') in numpy_aliases:
+            dstnode.set_attr('FLAVOR', tb.flavor.internal_flavor)
+
+
 def recreate_indexes(table, dstfileh, dsttable):
     listoldindexes = table._listoldindexes
     if listoldindexes != []:
@@ -145,12 +162,7 @@ def copy_leaf(srcfile, dstfile, srcnode, dstnode, title,
 
     # Upgrade flavors in dstnode, if required
     if upgradeflavors:
-        if srcfileh.format_version.startswith("1"):
-            # Remove original flavor in case the source file has 1.x format
-            dstnode.del_attr('FLAVOR')
-        elif srcfileh.format_version < "2.1":
-            if dstnode.get_attr('FLAVOR') in numpy_aliases:
-                dstnode.set_attr('FLAVOR', tb.flavor.internal_flavor)
+        upgrade_flavor(srcfileh, dstnode)
 
     # Recreate possible old indexes in destination node
     if srcnode._c_classid == "TABLE":
@@ -165,10 +177,17 @@ def copy_children(srcfile, dstfile, srcgroup, dstgroup, title,
                   recursive, filters, copyuserattrs, overwritefile,
                   overwrtnodes, stats, start, stop, step,
                   chunkshape, sortby, check_CSI, propindexes,
-                  upgradeflavors, allow_padding, use_hardlinks=True):
-    """Copy the children from source group to destination group"""
+                  upgradeflavors, allow_padding, use_hardlinks=True,
+                  jobs=1, manifest=None, done=()):
+    """Copy the children from source group to destination group
+
+    If `jobs` is greater than one, or a `manifest` file is given, the
+    leaves are copied one by one (see `copy_nodes()`).
+
+    """
     # Open the source file with srcgroup as root_uep
-    srcfileh = tb.open_file(srcfile, 'r', root_uep=srcgroup,
+    root_uep = srcgroup
+    srcfileh = tb.open_file(srcfile, 'r', root_uep=root_uep,
                             allow_padding=allow_padding)
     #  Assign the root to srcgroup
     srcgroup = srcfileh.root
@@ -215,14 +234,25 @@ def copy_children(srcfile, dstfile, srcgroup, dstgroup, title,
         srcgroup._v_attrs._f_copy(dstgroup)
 
     # Finally, copy srcgroup children to dstgroup
+    leafwise = jobs > 1 or manifest is not None
     try:
-        srcgroup._f_copy_children(
-            dstgroup, recursive=recursive, filters=filters,
-            copyuserattrs=copyuserattrs, overwrite=overwrtnodes,
-            stats=stats, start=start, stop=stop, step=step,
-            chunkshape=chunkshape,
-            sortby=sortby, check_CSI=check_CSI, propindexes=propindexes,
-            use_hardlinks=use_hardlinks)
+        if leafwise:
+            copy_nodes(
+                srcfile, root_uep, srcgroup, dstgroup, recursive=recursive,
+                overwrtnodes=overwrtnodes, upgradeflavors=upgradeflavors,
+                allow_padding=allow_padding, jobs=jobs, manifest=manifest,
+                done=done, filters=filters, copyuserattrs=copyuserattrs,
+                stats=stats, start=start, stop=stop, step=step,
+                chunkshape=chunkshape, sortby=sortby, check_CSI=check_CSI,
+                propindexes=propindexes)
+        else:
+            srcgroup._f_copy_children(
+                dstgroup, recursive=recursive, filters=filters,
+                copyuserattrs=copyuserattrs, overwrite=overwrtnodes,
+                stats=stats, start=start, stop=stop, step=step,
+                chunkshape=chunkshape,
+                sortby=sortby, check_CSI=check_CSI, propindexes=propindexes,
+                use_hardlinks=use_hardlinks)
     except Exception:
         (type_, value, traceback) = sys.exc_info()
         print("Problems doing the copy from '%s:%s' to '%s:%s'" %
@@ -238,26 +268,198 @@ def copy_children(srcfile, dstfile, srcgroup, dstgroup, title,
                            "particular, pay attention that root_uep is not "
                            "fooling you.")
 
-    # Upgrade flavors in dstnode, if required
-    if upgradeflavors:
-        for dstnode in dstgroup._f_walknodes("Leaf"):
-            if srcfileh.format_version.startswith("1"):
-                # Remove original flavor in case the source file has 1.x format
-                dstnode.del_attr('FLAVOR')
-            elif srcfileh.format_version < "2.1":
-                if dstnode.get_attr('FLAVOR') in numpy_aliases:
-                    dstnode.set_attr('FLAVOR', tb.flavor.internal_flavor)
-
-    # Convert the remaining tables with old indexes (if any)
-    for table in srcgroup._f_walknodes("Table"):
-        dsttable = dstfileh.get_node(dstgroup, table._v_pathname)
-        recreate_indexes(table, dstfileh, dsttable)
+    # Leaf by leaf copies already did this for every leaf.
+    if not leafwise:
+        # Upgrade flavors in dstnode, if required
+        if upgradeflavors:
+            for dstnode in dstgroup._f_walknodes("Leaf"):
+                upgrade_flavor(srcfileh, dstnode)
+
+        # Convert the remaining tables with old indexes (if any)
+        for table in srcgroup._f_walknodes("Table"):
+            dsttable = dstfileh.get_node(dstgroup, table._v_pathname)
+            recreate_indexes(table, dstfileh, dsttable)
 
     # Close all the open files:
     srcfileh.close()
     dstfileh.close()
 
 
+def read_manifest(manifestfile):
+    """Return the pathnames of the source nodes listed in `manifestfile`.
+
+    A last line without a newline is ignored, since the run which wrote
+    it may have been interrupted in the middle of it.
+
+    """
+    with open(manifestfile) as manifest:
+        return {line[:-1] for line in manifest if line.endswith('\n')}
+
+
+def record_node(manifest, dstfileh, pathname):
+    """Record the source node in `pathname` as copied in `manifest`.
+
+    The destination file is flushed first, so that the manifest never
+    lists nodes which are not in the file yet.
+
+    """
+    if manifest is None:
+        return
+    dstfileh.flush()
+    manifest.write(pathname + '\n')
+    manifest.flush()
+    os.fsync(manifest.fileno())
+
+
+def copy_to_staging(srcfile, root_uep, srcpath, stagingdir, allow_padding,
+                    kwargs):
+    """Copy the leaf in `srcpath` to a new file in `stagingdir`.
+
+    This is run in the worker processes of copies with several jobs.
+    The name of the new file is returned, and the copy of the leaf is
+    the ``/leaf`` node in it.
+
+    """
+    warnings.filterwarnings("ignore", category=tb.exceptions.OldIndexWarning)
+    warnings.filterwarnings("ignore", category=tb.exceptions.FlavorWarning)
+    fd, stagingfile = tempfile.mkstemp(suffix='.h5', dir=stagingdir)
+    os.close(fd)
+    with tb.open_file(srcfile, 'r', root_uep=root_uep,
+                      allow_padding=allow_padding) as srcfileh, \
+            tb.open_file(stagingfile, 'w',
+                         allow_padding=allow_padding) as stagingfileh:
+        srcnode = srcfileh.get_node(srcpath)
+        srcnode.copy(stagingfileh.root, 'leaf', **kwargs)
+    return stagingfile
+
+
+def copy_nodes(srcfile, root_uep, srcgroup, dstgroup, recursive,
+               overwrtnodes, upgradeflavors, allow_padding, jobs,
+               manifest, done, **kwargs):
+    """Copy the children of `srcgroup` to `dstgroup` leaf by leaf.
+
+    Groups and links are copied first.  Then, if `jobs` is greater than
+    one, each leaf is copied to a staging file by one of `jobs` worker
+    processes, and the copy is stitched into the destination file (which
+    copies its chunks as stored); else leaves are copied directly.
+
+    Once a node has been copied, the pathname of its source is recorded
+    in the `manifest` file (if any).  If `done` is not None, this
+    resumes an interrupted copy: the nodes in `done` are not copied
+    again, and other nodes which exist in the destination are removed
+    before copying them, since their copies may be incomplete.
+
+    """
+    srcfileh = srcgroup._v_file
+    dstfileh = dstgroup._v_file
+    stats = kwargs['stats']
+    # Indexes are built from the source tables while copying to the
+    # destination file (the staging copies lack them).
+    propindexes = kwargs.pop('propindexes')
+    resuming = done is not None
+    if not resuming:
+        done = ()
+
+    # Create groups and links, and find the leaves and hard links.
+    leaves = []
+    hardlinks = []
+    address_map = {}
+    parentstack = [(srcgroup, dstgroup)]
+    while parentstack:
+        (srcparent, dstparent) = parentstack.pop()
+        for srcchild in srcparent._v_children.values():
+            name = srcchild._v_name
+            srcpath = srcchild._v_pathname
+            target = None
+            if not isinstance(srcchild, tb.link.Link):
+                addr, rc = srcchild._get_obj_info()
+                if rc > 1:
+                    target = address_map.get(addr)
+                    if target is None:
+                        address_map[addr] = tb.path.join_path(
+                            dstparent._v_pathname, name)
+            isgroup = isinstance(srcchild, tb.group.Group)
+
+            if srcpath in done:
+                if isgroup and recursive and target is None:
+                    parentstack.append(
+                        (srcchild, dstparent._f_get_child(name)))
+                continue
+            if name in dstparent:
+                if not (resuming or overwrtnodes):
+                    raise tb.NodeError(
+                        "destination group ``%s`` already has "
+                        "a node named ``%s``; "
+                        "you may want to use the ``overwrite`` argument"
+                        % (dstparent._v_pathname, name))
+                dstparent._f_get_child(name)._f_remove(recursive=True)
+
+            if target is not None:
+                hardlinks.append((srcpath, dstparent, name, target))
+            elif isinstance(srcchild, tb.leaf.Leaf):
+                leaves.append((srcchild, dstparent))
+            else:
+                dstchild = srcchild._g_copy_as_child(dstparent, **kwargs)
+                record_node(manifest, dstfileh, srcpath)
+                if isgroup and recursive:
+                    parentstack.append((srcchild, dstchild))
+
+    def finish_leaf(srcleaf, dstleaf):
+        if isinstance(srcleaf, tb.table.Table):
+            if propindexes and srcleaf.indexed:
+                srcleaf._g_prop_indexes(dstleaf)
+            recreate_indexes(srcleaf, dstfileh, dstleaf)
+        if upgradeflavors:
+            upgrade_flavor(srcfileh, dstleaf)
+        record_node(manifest, dstfileh, srcleaf._v_pathname)
+
+    if jobs <= 1:
+        for (srcleaf, dstparent) in leaves:
+            dstleaf = srcleaf._g_copy_as_child(dstparent, **kwargs)
+            finish_leaf(srcleaf, dstleaf)
+    else:
+        leafkwargs = kwargs.copy()
+        del leafkwargs['stats']
+        stagingdir = tempfile.mkdtemp(
+            prefix='ptrepack-',
+            dir=os.path.dirname(os.path.abspath(dstfileh.filename)))
+        pool = get_pool(jobs)
+        # Keep a bounded number of staging files at a time, and stitch
+        # them in the order of the leaves.
+        pending = collections.deque()
+        leafiter = iter(leaves)
+        try:
+            while True:
+                for (srcleaf, dstparent) in leafiter:
+                    future = pool.submit(
+                        copy_to_staging, srcfile, root_uep,
+                        srcleaf._v_pathname, stagingdir, allow_padding,
+                        leafkwargs)
+                    pending.append((srcleaf, dstparent, future))
+                    if len(pending) > 2 * jobs:
+                        break
+                if not pending:
+                    break
+                (srcleaf, dstparent, future) = pending.popleft()
+                stagingfile = future.result()
+                with tb.open_file(stagingfile, 'r',
+                                  allow_padding=allow_padding) as stagingfileh:
+                    dstleaf = stagingfileh.root.leaf.copy(
+                        dstparent, srcleaf._v_name, stats=stats,
+                        copyuserattrs=kwargs['copyuserattrs'])
+                os.remove(stagingfile)
+                finish_leaf(srcleaf, dstleaf)
+        finally:
+            for (srcleaf, dstparent, future) in pending:
+                future.cancel()
+            shutil.rmtree(stagingdir, ignore_errors=True)
+
+    for (srcpath, dstparent, name, target) in hardlinks:
+        dstfileh.create_hard_link(dstparent, name, target)
+        stats['hardlinks'] += 1
+        record_node(manifest, dstfileh, srcpath)
+
+
 def _get_parser():
     parser = argparse.ArgumentParser(
         description='''This utility is very powerful and lets you copy any
@@ -384,6 +586,19 @@ def _get_parser():
         help='''remove the possible padding in compound types in source files.
         The default is to propagate it.  Only applies to table objects''',
     )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='''copy the leaves in a group with JOBS worker processes, each one
+        copying a leaf to a staging file which is then stitched into the
+        destination file.  The default is to copy one leaf at a time''',
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help='''record the copied nodes in a manifest file (the destination
+        file name plus "%s"), and do not copy them again when re-running an
+        interrupted copy with this same flag.  The manifest is removed when
+        the copy finishes''' % MANIFEST_SUFFIX.replace('%', '%%'),
+    )
     parser.add_argument(
         'src', metavar='sourcefile:sourcegroup', help='source file/group',
     )
@@ -417,6 +632,9 @@ def main():
             'invalid "complevel" value, it sould be in te range [0, 9]'
         )
 
+    if args.jobs < 1:
+        parser.error('invalid "jobs" value, it should be greater than zero')
+
     # Catch the files passed as the last arguments
     src = args.src.rsplit(':', 1)
     dst = args.dst.rsplit(':', 1)
@@ -495,6 +713,8 @@ def main():
         print("+=+" * 20)
         print("Recursive copy:", args.recursive)
         print("Applying filters:", filters)
+        if args.jobs > 1:
+            print("Parallel jobs:", args.jobs)
         if args.sortby is not None:
             print("Sorting table(s) by column:", args.sortby)
             print("Forcing a CSI creation:", args.checkCSI)
@@ -511,33 +731,60 @@ def main():
     # Close the file again
     h5srcfile.close()
 
+    # Skip the nodes copied by an interrupted run when resuming it.
+    manifest = done = None
+    if args.resume:
+        manifestfile = Path(dstfile + MANIFEST_SUFFIX)
+        if manifestfile.is_file() and Path(dstfile).is_file():
+            done = read_manifest(manifestfile)
+            args.overwritefile = False
+            manifest = open(manifestfile, 'a')
+        else:
+            manifest = open(manifestfile, 'w')
+        if verbose and done is not None:
+            print("Resuming copy, nodes already copied:", len(done))
+
     stats = {'groups': 0, 'leaves': 0, 'links': 0, 'bytes': 0, 'hardlinks': 0}
-    if isinstance(srcnodeobject, tb.group.Group):
-        copy_children(
-            srcfile, dstfile, srcnode, dstnode,
-            title=args.title, recursive=args.recursive, filters=filters,
-            copyuserattrs=args.copyuserattrs, overwritefile=args.overwritefile,
-            overwrtnodes=args.overwrtnodes, stats=stats,
-            start=start, stop=stop, step=step, chunkshape=args.chunkshape,
-            sortby=args.sortby, check_CSI=args.checkCSI,
-            propindexes=args.propindexes,
-            upgradeflavors=args.upgradeflavors,
-            allow_padding=allow_padding,
-            use_hardlinks=True)
-    else:
-        # If not a Group, it should be a Leaf
-        copy_leaf(
-            srcfile, dstfile, srcnode, dstnode,
-            title=args.title, filters=filters,
-            copyuserattrs=args.copyuserattrs,
-            overwritefile=args.overwritefile, overwrtnodes=args.overwrtnodes,
-            stats=stats, start=start, stop=stop, step=step,
-            chunkshape=args.chunkshape,
-            sortby=args.sortby, check_CSI=args.checkCSI,
-            propindexes=args.propindexes,
-            upgradeflavors=args.upgradeflavors,
-            allow_padding=allow_padding,
-        )
+    try:
+        if isinstance(srcnodeobject, tb.group.Group):
+            copy_children(
+                srcfile, dstfile, srcnode, dstnode,
+                title=args.title, recursive=args.recursive, filters=filters,
+                copyuserattrs=args.copyuserattrs,
+                overwritefile=args.overwritefile,
+                overwrtnodes=args.overwrtnodes, stats=stats,
+                start=start, stop=stop, step=step, chunkshape=args.chunkshape,
+                sortby=args.sortby, check_CSI=args.checkCSI,
+                propindexes=args.propindexes,
+                upgradeflavors=args.upgradeflavors,
+                allow_padding=allow_padding,
+                use_hardlinks=True, jobs=args.jobs, manifest=manifest,
+                done=done)
+        elif done is not None and srcnode in done:
+            if verbose:
+                print(f"Skipping {srcfile}:{srcnode}, already copied")
+        else:
+            # If not a Group, it should be a Leaf
+            copy_leaf(
+                srcfile, dstfile, srcnode, dstnode,
+                title=args.title, filters=filters,
+                copyuserattrs=args.copyuserattrs,
+                overwritefile=args.overwritefile,
+                overwrtnodes=args.overwrtnodes or done is not None,
+                stats=stats, start=start, stop=stop, step=step,
+                chunkshape=args.chunkshape,
+                sortby=args.sortby, check_CSI=args.checkCSI,
+                propindexes=args.propindexes,
+                upgradeflavors=args.upgradeflavors,
+                allow_padding=allow_padding,
+            )
+            if manifest is not None:
+                manifest.write(srcnode + '\n')
+    finally:
+        if manifest is not None:
+            manifest.close()
+    if manifest is not None:
+        manifestfile.unlink()
 
     # Gather some statistics
     t2 = clock()
@@ -1,5 +1,6 @@
 """Here is defined the Table class."""
 
+import bisect
 import functools
 import math
 import operator
@@ -12,10 +13,10 @@ from time import perf_counter as clock
 import numexpr as ne
 import numpy as np
 
-from . import tableextension
+from . import chunkio, parallel, tableextension
 from .lrucacheextension import ObjectCache, NumCache
 from .atom import Atom
-from .conditions import compile_condition
+from .conditions import compile_condition, call_on_recarr
 from .flavor import flavor_of, array_as_internal, internal_to_flavor
 from .utils import is_idx, lazyattr, SizeType, NailedDict as CacheDict
 from .leaf import Leaf
@@ -317,6 +318,31 @@ def _column__create_index(self, optlevel, kind, filters, tmp_dir,
     return indexedrows
 
 
+class _ChunkStarts:
+    """Lazy sequence with the first value of every chunk in a column.
+
+    Only one row is read for every accessed item, so this can be fed to
+    the functions in the ``bisect`` module in order to look up values
+    in a sorted column without reading it entirely.
+
+    """
+
+    def __init__(self, table, colpathname):
+        self._table = table
+        self._chunksize = table.chunkshape[0]
+        self._buffer = buf = table._get_container(1)
+        self._column = get_nested_field(buf, colpathname)
+        self._values = {}
+
+    def __getitem__(self, nchunk):
+        values = self._values
+        if nchunk not in values:
+            self._table._read_records(nchunk * self._chunksize, 1,
+                                      self._buffer)
+            values[nchunk] = self._column[0]
+        return values[nchunk]
+
+
 class _ColIndexes(dict):
     """Provides a nice representation of column indexes."""
 
@@ -416,6 +442,12 @@ class Table(tableextension.Table, Leaf):
 
         .. versionadded:: 3.4.3
 
+    attr_phase_change, attr_creation_order, expectedattrs
+        The settings for storing the attributes of the leaf (see
+        :meth:`File.create_group`).
+
+        .. versionadded:: 3.7
+
     Notes
     -----
     The instance variables below are provided in addition to those in
@@ -633,10 +665,68 @@ class Table(tableextension.Table, Leaf):
         """Whether some index in table is dirty."""
         return self._condition_cache._nailcount > 0
 
+    @property
+    def sortedby(self):
+        """The pathname of the column the table is sorted by, or None.
+
+        When this is set to the pathname of a column, the values in that
+        column are checked to be monotonically increasing (repeated
+        values are allowed), and rows appended afterwards are checked
+        to keep that order, otherwise a `ValueError` is raised.  Set it
+        to None in order to drop the declaration.
+
+        Queries on a sorted column which can not use an index look up
+        the bounds of the range of rows to be scanned with two binary
+        searches over the chunks of the table, so only the rows in that
+        range are read afterwards.
+
+        Modifying the values of the sorted column in a way that breaks
+        the order drops the declaration (a `PerformanceWarning` is
+        issued).  This value is persistent.
+
+        .. versionadded:: 3.7
+
+        """
+
+        if 'SORTEDBY' not in self._v_attrs:
+            return None
+        return self._v_attrs.SORTEDBY
+
+    @sortedby.setter
+    def sortedby(self, colpathname):
+        self._g_check_open()
+        self._v_file._check_writable()
+        if colpathname is None:
+            if 'SORTEDBY' in self._v_attrs:
+                del self._v_attrs.SORTEDBY
+                self._condition_cache.clear()
+            return
+
+        colpathname = str(colpathname)
+        if colpathname not in self.coldtypes:
+            raise KeyError("column ``%s`` is not a non-nested column "
+                           "of table ``%s``" % (colpathname, self._v_pathname))
+        dtype = self.coldtypes[colpathname]
+        if dtype.shape != ():
+            raise TypeError("multidimensional columns can not be sorted")
+        if dtype.kind == 'c':
+            raise TypeError("complex columns can not be sorted")
+        # Rows pending in the row buffer should be checked as well.
+        if 'row' in self.__dict__:
+            self.row._flush_buffered_rows()
+        if not self._is_column_sorted(colpathname):
+            raise ValueError("column ``%s`` of table ``%s`` is not sorted"
+                             % (colpathname, self._v_pathname))
+        self._v_attrs.SORTEDBY = colpathname
+        # Conditions compiled until now do not know about the sorted column.
+        self._condition_cache.clear()
+
     def __init__(self, parentnode, name,
                  description=None, title="", filters=None,
                  expectedrows=None, chunkshape=None,
-                 byteorder=None, _log=True, track_times=True):
+                 byteorder=None, _log=True, track_times=True,
+                 attr_phase_change=None, attr_creation_order=None,
+                 expectedattrs=None):
 
         self._v_new = new = description is not None
         """Is this the first time the node has been created?"""
@@ -805,7 +895,9 @@ class Table(tableextension.Table, Leaf):
             self._v_chunkshape = tuple(SizeType(s) for s in chunkshape)
 
         super().__init__(parentnode, name, new, filters, byteorder, _log,
-                         track_times)
+                         track_times, attr_phase_change=attr_phase_change,
+                         attr_creation_order=attr_creation_order,
+                         expectedattrs=expectedattrs)
 
     def _g_post_init_hook(self):
         # We are putting here the index-related issues
@@ -1155,7 +1247,8 @@ very small/large chunksize, you may want to increase/decrease it."""
         self._condition_cache.unnail()
         self._enabled_indexing_in_queries = True
 
-    def _required_expr_vars(self, expression, uservars, depth=1):
+    def _required_expr_vars(self, expression, uservars, depth=1,
+                            user_ns=None):
         """Get the variables required by the `expression`.
 
         A new dictionary defining the variables used in the `expression`
@@ -1174,7 +1267,8 @@ very small/large chunksize, you may want to increase/decrease it."""
         non-column variable values are converted to NumPy arrays.
 
         `depth` specifies the depth of the frame in order to reach local
-        or global variables.
+        or global variables.  A ``(locals, globals)`` pair of mappings may
+        be given as `user_ns` to be used instead of that frame.
 
         """
 
@@ -1197,7 +1291,9 @@ very small/large chunksize, you may want to increase/decrease it."""
         # Get the local and global variable mappings of the user frame
         # if no mapping has been explicitly given for user variables.
         user_locals, user_globals = {}, {}
-        if uservars is None:
+        if uservars is None and user_ns is not None:
+            user_locals, user_globals = user_ns
+        elif uservars is None:
             # We use specified depth to get the frame where the API
             # callable using this method is called.  For instance:
             #
@@ -1330,8 +1426,16 @@ very small/large chunksize, you may want to increase/decrease it."""
                 indexedcols.append(colname)
 
         indexedcols = frozenset(indexedcols)
+        # Get the variables referring to the column the table is sorted by.
+        sortedcols = []
+        sortedby = self.sortedby
+        if self._enabled_indexing_in_queries and sortedby is not None:
+            sortedcols = [colname for colname in colnames
+                          if condvars[colname].pathname == sortedby]
+        sortedcols = frozenset(sortedcols)
         # Now let ``compile_condition()`` do the Numexpr-related job.
-        compiled = compile_condition(condition, typemap, indexedcols)
+        compiled = compile_condition(condition, typemap, indexedcols,
+                                     sortedcols)
 
         # Check that there actually are columns in the condition.
         if not set(compiled.parameters).intersection(set(colnames)):
@@ -1359,6 +1463,9 @@ very small/large chunksize, you may want to increase/decrease it."""
         # Compile the condition and extract usable index conditions.
         condvars = self._required_expr_vars(condition, condvars, depth=2)
         compiled = self._compile_condition(condition, condvars)
+        if compiled.sorted_range:
+            # A sorted column only narrows the range, no index is used
+            return frozenset()
         # Return the columns in indexed expressions
         idxcols = [condvars[var].pathname for var in compiled.index_variables]
         return frozenset(idxcols)
@@ -1478,8 +1585,16 @@ very small/large chunksize, you may want to increase/decrease it."""
         condvars = self._required_expr_vars(condition, condvars, depth=3)
         compiled = self._compile_condition(condition, condvars)
 
+        # Can we narrow the range by means of a sorted column?
+        if compiled.sorted_range:
+            (start, stop) = self._sorted_range(compiled, start, stop, step)
+            if start >= stop:  # no rows in range, reset conditions
+                self._use_index = False
+                self._where_condition = None
+                return iter([])
+            chunkmap = None  # in-kernel query over the narrowed range
         # Can we use indexes?
-        if compiled.index_expressions:
+        elif compiled.index_expressions:
             chunkmap = _table__where_indexed(
                 self, compiled, condition, condvars, start, stop, step)
             if not isinstance(chunkmap, np.ndarray):
@@ -1499,6 +1614,59 @@ very small/large chunksize, you may want to increase/decrease it."""
             show_stats("Exiting table._where", tref)
         return row._iter(start, stop, step, chunkmap=chunkmap)
 
+    def _sorted_range(self, compiled, start, stop, step):
+        """Narrow the `start` and `stop` range by using the sorted column.
+
+        Every expression in the `compiled` condition is converted into a
+        span of chunks by means of binary searches over the first value
+        of each chunk in the sorted column.  Spans are combined as
+        stated in the string expression of the condition and the
+        (start, stop) bounds of the result are returned, with `start`
+        still in the sequence given by `step`.
+
+        """
+
+        chunksize = self.chunkshape[0]
+        # Only chunks in the [start, stop) range of rows are considered.
+        firstchunk = start // chunksize
+        lastchunk = (stop - 1) // chunksize + 1
+        nchunks = lastchunk - firstchunk
+        starts = _ChunkStarts(self, self.sortedby)
+        cmvars = {}
+        for i, (var, ops, lims) in enumerate(compiled.index_expressions):
+            lo, hi = firstchunk, lastchunk
+            for op, lim in zip(ops, lims):
+                # Rows in the chunk before the first one with a matching
+                # start value may also match.
+                if op in ('ge', 'eq'):
+                    lo = max(lo, bisect.bisect_left(
+                        starts, lim, firstchunk, lastchunk) - 1)
+                elif op == 'gt':
+                    lo = max(lo, bisect.bisect_right(
+                        starts, lim, firstchunk, lastchunk) - 1)
+                # No rows match from the first chunk starting past `lim`.
+                if op == 'lt':
+                    hi = min(hi, bisect.bisect_left(
+                        starts, lim, firstchunk, lastchunk))
+                elif op in ('le', 'eq'):
+                    hi = min(hi, bisect.bisect_right(
+                        starts, lim, firstchunk, lastchunk))
+            chunkmap = np.zeros(shape=nchunks, dtype="bool")
+            chunkmap[lo - firstchunk:hi - firstchunk] = True
+            cmvars["e%d" % i] = chunkmap
+
+        # Compute the final chunkmap and get its bounds
+        chunkmap = ne.evaluate(compiled.string_expression, cmvars)
+        nzchunks = np.flatnonzero(chunkmap)
+        if len(nzchunks) == 0:
+            return (start, start)
+        lo = (firstchunk + nzchunks[0]) * chunksize
+        if lo > start:
+            # Keep `start` in the sequence of rows selected by `step`.
+            start += -((start - lo) // step) * step
+        stop = min(stop, (firstchunk + nzchunks[-1] + 1) * chunksize)
+        return (int(start), int(stop))
+
     def read_where(self, condition, condvars=None, field=None,
                    start=None, stop=None, step=None):
         """Read table data fulfilling the given *condition*.
@@ -1535,6 +1703,11 @@ very small/large chunksize, you may want to increase/decrease it."""
         types. The meaning of the other arguments is the same as in the
         :meth:`Table.where` method.
 
+        Rows are read and appended in batches of the size of the I/O buffer.
+        If the descriptions of both tables differ, each column is converted
+        to the type of the column with the same pathname in dstTable, and
+        other columns in dstTable get their default values.
+
         The number of rows appended to dstTable is returned as a result.
 
         .. versionchanged:: 3.0
@@ -1547,21 +1720,47 @@ very small/large chunksize, you may want to increase/decrease it."""
         # Check that the destination file is not in read-only mode.
         dstTable._v_file._check_writable()
 
-        # Row objects do not support nested columns, so we must iterate
-        # over the flat column paths.  When rows support nesting,
-        # ``self.colnames`` can be directly iterated upon.
-        colNames = [colName for colName in self.colpathnames]
-        dstRow = dstTable.row
-        nrows = 0
         if condition is not None:
-            srcRows = self._where(condition, condvars, start, stop, step)
+            condvars = self._required_expr_vars(condition, condvars, depth=2)
+            (start, stop, step) = self._process_range_read(start, stop, step)
         else:
-            srcRows = self.iterrows(start, stop, step)
-        for srcRow in srcRows:
-            for colName in colNames:
-                dstRow[colName] = srcRow[colName]
-            dstRow.append()
-            nrows += 1
+            (start, stop, step) = self._process_range(start, stop, step)
+        return self._append_rows_to(dstTable, condition, condvars,
+                                    start, stop, step)
+
+    def _append_rows_to(self, dstTable, condition, condvars,
+                        start, stop, step):
+        """Append rows from `start` to `stop` fulfilling `condition`.
+
+        This is the private part of `append_where()`, once arguments are
+        processed, and `condvars` maps all the variables in `condition`
+        to their values.
+
+        """
+
+        coords = None
+        if condition is not None:
+            (condition, coords, start, stop) = self._batch_condition(
+                condition, condvars, start, stop, step)
+        if dstTable.description._v_dtype == self.description._v_dtype:
+            colnames = None
+        else:
+            # Row objects do not support nested columns, so we must
+            # convert the flat columns one by one.
+            colnames = self.colpathnames
+            for colname in colnames:
+                dstTable._check_column(colname)
+
+        nrows = 0
+        for batch in self._iter_batches(self.nrowsinbuf, condition, coords,
+                                        start, stop, step, True):
+            if colnames is None:
+                dstTable.append(batch)
+            else:
+                dstTable.append_columns(
+                    {colname: get_nested_field(batch, colname)
+                     for colname in colnames})
+            nrows += len(batch)
         dstTable.flush()
         return nrows
 
@@ -1759,6 +1958,152 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         return self.iterrows()
 
+    def iter_batches(self, batch_rows=None, fields=None, condition=None,
+                     condvars=None, start=None, stop=None, step=None,
+                     reuse_buffer=False):
+        """Iterate over the table in batches of rows.
+
+        This method is a middle ground between :meth:`Table.iterrows`,
+        which yields one Row instance per row, and :meth:`Table.read`,
+        which loads all the selected rows in memory at once.  Each batch
+        is yielded as a structured array of the current flavor with at
+        most batch_rows rows (the number of rows in the I/O buffer by
+        default).
+
+        If fields is a sequence of column pathnames, a dictionary
+        mapping each name to its column in the batch is yielded instead
+        of the structured array.
+
+        If a condition is given, only the rows fulfilling it are
+        included in each batch, and batches with no rows are skipped.
+        The meaning of the condition and condvars arguments is the same
+        as in :meth:`Table.where`.  The meaning of the start, stop and
+        step arguments is the same as in :meth:`Table.read`.
+
+        If reuse_buffer is true, all the batches are views of the same
+        buffer, which is overwritten when the next batch is read.  This
+        avoids allocating a new array for each batch, but batches must
+        be copied if they are needed after the next iteration.
+
+        Examples
+        --------
+
+        ::
+
+            total = 0.
+            for batch in table.iter_batches(condition='var1 > 20'):
+                total += batch['var2'].sum()
+
+            for cols in table.iter_batches(fields=['var1', 'var2']):
+                print(cols['var1'].mean(), cols['var2'].mean())
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._g_check_open()
+        if batch_rows is None:
+            batch_rows = self.nrowsinbuf
+        batch_rows = operator.index(batch_rows)
+        if batch_rows < 1:
+            raise ValueError("`batch_rows` must be greater than zero")
+        if fields is not None:
+            if isinstance(fields, str):
+                raise TypeError("`fields` must be a sequence of "
+                                "column pathnames")
+            fields = list(fields)
+            for field in fields:
+                self._check_column(field)
+        (start, stop, step) = self._process_range(start, stop, step)
+
+        coords = None
+        if condition is not None:
+            condvars = self._required_expr_vars(condition, condvars, depth=2)
+            (condition, coords, start, stop) = self._batch_condition(
+                condition, condvars, start, stop, step)
+
+        batches = self._iter_batches(batch_rows, condition, coords,
+                                     start, stop, step, reuse_buffer)
+        if fields is None:
+            return (internal_to_flavor(batch, self.flavor)
+                    for batch in batches)
+        return ({field: internal_to_flavor(get_nested_field(batch, field),
+                                           self.flavor)
+                 for field in fields}
+                for batch in batches)
+
+    def _batch_condition(self, condition, condvars, start, stop, step):
+        """Prepare a `condition` for selecting rows in `_iter_batches()`.
+
+        `condvars` must map all the variables in `condition` to their
+        values.  A ``(condition, coords, start, stop)`` tuple is
+        returned, with the arguments for `_iter_batches()`.
+
+        """
+
+        # Compile the condition and extract usable index conditions.
+        coords = None
+        compiled = self._compile_condition(condition, condvars)
+        if compiled.index_expressions and not compiled.sorted_range:
+            # Indexed queries give the coordinates of the rows.
+            coords = np.array(
+                [p.nrow for p in self._where(condition, condvars,
+                                             start, stop, step)],
+                dtype=SizeType)
+            self._where_condition = None  # reset the conditions
+            coords.sort()
+            condition = None
+        else:
+            if compiled.sorted_range:
+                (start, stop) = self._sorted_range(compiled, start,
+                                                   stop, step)
+            args = [condvars[param] for param in compiled.parameters]
+            condition = (compiled.function, args, compiled.kwargs)
+        return (condition, coords, start, stop)
+
+    def _iter_batches(self, batch_rows, condition, coords,
+                      start, stop, step, reuse_buffer):
+        """Iterate over batches of rows as internal structured arrays.
+
+        This is the private part of `iter_batches()`, once arguments are
+        processed.  `condition` is either None or a tuple of the compiled
+        function, arguments and keyword arguments of the condition.
+        When `coords` is not None, only these coordinates are read.
+
+        """
+
+        if reuse_buffer:
+            buffer = self._get_container(batch_rows)
+        if coords is not None:
+            nrows = len(coords)
+            batches = range(0, nrows, batch_rows)
+        else:
+            batches = range(start, stop, step * batch_rows)
+
+        for start2 in batches:
+            if coords is not None:
+                bcoords = coords[start2:start2 + batch_rows]
+                nrows = len(bcoords)
+            else:
+                stop2 = min(start2 + step * batch_rows, stop)
+                nrows = len(range(start2, stop2, step))
+            if reuse_buffer:
+                batch = buffer[:nrows]
+            else:
+                batch = self._get_container(nrows)
+
+            self._g_check_open()
+            if coords is not None:
+                self._read_elements(bcoords, batch)
+            else:
+                self._read(start2, stop2, step, out=batch)
+            if condition is not None:
+                func, args, kwargs = condition
+                batch = batch[call_on_recarr(func, args, batch, **kwargs)]
+                if len(batch) == 0:
+                    continue
+            yield batch
+
     def _read(self, start, stop, step, field=None, out=None):
         """Read a range of rows and return an in-memory object."""
 
@@ -1814,7 +2159,9 @@ very small/large chunksize, you may want to increase/decrease it."""
         if step == 1 and not field:
             # This optimization works three times faster than
             # the row._fill_col method (up to 170 MB/s on a pentium IV @ 2GHz)
-            self._read_records(start, stop - start, result)
+            if not (result.dtype == self._v_dtype and
+                    chunkio.read(self, [start], [stop], result)):
+                self._read_records(start, stop - start, result)
         # Warning!: _read_field_name should not be used until
         # H5TBread_fields_name in tableextension will be finished
         # F. Alted 2005/05/26
@@ -1903,6 +2250,158 @@ very small/large chunksize, you may want to increase/decrease it."""
         arr = self._read(start, stop, step, field, out)
         return internal_to_flavor(arr, self.flavor)
 
+    def read_columns(self, names=None, start=None, stop=None, step=None,
+                     out=None):
+        """Get data in the table as a dictionary of column arrays.
+
+        This method works much like :meth:`Table.read`, but the data of
+        every column in names (a sequence of column pathnames, which
+        defaults to :attr:`Table.colpathnames`) is returned in its own
+        contiguous array, instead of in a single structured array.  The
+        result is a dictionary mapping column pathnames to arrays of the
+        current flavor.
+
+        Rows are read in pieces fitting in the I/O buffer of the table,
+        and each piece is copied straight into the arrays of the result,
+        so no temporary structured array holding all the rows is
+        needed.  This is handy for working with NumPy or Numexpr on
+        single columns, which is faster over contiguous arrays than
+        over the strided columns of a structured array.
+
+        The meaning of the start, stop and step parameters is the same
+        as in :meth:`Table.read`.
+
+        The out parameter may be used to specify a dictionary mapping
+        the column pathnames in names to NumPy arrays receiving the data
+        (it is returned then).  Each array must have the shape of the
+        data selected for its column.  Data is cast to the type of each
+        array if needed.
+
+        Examples
+        --------
+
+        ::
+
+            cols = table.read_columns(['var1', 'var3'], stop=100)
+            result = numexpr.evaluate('var1 * var3', cols)
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._g_check_open()
+
+        if names is None:
+            names = self.colpathnames
+        elif isinstance(names, str):
+            raise TypeError("`names` must be a sequence of column pathnames")
+        names = list(names)
+        for name in names:
+            self._check_column(name)
+
+        if out is not None and self.flavor != 'numpy':
+            msg = ("Optional 'out' argument may only be supplied if array "
+                   "flavor is 'numpy', currently is {}").format(self.flavor)
+            raise TypeError(msg)
+
+        (start, stop, step) = self._process_range(start, stop, step)
+        nrows = len(range(start, stop, step))
+
+        iobuf = self._v_iobuf
+        nrowsinbuf = len(iobuf)
+        if out is None:
+            result = {}
+            for name in names:
+                field = get_nested_field(iobuf, name)
+                result[name] = np.empty((nrows,) + field.shape[1:],
+                                        dtype=field.dtype)
+        else:
+            result = out
+            for name in names:
+                if name not in out:
+                    raise KeyError("no output array for column ``%s``"
+                                   % name)
+                field = get_nested_field(iobuf, name)
+                shape = (nrows,) + field.shape[1:]
+                if out[name].shape != shape:
+                    raise ValueError("output array for column ``%s`` "
+                                     "has shape %r, need %r"
+                                     % (name, out[name].shape, shape))
+
+        # Read pieces of the table into the I/O buffer and scatter them
+        # into the columns of the result.
+        nrowsread = 0
+        for start2 in range(start, stop, step * nrowsinbuf):
+            stop2 = min(start2 + step * nrowsinbuf, stop)
+            nrows2 = len(range(start2, stop2, step))
+            buf = iobuf[:nrows2]
+            self._read(start2, stop2, step, out=buf)
+            for name in names:
+                result[name][nrowsread:nrowsread + nrows2] = (
+                    get_nested_field(buf, name))
+            nrowsread += nrows2
+
+        if out is None:
+            for name in names:
+                result[name] = internal_to_flavor(result[name], self.flavor)
+        return result
+
+    def map_chunks(self, func, reduce=None, processes=None, condition=None,
+                   condvars=None, start=None, stop=None,
+                   chunks_per_task=None):
+        """Call func on chunk-aligned ranges of rows in a pool of processes.
+
+        The rows from start to stop (see :meth:`Table.read`) are split
+        in ranges of chunks_per_task whole chunks (as many as fit in the
+        I/O buffer of the table by default), and func is called in a
+        worker process with the rows in each range, as read by
+        :meth:`Table.read`.  If a condition is given, only the rows
+        fulfilling it are passed to func, as read by
+        :meth:`Table.read_where`; the meaning of the condition and
+        condvars arguments is the same as in :meth:`Table.where`.
+
+        The results of the calls are returned in a list, in the order of
+        the rows.  If reduce is given, it is called with the result so
+        far and the next result (in the same order), like in
+        :func:`functools.reduce`, and the final result is returned
+        instead (None if there are no rows).
+
+        The workers belong to a persistent pool of processes (as many as
+        cores in the machine by default), and each one opens the file of
+        the table in read-only mode only once for all the calls, so the
+        file must be in the filesystem and any pending data is flushed
+        first.  func, reduce and the variables in the condition must be
+        picklable, so func must be defined at the top level of a module,
+        not in ``__main__`` of an interactive session.
+
+        Examples
+        --------
+
+        ::
+
+            def count(rows):
+                return len(rows)
+
+            nrows = table.map_chunks(count, reduce=operator.add,
+                                     condition='var1 > 20')
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._g_check_open()
+        if condition is not None:
+            condvars = self._required_expr_vars(condition, condvars, depth=2)
+            values, columns = {}, {}
+            for var, val in condvars.items():
+                if hasattr(val, 'pathname'):  # column of this table
+                    columns[var] = val.pathname
+                else:
+                    values[var] = val
+            condition = (condition, values, columns)
+        return parallel.map_chunks(self, func, reduce, processes, condition,
+                                   start, stop, chunks_per_task)
+
     def _read_coordinates(self, coords, field=None):
         """Private part of `read_coordinates()` with no flavor conversion."""
 
@@ -2126,11 +2625,63 @@ very small/large chunksize, you may want to increase/decrease it."""
         else:
             raise IndexError(f"Invalid index or slice: {key!r}")
 
+    def _is_column_sorted(self, colpathname):
+        """Check that the values in the column are monotonically increasing.
+
+        The column is read in pieces fitting in the I/O buffer.
+
+        """
+
+        nrowsinbuf = self.nrowsinbuf
+        last = None
+        for start in range(0, self.nrows, nrowsinbuf):
+            stop = min(start + nrowsinbuf, self.nrows)
+            values = self._read(start, stop, 1, field=colpathname)
+            if last is not None and not values[0] >= last:
+                return False
+            if not np.all(values[1:] >= values[:-1]):
+                return False
+            last = values[-1]
+        return True
+
+    def _check_sortedby_append(self, wbufRA, lenrows):
+        """Check that rows to be appended keep the table sorted."""
+
+        sortedby = self.sortedby
+        values = get_nested_field(wbufRA, sortedby)[:lenrows]
+        if (not np.all(values[1:] >= values[:-1]) or
+                (self.nrows > 0 and not values[0] >= self._read(
+                    self.nrows - 1, self.nrows, 1, field=sortedby)[0])):
+            raise ValueError("rows to be appended to table ``%s`` would "
+                             "break the order of its sorted column ``%s``"
+                             % (self._v_pathname, sortedby))
+
+    def _check_sortedby_modified(self, colnames):
+        """Drop the sorted column if modifying `colnames` broke its order."""
+
+        sortedby = self.sortedby
+        if sortedby is None or sortedby not in colnames:
+            return
+        if not self._is_column_sorted(sortedby):
+            del self._v_attrs.SORTEDBY
+            self._condition_cache.clear()
+            warnings.warn("column ``%s`` of table ``%s`` is not sorted "
+                          "anymore after being modified; queries on it "
+                          "will scan the whole table"
+                          % (sortedby, self._v_pathname),
+                          PerformanceWarning)
+
     def _save_buffered_rows(self, wbufRA, lenrows):
         """Update the indexes after a flushing of rows."""
 
-        self._open_append(wbufRA)
-        self._append_records(lenrows)
+        if self.sortedby is not None:
+            self._check_sortedby_append(wbufRA, lenrows)
+
+        def append_rows(recarr):
+            self._open_append(recarr)
+            self._append_records(len(recarr))
+
+        chunkio.append(self, wbufRA[:lenrows], append_rows)
         self._close_append()
         if self.indexed:
             self._unsaved_indexedrows += lenrows
@@ -2203,6 +2754,83 @@ very small/large chunksize, you may want to increase/decrease it."""
             # Save write buffer to disk
             self._save_buffered_rows(wbufRA, lenrows)
 
+    def append_columns(self, columns):
+        """Append rows given as separate column arrays to the table.
+
+        The columns argument is a dictionary mapping column pathnames
+        (which may also name nested columns as a whole) to objects which
+        can be converted into arrays with the type and shape of the
+        respective columns, and the same number of rows.  Columns
+        missing in the dictionary are filled with their default values.
+
+        Unlike :meth:`Table.append`, no structured array holding all
+        the new rows is built: the columns are interleaved into a buffer
+        of the size of the I/O buffer of the table, which is written
+        each time it gets full, so appending uses a constant amount of
+        additional memory.
+
+        Examples
+        --------
+
+        ::
+
+            table.append_columns({'name': names, 'lati': latitudes,
+                                  'longi': longitudes})
+
+        .. versionadded:: 3.7
+
+        """
+
+        self._g_check_open()
+        self._v_file._check_writable()
+
+        if not self._chunked:
+            raise HDF5ExtError(
+                "You cannot append rows to a non-chunked table.", h5bt=False)
+
+        wbufRA = self._get_container(self.nrowsinbuf)
+        arrays = {}
+        lenrows = None
+        for name, column in columns.items():
+            self._check_column(name)
+            field = get_nested_field(wbufRA, name)
+            try:
+                iflavor = flavor_of(column)
+                if iflavor != 'python':
+                    column = array_as_internal(column, iflavor)
+                column = np.asarray(column, dtype=field.dtype)
+            except Exception as exc:
+                raise ValueError("column ``%s`` cannot be converted into "
+                                 "an array compliant with table '%s'. "
+                                 "The error was: <%s>" % (name, self, exc))
+            if column.ndim == 0 or column.shape[1:] != field.shape[1:]:
+                raise ValueError("column ``%s`` has shape %r, which is not "
+                                 "compliant with table '%s'"
+                                 % (name, column.shape, self))
+            if lenrows is None:
+                lenrows = len(column)
+            elif len(column) != lenrows:
+                raise ValueError("all columns must have the same number "
+                                 "of rows")
+            arrays[name] = column
+        # If the number of rows to append is zero, don't do anything else
+        if not lenrows:
+            return
+
+        # Columns missing in the dictionary get their default values.
+        wdflts = self._v_wdflts
+        if wdflts is None:
+            wbufRA[:] = np.zeros(1, dtype=wbufRA.dtype)
+        else:
+            wbufRA[:] = wdflts
+        for start in range(0, lenrows, len(wbufRA)):
+            nrows = min(len(wbufRA), lenrows - start)
+            for name, column in arrays.items():
+                get_nested_field(wbufRA, name)[:nrows] = (
+                    column[start:start + nrows])
+            # Save write buffer to disk
+            self._save_buffered_rows(wbufRA, nrows)
+
     def _conv_to_recarr(self, obj):
         """Try to convert the object into a recarray."""
 
@@ -2689,6 +3317,7 @@ very small/large chunksize, you may want to increase/decrease it."""
     def _reindex(self, colnames):
         """Re-index columns in `colnames` if automatic indexing is true."""
 
+        self._check_sortedby_modified(colnames)
         if self.indexed:
             colindexed, cols = self.colindexed, self.cols
             colstoindex = []
@@ -2742,6 +3371,12 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         self._do_reindex(dirty=True)
 
+    def _g_truncate(self, size):
+        """Truncate the table to `size` rows and update its NROWS."""
+
+        super()._g_truncate(size)
+        self._close_append()
+
     def _g_copy_rows(self, object, start, stop, step, sortby, checkCSI):
         """Copy rows from self to object"""
         if sortby is None:
@@ -2810,6 +3445,15 @@ very small/large chunksize, you may want to increase/decrease it."""
         sortby = kwargs.pop('sortby', None)
         propindexes = kwargs.pop('propindexes', False)
         checkCSI = kwargs.pop('checkCSI', False)
+        condition = kwargs.pop('condition', None)
+        condvars = kwargs.pop('condvars', None)
+        if condition is not None:
+            if sortby is not None:
+                raise ValueError("``sortby`` and ``condition`` can not be "
+                                 "used together in a table copy")
+            # Only columns can be used as variables unless they are
+            # given (see `Table.copy()`).
+            condvars = self._required_expr_vars(condition, condvars or {})
         # Compute the correct indices.
         (start, stop, step) = self._process_range_read(
             start, stop, step, warn_negstep=sortby is None)
@@ -2820,7 +3464,19 @@ very small/large chunksize, you may want to increase/decrease it."""
                          filters=filters, expectedrows=nrows,
                          chunkshape=chunkshape,
                          _log=_log)
-        self._g_copy_rows(newtable, start, stop, step, sortby, checkCSI)
+        if condition is not None:
+            self._append_rows_to(newtable, condition, condvars,
+                                 start, stop, step)
+        elif sortby is None and chunkio.can_copy(self, newtable, start, stop,
+                                                 step):
+            # Copy the chunks as stored, without refiltering them
+            newtable._g_truncate(nrows)
+            chunkio.copy(self, newtable, start, stop)
+        else:
+            self._g_copy_rows(newtable, start, stop, step, sortby, checkCSI)
+        # A copy in the original order is still sorted.
+        if self.sortedby is not None and sortby is None and step > 0:
+            newtable._v_attrs.SORTEDBY = self.sortedby
         nbytes = newtable.nrows * newtable.rowsize
         # Generate equivalent indexes in the new table, if required.
         if propindexes and self.indexed:
@@ -2855,9 +3511,24 @@ very small/large chunksize, you may want to increase/decrease it."""
             If true, the existing indexes in the source table are propagated
             (created) to the new one.  If false (the default), the indexes are
             not propagated.
+        condition
+            If specified, only the rows fulfilling this condition (in the
+            range given by the start, stop and step keywords) are copied.
+            It can not be used together with sortby.
+        condvars
+            The variables in condition, with the same meaning as in
+            :meth:`Table.where`.  When copying groups (or files) with a
+            condition, variables which are not columns must be given here.
+
+        .. versionchanged:: 3.7
+           The *condition* and *condvars* keywords were added.
 
         """
 
+        condition = kwargs.get('condition')
+        if condition is not None:
+            kwargs['condvars'] = self._required_expr_vars(
+                condition, kwargs.get('condvars'), depth=2)
         return super().copy(
             newparent, newname, overwrite, createparents, **kwargs)
 
@@ -2881,6 +3552,20 @@ very small/large chunksize, you may want to increase/decrease it."""
 
         super().flush()
 
+    def refresh(self):
+        """Re-read the number of rows of the table from the file.
+
+        See :meth:`Leaf.refresh` for more info.  The table caches for
+        indexed queries are invalidated too.
+
+        .. versionadded:: 3.7
+
+        """
+
+        super().refresh()
+        # The table caches for indexed queries may be stale now
+        self._dirtycache = True
+
     def _g_pre_kill_hook(self):
         """Code to be called before killing the node."""
 
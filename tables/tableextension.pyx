@@ -31,10 +31,11 @@ from .conditions import call_on_recarr
 from .utilsextension import (get_nested_field, atom_from_hdf5_type,
   create_nested_type, hdf5_to_np_ext_type, create_nested_type, platform_byteorder,
   pttype_to_hdf5, pt_special_kinds, npext_prefixes_to_ptkinds, hdf5_class_to_string,
-  H5T_STD_I64)
+  H5T_STD_I64, hdf5_lock)
 from .utils import SizeType
 
-from .utilsextension cimport get_native_type, cstr_to_pystr
+from .utilsextension cimport (get_native_type, cstr_to_pystr,
+  acquire_hdf5_lock, release_hdf5_lock)
 
 # numpy functions & objects
 from hdf5extension cimport Leaf
@@ -55,7 +56,7 @@ from .definitions cimport (hid_t, herr_t, hsize_t, htri_t, hbool_t,
   H5Tget_nmembers, H5Tget_member_name, H5Tget_member_type, H5Tget_native_type,
   H5Tget_member_offset, H5Tinsert, H5Tget_class, H5Tget_super, H5Tget_offset,
   H5T_cset_t, H5T_CSET_ASCII, H5T_CSET_UTF8,
-  H5ATTRset_attribute_string, H5ATTRset_attribute,
+  H5ATTRset_attribute_string, H5ATTRset_attribute, H5ATTRcopy_attributes,
   get_len_of_range, get_order, set_order, is_complex,
   conv_float64_timeval32, truncate_dset,
   pt_H5free_memory)
@@ -74,7 +75,9 @@ cdef extern from "H5TB-opt.h" nogil:
                           hid_t mem_type_id, hsize_t nrecords,
                           hsize_t chunk_size, void *fill_data, int compress,
                           char *complib, int shuffle, int fletcher32,
-                          hbool_t track_times, void *data )
+                          hbool_t track_times, int attr_max_compact,
+                          int attr_min_dense, int attr_creation_order,
+                          void *data )
 
   herr_t H5TBOread_records( hid_t dataset_id, hid_t mem_type_id,
                             hsize_t start, hsize_t nrecords, void *data )
@@ -165,6 +168,7 @@ cdef class Table(Leaf):
     cdef char fieldname[128]
     cdef int i
     cdef H5T_cset_t cset = H5T_CSET_ASCII
+    cdef int max_compact, min_dense, creation_order
 
     encoded_title = title.encode('utf-8')
     encoded_complib = complib.encode('utf-8')
@@ -197,6 +201,7 @@ cdef class Table(Leaf):
       data = NULL
 
     class_ = self._c_classid.encode('utf-8')
+    (max_compact, min_dense, creation_order) = self._want_attr_storage
     self.dataset_id = H5TBOmake_table(ctitle, self.parent_id, encoded_name,
                                       cobversion, class_, self.disk_type_id,
                                       self.nrows, self.chunkshape[0],
@@ -204,7 +209,8 @@ cdef class Table(Leaf):
                                       self.filters.complevel, encoded_complib,
                                       self.filters.shuffle_bitshuffle,
                                       self.filters.fletcher32,
-                                      self._want_track_times, data)
+                                      self._want_track_times, max_compact,
+                                      min_dense, creation_order, data)
     if self.dataset_id < 0:
       raise HDF5ExtError("Problems creating the table")
 
@@ -255,6 +261,65 @@ cdef class Table(Leaf):
     # Finally, return the object identifier.
     return self.dataset_id
 
+  def _create_tables_like(self, list names, list recarrays, title, complib,
+                          obversion):
+    """Create tables like this one, named after `names` in its group.
+
+    This is a fast path for `File.create_tables()`, where no node
+    objects are created for the new tables.  They get the type,
+    chunkshape, filters and attributes of this (just created) table,
+    and their rows are in the `recarrays` NumPy arrays, which must have
+    the same dtype and byteorder as the initial rows of this table.
+
+    """
+
+    cdef int i
+    cdef hid_t dataset_id
+    cdef hsize_t nrows, chunksize
+    cdef void *data
+    cdef void *fill_data
+    cdef ndarray wdflts, recarr
+    cdef bytes encoded_title, encoded_complib, encoded_obversion, class_
+    cdef bytes encoded_name
+    cdef int sys_attrs, max_compact, min_dense, creation_order
+
+    encoded_title = title.encode('utf-8')
+    encoded_complib = complib.encode('utf-8')
+    encoded_obversion = obversion.encode('utf-8')
+    class_ = self._c_classid.encode('utf-8')
+    sys_attrs = self._v_file.params['PYTABLES_SYS_ATTRS']
+    wdflts = self._v_wdflts
+    fill_data = NULL if wdflts is None else PyArray_DATA(wdflts)
+    chunksize = self.chunkshape[0]
+    (max_compact, min_dense, creation_order) = self._want_attr_storage
+
+    for i in range(len(names)):
+      encoded_name = names[i].encode('utf-8')
+      recarr = recarrays[i]
+      nrows = len(recarr)
+      data = PyArray_DATA(recarr) if nrows > 0 else NULL
+      dataset_id = H5TBOmake_table(encoded_title, self.parent_id,
+                                   encoded_name, encoded_obversion, class_,
+                                   self.disk_type_id, nrows, chunksize,
+                                   fill_data, self.filters.complevel,
+                                   encoded_complib,
+                                   self.filters.shuffle_bitshuffle,
+                                   self.filters.fletcher32,
+                                   self._want_track_times, max_compact,
+                                   min_dense, creation_order, data)
+      if dataset_id < 0:
+        raise HDF5ExtError("Problems creating the table ``%s``." % names[i])
+
+      # Copy the system attributes of this table and fix the number of rows
+      if (H5ATTRcopy_attributes(self.dataset_id, dataset_id) < 0 or
+          (sys_attrs and
+           H5ATTRset_attribute(dataset_id, "NROWS", H5T_STD_I64, 0, NULL,
+                               <char *>&nrows) < 0)):
+        H5Dclose(dataset_id)
+        raise HDF5ExtError("Can't set the system attributes of the table "
+                           "``%s``." % names[i])
+      H5Dclose(dataset_id)
+
 
   cdef get_nested_type(self, hid_t type_id, hid_t native_type_id,
                        object colpath, object field_byteorders):
@@ -443,8 +508,9 @@ cdef class Table(Leaf):
     nelements = nparr.size // len(nparr)
     t64buf = PyArray_DATA(nparr)
 
-    conv_float64_timeval32(
-      t64buf, byteoffset, bytestride, nrecords, nelements, sense)
+    with nogil:
+      conv_float64_timeval32(
+        t64buf, byteoffset, bytestride, nrecords, nelements, sense)
 
   cpdef _convert_types(self, ndarray recarr, hsize_t nrecords, int sense):
     """Converts columns in 'recarr' between NumPy and HDF5 formats.
@@ -487,9 +553,11 @@ cdef class Table(Leaf):
     nrows = self.nrows
     # release GIL (allow other threads to use the Python interpreter)
     with nogil:
+        acquire_hdf5_lock()
         # Append the records:
         ret = H5TBOappend_records(self.dataset_id, self.type_id,
                                   nrecords, nrows, self.wbuf)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Problems appending the records.")
@@ -498,12 +566,15 @@ cdef class Table(Leaf):
 
   def _close_append(self):
     cdef hsize_t nrows
+    cdef herr_t ret
 
     if self._v_file.params['PYTABLES_SYS_ATTRS']:
       # Update the NROWS attribute
       nrows = self.nrows
-      if (H5ATTRset_attribute(self.dataset_id, "NROWS", H5T_STD_I64,
-                              0, NULL, <char *>&nrows) < 0):
+      with hdf5_lock:
+        ret = H5ATTRset_attribute(self.dataset_id, "NROWS", H5T_STD_I64,
+                                  0, NULL, <char *>&nrows)
+      if ret < 0:
         raise HDF5ExtError("Problems setting the NROWS attribute.")
 
     # Set the caches to dirty (in fact, and for the append case,
@@ -531,8 +602,10 @@ cdef class Table(Leaf):
     self._convert_types(recarr, nrecords, 0)
     # Update the records:
     with nogil:
+        acquire_hdf5_lock()
         ret = H5TBOwrite_records(self.dataset_id, self.type_id,
                                  start, nrecords, step, rbuf )
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Problems updating the records.")
@@ -557,8 +630,10 @@ cdef class Table(Leaf):
 
     # Update the records:
     with nogil:
+        acquire_hdf5_lock()
         ret = H5TBOwrite_elements(self.dataset_id, self.type_id,
                                   nrecords, rcoords, rbuf)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Problems updating the records.")
@@ -579,8 +654,10 @@ cdef class Table(Leaf):
 
     # Read the records from disk
     with nogil:
+        acquire_hdf5_lock()
         ret = H5TBOread_records(self.dataset_id, self.type_id, start,
                                 nrecords, rbuf)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Problems reading records.")
@@ -612,8 +689,10 @@ cdef class Table(Leaf):
     else:
       # Chunk is not in cache. Read it and put it in the LRU cache.
       with nogil:
+          acquire_hdf5_lock()
           ret = H5TBOread_records(self.dataset_id, self.type_id,
                                   start, nrecords, rbuf)
+          release_hdf5_lock()
 
       if ret < 0:
         raise HDF5ExtError("Problems reading chunk records.")
@@ -634,8 +713,10 @@ cdef class Table(Leaf):
     rbuf2 = PyArray_DATA(coords)
 
     with nogil:
+        acquire_hdf5_lock()
         ret = H5TBOread_elements(self.dataset_id, self.type_id,
                                  nrecords, rbuf2, rbuf)
+        release_hdf5_lock()
 
     if ret < 0:
       raise HDF5ExtError("Problems reading records.")
@@ -654,17 +735,18 @@ cdef class Table(Leaf):
       nrecords = stop - start
       rowsize = self.rowsize
       # Using self.disk_type_id should be faster (i.e. less conversions)
-      if (H5TBOdelete_records(self.dataset_id, self.disk_type_id,
-                              self.nrows, rowsize, start, nrecords,
-                              self.nrowsinbuf) < 0):
-        raise HDF5ExtError("Problems deleting records.")
-
-      self.nrows = self.nrows - nrecords
-      if self._v_file.params['PYTABLES_SYS_ATTRS']:
-        # Attach the NROWS attribute
-        nrecords2 = self.nrows
-        H5ATTRset_attribute(self.dataset_id, "NROWS", H5T_STD_I64,
-                            0, NULL, <char *>&nrecords2)
+      with hdf5_lock:
+        if (H5TBOdelete_records(self.dataset_id, self.disk_type_id,
+                                self.nrows, rowsize, start, nrecords,
+                                self.nrowsinbuf) < 0):
+          raise HDF5ExtError("Problems deleting records.")
+
+        self.nrows = self.nrows - nrecords
+        if self._v_file.params['PYTABLES_SYS_ATTRS']:
+          # Attach the NROWS attribute
+          nrecords2 = self.nrows
+          H5ATTRset_attribute(self.dataset_id, "NROWS", H5T_STD_I64,
+                              0, NULL, <char *>&nrecords2)
       # Set the caches to dirty
       self._dirtycache = True
     elif step == -1:
@@ -1196,6 +1278,8 @@ cdef class Row:
     self.seqcache_key = None
     if self._mod_nrows > 0:    # Check if there is some modified row
       self._flush_mod_rows()     # Flush any possible modified row
+    if self.modified_fields:   # Check that the sorted column is still sorted
+      self.table._check_sortedby_modified(self.modified_fields)
     self.modified_fields = set()  # Empty the set of modified fields
     raise StopIteration        # end of iteration
 
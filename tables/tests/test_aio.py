@@ -0,0 +1,210 @@
+"""Test module for the asyncio front-end."""
+
+import sys
+import asyncio
+import threading
+
+import numpy as np
+
+import tables as tb
+import tables.aio
+from tables.tests import common
+
+
+class AsyncTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Using files and nodes from coroutines."""
+
+    def setUp(self):
+        super().setUp()
+
+        data = np.zeros(1000, dtype=[('x', 'i4'), ('y', 'f8')])
+        data['x'] = np.arange(1000)
+        data['y'] = np.arange(1000) / 10
+        self.data = data
+        self.h5file.create_table('/', 'table', data, chunkshape=16)
+        self.h5file.create_earray('/', 'earray', obj=data['x'].reshape(100, 10),
+                                  chunkshape=(8, 10))
+        vlarray = self.h5file.create_vlarray('/', 'vlarray', tb.Int32Atom())
+        for i in range(20):
+            vlarray.append(np.arange(i))
+        self._reopen('a')
+        self.h5file.root.table.nrowsinbuf = 100
+        self.h5file.root.earray.nrowsinbuf = 8
+        self.h5file.root.vlarray.nrowsinbuf = 3
+
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    def test00_open_file(self):
+        """Opening and closing a file."""
+
+        self.h5file.close()
+
+        async def main():
+            async with await tables.aio.open_file(self.h5fname) as h5file:
+                self.assertTrue(h5file.isopen)
+                self.assertEqual(h5file.mode, 'r')
+                table = await h5file.get_node('/table')
+                self.assertIsInstance(table, tables.aio.AsyncTable)
+                self.assertEqual(table.nrows, 1000)
+                nodes = await h5file.list_nodes('/')
+                self.assertEqual(
+                    sorted(type(node).__name__ for node in nodes),
+                    ['AsyncArray', 'AsyncTable', 'AsyncVLArray'])
+            return h5file
+
+        h5file = self._run(main())
+        self.assertFalse(h5file.isopen)
+        self.h5file = tb.open_file(self.h5fname)
+
+    def test01_table(self):
+        """Reading a table."""
+
+        data = self.data
+
+        async def main():
+            afile = tables.aio.AsyncFile(self.h5file)
+            table = await afile.get_node('/table')
+            self.assertTrue(common.areArraysEqual(await table.read(), data))
+            self.assertTrue(common.areArraysEqual(
+                await table.read(5, 950, 3), data[5:950:3]))
+            self.assertTrue(common.areArraysEqual(
+                await table.read(field='y'), data['y']))
+            self.assertTrue(common.areArraysEqual(await table[10:20],
+                                                  data[10:20]))
+            limit = 300
+            self.assertTrue(common.areArraysEqual(
+                await table.read_where('(x > 100) & (x < limit)'),
+                data[101:300]))
+            self.assertEqual((await table.get_where_list('x < 5')).tolist(),
+                             list(range(5)))
+            self.assertTrue(common.areArraysEqual(
+                await table.read_coordinates([1, 3]), data[[1, 3]]))
+            batches = [batch async for batch in table.iter_batches(
+                batch_rows=64, condition='x % 2 == 0')]
+            self.assertEqual(len(batches), 16)
+            self.assertTrue(common.areArraysEqual(np.concatenate(batches),
+                                                  data[::2]))
+
+        self._run(main())
+
+    def test02_arrays(self):
+        """Reading and appending to arrays."""
+
+        async def main():
+            afile = tables.aio.AsyncFile(self.h5file)
+            earray = await afile.get_node('/earray')
+            data = np.arange(1000).reshape(100, 10)
+            self.assertTrue(common.areArraysEqual(await earray.read(), data))
+            self.assertTrue(common.areArraysEqual(
+                await earray.read(3, 90, 7), data[3:90:7]))
+            self.assertTrue(common.areArraysEqual(await earray[5, 2:],
+                                                  data[5, 2:]))
+            await earray.append(data)
+            self.assertEqual(earray.nrows, 200)
+
+            vlarray = await afile.get_node('/vlarray')
+            rows = await vlarray.read(2, 17)
+            self.assertEqual([row.tolist() for row in rows],
+                             [list(range(i)) for i in range(2, 17)])
+            self.assertEqual((await vlarray[5]).tolist(), list(range(5)))
+
+        self._run(main())
+
+    def test03_serialized(self):
+        """Calls on the same file do not run concurrently."""
+
+        running = []
+        overlaps = []
+
+        def slow_read(start, stop):
+            running.append(threading.get_ident())
+            if len(running) > 1:
+                overlaps.append(True)
+            try:
+                return self.h5file.root.table.read(start, stop)
+            finally:
+                running.pop()
+
+        async def main():
+            afile = tables.aio.AsyncFile(self.h5file)
+            results = await asyncio.gather(*[
+                afile._run(slow_read, i, i + 10) for i in range(0, 100, 10)])
+            return np.concatenate(results)
+
+        result = self._run(main())
+        self.assertEqual(overlaps, [])
+        self.assertTrue(common.areArraysEqual(result, self.data[:100]))
+
+    def test04_cancel(self):
+        """Cancelling a read between buffers."""
+
+        calls = []
+        cancelled = threading.Event()
+        table = self.h5file.root.table
+        read = table.read
+
+        def counted_read(*args):
+            calls.append(args)
+            # Keep the first buffer being read until the task is cancelled.
+            self.assertTrue(cancelled.wait(10))
+            return read(*args)
+
+        async def main():
+            afile = tables.aio.AsyncFile(self.h5file)
+            atable = await afile.get_node('/table')
+            task = asyncio.ensure_future(atable.read())
+            while not calls:
+                await asyncio.sleep(0.001)
+            task.cancel()
+            cancelled.set()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # Following calls wait for the running one.
+            self.assertEqual(len(await atable.read(0, 10)), 10)
+
+        table.read = counted_read
+        try:
+            self._run(main())
+        finally:
+            del table.read
+        # No more buffers are read after cancelling.
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(calls[1][:2], (0, 10))
+
+    def test05_condition_tasks(self):
+        """Condition variables are taken from the caller in tasks."""
+
+        data = self.data
+
+        async def main():
+            afile = tables.aio.AsyncFile(self.h5file)
+            table = await afile.get_node('/table')
+            limit = 20
+            rows, coords = await asyncio.gather(
+                table.read_where('x < limit'),
+                asyncio.create_task(table.get_where_list('x < limit')))
+            self.assertTrue(common.areArraysEqual(rows, data[:20]))
+            self.assertEqual(coords.tolist(), list(range(20)))
+            batches = table.iter_batches(condition='x < limit')
+            limit = 0
+            self.assertEqual(
+                sum([len(batch) async for batch in batches]), 20)
+
+        self._run(main())
+
+
+def suite():
+    theSuite = common.unittest.TestSuite()
+    niter = 1
+
+    for i in range(niter):
+        theSuite.addTest(common.unittest.makeSuite(AsyncTestCase))
+
+    return theSuite
+
+
+if __name__ == '__main__':
+    common.parse_argv(sys.argv)
+    common.print_versions()
+    common.unittest.main(defaultTest='suite')
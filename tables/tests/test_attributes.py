@@ -1825,7 +1825,158 @@ class UnsupportedAttrTypeTestCase(common.TestFileMixin,
     def test00_unsupportedType(self):
         """Checking file with unsupported type."""
 
-        self.assertWarns(tb.exceptions.DataTypeWarning, repr, self.h5file)
+        # Attribute values are only read when accessed.
+        attrs = self.h5file.root.wfm_group0.axes.axis0._v_attrs
+        self.assertEqual(attrs._v_unimplemented, [])
+        self.assertWarns(tb.exceptions.DataTypeWarning, repr, attrs)
+        self.assertEqual(attrs._v_unimplemented, ['ref_time'])
+
+
+class LazyAttrsTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Reading attribute values on first access."""
+
+    def setUp(self):
+        super().setUp()
+
+        attrs = self.h5file.root._v_attrs
+        attrs.scalar = 1
+        attrs.array = np.arange(10)
+        attrs.obj = {'a': [1, 2]}
+        attrs.text = 'text'
+        self._reopen()
+
+    def test00_lazy(self):
+        """Attribute values are read when first accessed."""
+
+        attrs = self.h5file.root._v_attrs
+        self.assertEqual(attrs._f_list(), ['array', 'obj', 'scalar', 'text'])
+        self.assertNotIn('array', attrs.__dict__)
+        self.assertIn('array', dir(attrs))
+        self.assertTrue(common.areArraysEqual(attrs.array, np.arange(10)))
+        self.assertIn('array', attrs.__dict__)
+        self.assertEqual(attrs['obj'], {'a': [1, 2]})
+        self.assertNotIn('text', attrs.__dict__)
+
+    def test01_get_many(self):
+        """Getting several attributes at once."""
+
+        attrs = self.h5file.root._v_attrs
+        self.assertEqual(attrs.scalar, 1)
+        values = attrs._f_get_many(['text', 'obj', 'scalar', 'text'])
+        self.assertEqual(values, {'text': 'text', 'obj': {'a': [1, 2]},
+                                  'scalar': 1})
+        self.assertIsInstance(values['text'], str)
+        self.assertEqual(attrs._f_get_many([]), {})
+        self.assertRaises(AttributeError, attrs._f_get_many,
+                          ['scalar', 'missing'])
+
+    def test02_delete(self):
+        """Deleting and copying attributes which have not been read."""
+
+        self._reopen('a')
+        attrs = self.h5file.root._v_attrs
+        del attrs.array
+        self.assertNotIn('array', attrs)
+        group = self.h5file.create_group('/', 'group')
+        attrs._f_copy(group)
+        self.assertEqual(group._v_attrs._f_get_many(['obj', 'scalar']),
+                         {'obj': {'a': [1, 2]}, 'scalar': 1})
+
+
+class AttrStorageTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Storing the attributes of nodes densely."""
+
+    nattrs = 100
+
+    def _fill(self, node):
+        attrs = node._v_attrs
+        for i in range(self.nattrs):
+            setattr(attrs, 'attr%03d' % i, i)
+        return node._v_pathname
+
+    def _check(self, path):
+        attrs = self.h5file.get_node(path)._v_attrs
+        names = ['attr%03d' % i for i in range(self.nattrs)]
+        self.assertEqual(attrs._f_list(), names)
+        self.assertEqual(attrs.attr042, 42)
+        self.assertEqual(attrs._f_get_many(['attr000', 'attr099']),
+                         {'attr000': 0, 'attr099': 99})
+        self.assertNotIn('attr100', attrs)
+        if self.h5file.mode != 'r':
+            del attrs.attr042
+            self.assertNotIn('attr042', attrs)
+            self.assertEqual(len(attrs._f_list()), self.nattrs - 1)
+
+    def test00_create(self):
+        """Creating nodes with dense attribute storage."""
+
+        h5file = self.h5file
+        paths = [
+            self._fill(h5file.create_group(
+                '/', 'group', attr_phase_change=(8, 6))),
+            self._fill(h5file.create_array(
+                '/', 'array', [1, 2], attr_phase_change=(0, 0))),
+            self._fill(h5file.create_carray(
+                '/', 'carray', tb.Int8Atom(), (2,), attr_creation_order=True)),
+            self._fill(h5file.create_earray(
+                '/', 'earray', tb.Int8Atom(), (0,),
+                attr_phase_change=(4, 2))),
+            self._fill(h5file.create_vlarray(
+                '/', 'vlarray', tb.Int8Atom(), attr_phase_change=(8, 6))),
+            self._fill(h5file.create_table(
+                '/', 'table', {'x': tb.Int8Col()}, attr_phase_change=(8, 6),
+                attr_creation_order=True)),
+        ]
+        self._reopen()
+        for path in paths:
+            self._check(path)
+        self._reopen('a')
+        for path in paths:
+            self._check(path)
+        self._reopen()
+        for path in paths:
+            self.assertNotIn('attr042', self.h5file.get_node(path)._v_attrs)
+
+    def test01_params(self):
+        """Dense attribute storage for all the new nodes in a file."""
+
+        self._reopen('a', attr_phase_change=(8, 6))
+        group = self.h5file.create_group('/', 'group')
+        table = self.h5file.create_table(group, 'table', {'x': tb.Int8Col()})
+        paths = [self._fill(group), self._fill(table)]
+        self._reopen('a')
+        for path in paths:
+            self._check(path)
+
+    def test02_invalid(self):
+        """Invalid phase change values."""
+
+        for value in [(4, 6), (-1, 0), (70000, 6), 8]:
+            self.assertRaises((ValueError, TypeError), self.h5file.create_group,
+                              '/', 'group', attr_phase_change=value)
+        self.assertNotIn('/group', self.h5file)
+
+    def test03_expectedattrs(self):
+        """Dense attribute storage for nodes with many expected attributes."""
+
+        h5file = self.h5file
+        group = h5file.create_group('/', 'group', expectedattrs=self.nattrs)
+        array = h5file.create_array(group, 'array', [1, 2],
+                                    expectedattrs=self.nattrs)
+        table = h5file.create_table(group, 'table', {'x': tb.Int8Col()},
+                                    expectedattrs=self.nattrs)
+        for node in [group, array, table]:
+            self.assertEqual(node._want_attr_storage, (8, 6, 0))
+        # A few attributes, or an explicit setting, keep the default.
+        few = h5file.create_group('/', 'few', expectedattrs=5)
+        self.assertEqual(few._want_attr_storage, (-1, -1, 0))
+        explicit = h5file.create_group('/', 'explicit', expectedattrs=500,
+                                       attr_phase_change=(16, 8))
+        self.assertEqual(explicit._want_attr_storage, (16, 8, 0))
+        paths = [self._fill(node) for node in [group, array, table]]
+        self._reopen()
+        for path in paths:
+            self._check(path)
 
 
 # Test for specific system attributes
@@ -1880,6 +2031,8 @@ def suite():
         theSuite.addTest(common.unittest.makeSuite(VlenStrAttrTestCase))
         theSuite.addTest(common.unittest.makeSuite(
             UnsupportedAttrTypeTestCase))
+        theSuite.addTest(common.unittest.makeSuite(LazyAttrsTestCase))
+        theSuite.addTest(common.unittest.makeSuite(AttrStorageTestCase))
         theSuite.addTest(common.unittest.makeSuite(SpecificAttrsTestCase))
 
     return theSuite
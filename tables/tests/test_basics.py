@@ -1396,6 +1396,167 @@ class ThreadingTestCase(common.TempFileMixin, common.PyTablesTestCase):
             t.join()
 
 
+@common.unittest.skipIf(tb.file._FILE_OPEN_POLICY == 'strict',
+                        'FILE_OPEN_POLICY = "strict"')
+class HDF5LockTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test the lock serializing the calls to HDF5."""
+
+    def setUp(self):
+        super().setUp()
+        self.data = np.arange(200 * 300).reshape(200, 300) % 123
+        self.h5file.create_carray('/', 'test_array', obj=self.data,
+                                  filters=tb.Filters(complevel=1),
+                                  chunkshape=(10, 300))
+        table = self.h5file.create_table('/', 'test_table',
+                                         {'x': tb.Int64Col()})
+        table.append_columns({'x': self.data[:, 0]})
+        self.h5file.close()
+
+    def test00_reentrant(self):
+        """Acquiring the lock several times in a thread."""
+
+        self.assertFalse(tb.hdf5_lock.locked())
+        with tb.hdf5_lock:
+            with tb.hdf5_lock:
+                self.assertTrue(tb.hdf5_lock.locked())
+                self.h5file = tb.open_file(self.h5fname)
+                self.assertTrue(common.areArraysEqual(
+                    self.h5file.root.test_array[:], self.data))
+            self.assertTrue(tb.hdf5_lock.locked())
+        self.assertFalse(tb.hdf5_lock.locked())
+        self.assertRaises(RuntimeError, tb.hdf5_lock.release)
+
+    def test01_blocking(self):
+        """Reading data waits for the lock held by another thread."""
+
+        self.h5file = tb.open_file(self.h5fname)
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with tb.hdf5_lock:
+                locked.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        locked.wait()
+        self.assertRaises(RuntimeError, tb.hdf5_lock.release)
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        self.assertTrue(common.areArraysEqual(
+            self.h5file.root.test_array[:], self.data))
+        self.assertTrue(release.is_set())
+        thread.join()
+        timer.join()
+
+    def test02_concurrent(self):
+        """Reading from several threads at the same time."""
+
+        def run(q):
+            try:
+                with tb.open_file(self.h5fname) as h5file:
+                    for i in range(10):
+                        arr = h5file.root.test_array[i * 20:(i + 1) * 20]
+                        assert (arr == self.data[i * 20:(i + 1) * 20]).all()
+                        col = h5file.root.test_table.col('x')
+                        assert (col == self.data[:, 0]).all()
+                        assert h5file.root.test_array.attrs.CLASS == 'CARRAY'
+            except Exception:
+                q.put(sys.exc_info())
+            else:
+                q.put('OK')
+
+        threads = []
+        q = queue.Queue()
+        for i in range(8):
+            t = threading.Thread(target=run, args=(q,))
+            t.start()
+            threads.append(t)
+
+        for i in range(8):
+            self.assertEqual(q.get(), 'OK')
+
+        for t in threads:
+            t.join()
+
+    def test03_metadata(self):
+        """Flushing, truncating and listing nodes wait for the lock."""
+
+        self.h5file = tb.open_file(self.h5fname, 'a')
+        root = self.h5file.root
+        calls = [
+            self.h5file.flush,
+            root.test_array.flush,
+            lambda: root.test_table.truncate(100),
+            lambda: root.test_table.remove_rows(0, 10),
+            lambda: root._f_list_nodes(),
+            lambda: root.__contains__('test_array'),
+            lambda: root.test_array.filters,
+            lambda: self.h5file.get_filesize(),
+        ]
+        for call in calls:
+            locked = threading.Event()
+            release = threading.Event()
+
+            def hold():
+                with tb.hdf5_lock:
+                    locked.set()
+                    release.wait()
+
+            thread = threading.Thread(target=hold)
+            thread.start()
+            locked.wait()
+            timer = threading.Timer(0.05, release.set)
+            timer.start()
+            call()
+            self.assertTrue(release.is_set())
+            thread.join()
+            timer.join()
+        self.assertEqual(root.test_table.nrows, 90)
+        self.assertEqual(root.test_table.attrs.NROWS, 90)
+
+    def test04_selections(self):
+        """Reading points, selections and VL rows from several threads."""
+
+        with tb.open_file(self.h5fname, 'a') as h5file:
+            vlarray = h5file.create_vlarray('/', 'test_vlarray',
+                                            tb.Int32Atom())
+            for i in range(20):
+                vlarray.append(np.arange(i))
+
+        def run(q):
+            try:
+                with tb.open_file(self.h5fname) as h5file:
+                    array = h5file.root.test_array
+                    for i in range(10):
+                        rows = [i, 2 * i + 1, 199 - i]
+                        points = (np.array(rows), np.array([5, i, 0]))
+                        assert (array[points] == self.data[points]).all()
+                        assert (array[rows, i:i + 3] ==
+                                self.data[rows, i:i + 3]).all()
+                        vlrows = h5file.root.test_vlarray[i:i + 5]
+                        assert [len(row) for row in vlrows] == list(
+                            range(i, i + 5))
+            except Exception:
+                q.put(sys.exc_info())
+            else:
+                q.put('OK')
+
+        threads = []
+        q = queue.Queue()
+        for i in range(8):
+            t = threading.Thread(target=run, args=(q,))
+            t.start()
+            threads.append(t)
+
+        for i in range(8):
+            self.assertEqual(q.get(), 'OK')
+
+        for t in threads:
+            t.join()
+
+
 class PythonAttrsTestCase(common.TempFileMixin, common.PyTablesTestCase):
     """Test interactions of Python attributes and child nodes."""
 
@@ -2172,6 +2333,94 @@ class BloscSubprocess(common.PyTablesTestCase):
             Path(h5fname).unlink()
 
 
+def _swmr_writer(fn, qin, qout):
+    with tb.open_file(fn, 'w', swmr=True) as fp:
+        earray = fp.create_earray('/', 'earray', tb.Int32Atom(), (0, 2),
+                                  chunkshape=(4, 2))
+        table = fp.create_table('/', 'table', {'x': tb.Int32Col()},
+                                chunkshape=4)
+        table.append([(i,) for i in range(3)])
+        fp.start_swmr_write()
+        qout.put(fp.swmr_mode)
+        while qin.get():
+            earray.append(np.arange(20, dtype='i4').reshape(10, 2))
+            table.append([(i,) for i in range(10)])
+            fp.flush()
+            qout.put("Appended")
+
+
+@common.unittest.skipIf(not multiprocessing_imported,
+                        'multiprocessing module not available')
+@common.unittest.skipIf(not tb.hdf5extension.HAVE_SWMR,
+                        'SWMR access not supported by HDF5')
+class SWMRTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Single-writer/multiple-reader access."""
+
+    def test00_refresh(self):
+        """Refreshing leaves with data appended in this process."""
+
+        earray = self.h5file.create_earray('/', 'earray', tb.Int32Atom(),
+                                           (0,))
+        earray.append(np.arange(10))
+        earray.refresh()
+        self.assertEqual(earray.shape, (10,))
+        self.assertEqual(earray.nrows, 10)
+        self.assertFalse(self.h5file.swmr_mode)
+
+    def test01_errors(self):
+        """Opening files in SWMR mode."""
+
+        self._reopen('w', swmr=True)
+        self.assertFalse(self.h5file.swmr_mode)
+        self.h5file.create_earray('/', 'earray', tb.Int32Atom(), (0,))
+        self.h5file.start_swmr_write()
+        self.assertTrue(self.h5file.swmr_mode)
+        self._reopen('a', swmr=True)
+        self.assertTrue(self.h5file.swmr_mode)
+        self.h5file.start_swmr_write()  # no-op
+        self._reopen('r', swmr=True)
+        self.assertTrue(self.h5file.swmr_mode)
+        self.assertRaises(tb.FileModeError, self.h5file.start_swmr_write)
+
+    def test02_reader(self):
+        """Reading data appended by a writer process."""
+
+        qin, qout = mp.Queue(), mp.Queue()
+        self.h5file.close()
+        writer = mp.Process(target=_swmr_writer,
+                            args=(self.h5fname, qin, qout))
+        writer.daemon = True
+        writer.start()
+        try:
+            self.assertTrue(qout.get(timeout=60))
+            self.h5file = tb.open_file(self.h5fname, 'r', swmr=True)
+            self.assertTrue(self.h5file.swmr_mode)
+            earray = self.h5file.root.earray
+            table = self.h5file.root.table
+            self.assertEqual(earray.shape, (0, 2))
+            self.assertEqual(table.nrows, 3)
+
+            for i in range(1, 3):
+                qin.put(True)
+                self.assertEqual(qout.get(timeout=60), "Appended")
+                self.assertEqual(earray.nrows, 10 * (i - 1))
+                earray.refresh()
+                table.refresh()
+                self.assertEqual(earray.shape, (10 * i, 2))
+                self.assertEqual(earray.nrows, 10 * i)
+                self.assertEqual(table.nrows, 3 + 10 * i)
+                self.assertTrue(common.areArraysEqual(
+                    earray[-10:], np.arange(20).reshape(10, 2)))
+                self.assertEqual(table.col('x')[-10:].tolist(),
+                                 list(range(10)))
+                self.assertEqual(
+                    len(table.read_where('x < 3')), 3 + 3 * i)
+        finally:
+            qin.put(False)
+            writer.join(60)
+        self.assertEqual(writer.exitcode, 0)
+
+
 class HDF5ErrorHandling(common.PyTablesTestCase):
     def setUp(self):
         super().setUp()
@@ -2482,6 +2731,7 @@ def suite():
         theSuite.addTest(common.unittest.makeSuite(DictNodeCacheOpenFile))
         theSuite.addTest(common.unittest.makeSuite(CheckFileTestCase))
         theSuite.addTest(common.unittest.makeSuite(ThreadingTestCase))
+        theSuite.addTest(common.unittest.makeSuite(HDF5LockTestCase))
         theSuite.addTest(common.unittest.makeSuite(PythonAttrsTestCase))
         theSuite.addTest(common.unittest.makeSuite(StateTestCase))
         theSuite.addTest(common.unittest.makeSuite(FlavorTestCase))
@@ -2490,6 +2740,7 @@ def suite():
         theSuite.addTest(common.unittest.makeSuite(FilePropertyTestCase))
         theSuite.addTest(common.unittest.makeSuite(BloscBigEndian))
         theSuite.addTest(common.unittest.makeSuite(BloscSubprocess))
+        theSuite.addTest(common.unittest.makeSuite(SWMRTestCase))
         theSuite.addTest(common.unittest.makeSuite(HDF5ErrorHandling))
         theSuite.addTest(common.unittest.makeSuite(TestDescription))
         theSuite.addTest(common.unittest.makeSuite(TestAtom))
@@ -1,5 +1,6 @@
 import sys
 from pathlib import Path
+from unittest import mock
 
 import numpy as np
 
@@ -2488,6 +2489,209 @@ class AccessClosedTestCase(common.TempFileMixin, common.PyTablesTestCase):
         self.assertRaises(tb.ClosedNodeError, self.array.__setitem__, 0, 0)
 
 
+class IterChunksTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Iterating over chunk-aligned blocks of arrays."""
+
+    def setUp(self):
+        super().setUp()
+        self.data = np.arange(7 * 9 * 4, dtype='i4').reshape(7, 9, 4)
+        self.carray = self.h5file.create_carray(
+            '/', 'carray', obj=self.data, chunkshape=(3, 4, 4))
+
+    def _check_blocks(self, array, blocks, selection=()):
+        expected = np.zeros_like(self.data)[selection]
+        covered = np.zeros(self.data.shape, dtype=bool)
+        for slices, block in blocks:
+            self.assertTrue(common.areArraysEqual(block, self.data[slices]))
+            self.assertFalse(covered[slices].any())
+            covered[slices] = True
+        self.assertTrue(covered[selection].all())
+        self.assertEqual(covered.sum(), expected.size)
+
+    def test00_all(self):
+        """Iterating over all the chunks in storage order."""
+
+        blocks = list(self.carray.iter_chunks())
+        self.assertEqual(len(blocks), 3 * 3 * 1)
+        self.assertEqual(blocks[0][0], (slice(0, 3), slice(0, 4),
+                                        slice(0, 4)))
+        self.assertEqual(blocks[1][0], (slice(0, 3), slice(4, 8),
+                                        slice(0, 4)))
+        self.assertEqual(blocks[-1][0], (slice(6, 7), slice(8, 9),
+                                         slice(0, 4)))
+        self._check_blocks(self.carray, blocks)
+
+    def test01_selection(self):
+        """Iterating over the chunks in a selection."""
+
+        selection = (slice(2, 5), slice(3, None), 1)
+        blocks = list(self.carray.iter_chunks(selection))
+        self.assertEqual([slices for (slices, block) in blocks], [
+            (slice(2, 3), slice(3, 4), slice(1, 2)),
+            (slice(2, 3), slice(4, 8), slice(1, 2)),
+            (slice(2, 3), slice(8, 9), slice(1, 2)),
+            (slice(3, 5), slice(3, 4), slice(1, 2)),
+            (slice(3, 5), slice(4, 8), slice(1, 2)),
+            (slice(3, 5), slice(8, 9), slice(1, 2))])
+        self._check_blocks(self.carray, blocks,
+                           (slice(2, 5), slice(3, None), slice(1, 2)))
+        self.assertEqual(list(self.carray.iter_chunks(slice(3, 3))), [])
+        self.assertRaises(ValueError, self.carray.iter_chunks,
+                          slice(None, None, 2))
+
+    def test02_reuse_buffer(self):
+        """Reusing the same buffer for all the blocks."""
+
+        blocks = []
+        base = None
+        for slices, block in self.carray.iter_chunks(reuse_buffer=True):
+            self.assertTrue(common.areArraysEqual(block, self.data[slices]))
+            if base is None:
+                base = block.base
+            self.assertIs(block.base, base)
+            blocks.append((slices, block.copy()))
+        self._check_blocks(self.carray, blocks)
+
+    def test03_not_chunked(self):
+        """Iterating over a non-chunked array."""
+
+        array = self.h5file.create_array('/', 'array', self.data)
+        array.nrowsinbuf = 2
+        blocks = list(array.iter_chunks())
+        self.assertEqual(len(blocks), 4)
+        self.assertEqual(blocks[0][0], (slice(0, 2), slice(0, 9),
+                                        slice(0, 4)))
+        self._check_blocks(array, blocks)
+
+    def test04_earray(self):
+        """Iterating over an enlargeable array."""
+
+        earray = self.h5file.create_earray('/', 'earray', tb.Int32Atom(),
+                                           (4, 0), chunkshape=(4, 5))
+        self.assertEqual(list(earray.iter_chunks()), [])
+        earray.append(np.arange(48).reshape(4, 12))
+        blocks = list(earray.iter_chunks())
+        self.assertEqual([block.shape for (slices, block) in blocks],
+                         [(4, 5), (4, 5), (4, 2)])
+        self.assertTrue(common.areArraysEqual(
+            np.concatenate([block for (slices, block) in blocks], axis=1),
+            earray[:]))
+
+
+@common.unittest.skipIf(not tb.hdf5extension.HAVE_DIRECT_CHUNK,
+                        'querying chunks not supported by HDF5')
+class SparseTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Reading arrays with unallocated chunks."""
+
+    def setUp(self):
+        super().setUp()
+        self.carray = self.h5file.create_carray(
+            '/', 'carray', tb.Float64Atom(dflt=-1), (40, 30, 20),
+            chunkshape=(10, 10, 10))
+        self.data = np.full(self.carray.shape, -1.)
+        for slices in [(slice(0, 10), slice(10, 15), slice(0, 20)),
+                       (slice(32, 35), slice(20, 30), slice(15, 20))]:
+            self.carray[slices] = self.data[slices] = np.random.rand(
+                *self.data[slices].shape)
+
+    def _count_reads(self):
+        """Count the calls to the HDF5 read routine of the array."""
+
+        calls = []
+        read = self.carray._g_read_slice
+
+        def counted_read(*args):
+            calls.append(args)
+            return read(*args)
+
+        self.carray._g_read_slice = counted_read
+        return calls
+
+    def test00_allocated_chunks(self):
+        """Getting the allocated chunks."""
+
+        self.assertEqual(self.carray.allocated_chunks().tolist(),
+                         [[0, 10, 0], [0, 10, 10], [30, 20, 10]])
+        carray = self.h5file.create_carray('/', 'empty', tb.Int8Atom(),
+                                           (5, 5), chunkshape=(2, 2))
+        self.assertEqual(carray.allocated_chunks().shape, (0, 2))
+
+    def test01_read(self):
+        """Reading only the allocated chunks."""
+
+        calls = self._count_reads()
+        self.assertTrue(common.areArraysEqual(self.carray[:], self.data))
+        self.assertEqual(len(calls), 3)
+        self.assertTrue(common.areArraysEqual(self.carray.read(5, 35),
+                                              self.data[5:35]))
+        self.assertTrue(common.areArraysEqual(self.carray[2:33, 12, 5:],
+                                              self.data[2:33, 12, 5:]))
+
+    def test02_dense(self):
+        """Reading mostly allocated regions in one go."""
+
+        calls = self._count_reads()
+        self.assertTrue(common.areArraysEqual(self.carray[:10, 10:20],
+                                              self.data[:10, 10:20]))
+        self.assertEqual(len(calls), 1)
+
+    def test03_iter_chunks(self):
+        """Iterating without reading unallocated chunks."""
+
+        calls = self._count_reads()
+        nblocks = 0
+        for slices, block in self.carray.iter_chunks():
+            self.assertTrue(common.areArraysEqual(block, self.data[slices]))
+            nblocks += 1
+        self.assertEqual(nblocks, 4 * 3 * 2)
+        self.assertEqual(len(calls), 3)
+
+    def test04_expr(self):
+        """Evaluating expressions over sparse arrays."""
+
+        carray = self.carray
+        expr = tb.Expr('carray * 2')
+        self.assertTrue(common.areArraysEqual(expr.eval(), self.data * 2))
+
+    def test05_fully_allocated(self):
+        """Reading arrays with all their chunks allocated."""
+
+        self.carray[:] = self.data
+        self.assertFalse(self.carray._may_be_sparse())
+        with mock.patch.object(tb.Array, '_g_allocated_chunks') as scan:
+            self.assertTrue(common.areArraysEqual(self.carray[:],
+                                                  self.data))
+            self.assertEqual(
+                sum(1 for _ in self.carray.iter_chunks()), 4 * 3 * 2)
+        self.assertEqual(scan.call_count, 0)
+
+    def test06_small_reads(self):
+        """Reading a few chunks of dense arrays without counting chunks."""
+
+        carray = self.h5file.create_carray(
+            '/', 'dense', obj=np.arange(100_000), chunkshape=(10,))
+        counts = []
+        get_num_chunks = carray._g_get_num_chunks
+
+        def counted_get_num_chunks():
+            counts.append(None)
+            return get_num_chunks()
+
+        carray._g_get_num_chunks = counted_get_num_chunks
+        with mock.patch.object(tb.Array, '_g_allocated_chunks') as scan:
+            for i in range(0, 100_000, 5000):
+                self.assertEqual(carray[i], i)
+                self.assertEqual(carray[i:i + 5].tolist(),
+                                 list(range(i, i + 5)))
+            self.assertEqual(len(counts), 0)
+            # The chunks of the array are only counted once.
+            for i in range(0, 100_000, 5000):
+                self.assertEqual(carray[i:i + 100].tolist(),
+                                 list(range(i, i + 100)))
+            self.assertEqual(len(counts), 1)
+        self.assertEqual(scan.call_count, 0)
+
+
 class TestCreateCArrayArgs(common.TempFileMixin, common.PyTablesTestCase):
     obj = np.array([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
     where = '/'
@@ -2808,6 +3012,8 @@ def suite():
         theSuite.addTest(common.unittest.makeSuite(MDLargeAtomNoReopen))
         theSuite.addTest(common.unittest.makeSuite(MDLargeAtomReopen))
         theSuite.addTest(common.unittest.makeSuite(AccessClosedTestCase))
+        theSuite.addTest(common.unittest.makeSuite(IterChunksTestCase))
+        theSuite.addTest(common.unittest.makeSuite(SparseTestCase))
         theSuite.addTest(common.unittest.makeSuite(TestCreateCArrayArgs))
     if common.heavy:
         theSuite.addTest(common.unittest.makeSuite(Slices3CArrayTestCase))
@@ -0,0 +1,221 @@
+"""Test module for persistent catalogs of nodes."""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+import tables as tb
+from tables import hdf5extension
+from tables.catalog import CATALOG_SUFFIX
+from tables.path import isvisiblepath
+from tables.tests import common
+
+
+class NodeCatalogTestCase(common.PyTablesTestCase):
+    """Listing and looking up nodes with a persistent node catalog."""
+
+    def setUp(self):
+        super().setUp()
+
+        self.tmpdir = Path(tempfile.mkdtemp(prefix=self._getName()))
+        self.h5fname = str(self.tmpdir / 'nodes.h5')
+        self.catname = self.h5fname + CATALOG_SUFFIX
+        with tb.open_file(self.h5fname, 'w', node_catalog=True) as h5file:
+            for i in range(3):
+                group = h5file.create_group('/', 'group%d' % i)
+                table = h5file.create_table(
+                    group, 'table', {'x': tb.Int32Col(), 'y': tb.Float64Col()})
+                table.append([(j, j / 2) for j in range(10 * (i + 1))])
+                table.cols.x.create_index()
+                h5file.create_array(group, 'array', np.arange(i + 1))
+            h5file.create_group('/group0', 'sub')
+            h5file.create_soft_link('/', 'link', '/group1/table')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        super().tearDown()
+
+    def _open(self, mode='r', **kwargs):
+        """Open the file with its node catalog, checking it is up to date.
+
+        The catalog must have been loaded from its file, unless `rebuilt`.
+
+        """
+
+        rebuilt = kwargs.pop('rebuilt', False)
+        visits = []
+
+        def visit(h5file, *args):
+            visits.append(args)
+            return hdf5extension.File._g_visit_paths(h5file, *args)
+
+        with mock.patch.object(tb.File, '_g_visit_paths', visit):
+            h5file = tb.open_file(self.h5fname, mode, node_catalog=True,
+                                  **kwargs)
+        self.assertEqual(bool(visits), rebuilt)
+        self._check_paths(h5file)
+        return h5file
+
+    def _check_paths(self, h5file):
+        """Check that the catalog of `h5file` has the nodes in the file."""
+
+        expected = [hdf5extension.PathInfo(*record) for record in
+                    h5file._g_visit_paths('/', True, True)]
+        self.assertEqual(list(h5file.iter_paths()), expected)
+
+    def test00_load(self):
+        """Loading the catalog of a file."""
+
+        self.assertTrue(Path(self.catname).exists())
+        with self._open() as h5file:
+            self.assertIn('/group1/table', h5file)
+            self.assertIn('/link', h5file)
+            self.assertNotIn('/group1/missing', h5file)
+            self.assertRaises(tb.NoSuchNodeError, h5file.get_node,
+                              '/missing/table')
+            # Hidden nodes are looked up in the file.
+            self.assertIn('/group1/_i_table', h5file)
+            info = dict((info.path, info) for info in h5file.iter_paths())
+            self.assertEqual(info['/group2/table'].shape, (30,))
+            self.assertEqual(info['/group2/table'].dtype,
+                             np.dtype([('x', 'i4'), ('y', 'f8')]))
+            self.assertEqual(info['/link'].h5class, 'SoftLink')
+        with tb.open_file(self.h5fname, node_catalog=False) as h5file:
+            expected = [node._v_pathname for node in h5file]
+        with self._open() as h5file:
+            self.assertEqual([node._v_pathname for node in h5file], expected)
+            self.assertEqual(
+                [node._v_pathname for node in h5file.walk_groups()],
+                ['/', '/group0', '/group1', '/group2', '/group0/sub'])
+            self.assertEqual(
+                [node._v_name for node in h5file.list_nodes('/group0')],
+                ['array', 'sub', 'table'])
+            self.assertEqual(
+                [node._v_name for node in
+                 h5file.list_nodes('/group0', classname='Leaf')],
+                ['array', 'table'])
+            self.assertEqual(
+                [node._v_pathname for node in h5file.list_nodes('/', 'Link')],
+                ['/link'])
+
+    def test01_classname(self):
+        """Only the nodes of the requested class are loaded."""
+
+        with self._open() as h5file:
+            tables = list(h5file.walk_nodes('/', classname='Table'))
+            self.assertEqual([table._v_pathname for table in tables],
+                             ['/group0/table', '/group1/table',
+                              '/group2/table'])
+            # Groups are not loaded (tables load their hidden indexes).
+            loaded = set(h5file._node_manager.cache)
+            loaded.update(h5file._node_manager.registry)
+            self.assertEqual({path for path in loaded
+                              if isvisiblepath(path) and path != '/'},
+                             {table._v_pathname for table in tables})
+            # Nodes of other classes are not loaded by get_node() either.
+            self.assertRaises(tb.NoSuchNodeError, h5file.get_node,
+                              '/group0/array', classname='Table')
+            self.assertRaises(tb.NoSuchNodeError, h5file.get_node,
+                              '/link', classname='Leaf')
+            self.assertNotIn('/group0/array', h5file._node_manager.registry)
+            self.assertNotIn('/group0/array', h5file._node_manager.cache)
+            self.assertNotIn('/link', h5file._node_manager.registry)
+            self.assertNotIn('/link', h5file._node_manager.cache)
+            self.assertIs(h5file.get_node('/group1', 'table', 'Leaf'),
+                          tables[1])
+            self.assertRaises(tb.NoSuchNodeError, h5file.get_node,
+                              '/group1/missing', classname='Leaf')
+
+    def test02_update(self):
+        """The catalog is updated with changes to the file."""
+
+        with self._open('a') as h5file:
+            h5file.create_group('/group1', 'new')
+            h5file.create_earray('/group1/new', 'earray', tb.Int8Atom(),
+                                 (0,))
+            h5file.rename_node('/group1', 'renamed')
+            h5file.move_node('/group0/sub', '/group2')
+            h5file.remove_node('/group0/table')
+            h5file.create_hard_link('/', 'hard', '/group2/array')
+            h5file.root.renamed.new.earray.append([1, 2, 3])
+            h5file.root.group2.table.append([(100, 0.)])
+            self._check_paths(h5file)
+            self.assertNotIn('/group1/table', h5file)
+            self.assertIn('/renamed/new/earray', h5file)
+            self.assertEqual(
+                [node._v_name for node in h5file.list_nodes('/group2')],
+                ['array', 'sub', 'table'])
+        with self._open() as h5file:
+            self.assertEqual(h5file.root.renamed.new.earray.nrows, 3)
+
+    def test03_undo(self):
+        """The catalog is updated when undoing and redoing changes."""
+
+        with self._open('a') as h5file:
+            h5file.enable_undo()
+            h5file.remove_node('/group1', recursive=True)
+            h5file.rename_node('/group2/array', 'renamed')
+            self._check_paths(h5file)
+            h5file.undo()
+            self._check_paths(h5file)
+            self.assertIn('/group1/table', h5file)
+            h5file.redo()
+            self._check_paths(h5file)
+            h5file.disable_undo()
+
+    def test04_stale(self):
+        """The catalog is built again if the file has been modified."""
+
+        with tb.open_file(self.h5fname, 'a', node_catalog=False) as h5file:
+            h5file.create_array('/', 'array', [1])
+        with self._open(rebuilt=True) as h5file:
+            self.assertIn('/array', h5file)
+        with self._open() as h5file:
+            self.assertIn('/array', h5file)
+
+        Path(self.catname).write_bytes(b'broken')
+        self._open(rebuilt=True).close()
+
+    def test05_root_uep(self):
+        """Catalogs of files opened with a root user entry point."""
+
+        with self._open(root_uep='/group1', rebuilt=True) as h5file:
+            self.assertIn('/table', h5file)
+            self.assertEqual(
+                [node._v_pathname for node in h5file.walk_nodes('/', 'Leaf')],
+                ['/array', '/table'])
+        with self._open(root_uep='/group1') as h5file:
+            self.assertNotIn('/group1', h5file)
+
+    def test06_bulk(self):
+        """The catalog is updated with leaves created at once."""
+
+        with self._open('a') as h5file:
+            h5file.create_arrays('/group0', {'a%d' % i: [i] for i in range(3)})
+            h5file.create_tables('/new', {'t%d' % i: np.zeros(i, 'i4,f4')
+                                          for i in range(3)},
+                                 createparents=True)
+            self._check_paths(h5file)
+        with self._open() as h5file:
+            self.assertIn('/group0/a2', h5file)
+            self.assertEqual(h5file.root.new.t2.nrows, 2)
+
+
+def suite():
+    theSuite = common.unittest.TestSuite()
+    niter = 1
+
+    for i in range(niter):
+        theSuite.addTest(common.unittest.makeSuite(NodeCatalogTestCase))
+
+    return theSuite
+
+
+if __name__ == '__main__':
+    common.parse_argv(sys.argv)
+    common.print_versions()
+    common.unittest.main(defaultTest='suite')
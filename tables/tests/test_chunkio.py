@@ -0,0 +1,533 @@
+"""Test module for direct chunk I/O."""
+
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+import tables as tb
+from tables import chunkio
+from tables.tests import common
+
+
+@common.unittest.skipIf(not tb.hdf5extension.HAVE_DIRECT_CHUNK,
+                        'direct chunk I/O not supported by HDF5')
+class ParallelAppendTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Appending data compressed in several threads."""
+
+    filters = tb.Filters(complevel=1, complib='zlib', shuffle=True)
+    open_kwargs = dict(max_chunk_threads=4)
+
+    def _check_same_storage(self, node):
+        """Check that `node` is stored like a copy made by HDF5."""
+
+        copy = node.copy('/', node.name + '_copy')
+        self.assertEqual(copy.size_on_disk, node.size_on_disk)
+        self.assertTrue(common.areArraysEqual(copy[:], node[:]))
+
+    def _check_earray(self, shape, extdim, chunkshape, appends):
+        atom = tb.Float64Atom()
+        eshape = list(shape)
+        eshape[extdim] = 0
+        earray = self.h5file.create_earray('/', 'earray', atom, eshape,
+                                           filters=self.filters,
+                                           chunkshape=chunkshape)
+        self.assertIsNotNone(earray._v_chunk_pipeline)
+        data = []
+        for nrows in appends:
+            dshape = list(shape)
+            dshape[extdim] = nrows
+            arr = np.arange(np.prod(dshape), dtype='f8').reshape(dshape)
+            arr = np.round(np.sin(arr), 2)
+            earray.append(arr)
+            data.append(arr)
+        data = np.concatenate(data, axis=extdim)
+        self.assertEqual(earray.shape, data.shape)
+        self.assertTrue(common.areArraysEqual(earray[:], data))
+
+        self._reopen('a')
+        earray = self.h5file.root.earray
+        self.assertTrue(common.areArraysEqual(earray[:], data))
+        self._check_same_storage(earray)
+
+    def test00_earray(self):
+        """Appending to a unidimensional EArray."""
+
+        self._check_earray((0,), 0, (100,), [1000, 50, 1234, 10])
+
+    def test01_earray_multidim(self):
+        """Appending to a multidimensional EArray."""
+
+        self._check_earray((0, 7, 3), 0, (8, 4, 2), [70, 3, 33])
+
+    def test02_earray_extdim(self):
+        """Appending to an EArray enlargeable in another dimension."""
+
+        self._check_earray((5, 0), 1, (2, 16), [100, 3, 200])
+
+    def test03_table(self):
+        """Appending to a Table."""
+
+        table = self.h5file.create_table('/', 'table', {
+            'x': tb.Float64Col(), 'y': tb.Int32Col(shape=(2,)),
+            's': tb.StringCol(4)}, filters=self.filters, chunkshape=64)
+        self.assertIsNotNone(table._v_chunk_pipeline)
+        data = np.zeros(1000, dtype=table.dtype)
+        data['x'] = np.round(np.sin(np.arange(1000)), 2)
+        data['y'] = np.arange(2000).reshape(1000, 2) % 17
+        data['s'] = 'abcd'
+        table.append(data[:10])
+        table.append(data[10:500])
+        table.append_columns({'x': data['x'][500:],
+                              'y': data['y'][500:],
+                              's': data['s'][500:]})
+        row = table.row
+        for x in data['x']:
+            row['x'] = x
+            row.append()
+        table.flush()
+        data = np.concatenate([data, data])
+        data['y'][1000:] = 0
+        data['s'][1000:] = ''
+
+        self._reopen('a')
+        table = self.h5file.root.table
+        self.assertEqual(table.nrows, 2000)
+        self.assertTrue(common.areArraysEqual(table[:], data))
+        self._check_same_storage(table)
+
+    def test04_incompressible(self):
+        """Appending data which does not compress."""
+
+        earray = self.h5file.create_earray('/', 'earray', tb.UInt8Atom(),
+                                           (0,), filters=self.filters,
+                                           chunkshape=(1000,))
+        data = np.random.randint(0, 256, 10_000).astype('u1')
+        earray.append(data)
+        self._reopen()
+        self.assertTrue(common.areArraysEqual(self.h5file.root.earray[:],
+                                              data))
+
+    def test05_unsupported(self):
+        """Appending with unsupported filters."""
+
+        filters = tb.Filters(complevel=1, fletcher32=True)
+        earray = self.h5file.create_earray('/', 'earray', tb.Int32Atom(),
+                                           (0,), filters=filters,
+                                           chunkshape=(10,))
+        self.assertIsNone(earray._v_chunk_pipeline)
+        earray.append(np.arange(1000))
+        self.assertTrue(common.areArraysEqual(earray[:], np.arange(1000)))
+
+    def test06_shaped_atom(self):
+        """Appending to an EArray with a multidimensional atom."""
+
+        earray = self.h5file.create_earray('/', 'earray',
+                                           tb.Int32Atom(shape=(2,)), (0, 3),
+                                           filters=self.filters,
+                                           chunkshape=(4, 2))
+        self.assertIsNotNone(earray._v_chunk_pipeline)
+        data = np.arange(10 * 3 * 2, dtype='i4').reshape(10, 3, 2)
+        earray.append(data[:5])
+        earray.append(data[5:])
+        self.assertEqual(earray.shape, (10, 3))
+        self.assertTrue(common.areArraysEqual(earray[:], data))
+
+        self._reopen('a')
+        earray = self.h5file.root.earray
+        self.assertTrue(common.areArraysEqual(earray[:], data))
+        self._check_same_storage(earray)
+
+    def test07_write_error(self):
+        """Failing to write chunks does not leave rows appended."""
+
+        earray = self.h5file.create_earray('/', 'earray', tb.Int32Atom(),
+                                           (0,), filters=self.filters,
+                                           chunkshape=(10,))
+        table = self.h5file.create_table('/', 'table', {'x': tb.Int32Col()},
+                                         filters=self.filters, chunkshape=10)
+        earray.append(np.arange(5))
+        table.append_columns({'x': np.arange(5)})
+        with mock.patch.object(chunkio, 'encode_chunk',
+                               side_effect=ValueError('encode')):
+            self.assertRaises(ValueError, earray.append, np.arange(100))
+            self.assertRaises(ValueError, table.append_columns,
+                              {'x': np.arange(100)})
+        # Only the rows completing the last chunk are appended.
+        self.assertEqual(earray.nrows, 10)
+        self.assertEqual(table.nrows, 10)
+        self.assertEqual(table.attrs.NROWS, 10)
+
+        self._reopen()
+        self.assertEqual(self.h5file.root.earray.nrows, 10)
+        self.assertEqual(self.h5file.root.table.nrows, 10)
+        self.assertTrue(common.areArraysEqual(
+            self.h5file.root.earray[:], np.arange(10) % 5))
+
+
+@common.unittest.skipIf(not tb.hdf5extension.HAVE_DIRECT_CHUNK,
+                        'direct chunk I/O not supported by HDF5')
+class ParallelReadTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Reading data decompressed in several threads."""
+
+    filters = tb.Filters(complevel=1, complib='zlib', shuffle=True)
+
+    def _reopen_parallel(self):
+        self._reopen(max_chunk_threads=4)
+
+    def test00_carray(self):
+        """Reading slices of a CArray."""
+
+        data = np.round(np.sin(np.arange(60 * 70)), 2).reshape(60, 70)
+        carray = self.h5file.create_carray('/', 'carray', obj=data,
+                                           filters=self.filters,
+                                           chunkshape=(8, 16))
+        self._reopen_parallel()
+        carray = self.h5file.root.carray
+        self.assertIsNotNone(carray._v_chunk_pipeline)
+        self.assertTrue(common.areArraysEqual(carray.read(), data))
+        self.assertTrue(common.areArraysEqual(carray.read(5, 50), data[5:50]))
+        self.assertTrue(common.areArraysEqual(carray.read(5, 50, 3),
+                                              data[5:50:3]))
+        for key in [np.s_[:], np.s_[3:47, 5:69], np.s_[10, 3:60],
+                    np.s_[..., 17], np.s_[1:59:2, 3:60]]:
+            self.assertTrue(common.areArraysEqual(carray[key], data[key]))
+        out = np.empty_like(data)
+        carray.read(out=out)
+        self.assertTrue(common.areArraysEqual(out, data))
+
+    def test01_carray_atom_shape(self):
+        """Reading a CArray with a multidimensional atom."""
+
+        atom = tb.Int32Atom(shape=(2, 3))
+        carray = self.h5file.create_carray('/', 'carray', atom, (100,),
+                                           filters=self.filters,
+                                           chunkshape=(7,))
+        data = np.arange(600, dtype='i4').reshape(100, 2, 3)
+        carray[:] = data
+        self._reopen_parallel()
+        carray = self.h5file.root.carray
+        self.assertTrue(common.areArraysEqual(carray.read(), data))
+        self.assertTrue(common.areArraysEqual(carray[3:95], data[3:95]))
+
+    def test02_carray_sparse(self):
+        """Reading a CArray with chunks not written yet."""
+
+        atom = tb.Float64Atom(dflt=-1)
+        carray = self.h5file.create_carray('/', 'carray', atom, (100, 10),
+                                           filters=self.filters,
+                                           chunkshape=(10, 5))
+        carray[25:35, 2:4] = 3
+        data = np.full((100, 10), -1.)
+        data[25:35, 2:4] = 3
+        self._reopen_parallel()
+        carray = self.h5file.root.carray
+        self.assertTrue(common.areArraysEqual(carray.read(), data))
+        self.assertTrue(common.areArraysEqual(carray[20:70, 1:],
+                                              data[20:70, 1:]))
+
+    def test03_earray(self):
+        """Reading an EArray."""
+
+        earray = self.h5file.create_earray('/', 'earray', tb.Int16Atom(),
+                                           (3, 0), filters=self.filters,
+                                           chunkshape=(2, 10))
+        data = np.arange(3 * 95, dtype='i2').reshape(3, 95)
+        earray.append(data)
+        self._reopen_parallel()
+        earray = self.h5file.root.earray
+        self.assertTrue(common.areArraysEqual(earray.read(), data))
+        self.assertTrue(common.areArraysEqual(earray.read(12, 77),
+                                              data[:, 12:77]))
+        self.assertTrue(common.areArraysEqual(earray[1:, 12:77],
+                                              data[1:, 12:77]))
+
+    def test04_table(self):
+        """Reading a Table."""
+
+        data = np.zeros(1000, dtype=[('x', 'f8'), ('y', 'i4', (2,)),
+                                     ('s', 'S4')])
+        data['x'] = np.round(np.sin(np.arange(1000)), 2)
+        data['y'] = np.arange(2000).reshape(1000, 2) % 17
+        data['s'] = 'abcd'
+        self.h5file.create_table('/', 'table', data, filters=self.filters,
+                                 chunkshape=64)
+        self._reopen_parallel()
+        table = self.h5file.root.table
+        self.assertIsNotNone(table._v_chunk_pipeline)
+        self.assertTrue(common.areArraysEqual(table.read(), data))
+        self.assertTrue(common.areArraysEqual(table.read(10, 900),
+                                              data[10:900]))
+        self.assertTrue(common.areArraysEqual(table[10:900], data[10:900]))
+        self.assertTrue(common.areArraysEqual(table.read(10, 900, 7),
+                                              data[10:900:7]))
+        self.assertTrue(common.areArraysEqual(table.read(field='y'),
+                                              data['y']))
+
+    def test05_errors(self):
+        """Reading corrupted chunks."""
+
+        earray = self.h5file.create_earray('/', 'earray', tb.Int32Atom(),
+                                           (0,), filters=self.filters,
+                                           chunkshape=(10,))
+        earray.append(np.arange(100))
+        earray._g_write_chunk((50,), b'garbage')
+        self._reopen_parallel()
+        earray = self.h5file.root.earray
+        self.assertRaises(tb.HDF5ExtError, earray.read)
+        self.assertTrue(common.areArraysEqual(earray[:50], np.arange(50)))
+
+
+@common.unittest.skipIf(not tb.hdf5extension.HAVE_DIRECT_CHUNK,
+                        'direct chunk I/O not supported by HDF5')
+class RawChunkTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Inspecting chunks and reading and writing them as stored."""
+
+    filters = tb.Filters(complevel=1, complib='zlib', shuffle=True)
+
+    def setUp(self):
+        super().setUp()
+        self.earray = self.h5file.create_earray(
+            '/', 'earray', tb.Int32Atom(), (0, 6), filters=self.filters,
+            chunkshape=(10, 4))
+        self.earray.append(np.arange(25 * 6, dtype='i4').reshape(25, 6))
+        data = np.zeros(50, dtype=[('x', 'i4'), ('y', 'f8')])
+        data['x'] = np.arange(50)
+        self.table = self.h5file.create_table('/', 'table', data,
+                                              filters=self.filters,
+                                              chunkshape=16)
+
+    def test00_iter_chunk_info(self):
+        """Getting information on the allocated chunks."""
+
+        infos = list(self.earray.iter_chunk_info())
+        self.assertEqual([info.offset for info in infos],
+                         [(0, 0), (0, 4), (10, 0), (10, 4), (20, 0),
+                          (20, 4)])
+        self.assertEqual([info.filter_mask for info in infos], [0] * 6)
+        self.assertEqual(sum(info.size for info in infos),
+                         self.earray.size_on_disk)
+        self.assertEqual(len({info.byte_offset for info in infos}), 6)
+
+        infos = list(self.table.iter_chunk_info())
+        self.assertEqual([info.offset for info in infos],
+                         [(0,), (16,), (32,), (48,)])
+
+        carray = self.h5file.create_carray('/', 'carray', tb.Int8Atom(),
+                                           (10, 10), chunkshape=(5, 5))
+        carray[6, 6] = 1
+        self.assertEqual([info.offset for info in carray.iter_chunk_info()],
+                         [(5, 5)])
+
+    def test01_raw_copy(self):
+        """Copying chunks as stored to another leaf."""
+
+        dst = self.h5file.create_earray(
+            '/', 'dst', tb.Int32Atom(), (0, 6), filters=self.filters,
+            chunkshape=(10, 4))
+        dst.truncate(25)
+        for info in self.earray.iter_chunk_info():
+            filter_mask, data = self.earray.read_raw_chunk(info.offset)
+            self.assertEqual(len(data), info.size)
+            dst.write_raw_chunk(info.offset, data, filter_mask)
+        self.assertTrue(common.areArraysEqual(dst[:], self.earray[:]))
+
+        dst = self.h5file.create_table('/', 'dsttable',
+                                       self.table.description,
+                                       filters=self.filters, chunkshape=16)
+        dst.truncate(self.table.nrows)
+        for info in self.table.iter_chunk_info():
+            dst.write_raw_chunk(info.offset,
+                                self.table.read_raw_chunk(info.offset)[1])
+        self.assertTrue(common.areArraysEqual(dst[:], self.table[:]))
+
+    def test02_unallocated(self):
+        """Reading chunks which are not allocated."""
+
+        self.earray.truncate(40)
+        self.assertEqual(self.earray.read_raw_chunk((30, 4)), (0, None))
+
+    def test03_errors(self):
+        """Invalid chunks and leaves."""
+
+        earray = self.earray
+        self.assertRaises(ValueError, earray.read_raw_chunk, (5, 0))
+        self.assertRaises(ValueError, earray.read_raw_chunk, (0,))
+        self.assertRaises(IndexError, earray.read_raw_chunk, (30, 0))
+        self.assertRaises(IndexError, earray.write_raw_chunk, (30, 0), b'')
+        array = self.h5file.create_array('/', 'array', [1, 2, 3])
+        self.assertRaises(TypeError, array.iter_chunk_info)
+        self.assertRaises(TypeError, array.read_raw_chunk, (0,))
+        self._reopen('r')
+        self.assertRaises(tb.FileModeError,
+                          self.h5file.root.earray.write_raw_chunk,
+                          (0, 0), b'')
+
+
+@common.unittest.skipIf(not tb.hdf5extension.HAVE_DIRECT_CHUNK,
+                        'direct chunk I/O not supported by HDF5')
+class RawCopyTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Copying leaves without refiltering their chunks."""
+
+    filters = tb.Filters(complevel=1, complib='zlib', shuffle=True)
+
+    def setUp(self):
+        super().setUp()
+        data = np.zeros(100, dtype=[('x', 'i4'), ('y', 'f8')])
+        data['x'] = np.arange(100)
+        data['y'] = np.sqrt(np.arange(100))
+        self.h5file.create_table('/', 'table', data, filters=self.filters,
+                                 chunkshape=16)
+        earray = self.h5file.create_earray(
+            '/', 'earray', tb.Float64Atom(), (0, 5), filters=self.filters,
+            chunkshape=(8, 5))
+        earray.append(np.sqrt(np.arange(250)).reshape(50, 5))
+        carray = self.h5file.create_carray(
+            '/', 'carray', tb.Int32Atom(dflt=3), (30, 30),
+            filters=self.filters, chunkshape=(10, 10))
+        carray[5:15, :12] = np.arange(120).reshape(10, 12)
+
+        # Count the copies of chunks as stored.
+        self.copies = []
+        copy = tb.chunkio.copy
+
+        def counted_copy(src, dst, start, stop):
+            self.copies.append(src._v_pathname)
+            return copy(src, dst, start, stop)
+
+        self._copy = copy
+        tb.chunkio.copy = counted_copy
+
+    def tearDown(self):
+        tb.chunkio.copy = self._copy
+        super().tearDown()
+
+    def _check_copy(self, src, dst, raw, start=None, stop=None):
+        self.assertEqual(self.copies, [src._v_pathname] if raw else [])
+        del self.copies[:]
+        self.assertTrue(common.areArraysEqual(dst[:], src[start:stop]))
+        self.assertEqual(dst.nrows, len(src[start:stop]))
+        if isinstance(dst, tb.Table):
+            self.assertEqual(dst.attrs.NROWS, dst.nrows)
+
+    def test00_same_file(self):
+        """Copying leaves in the same file."""
+
+        for name in ['table', 'earray', 'carray']:
+            src = self.h5file.get_node('/', name)
+            dst = src.copy('/', name + '_copy')
+            self._check_copy(src, dst, True)
+            self.assertEqual(
+                [info.offset for info in dst.iter_chunk_info()],
+                [info.offset for info in src.iter_chunk_info()])
+        carray = self.h5file.root.carray_copy
+        self.assertEqual(carray[20, 20], 3)
+
+    def test01_ranges(self):
+        """Copying ranges of rows starting at chunk boundaries."""
+
+        table = self.h5file.root.table
+        self._check_copy(table, table.copy('/', 't1', start=32, stop=100),
+                         True, 32)
+        self._check_copy(table, table.copy('/', 't2', start=16, stop=48),
+                         True, 16, 48)
+        self._check_copy(table, table.copy('/', 't3', start=10, stop=100),
+                         False, 10)
+        self._check_copy(table, table.copy('/', 't4', stop=40), False,
+                         None, 40)
+        earray = self.h5file.root.earray
+        self._check_copy(earray, earray.copy('/', 'e1', start=8, stop=16),
+                         True, 8, 16)
+
+        self._reopen()
+        for name, nrows in [('t1', 68), ('t2', 32), ('t3', 90), ('t4', 40)]:
+            self.assertEqual(self.h5file.get_node('/', name).attrs.NROWS,
+                             nrows)
+
+    def test02_fallback(self):
+        """Copying with other filters, chunkshapes or steps."""
+
+        table = self.h5file.root.table
+        self._check_copy(table, table.copy('/', 't1', filters=tb.Filters()),
+                         False)
+        self._check_copy(table, table.copy('/', 't2', chunkshape=32), False)
+        dst = table.copy('/', 't3', step=2)
+        self.assertEqual(self.copies, [])
+        self.assertTrue(common.areArraysEqual(dst[:], table[::2]))
+        table.cols.x.create_csindex()
+        dst = table.copy('/', 't4', sortby='x')
+        self.assertEqual(self.copies, [])
+        self.assertTrue(common.areArraysEqual(dst[:], table[:]))
+
+    def test03_copy_file(self):
+        """Copying whole files."""
+
+        h5fname = tempfile.mktemp(".h5")
+        try:
+            self.h5file.copy_file(h5fname)
+            self.assertEqual(sorted(self.copies),
+                             ['/carray', '/earray', '/table'])
+            with tb.open_file(h5fname) as h5file:
+                for name in ['table', 'earray', 'carray']:
+                    self.assertTrue(common.areArraysEqual(
+                        h5file.get_node('/', name)[:],
+                        self.h5file.get_node('/', name)[:]))
+                self.assertEqual(h5file.root.table.attrs.NROWS, 100)
+        finally:
+            if Path(h5fname).is_file():
+                Path(h5fname).unlink()
+
+
+class BloscParallelAppendTestCase(ParallelAppendTestCase):
+    filters = tb.Filters(complevel=5, complib='blosc', shuffle=True)
+
+
+class BloscLZ4ParallelAppendTestCase(ParallelAppendTestCase):
+    filters = tb.Filters(complevel=9, complib='blosc:lz4', shuffle=False,
+                         bitshuffle=True)
+
+
+class ZlibNoShuffleParallelAppendTestCase(ParallelAppendTestCase):
+    filters = tb.Filters(complevel=9, complib='zlib', shuffle=False)
+
+
+class BloscParallelReadTestCase(ParallelReadTestCase):
+    filters = tb.Filters(complevel=5, complib='blosc', shuffle=True)
+
+
+class BloscZstdParallelReadTestCase(ParallelReadTestCase):
+    filters = tb.Filters(complevel=5, complib='blosc:zstd', shuffle=False,
+                         bitshuffle=True)
+
+
+def suite():
+    theSuite = common.unittest.TestSuite()
+    niter = 1
+
+    for i in range(niter):
+        theSuite.addTest(common.unittest.makeSuite(ParallelAppendTestCase))
+        if common.blosc_avail:
+            theSuite.addTest(common.unittest.makeSuite(
+                BloscParallelAppendTestCase))
+            theSuite.addTest(common.unittest.makeSuite(
+                BloscLZ4ParallelAppendTestCase))
+        theSuite.addTest(common.unittest.makeSuite(
+            ZlibNoShuffleParallelAppendTestCase))
+        theSuite.addTest(common.unittest.makeSuite(ParallelReadTestCase))
+        theSuite.addTest(common.unittest.makeSuite(RawChunkTestCase))
+        theSuite.addTest(common.unittest.makeSuite(RawCopyTestCase))
+        if common.blosc_avail:
+            theSuite.addTest(common.unittest.makeSuite(
+                BloscParallelReadTestCase))
+            theSuite.addTest(common.unittest.makeSuite(
+                BloscZstdParallelReadTestCase))
+
+    return theSuite
+
+
+if __name__ == '__main__':
+    common.parse_argv(sys.argv)
+    common.print_versions()
+    common.unittest.main(defaultTest='suite')
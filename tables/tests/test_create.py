@@ -1544,6 +1544,27 @@ class SetBloscMaxThreadsTestCase(common.TempFileMixin,
             print("Should be:", self.h5file.params['MAX_BLOSC_THREADS'])
         self.assertEqual(nthreads_old, self.h5file.params['MAX_BLOSC_THREADS'])
 
+    def test02_threads(self):
+        """Checking the Blosc filter with several threads"""
+
+        nthreads_old = tb.set_blosc_max_threads(4)
+        try:
+            data = np.arange(1_000_000, dtype='i8') % 1234
+            for complib in ['blosc', 'blosc:lz4', 'blosc:zstd']:
+                if complib not in tb.filters.all_complibs:
+                    continue
+                filters = tb.Filters(complevel=5, complib=complib)
+                name = complib.replace(':', '_')
+                self.h5file.create_carray('/', name, obj=data,
+                                          filters=filters,
+                                          chunkshape=(len(data),))
+            self._reopen()
+            tb.set_blosc_max_threads(3)
+            for node in self.h5file.root:
+                self.assertTrue(common.areArraysEqual(node[:], data))
+        finally:
+            tb.set_blosc_max_threads(nthreads_old)
+
 
 class FilterTestCase(common.PyTablesTestCase):
     def test_filter_pack_type(self):
@@ -2522,6 +2543,150 @@ class QuantizeTestCase(common.TempFileMixin, common.PyTablesTestCase):
             np.abs(self.h5file.root.floats[:] - self.randomdata).max(), 0.05)
 
 
+class BulkCreateTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Creating many leaves at once."""
+
+    def _check_same(self, node, expected):
+        """Check that `node` is stored like the `expected` node."""
+
+        self.assertIs(type(node), type(expected))
+        self.assertEqual(node.shape, expected.shape)
+        self.assertEqual(node.dtype, expected.dtype)
+        self.assertEqual(node.byteorder, expected.byteorder)
+        self.assertEqual(node.flavor, expected.flavor)
+        self.assertEqual(node.chunkshape, expected.chunkshape)
+        self.assertEqual(node.filters, expected.filters)
+        attrs, eattrs = node._v_attrs, expected._v_attrs
+        self.assertEqual(attrs._f_list('all'), eattrs._f_list('all'))
+        for name in eattrs._f_list('all'):
+            self.assertTrue(common.areArraysEqual(
+                np.asarray(attrs[name]), np.asarray(eattrs[name])))
+        self.assertTrue(common.areArraysEqual(node.read(), expected.read()))
+
+    def test00_arrays(self):
+        """Creating many arrays at once."""
+
+        arrays = {
+            'ints': np.arange(10, dtype='>i4'),
+            'floats': np.linspace(0, 1, 6).reshape(2, 3),
+            'strings': np.array([b'a', b'bcd']),
+            'list': [[1, 2], [3, 4]],
+            'scalar': 3.5,
+            '_p_hidden': np.zeros(1),
+        }
+        self.h5file.create_group('/', 'expected')
+        for (name, obj) in arrays.items():
+            self.h5file.create_array('/expected', name, obj, title='Title')
+        group = self.h5file.create_group('/', 'group')
+        self.assertEqual(len(group._v_children), 0)  # names are loaded
+        self.h5file.create_arrays(group, arrays, title='Title')
+        self.h5file.create_arrays('/big', {'ints': np.arange(10)},
+                                  byteorder='big', createparents=True)
+
+        self.assertEqual(sorted(group._v_leaves), sorted(
+            name for name in arrays if not name.startswith('_')))
+        self.assertIn('_p_hidden', group._v_hidden)
+        self.assertEqual(self.h5file.root.big.ints.byteorder, 'big')
+        self._reopen()
+        for name in arrays:
+            self._check_same(self.h5file.get_node('/group', name),
+                             self.h5file.get_node('/expected', name))
+
+    def test01_tables(self):
+        """Creating many tables at once."""
+
+        dtype1 = np.dtype([('x', 'i4'), ('y', 'f8', (2,))])
+        dtype2 = np.dtype([('s', 'S3'), ('b', '?')])
+        tables = {
+            'table%d' % i: np.array([(j, (j, -j)) for j in range(i)], dtype1)
+            for i in range(5)}
+        tables['other'] = np.array([(b'abc', True)], dtype2)
+        tables['recarray'] = np.rec.array([(1, (2., 3.))], dtype=dtype1)
+        filters = tb.Filters(complevel=1)
+        self.h5file.create_group('/', 'expected')
+        for (name, obj) in tables.items():
+            self.h5file.create_table('/expected', name, obj, title='Title',
+                                     filters=filters)
+        self.h5file.create_tables('/group', tables, title='Title',
+                                  filters=filters, createparents=True)
+
+        self._reopen('a')
+        for name in tables:
+            self._check_same(self.h5file.get_node('/group', name),
+                             self.h5file.get_node('/expected', name))
+        table = self.h5file.root.group.table0
+        table.append([(1, (2., 3.))])
+        self.assertEqual(table.cols.x[:].tolist(), [1])
+
+    def test02_errors(self):
+        """Leaves are not created when some of them can not be created."""
+
+        self.h5file.create_array('/', 'array', [1])
+        for (names, exception) in [(['new', 'array'], tb.NodeError),
+                                   (['new', '_i_new'], ValueError),
+                                   (['new', 'a/b'], ValueError)]:
+            arrays = {name: [1] for name in names}
+            self.assertRaises(exception, self.h5file.create_arrays, '/',
+                              arrays)
+            tables = {name: np.zeros(1, 'i4,f4') for name in names}
+            self.assertRaises(exception, self.h5file.create_tables, '/',
+                              tables)
+        self.assertRaises(TypeError, self.h5file.create_arrays, '/',
+                          {'new': np.array([{}], dtype=object)})
+        self.assertRaises(TypeError, self.h5file.create_tables, '/',
+                          {'new': np.arange(3)})
+        self.assertRaises(TypeError, self.h5file.create_arrays, '/array',
+                          {'new': [1]})
+        self.assertEqual(list(self.h5file.root._v_children), ['array'])
+
+    def test03_undo(self):
+        """Undoing the creation of many leaves."""
+
+        self.h5file.enable_undo()
+        self.h5file.create_arrays('/', {'a%d' % i: [i] for i in range(3)})
+        self.h5file.create_tables('/', {'t%d' % i: np.zeros(i, 'i4,f4')
+                                        for i in range(3)})
+        self.h5file.undo()
+        self.assertEqual(list(self.h5file.root._v_children), [])
+        self.h5file.redo()
+        self.assertEqual(sorted(self.h5file.root._v_children),
+                         ['a0', 'a1', 'a2', 't0', 't1', 't2'])
+        self.assertEqual(self.h5file.root.a2[:], [2])
+        self.assertEqual(self.h5file.root.t2.nrows, 2)
+        self.h5file.disable_undo()
+
+    def test04_byteorder(self):
+        """Creating many tables with rows in a non-native byteorder."""
+
+        native = '<' if sys.byteorder == 'little' else '>'
+        other = {'<': '>', '>': '<'}[native]
+        dtype = np.dtype([('x', other + 'i4'), ('y', other + 'f8')])
+        tables = {'t%d' % i: np.array([(j, j / 2) for j in range(i)], dtype)
+                  for i in range(4)}
+        expected = {name: nparray.copy() for (name, nparray) in tables.items()}
+        for (where, byteorder) in [('/data', None), ('/little', 'little'),
+                                   ('/big', 'big')]:
+            self.h5file.create_tables(where, tables, byteorder=byteorder,
+                                      createparents=True)
+            # The given rows are not byteswapped.
+            for (name, nparray) in tables.items():
+                self.assertEqual(nparray.dtype, dtype)
+                self.assertTrue(common.areArraysEqual(nparray,
+                                                      expected[name]))
+
+        self._reopen()
+        data_byteorder = 'little' if other == '<' else 'big'
+        for (where, byteorder) in [('/data', data_byteorder),
+                                   ('/little', 'little'), ('/big', 'big')]:
+            for (name, nparray) in expected.items():
+                table = self.h5file.get_node(where, name)
+                self.assertEqual(table.byteorder, byteorder)
+                self.assertEqual(table.read()['x'].tolist(),
+                                 nparray['x'].tolist())
+                self.assertEqual(table.read()['y'].tolist(),
+                                 nparray['y'].tolist())
+
+
 def suite():
     import doctest
 
@@ -2569,6 +2734,7 @@ def suite():
         theSuite.addTest(common.unittest.makeSuite(InMemoryCoreDriverTestCase))
 
         theSuite.addTest(common.unittest.makeSuite(QuantizeTestCase))
+        theSuite.addTest(common.unittest.makeSuite(BulkCreateTestCase))
 
     if common.heavy:
         theSuite.addTest(common.unittest.makeSuite(CreateTestCase))
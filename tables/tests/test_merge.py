@@ -0,0 +1,159 @@
+"""Test module for merging tables and enlargeable arrays of several files."""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+import tables as tb
+from tables import chunkio
+from tables.tests import common
+
+
+class MergeTablesTestCase(common.PyTablesTestCase):
+    """Concatenating the tables and enlargeable arrays of several files."""
+
+    sizes = (250, 130, 0, 77)
+
+    def setUp(self):
+        super().setUp()
+
+        self.tmpdir = Path(tempfile.mkdtemp(prefix=self._getName()))
+        self.sources = []
+        for (i, size) in enumerate(self.sizes):
+            filename = str(self.tmpdir / f'shard{i}.h5')
+            with tb.open_file(filename, 'w') as h5file:
+                data = np.zeros(size, dtype=[('x', 'i4'), ('y', 'f8')])
+                data['x'] = np.arange(size) + 1000 * i
+                table = h5file.create_table(
+                    '/group', 'table', data, chunkshape=50,
+                    filters=tb.Filters(complevel=1), createparents=True)
+                table.cols.x.create_index()
+                table.attrs.shard = i
+                h5file.create_earray(
+                    '/', 'earray', obj=np.arange(2 * size).reshape(-1, 2),
+                    chunkshape=(25, 2), filters=tb.Filters(complevel=1))
+                h5file.create_array('/', 'array', [i])
+            self.sources.append(filename)
+        self.dest = str(self.tmpdir / 'merged.h5')
+        self.expected = np.concatenate([
+            np.arange(size) + 1000 * i for (i, size) in enumerate(self.sizes)])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        super().tearDown()
+
+    def _merge(self, *args, **kwargs):
+        with mock.patch.object(chunkio, 'copy', wraps=chunkio.copy) as copy:
+            nrows = tb.merge_tables(*args, **kwargs)
+        self.copies = copy.call_count
+        return nrows
+
+    def _check_table(self, table, expected):
+        self.assertEqual(table.attrs.shard, 0)
+        self.assertEqual(table.filters.complevel, 1)
+        self.assertEqual(table.chunkshape, (50,))
+        self.assertTrue(common.areArraysEqual(table.cols.x[:], expected))
+        self.assertEqual(table.attrs.NROWS, len(expected))
+        self.assertTrue(table.cols.x.is_indexed)
+        # Indexed queries see all the rows.
+        self.assertEqual(sorted(table.read_where('x >= 1050')['x']),
+                         sorted(expected[expected >= 1050]))
+
+    def test00_ordered(self):
+        """Merging files in order."""
+
+        nrows = self._merge(self.sources, self.dest)
+        self.assertEqual(nrows, {'/group/table': 457, '/earray': 457})
+        # Rows are copied as stored while the destination ends at a
+        # chunk boundary.
+        self.assertEqual(self.copies, 4)
+        with tb.open_file(self.dest) as h5file:
+            self.assertNotIn('/array', h5file)
+            self._check_table(h5file.root.group.table, self.expected)
+            earray = h5file.root.earray
+            self.assertEqual(earray.shape, (457, 2))
+            self.assertTrue(common.areArraysEqual(
+                earray[:, 0], np.concatenate(
+                    [np.arange(0, 2 * size, 2) for size in self.sizes])))
+
+    def test01_unordered(self):
+        """Merging files with the last chunks of sources at the end."""
+
+        self._merge(self.sources, self.dest, ordered=False)
+        # All the complete chunks are copied as stored.
+        self.assertEqual(self.copies, 6)
+        chunks, tails = [], []
+        for (i, size) in enumerate(self.sizes):
+            x = np.arange(size) + 1000 * i
+            chunks.append(x[:size - size % 50])
+            tails.append(x[size - size % 50:])
+        with tb.open_file(self.dest) as h5file:
+            self._check_table(h5file.root.group.table,
+                              np.concatenate(chunks + tails))
+
+    def test02_append(self):
+        """Merging files into existing nodes."""
+
+        with tb.open_file(self.dest, 'w') as h5file:
+            self._merge(self.sources[:1], h5file, where='/group')
+            self.assertNotIn('/earray', h5file)
+            table = h5file.root.group.table
+            table.append([(-1, 0.)])
+            self._merge(self.sources[1:], h5file, where='/group/table')
+            self._check_table(table, np.concatenate(
+                [self.expected[:250], [-1], self.expected[250:]]))
+
+    def test03_mismatch(self):
+        """Merging nodes with different descriptions."""
+
+        with tb.open_file(self.sources[1], 'a') as h5file:
+            h5file.root.group.table.remove()
+            h5file.create_table('/group', 'table', {'x': tb.Int64Col()})
+        self.assertRaises(ValueError, tb.merge_tables, self.sources,
+                          self.dest)
+
+    def test04_filters(self):
+        """Merging nodes with different filters."""
+
+        with tb.open_file(self.sources[0], 'a') as h5file:
+            h5file.root.group.table.copy(
+                '/group', 'table2', filters=tb.Filters(complevel=5))
+            h5file.root.group.table.remove()
+            h5file.move_node('/group/table2', newname='table')
+        self._merge(self.sources, self.dest, where='/group')
+        # Only the first source has the filters of the destination.
+        self.assertEqual(self.copies, 1)
+        with tb.open_file(self.dest) as h5file:
+            self.assertEqual(h5file.root.group.table.filters.complevel, 5)
+            self.assertTrue(common.areArraysEqual(
+                h5file.root.group.table.cols.x[:], self.expected))
+
+    def test05_nrows(self):
+        """Merging files with rows only copied as stored."""
+
+        with tb.open_file(self.dest, 'w') as h5file:
+            self._merge(self.sources[:2], h5file)
+            self.assertEqual(self.copies, 4)
+            self.assertEqual(h5file.root.group.table.attrs.NROWS, 380)
+        with tb.open_file(self.dest) as h5file:
+            self._check_table(h5file.root.group.table, self.expected[:380])
+
+
+def suite():
+    theSuite = common.unittest.TestSuite()
+    niter = 1
+
+    for i in range(niter):
+        theSuite.addTest(common.unittest.makeSuite(MergeTablesTestCase))
+
+    return theSuite
+
+
+if __name__ == '__main__':
+    common.parse_argv(sys.argv)
+    common.print_versions()
+    common.unittest.main(defaultTest='suite')
@@ -0,0 +1,146 @@
+"""Test module for map/reduce over chunks in a pool of processes."""
+
+import operator
+import subprocess
+import sys
+
+import numpy as np
+
+import tables as tb
+from tables.tests import common
+
+
+def _ranges(data):
+    return (len(data), int(data['x'][0]) if len(data) else None)
+
+
+def _sum_x(data):
+    return int(data['x'].sum())
+
+
+def _sum(data):
+    return data.sum(axis=0)
+
+
+def _shape(data):
+    return data.shape
+
+
+class MapChunksTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Calling functions on chunks of leaves in worker processes."""
+
+    processes = 2
+
+    def setUp(self):
+        super().setUp()
+
+        data = np.zeros(1000, dtype=[('x', 'i4'), ('y', 'f8')])
+        data['x'] = np.arange(1000)
+        data['y'] = np.arange(1000) / 10
+        self.data = data
+        table = self.h5file.create_table('/', 'table', data, chunkshape=16)
+        table.nrowsinbuf = 100
+        earray = self.h5file.create_earray('/', 'earray', tb.Int64Atom(),
+                                           (0, 3), chunkshape=(10, 2))
+        earray.append(np.arange(300).reshape(100, 3))
+        self.h5file.flush()
+
+    def test00_table(self):
+        """Mapping a function over a table."""
+
+        table = self.h5file.root.table
+        results = table.map_chunks(_ranges, processes=self.processes)
+        # Ranges span as many chunks as fit in the buffer.
+        self.assertEqual(results, [(96, i * 96) for i in range(10)] +
+                         [(40, 960)])
+        results = table.map_chunks(_ranges, processes=self.processes,
+                                   start=10, stop=50, chunks_per_task=1)
+        self.assertEqual(results, [(6, 10), (16, 16), (16, 32), (2, 48)])
+
+    def test01_reduce(self):
+        """Reducing the results of a function over a table."""
+
+        table = self.h5file.root.table
+        self.assertEqual(
+            table.map_chunks(_sum_x, operator.add, self.processes),
+            sum(range(1000)))
+        self.assertIsNone(table.map_chunks(
+            _sum_x, operator.add, self.processes, start=5, stop=5))
+
+    def test02_condition(self):
+        """Mapping a function over the rows fulfilling a condition."""
+
+        table = self.h5file.root.table
+        limit = 500
+        self.assertEqual(
+            table.map_chunks(_sum_x, operator.add, self.processes,
+                             condition='(x >= limit) & (y < 60)'),
+            sum(range(500, 600)))
+        self.assertEqual(
+            table.map_chunks(_sum_x, operator.add, self.processes,
+                             condition='c < 10',
+                             condvars={'c': table.cols.x}),
+            sum(range(10)))
+
+    def test03_earray(self):
+        """Mapping a function over an enlargeable array."""
+
+        earray = self.h5file.root.earray
+        self.assertTrue(common.areArraysEqual(
+            earray.map_chunks(_sum, operator.add, self.processes),
+            earray[:].sum(axis=0)))
+        self.assertEqual(
+            earray.map_chunks(_shape, processes=self.processes,
+                              chunks_per_task=3),
+            [(30, 3)] * 3 + [(10, 3)])
+
+    def test04_modified(self):
+        """Workers see data appended after a previous call."""
+
+        earray = self.h5file.root.earray
+        earray.map_chunks(_shape, processes=self.processes)
+        earray.append(np.ones((50, 3)))
+        self.assertEqual(
+            earray.map_chunks(_shape, operator.add, self.processes,
+                              chunks_per_task=15),
+            (150, 3))
+
+    def test05_errors(self):
+        """Invalid arguments."""
+
+        table = self.h5file.root.table
+        self.assertRaises(ValueError, table.map_chunks, _ranges,
+                          processes=0)
+        self.assertRaises(ValueError, table.map_chunks, _ranges,
+                          chunks_per_task=0)
+        self.assertRaises(NameError, table.map_chunks, _ranges,
+                          condition='z > 0')
+
+    def test06_worker_exit(self):
+        """Workers close the files they have opened when they exit."""
+
+        self._reopen()
+        script = ('import tables; '
+                  'h5file = tables.open_file(%r); '
+                  'print(h5file.root.earray.map_chunks(len, sum, 1)); '
+                  'h5file.close()' % self.h5fname)
+        result = subprocess.run([sys.executable, '-c', script],
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '100')
+        self.assertNotIn('Closing remaining open files', result.stderr)
+
+
+def suite():
+    theSuite = common.unittest.TestSuite()
+    niter = 1
+
+    for i in range(niter):
+        theSuite.addTest(common.unittest.makeSuite(MapChunksTestCase))
+
+    return theSuite
+
+
+if __name__ == '__main__':
+    common.parse_argv(sys.argv)
+    common.print_versions()
+    common.unittest.main(defaultTest='suite')
@@ -34,6 +34,11 @@ def suite():
         'tables.tests.test_index_backcompat',
         'tables.tests.test_aux',
         'tables.tests.test_utils',
+        'tables.tests.test_chunkio',
+        'tables.tests.test_aio',
+        'tables.tests.test_parallel',
+        'tables.tests.test_merge',
+        'tables.tests.test_catalog',
         # Sub-packages
         'tables.nodes.tests.test_filenode',
     ]
@@ -1,6 +1,7 @@
 import itertools
 import sys
 import tempfile
+import warnings
 import struct
 import platform
 from pathlib import Path
@@ -5490,6 +5491,345 @@ class Length2TestCase(LengthTestCase):
     nrows = 100
 
 
+class IterBatchesTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Tests for the `Table.iter_batches()` method."""
+
+    nrows = 1000
+
+    def setUp(self):
+        super().setUp()
+
+        self.data = data = np.zeros(self.nrows, dtype=[
+            ('t', 'f8'), ('v', 'i4'), ('n', [('a', 'i2'), ('b', 'f4')])])
+        data['t'] = np.arange(self.nrows)
+        data['v'] = np.arange(self.nrows) % 7
+        data['n']['a'] = np.arange(self.nrows) % 11
+        self.table = self.h5file.create_table(
+            '/', 'table', data, chunkshape=32)
+
+    def test00_all(self):
+        """Checking batches covering the whole table."""
+
+        batches = list(self.table.iter_batches(batch_rows=100))
+        self.assertEqual([len(b) for b in batches], [100] * 10)
+        self.assertTrue(common.areArraysEqual(np.concatenate(batches),
+                                              self.data))
+
+    def test01_range(self):
+        """Checking batches in a range with a step."""
+
+        batches = list(self.table.iter_batches(batch_rows=30, start=5,
+                                               stop=900, step=7))
+        self.assertTrue(all(len(b) <= 30 for b in batches))
+        self.assertTrue(common.areArraysEqual(np.concatenate(batches),
+                                              self.data[5:900:7]))
+
+    def test02_reuse_buffer(self):
+        """Checking batches sharing the same buffer."""
+
+        batches = [b.copy() for b in self.table.iter_batches(
+            batch_rows=64, reuse_buffer=True)]
+        self.assertTrue(common.areArraysEqual(np.concatenate(batches),
+                                              self.data))
+
+    def test03_fields(self):
+        """Checking batches of selected columns."""
+
+        batches = list(self.table.iter_batches(batch_rows=300,
+                                               fields=['v', 'n/a']))
+        self.assertEqual(sorted(batches[0]), ['n/a', 'v'])
+        self.assertTrue(common.areArraysEqual(
+            np.concatenate([b['n/a'] for b in batches]),
+            self.data['n']['a']))
+        self.assertRaises(TypeError, self.table.iter_batches, fields='v')
+        self.assertRaises(KeyError, self.table.iter_batches,
+                          fields=['foo'])
+
+    def _check_condition(self, condition, expected, **kwargs):
+        condvars = {'limit': 500}
+        batches = list(self.table.iter_batches(
+            batch_rows=50, condition=condition, condvars=condvars, **kwargs))
+        self.assertTrue(all(0 < len(b) <= 50 for b in batches))
+        self.assertTrue(common.areArraysEqual(np.concatenate(batches),
+                                              expected))
+
+    def test04_condition(self):
+        """Checking batches of rows fulfilling a condition."""
+
+        data = self.data
+        self._check_condition('v == 3', data[data['v'] == 3])
+        self._check_condition('(v == 3) & (t > limit)',
+                              data[(data['v'] == 3) & (data['t'] > 500)])
+        self._check_condition('v == 3', data[::3][data[::3]['v'] == 3],
+                              step=3)
+        self.assertEqual(list(self.table.iter_batches(condition='v > 7')),
+                         [])
+
+    def test05_condition_indexed(self):
+        """Checking batches of rows fulfilling an indexed condition."""
+
+        self.table.cols.v.create_index()
+        data = self.data
+        self._check_condition('v == 3', data[data['v'] == 3])
+        self._check_condition('(v == 3) & (t >= 100)',
+                              data[(data['v'] == 3) & (data['t'] >= 100)])
+
+    def test06_condition_sorted(self):
+        """Checking batches of rows fulfilling a sorted condition."""
+
+        self.table.sortedby = 't'
+        data = self.data
+        self._check_condition('(t > 200) & (t < 300)',
+                              data[(data['t'] > 200) & (data['t'] < 300)])
+        self._check_condition('(t > 200) & (v == 1)',
+                              data[(data['t'] > 200) & (data['v'] == 1)])
+
+
+class ReadColumnsTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Tests for the `Table.read_columns()` method."""
+
+    nrows = 1000
+
+    def setUp(self):
+        super().setUp()
+
+        self.data = data = np.zeros(self.nrows, dtype=[
+            ('t', 'f8'), ('m', 'i4', (2,)),
+            ('n', [('a', 'i2'), ('b', 'f4')])])
+        data['t'] = np.arange(self.nrows)
+        data['m'] = np.arange(self.nrows)[:, None] % 7
+        data['n']['a'] = np.arange(self.nrows) % 11
+        self.table = self.h5file.create_table(
+            '/', 'table', data, chunkshape=32)
+        # Use a small I/O buffer to read the table in several pieces.
+        self.table.nrowsinbuf = 50
+
+    def _check_columns(self, columns, data):
+        for name, column in columns.items():
+            self.assertTrue(column.flags.c_contiguous)
+            self.assertTrue(common.areArraysEqual(
+                column, tb.table.get_nested_field(data, name)))
+
+    def test00_all(self):
+        """Checking all the columns of the table."""
+
+        columns = self.table.read_columns()
+        self.assertEqual(sorted(columns), ['m', 'n/a', 'n/b', 't'])
+        self._check_columns(columns, self.data)
+
+    def test01_range(self):
+        """Checking some columns in a range with a step."""
+
+        for start, stop, step in [(5, 900, 7), (None, None, 3),
+                                  (10, 20, None), (20, 10, None)]:
+            columns = self.table.read_columns(['t', 'm', 'n'],
+                                              start, stop, step)
+            self._check_columns(columns, self.data[start:stop:step])
+
+    def test02_out(self):
+        """Checking columns read into given arrays."""
+
+        out = {'t': np.empty(100, 'i8'), 'n/a': np.empty(100, 'i2')}
+        columns = self.table.read_columns(['t', 'n/a'], step=10, out=out)
+        self.assertIs(columns, out)
+        self._check_columns(columns, self.data[::10])
+
+    def test03_errors(self):
+        """Checking wrong arguments."""
+
+        read_columns = self.table.read_columns
+        self.assertRaises(TypeError, read_columns, 't')
+        self.assertRaises(KeyError, read_columns, ['x'])
+        self.assertRaises(KeyError, read_columns, ['t'],
+                          out={'m': np.empty(self.nrows, 'i4')})
+        self.assertRaises(ValueError, read_columns, ['t'],
+                          out={'t': np.empty(10, 'f8')})
+
+
+class AppendColumnsTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Tests for the `Table.append_columns()` method."""
+
+    nrows = 1000
+
+    class Record(tb.IsDescription):
+        t = tb.Float64Col(pos=0)
+        m = tb.Int32Col(shape=(2,), dflt=5, pos=1)
+
+        class n(tb.IsDescription):
+            a = tb.Int16Col(dflt=-1, pos=0)
+            b = tb.Float32Col(pos=1)
+
+    def setUp(self):
+        super().setUp()
+
+        self.table = self.h5file.create_table('/', 'table', self.Record)
+        # Use a small I/O buffer to write the table in several pieces.
+        self.table.nrowsinbuf = 64
+
+    def test00_all(self):
+        """Appending all the columns of the table."""
+
+        data = np.zeros(self.nrows, dtype=self.table.dtype)
+        data['t'] = np.arange(self.nrows)
+        data['m'] = np.arange(2 * self.nrows).reshape(self.nrows, 2)
+        data['n']['a'] = np.arange(self.nrows) % 11
+        data['n']['b'] = -np.arange(self.nrows)
+        self.table.append_columns({'t': data['t'], 'm': data['m'],
+                                   'n': data['n']})
+        self.table.append_columns({'t': data['t'], 'm': data['m'].tolist(),
+                                   'n/a': data['n']['a'],
+                                   'n/b': data['n']['b']})
+        if self.reopen:
+            self._reopen()
+            self.table = self.h5file.root.table
+        self.assertEqual(self.table.nrows, 2 * self.nrows)
+        self.assertTrue(common.areArraysEqual(self.table[:self.nrows], data))
+        self.assertTrue(common.areArraysEqual(self.table[self.nrows:], data))
+
+    def test01_defaults(self):
+        """Appending some columns of the table."""
+
+        self.table.append_columns({'n/b': np.arange(self.nrows)})
+        self.assertEqual(self.table.nrows, self.nrows)
+        self.assertTrue((self.table.col('t') == 0).all())
+        self.assertTrue((self.table.col('m') == 5).all())
+        self.assertTrue((self.table.col('n/a') == -1).all())
+        self.assertTrue((self.table.col('n/b') == np.arange(self.nrows)).all())
+
+    def test02_empty(self):
+        """Appending no rows."""
+
+        self.table.append_columns({})
+        self.table.append_columns({'t': []})
+        self.assertEqual(self.table.nrows, 0)
+
+    def test03_errors(self):
+        """Appending wrong columns."""
+
+        append_columns = self.table.append_columns
+        self.assertRaises(KeyError, append_columns, {'x': [1]})
+        self.assertRaises(ValueError, append_columns, {'t': ['a']})
+        self.assertRaises(ValueError, append_columns, {'m': [1, 2]})
+        self.assertRaises(ValueError, append_columns, {'t': [1, 2],
+                                                       'n/a': [1]})
+        self.assertEqual(self.table.nrows, 0)
+
+
+class AppendColumnsReopenTestCase(AppendColumnsTestCase):
+    reopen = True
+
+
+class AppendColumnsNoReopenTestCase(AppendColumnsTestCase):
+    reopen = False
+
+
+class SortedColumnTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Tests for the `Table.sortedby` column declaration."""
+
+    nrows = 1000
+
+    def setUp(self):
+        super().setUp()
+
+        self.data = data = np.empty(self.nrows, dtype=[('t', 'f8'),
+                                                       ('v', 'i4')])
+        data['t'] = np.arange(self.nrows) // 3
+        data['v'] = np.arange(self.nrows)[::-1]
+        self.table = self.h5file.create_table(
+            '/', 'table', data, chunkshape=16)
+
+    def _check_queries(self):
+        table, data = self.table, self.data
+        for cond, start, stop, step in [
+                ('t >= 100', None, None, None),
+                ('t > 100', None, None, None),
+                ('t < 50', None, None, None),
+                ('t <= 50', None, None, None),
+                ('t == 120', None, None, None),
+                ('(t > 20) & (t < 40)', None, None, None),
+                ('(t < 20) | (t >= 300)', None, None, None),
+                ('(t >= 30) & (v % 2 == 0)', None, None, None),
+                ('(t >= 30) & (t < 60)', 100, 500, 3),
+                ('t > 1000', None, None, None),
+                ('t < 0', None, None, None)]:
+            cmp = np.arange(self.nrows)[start:stop:step]
+            tv = data['t'][cmp]
+            vv = data['v'][cmp]
+            mask = eval(cond, {'t': tv, 'v': vv})
+            expected = cmp[mask]
+            coords = table.get_where_list(cond, start=start, stop=stop,
+                                          step=step)
+            self.assertEqual(coords.tolist(), expected.tolist(), cond)
+            result = table.read_where(cond, start=start, stop=stop,
+                                      step=step)
+            self.assertEqual(result.tolist(), data[expected].tolist())
+
+    def test00_queries(self):
+        """Checking queries on a sorted column."""
+
+        self.table.sortedby = 't'
+        self.assertEqual(self.table.sortedby, 't')
+        self.assertFalse(self.table.will_query_use_indexing('t > 3'))
+        self._check_queries()
+
+    def test01_persistent(self):
+        """Checking that the sorted column is persistent."""
+
+        self.table.sortedby = 't'
+        self._reopen()
+        self.table = self.h5file.root.table
+        self.assertEqual(self.table.sortedby, 't')
+        self._check_queries()
+
+    def test02_unsorted(self):
+        """Checking that an unsorted column can not be declared sorted."""
+
+        self.assertRaises(ValueError, setattr, self.table, 'sortedby', 'v')
+        self.assertIsNone(self.table.sortedby)
+
+    def test03_append(self):
+        """Checking that appends must keep the order."""
+
+        table = self.table
+        table.sortedby = 't'
+        last = self.data['t'][-1]
+        table.append([(last, 0), (last + 1, 0)])
+        self.assertEqual(table.nrows, self.nrows + 2)
+        self.assertRaises(ValueError, table.append, [(last, 0)])
+        self.assertRaises(ValueError, table.append,
+                          [(last + 3, 0), (last + 2, 0)])
+        self.assertEqual(table.nrows, self.nrows + 2)
+
+    def test04_modify(self):
+        """Checking that modifications breaking the order drop it."""
+
+        table = self.table
+        table.sortedby = 't'
+        table.modify_column(0, 1, column=[0.], colname='t')
+        self.assertEqual(table.sortedby, 't')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', tb.PerformanceWarning)
+            table.modify_column(0, 1, column=[1e6], colname='t')
+        self.assertIsNone(table.sortedby)
+
+    def test05_reset(self):
+        """Checking that the sorted column can be dropped."""
+
+        table = self.table
+        table.sortedby = 't'
+        table.sortedby = None
+        self.assertIsNone(table.sortedby)
+        self._check_queries()
+
+    def test06_copy(self):
+        """Checking that copies keep the sorted column."""
+
+        self.table.sortedby = 't'
+        self.table = self.table.copy('/', 'table2')
+        self.assertEqual(self.table.sortedby, 't')
+        self._check_queries()
+
+
 class WhereAppendTestCase(common.TempFileMixin, common.PyTablesTestCase):
     """Tests `Table.append_where()` method."""
 
@@ -5663,6 +6003,53 @@ class WhereAppendTestCase(common.TempFileMixin, common.PyTablesTestCase):
         # There are no more rows.
         self.assertRaises(StopIteration, next, it2)
 
+    def test07_buffers(self):
+        """Appending rows spanning several I/O buffers."""
+
+        class DstTblDesc(tb.IsDescription):
+            id = tb.Int64Col()
+            v1 = tb.Float32Col()
+            v3 = tb.IntCol(dflt=-1)  # extra column
+            v2 = tb.StringCol(itemsize=8)
+
+        tbl1 = self.h5file.root.test
+        tbl1.append([(i, i / 2, str(i)) for i in range(3, 1000)])
+        tbl1.nrowsinbuf = 100
+        tbl2 = self.h5file.create_table('/', 'test2', DstTblDesc)
+        tbl3 = self.h5file.create_table('/', 'test3', self.SrcTblDesc)
+
+        limit = 500
+        self.assertEqual(tbl1.append_where(tbl2, '(id > limit) | (id < 3)'),
+                         501)
+        self.assertEqual(tbl1.append_where(tbl3, 'id % 2 == 0', start=2,
+                                           stop=20, step=3), 3)
+        self.assertEqual(tbl2.cols.id[:].tolist(),
+                         [1, 2] + list(range(501, 1000)))
+        self.assertEqual(tbl2.cols.v1[-1], 499.5)
+        self.assertEqual(tbl2.cols.v2[-1], b'999')
+        self.assertEqual(set(tbl2.cols.v3[:]), {-1})
+        self.assertEqual(tbl3.cols.id[:].tolist(), [6, 12, 18])
+
+    def test08_copyCondition(self):
+        """Copying the rows of a table fulfilling a condition."""
+
+        tbl1 = self.h5file.root.test
+        tbl1.append([(i, i / 2, str(i)) for i in range(3, 1000)])
+        tbl1.cols.id.create_index()
+
+        limit = 990
+        tbl2 = tbl1.copy('/', 'test2', condition='id > limit',
+                         propindexes=True)
+        self.assertEqual(tbl2.cols.id[:].tolist(), list(range(991, 1000)))
+        self.assertTrue(tbl2.cols.id.is_indexed)
+        tbl3 = tbl1.copy('/', 'test3', condition='(id > c) & (v1 < 10)',
+                         condvars={'c': 15}, start=10, stop=100)
+        self.assertEqual(tbl3.cols.id[:].tolist(), list(range(16, 20)))
+        self.h5file.copy_node(tbl1, '/', 'test4', condition='id < 3')
+        self.assertEqual(self.h5file.root.test4.nrows, 2)
+        self.assertRaises(ValueError, tbl1.copy, '/', 'test5',
+                          condition='id > 1', sortby='id')
+
 
 class DerivedTableTestCase(common.TempFileMixin, common.PyTablesTestCase):
     def setUp(self):
@@ -6611,6 +6998,13 @@ def suite():
         theSuite.addTest(common.unittest.makeSuite(OldRecordDefaultValues))
         theSuite.addTest(common.unittest.makeSuite(Length1TestCase))
         theSuite.addTest(common.unittest.makeSuite(Length2TestCase))
+        theSuite.addTest(common.unittest.makeSuite(IterBatchesTestCase))
+        theSuite.addTest(common.unittest.makeSuite(ReadColumnsTestCase))
+        theSuite.addTest(common.unittest.makeSuite(
+            AppendColumnsReopenTestCase))
+        theSuite.addTest(common.unittest.makeSuite(
+            AppendColumnsNoReopenTestCase))
+        theSuite.addTest(common.unittest.makeSuite(SortedColumnTestCase))
         theSuite.addTest(common.unittest.makeSuite(WhereAppendTestCase))
         theSuite.addTest(common.unittest.makeSuite(DerivedTableTestCase))
         theSuite.addTest(common.unittest.makeSuite(ChunkshapeTestCase))
@@ -4,6 +4,8 @@ import warnings
 from pathlib import Path
 from time import perf_counter as clock
 
+import numpy as np
+
 import tables as tb
 from tables.tests import common
 
@@ -1086,6 +1088,217 @@ class CreateParentsTestCase(common.TempFileMixin, common.PyTablesTestCase):
             self.assertEqual(self.filters, group._v_filters)
 
 
+class LazyChildrenTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Checks for groups not loading the names of all their children."""
+
+    def setUp(self):
+        super().setUp()
+
+        for i in range(20):
+            self.h5file.create_array('/', 'array%02d' % i, [i])
+        self.h5file.create_group('/', 'group')
+        self.h5file.create_array('/group', 'inner', [0])
+        self.h5file.create_soft_link('/', 'link', '/array01')
+        self.h5file.create_array('/', '_p_hidden', [0])
+        self._reopen()
+
+    def _loaded(self):
+        return '_v_children' in self.h5file.root.__dict__
+
+    def test00_contains(self):
+        """Checking for children without listing them."""
+
+        root = self.h5file.root
+        self.assertIn('array05', root)
+        self.assertIn('_p_hidden', root)
+        self.assertIn('link', root)
+        self.assertNotIn('array99', root)
+        self.assertNotIn('foo/bar', root)
+        # Only direct children are found.
+        self.assertIn('inner', root.group)
+        self.assertNotIn('group/inner', root)
+        self.assertFalse(self._loaded())
+
+    def test01_create(self):
+        """Creating children without listing the other ones."""
+
+        self._reopen('a')
+        root = self.h5file.root
+        self.h5file.create_array('/', 'newarray', [1])
+        self.h5file.create_soft_link('/', 'newlink', '/newarray')
+        self.assertFalse(self._loaded())
+        self.assertIn('newarray', root._v_leaves)
+        self.assertIn('newlink', root._v_links)
+        self.h5file.remove_node('/newarray')
+        self.assertNotIn('newarray', root._v_children)
+        self.assertNotIn('newarray', root.__members__)
+
+    def test02_paged(self):
+        """Iterating over children in pages."""
+
+        classnames = (None, 'Group', 'Leaf', 'Link', 'Array')
+        paged = {}
+        for classname in classnames:
+            for page_size in (1, 3, 100):
+                paged[classname, page_size] = [
+                    node._v_name for node in self.h5file.iter_nodes(
+                        '/', classname, page_size=page_size)]
+        self.assertFalse(self._loaded())
+        for (classname, page_size), names in paged.items():
+            self.assertEqual(names, [
+                node._v_name for node in self.h5file.list_nodes(
+                    '/', classname)])
+        self.assertEqual(len(paged[None, 1]), 22)
+        self.assertNotIn('_p_hidden', paged[None, 1])
+        self.assertRaises(ValueError, list,
+                          self.h5file.iter_nodes('/', page_size=0))
+
+
+class IterPathsTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Checks for listing paths without creating node objects."""
+
+    def setUp(self):
+        super().setUp()
+
+        h5file = self.h5file
+        table = h5file.create_table(
+            '/group', 'table', {'x': tb.Int32Col(), 'y': tb.Float64Col()},
+            createparents=True)
+        table.append([(1, 2.)])
+        table.cols.x.create_index()
+        h5file.create_carray('/group/subgroup', 'carray', tb.Float32Atom(),
+                             (10, 2), createparents=True)
+        h5file.create_earray('/', 'earray', tb.StringAtom(5), (0,))
+        h5file.create_vlarray('/', 'vlarray', tb.Int32Atom())
+        h5file.create_array('/', 'array', 3)
+        h5file.create_array('/', '_p_hidden', [1])
+        h5file.create_soft_link('/', 'link', '/group/table')
+        self._reopen()
+
+    def test00_paths(self):
+        """Listing all the paths."""
+
+        paths = list(self.h5file.iter_paths(with_info=False))
+        self.assertEqual(paths, [
+            '/', '/array', '/earray', '/group', '/group/subgroup',
+            '/group/subgroup/carray', '/group/table', '/link', '/vlarray'])
+        self.assertEqual(
+            list(self.h5file.iter_paths('/group/subgroup', with_info=False)),
+            ['/group/subgroup', '/group/subgroup/carray'])
+        # No leaves have been loaded.
+        for path in ('/array', '/group/table', '/group/subgroup/carray'):
+            self.assertNotIn(path, self.h5file._node_manager.registry)
+        self.assertEqual(sorted(paths), sorted(
+            node._v_pathname for node in self.h5file.walk_nodes()))
+
+    def test01_info(self):
+        """Getting basic information on nodes."""
+
+        infos = {info.path: info for info in self.h5file.iter_paths()}
+        table = self.h5file.root.group.table
+        info = infos['/group/table']
+        self.assertEqual(info.h5class, 'Dataset')
+        self.assertEqual(info.classid, 'TABLE')
+        self.assertEqual(info.shape, (1,))
+        self.assertEqual(info.dtype, table.dtype)
+        self.assertEqual(info.size, table.size_on_disk)
+        info = infos['/group/subgroup/carray']
+        self.assertEqual((info.classid, info.shape, info.dtype),
+                         ('CARRAY', (10, 2), np.dtype('float32')))
+        self.assertEqual(infos['/array'].shape, ())
+        self.assertEqual(infos['/earray'].dtype, np.dtype('S5'))
+        self.assertIsNone(infos['/vlarray'].dtype)
+        self.assertEqual(infos['/group'][1:],
+                         ('Group', 'GROUP', None, None, None))
+        self.assertEqual(infos['/link'][1:],
+                         ('SoftLink', None, None, None, None))
+
+    def test02_classname(self):
+        """Listing the paths of nodes of a given class."""
+
+        def paths(classname):
+            return list(self.h5file.iter_paths(classname=classname,
+                                               with_info=False))
+
+        self.assertEqual(paths('Group'), ['/', '/group', '/group/subgroup'])
+        self.assertEqual(paths('Array'), ['/array', '/earray',
+                                          '/group/subgroup/carray'])
+        self.assertEqual(paths('Table'), ['/group/table'])
+        self.assertEqual(paths('Link'), ['/link'])
+        for classname in ('Node', 'Leaf', 'VLArray'):
+            self.assertEqual(paths(classname), [
+                node._v_pathname for node in sorted(
+                    self.h5file.walk_nodes(classname=classname),
+                    key=lambda node: node._v_pathname)])
+
+
+class ReadAttrsTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Checks for reading attributes of many nodes at once."""
+
+    def setUp(self):
+        super().setUp()
+
+        h5file = self.h5file
+        for i in range(3):
+            array = h5file.create_array('/group', 'array%d' % i, [i],
+                                        createparents=True)
+            array.attrs.index = i
+            if i != 1:
+                array.attrs.units = 'm' * (i + 1)
+        table = h5file.create_table('/group/subgroup', 'table',
+                                    {'x': tb.Int32Col()}, createparents=True)
+        table.attrs.units = {'x': 's'}
+        h5file.root.group._v_attrs.units = np.arange(3)
+        h5file.create_soft_link('/group', 'link', '/group/array0')
+        self._reopen()
+
+    def test00_group(self):
+        """Reading attributes of the nodes under a group."""
+
+        (paths, values) = self.h5file.read_attrs('/group', ['units', 'index'])
+        self.assertEqual(paths, [
+            '/group', '/group/array0', '/group/array1', '/group/array2',
+            '/group/subgroup', '/group/subgroup/table'])
+        self.assertEqual(list(values), ['units', 'index'])
+        self.assertTrue(common.areArraysEqual(values['units'][0],
+                                              np.arange(3)))
+        self.assertEqual(values['units'][1:],
+                         ['m', None, 'mmm', None, {'x': 's'}])
+        self.assertEqual(values['index'],
+                         [None, 0, 1, 2, None, None])
+        # No nodes have been loaded.
+        for path in paths[1:]:
+            self.assertNotIn(path, self.h5file._node_manager.registry)
+            self.assertNotIn(path, self.h5file._node_manager.cache)
+
+    def test01_paths(self):
+        """Reading attributes of the nodes in a sequence of paths."""
+
+        table = self.h5file.root.group.subgroup.table
+        (paths, values) = self.h5file.read_attrs(
+            ['/group/array2', table, '/group/link'], ['units', 'CLASS'])
+        self.assertEqual(paths, ['/group/array2', '/group/subgroup/table',
+                                 '/group/link'])
+        self.assertEqual(values['units'], ['mmm', {'x': 's'}, 'm'])
+        self.assertEqual(values['CLASS'], ['ARRAY', 'TABLE', 'ARRAY'])
+        self.assertRaises(tb.NoSuchNodeError, self.h5file.read_attrs,
+                          ['/group/missing'], ['units'])
+
+    def test02_classname(self):
+        """Reading attributes of the nodes of a given class."""
+
+        (paths, values) = self.h5file.read_attrs('/', ['index'],
+                                                 classname='Array')
+        self.assertEqual(paths, ['/group/array0', '/group/array1',
+                                 '/group/array2'])
+        self.assertEqual(values['index'], [0, 1, 2])
+        (paths, values) = self.h5file.read_attrs(
+            ['/group', '/group/array0', '/group/subgroup/table'], ['units'],
+            classname='Leaf')
+        self.assertEqual(paths, ['/group/array0', '/group/subgroup/table'])
+        self.assertEqual(values['units'], ['m', {'x': 's'}])
+
+
 def suite():
     theSuite = common.unittest.TestSuite()
     # This counter is useful when detecting memory leaks
@@ -1097,6 +1310,9 @@ def suite():
         theSuite.addTest(common.unittest.makeSuite(WideTreeTestCase))
         theSuite.addTest(common.unittest.makeSuite(HiddenTreeTestCase))
         theSuite.addTest(common.unittest.makeSuite(CreateParentsTestCase))
+        theSuite.addTest(common.unittest.makeSuite(LazyChildrenTestCase))
+        theSuite.addTest(common.unittest.makeSuite(IterPathsTestCase))
+        theSuite.addTest(common.unittest.makeSuite(ReadAttrsTestCase))
 
     return theSuite
 
@@ -1,8 +1,14 @@
 import sys
+import tempfile
 from io import StringIO
+from pathlib import Path
 
 from unittest.mock import patch
 
+import numpy as np
+
+import tables as tb
+import tables.scripts.ptmerge as ptmerge
 import tables.scripts.ptrepack as ptrepack
 import tables.scripts.ptdump as ptdump
 import tables.scripts.pttree as pttree
@@ -35,6 +41,140 @@ class ptrepackTestCase(common.PyTablesTestCase):
         self.assertEqual(args, (src_fn, dst_fn, src_path, dst_path))
 
 
+class ptrepackLeafwiseTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test ptrepack copying leaf by leaf (with several jobs or resuming)"""
+
+    def setUp(self):
+        super().setUp()
+
+        data = np.zeros(1000, dtype=[('x', 'i4'), ('y', 'f8')])
+        data['x'] = np.arange(1000)
+        # The table is copied as stored, since it has the filters of
+        # the copy.
+        table = self.h5file.create_table('/', 'table', data, chunkshape=100,
+                                         filters=tb.Filters(complevel=1))
+        table.cols.x.create_index()
+        table.attrs.foo = 'bar'
+        group = self.h5file.create_group('/', 'group')
+        self.h5file.create_earray(group, 'earray',
+                                  obj=np.arange(2000).reshape(-1, 2),
+                                  chunkshape=(50, 2))
+        self.h5file.create_array(group, 'array', np.arange(10))
+        self.h5file.create_soft_link('/', 'softlink', '/group/earray')
+        self.h5file.create_hard_link('/', 'hardlink', '/group/array')
+        self.h5file.close()
+
+        self.dstfname = tempfile.mktemp(prefix=self._getName(),
+                                        suffix='.h5')
+        self.manifest = Path(self.dstfname + ptrepack.MANIFEST_SUFFIX)
+
+    def tearDown(self):
+        Path(self.dstfname).unlink(missing_ok=True)
+        self.manifest.unlink(missing_ok=True)
+        self.h5file = tb.open_file(self.h5fname)
+        super().tearDown()
+
+    def _repack(self, *args):
+        argv = ['ptrepack', '--complevel=1', '--propindexes', *args,
+                self.h5fname, self.dstfname]
+        with patch.object(sys, 'argv', argv):
+            ptrepack.main()
+
+    def _check_copy(self):
+        with tb.open_file(self.dstfname) as dstfileh:
+            self.assertEqual(
+                sorted(node._v_pathname for node in dstfileh.walk_nodes()),
+                ['/', '/group', '/group/array', '/group/earray',
+                 '/hardlink', '/softlink', '/table'])
+            table = dstfileh.root.table
+            self.assertEqual(table.filters.complevel, 1)
+            self.assertTrue(table.cols.x.is_indexed)
+            self.assertEqual(table.attrs.foo, 'bar')
+            self.assertEqual(table.attrs.NROWS, 1000)
+            self.assertTrue(common.areArraysEqual(
+                table.cols.x[:], np.arange(1000)))
+            self.assertTrue(common.areArraysEqual(
+                dstfileh.root.group.earray[:],
+                np.arange(2000).reshape(-1, 2)))
+            self.assertEqual(dstfileh.root.softlink.target, '/group/earray')
+            self.assertEqual(dstfileh.root.hardlink._get_obj_info().rc, 2)
+        self.assertFalse(self.manifest.exists())
+
+    def test00_jobs(self):
+        """Copying leaves in worker processes"""
+
+        self._repack('--jobs=2')
+        self._check_copy()
+        self.assertEqual(list(Path(self.dstfname).parent.glob(
+            'ptrepack-*')), [])
+
+    def test01_resume(self):
+        """Resuming an interrupted copy"""
+
+        record_node = ptrepack.record_node
+
+        def interrupt(manifest, dstfileh, pathname):
+            record_node(manifest, dstfileh, pathname)
+            if pathname == '/table':
+                raise OSError("interrupted")
+
+        with patch.object(ptrepack, 'record_node', interrupt), \
+                patch('sys.stdout', new_callable=StringIO):
+            self.assertRaises(RuntimeError, self._repack, '--resume')
+        done = ptrepack.read_manifest(self.manifest)
+        self.assertIn('/table', done)
+        self.assertNotIn('/group/earray', done)
+        with tb.open_file(self.dstfname) as dstfileh:
+            addr = dstfileh.root.table._get_obj_info().addr
+
+        self._repack('--resume', '--jobs=2')
+        self._check_copy()
+        with tb.open_file(self.dstfname) as dstfileh:
+            # Copied nodes are not copied again.
+            self.assertEqual(dstfileh.root.table._get_obj_info().addr, addr)
+
+    def test02_errors(self):
+        """Checking invalid numbers of jobs"""
+
+        with patch('sys.stderr', new_callable=StringIO):
+            self.assertRaises(SystemExit, self._repack, '--jobs=0')
+
+
+class ptmergeTestCase(common.TempFileMixin, common.PyTablesTestCase):
+    """Test ptmerge"""
+
+    def setUp(self):
+        super().setUp()
+        self.h5file.create_table('/', 'table', np.zeros(10, dtype='i4,f8'))
+        self.h5file.close()
+        self.dstfname = tempfile.mktemp(prefix=self._getName(),
+                                        suffix='.h5')
+
+    def tearDown(self):
+        Path(self.dstfname).unlink(missing_ok=True)
+        self.h5file = tb.open_file(self.h5fname)
+        super().tearDown()
+
+    def _merge(self, *args):
+        argv = ['ptmerge', *args, self.h5fname, self.h5fname, self.dstfname]
+        with patch.object(sys, 'argv', argv), \
+                patch('sys.stdout', new_callable=StringIO) as stdout:
+            ptmerge.main()
+        return stdout.getvalue()
+
+    def test00_merge(self):
+        """Merging the same file twice"""
+
+        output = self._merge('-v')
+        self.assertIn('/table: 20 rows appended', output)
+        self._merge()
+        with tb.open_file(self.dstfname) as dstfileh:
+            self.assertEqual(dstfileh.root.table.nrows, 40)
+        self._merge('-o', '--unordered')
+        with tb.open_file(self.dstfname) as dstfileh:
+            self.assertEqual(dstfileh.root.table.nrows, 20)
+
+
 class ptdumpTestCase(common.PyTablesTestCase):
     """Test ptdump"""
 
@@ -82,6 +222,8 @@ def suite():
     theSuite = common.unittest.TestSuite()
 
     theSuite.addTest(common.unittest.makeSuite(ptrepackTestCase))
+    theSuite.addTest(common.unittest.makeSuite(ptrepackLeafwiseTestCase))
+    theSuite.addTest(common.unittest.makeSuite(ptmergeTestCase))
     theSuite.addTest(common.unittest.makeSuite(ptdumpTestCase))
     theSuite.addTest(common.unittest.makeSuite(pttreeTestCase))
 
@@ -20,3 +20,5 @@ cdef hsize_t *malloc_dims(object)
 cdef hid_t get_native_type(hid_t) nogil
 cdef str cstr_to_pystr(const char*)
 cdef int load_reference(hid_t dataset_id, hobj_ref_t *refbuf, size_t item_size, ndarray nparr) except -1
+cdef void acquire_hdf5_lock() nogil
+cdef void release_hdf5_lock() nogil
@@ -34,6 +34,7 @@ from libc.stdlib cimport malloc, free
 from libc.string cimport strchr, strcmp, strncmp, strlen
 from cpython.bytes cimport PyBytes_Check, PyBytes_FromStringAndSize
 from cpython.unicode cimport PyUnicode_DecodeUTF8, PyUnicode_Check
+from cpython.buffer cimport PyObject_GetBuffer, PyBuffer_Release, PyBUF_SIMPLE
 
 from numpy cimport (import_array, ndarray, dtype,
   npy_int64, PyArray_DATA, PyArray_GETPTR1, PyArray_DescrFromType, npy_intp,
@@ -68,7 +69,8 @@ from .definitions cimport (H5ARRAYget_info, H5ARRAYget_ndims,
   PyArray_Scalar, create_ieee_complex128, create_ieee_complex64,
   create_ieee_float16, create_ieee_complex192, create_ieee_complex256,
   get_len_of_range, get_order, herr_t, hid_t, hsize_t,
-  hssize_t, htri_t, is_complex, register_blosc, set_order,
+  hssize_t, htri_t, is_complex, register_blosc, blosc_filter_set_nthreads,
+  set_order,
   pt_H5free_memory, H5T_STD_REF_OBJ, H5Rdereference, H5R_OBJECT, H5I_DATASET, H5I_REFERENCE,
   H5Iget_type, hobj_ref_t, H5Oclose)
 
@@ -192,6 +194,35 @@ cdef extern from "blosc.h" nogil:
   const char* blosc_list_compressors()
   int blosc_compcode_to_compname(int compcode, char **compname)
   int blosc_get_complib_info(char *compname, char **complib, char **version)
+  int blosc_compress_ctx(int clevel, int doshuffle, size_t typesize,
+                         size_t nbytes, const void* src, void* dest,
+                         size_t destsize, const char* compressor,
+                         size_t blocksize, int numinternalthreads)
+  int blosc_decompress_ctx(const void *src, void *dest, size_t destsize,
+                           int numinternalthreads)
+  void blosc_cbuffer_sizes(const void *cbuffer, size_t *nbytes,
+                           size_t *cbytes, size_t *blocksize)
+
+# Functions from the Python thread API
+cdef extern from "pythread.h" nogil:
+  ctypedef void *PyThread_type_lock
+  PyThread_type_lock PyThread_allocate_lock()
+  int PyThread_acquire_lock(PyThread_type_lock lock, int waitflag)
+  void PyThread_release_lock(PyThread_type_lock lock)
+  unsigned long PyThread_get_thread_ident()
+  int WAIT_LOCK
+  int NOWAIT_LOCK
+
+# Functions from zlib
+cdef extern from "zlib.h" nogil:
+  ctypedef unsigned long uLong
+  ctypedef unsigned long uLongf
+  int Z_OK
+  uLong compressBound(uLong sourceLen)
+  int compress2(unsigned char *dest, uLongf *destLen,
+                const unsigned char *source, uLong sourceLen, int level)
+  int uncompress(unsigned char *dest, uLongf *destLen,
+                 const unsigned char *source, uLong sourceLen)
 
 cdef extern from "H5ARRAY.h" nogil:
   herr_t H5ARRAYread(hid_t dataset_id, hid_t type_id,
@@ -300,11 +331,250 @@ def set_blosc_max_threads(nthreads):
   this function is called again or a new file with a different
   :data:`tables.parameters.MAX_BLOSC_THREADS` value is specified.
 
+  The Blosc filter uses this number of threads for each chunk without
+  sharing any state between calls, so it is safe to read or write
+  Blosc-compressed datasets from several Python threads at the same time.
+
   Returns the previous setting for maximum threads.
 
+  .. versionchanged:: 3.7
+     The setting is used through the context-based Blosc API instead of
+     the global state of Blosc.
+
   """
 
-  return blosc_set_nthreads(nthreads)
+  blosc_set_nthreads(nthreads)
+  return blosc_filter_set_nthreads(nthreads)
+
+
+def blosc_compress_buffer(object data, int clevel, int doshuffle,
+                          size_t typesize, str compname):
+  """blosc_compress_buffer(data, clevel, doshuffle, typesize, compname)
+
+  Compress the `data` buffer the same way the HDF5 Blosc filter does.
+
+  Return an array of bytes with the compressed data, or None if it does
+  not fit in the size of `data` (in which case the filter leaves the data
+  uncompressed).  The compression does not use the global state of Blosc
+  and it releases the GIL, so it can be run concurrently from several
+  threads.
+
+  """
+
+  cdef Py_buffer view
+  cdef ndarray dest
+  cdef int csize
+  cdef bytes encoded_compname = compname.encode('ascii')
+  cdef const char *ccompname = encoded_compname
+
+  PyObject_GetBuffer(data, &view, PyBUF_SIMPLE)
+  try:
+    dest = numpy.empty(view.len, dtype=numpy.uint8)
+    with nogil:
+      csize = blosc_compress_ctx(clevel, doshuffle, typesize, view.len,
+                                 view.buf, PyArray_DATA(dest), view.len,
+                                 ccompname, 0, 1)
+  finally:
+    PyBuffer_Release(&view)
+
+  if csize < 0:
+    raise HDF5ExtError("Blosc compression error", h5bt=False)
+  elif csize == 0:
+    return None
+  return dest[:csize]
+
+
+def blosc_decompress_buffer(object data):
+  """blosc_decompress_buffer(data)
+
+  Decompress the `data` buffer compressed with Blosc.
+
+  Return an array of bytes with the decompressed data.  Like
+  :func:`blosc_compress_buffer`, this releases the GIL and can be run
+  concurrently from several threads.
+
+  """
+
+  cdef Py_buffer view
+  cdef ndarray dest
+  cdef size_t nbytes, cbytes, blocksize
+  cdef int dsize
+
+  PyObject_GetBuffer(data, &view, PyBUF_SIMPLE)
+  try:
+    if view.len < 16:  # BLOSC_MAX_OVERHEAD
+      raise HDF5ExtError("Blosc decompression error", h5bt=False)
+    blosc_cbuffer_sizes(view.buf, &nbytes, &cbytes, &blocksize)
+    dest = numpy.empty(nbytes, dtype=numpy.uint8)
+    with nogil:
+      dsize = blosc_decompress_ctx(view.buf, PyArray_DATA(dest), nbytes, 1)
+  finally:
+    PyBuffer_Release(&view)
+
+  if dsize < 0 or <size_t>dsize != nbytes:
+    raise HDF5ExtError("Blosc decompression error", h5bt=False)
+  return dest
+
+
+def zlib_compress_buffer(object data, int level):
+  """zlib_compress_buffer(data, level)
+
+  Compress the `data` buffer the same way the HDF5 deflate filter does.
+
+  Return an array of bytes with the compressed data.  This uses the same
+  zlib library as HDF5 and it releases the GIL, so it can be run
+  concurrently from several threads.
+
+  """
+
+  cdef Py_buffer view
+  cdef ndarray dest
+  cdef uLongf csize
+  cdef int ret
+
+  PyObject_GetBuffer(data, &view, PyBUF_SIMPLE)
+  try:
+    csize = compressBound(view.len)
+    dest = numpy.empty(csize, dtype=numpy.uint8)
+    with nogil:
+      ret = compress2(<unsigned char *>PyArray_DATA(dest), &csize,
+                      <const unsigned char *>view.buf, view.len, level)
+  finally:
+    PyBuffer_Release(&view)
+
+  if ret != Z_OK:
+    raise HDF5ExtError("zlib compression error (%d)" % ret, h5bt=False)
+  return dest[:csize]
+
+
+def zlib_decompress_buffer(object data, size_t nbytes):
+  """zlib_decompress_buffer(data, nbytes)
+
+  Decompress the `data` buffer compressed with zlib into `nbytes` bytes.
+
+  Return an array of bytes with the decompressed data.  Like
+  :func:`zlib_compress_buffer`, this releases the GIL and can be run
+  concurrently from several threads.
+
+  """
+
+  cdef Py_buffer view
+  cdef ndarray dest
+  cdef uLongf dsize = nbytes
+  cdef int ret
+
+  PyObject_GetBuffer(data, &view, PyBUF_SIMPLE)
+  try:
+    dest = numpy.empty(nbytes, dtype=numpy.uint8)
+    with nogil:
+      ret = uncompress(<unsigned char *>PyArray_DATA(dest), &dsize,
+                       <const unsigned char *>view.buf, view.len)
+  finally:
+    PyBuffer_Release(&view)
+
+  if ret != Z_OK or dsize != nbytes:
+    raise HDF5ExtError("zlib decompression error (%d)" % ret, h5bt=False)
+  return dest
+
+
+# The lock for the calls to the HDF5 library.  It is reentrant, so that
+# a thread holding it (e.g. through `hdf5_lock`) can make calls that take
+# it again.  The owner and count are only changed by the thread holding
+# the lock.
+cdef PyThread_type_lock _hdf5_lock = PyThread_allocate_lock()
+cdef unsigned long _hdf5_lock_owner = 0
+cdef long _hdf5_lock_count = 0
+
+if _hdf5_lock == NULL:
+  raise MemoryError("Unable to allocate the HDF5 lock")
+
+
+cdef int _acquire_hdf5_lock(int waitflag) nogil:
+  global _hdf5_lock_owner, _hdf5_lock_count
+  cdef unsigned long ident = PyThread_get_thread_ident()
+
+  if _hdf5_lock_count > 0 and _hdf5_lock_owner == ident:
+    _hdf5_lock_count += 1
+    return 1
+  if not PyThread_acquire_lock(_hdf5_lock, waitflag):
+    return 0
+  _hdf5_lock_owner = ident
+  _hdf5_lock_count = 1
+  return 1
+
+
+cdef void acquire_hdf5_lock() nogil:
+  """Acquire the HDF5 lock, waiting for it if needed.
+
+  This must be called without holding the GIL, so that the thread
+  holding the lock can get the GIL in the meanwhile.
+
+  """
+
+  _acquire_hdf5_lock(WAIT_LOCK)
+
+
+cdef void release_hdf5_lock() nogil:
+  """Release the HDF5 lock acquired by the current thread."""
+
+  global _hdf5_lock_owner, _hdf5_lock_count
+
+  _hdf5_lock_count -= 1
+  if _hdf5_lock_count == 0:
+    _hdf5_lock_owner = 0
+    PyThread_release_lock(_hdf5_lock)
+
+
+cdef class HDF5Lock:
+  """The lock serializing the calls of PyTables to the HDF5 library.
+
+  Reading and writing data in datasets is done without holding the GIL,
+  but taking this lock, so that other Python threads can run while the
+  I/O is in progress (e.g. while HDF5 decompresses chunks) and the HDF5
+  library is never entered concurrently, even when it is not thread
+  safe.  Opening, flushing and closing files and nodes, listing and
+  moving nodes, truncating leaves and accessing attributes are also done
+  with this lock.  Other functions calling HDF5 (e.g.
+  :func:`is_hdf5_file`) do not take it, so they should be called with
+  the lock held if other threads may be using HDF5 at the same time.
+
+  The lock is reentrant and it can be used as a context manager, so that
+  several HDF5 operations in a thread can be run without other threads
+  doing HDF5 calls in between.  The single instance of this class is
+  available as :data:`tables.hdf5_lock`.
+
+  .. versionadded:: 3.7
+
+  """
+
+  def acquire(self):
+    """Acquire the lock, blocking until it is available."""
+
+    if not _acquire_hdf5_lock(NOWAIT_LOCK):
+      with nogil:
+        acquire_hdf5_lock()
+
+  def release(self):
+    """Release the lock, which must be held by the current thread."""
+
+    if _hdf5_lock_count == 0 or _hdf5_lock_owner != PyThread_get_thread_ident():
+      raise RuntimeError("cannot release un-acquired lock")
+    release_hdf5_lock()
+
+  def locked(self):
+    """Return whether the lock is held by some thread."""
+
+    return _hdf5_lock_count > 0
+
+  def __enter__(self):
+    self.acquire()
+    return self
+
+  def __exit__(self, *exc_info):
+    self.release()
+
+
+hdf5_lock = HDF5Lock()
 
 
 
@@ -1397,6 +1667,8 @@ cdef int load_reference(hid_t dataset_id, hobj_ref_t *refbuf, size_t item_size,
   if refbuf == NULL:
     raise ValueError("Invalid reference buffer")
 
+  # The calls to HDF5 made with the GIL need the lock too.
+  hdf5_lock.acquire()
   try:
 
     for i in range(nelements):
@@ -1450,7 +1722,9 @@ cdef int load_reference(hid_t dataset_id, hobj_ref_t *refbuf, size_t item_size,
 
       # Do the physical read
       with nogil:
+          acquire_hdf5_lock()
           ret = H5ARRAYread(refobj_id, reftype_id, 0, nrows, 1, extdim, rbuf)
+          release_hdf5_lock()
       if ret < 0:
         raise HDF5ExtError("Problems reading the array data.")
 
@@ -1486,6 +1760,7 @@ cdef int load_reference(hid_t dataset_id, hobj_ref_t *refbuf, size_t item_size,
       free(<void *>maxdims)
     if dims:
       free(<void *>dims)
+    hdf5_lock.release()
 
   # no error
   return 0
@@ -98,6 +98,12 @@ class VLArray(hdf5extension.VLArray, Leaf):
 
         .. versionadded:: 3.4.3
 
+    attr_phase_change, attr_creation_order, expectedattrs
+        The settings for storing the attributes of the leaf (see
+        :meth:`File.create_group`).
+
+        .. versionadded:: 3.7
+
 
     .. versionchanged:: 3.0
        *parentNode* renamed into *parentnode*.
@@ -245,7 +251,8 @@ class VLArray(hdf5extension.VLArray, Leaf):
     def __init__(self, parentnode, name, atom=None, title="",
                  filters=None, expectedrows=None,
                  chunkshape=None, byteorder=None,
-                 _log=True, track_times=True):
+                 _log=True, track_times=True, attr_phase_change=None,
+                 attr_creation_order=None, expectedattrs=None):
 
         self._v_version = None
         """The object version of this array."""
@@ -332,7 +339,10 @@ class VLArray(hdf5extension.VLArray, Leaf):
             self._v_chunkshape = tuple(SizeType(s) for s in chunkshape)
 
         super().__init__(parentnode, name, new, filters,
-                         byteorder, _log, track_times)
+                         byteorder, _log, track_times,
+                         attr_phase_change=attr_phase_change,
+                         attr_creation_order=attr_creation_order,
+                         expectedattrs=expectedattrs)
 
     def _g_post_init_hook(self):
         super()._g_post_init_hook()